@@ -1,12 +1,79 @@
 import sqlite3
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from core.config import DB_PATH
+from typing import List, Dict, Any, Iterator, Optional, Sequence
+from core.config import (
+    DB_PATH, DB_POOL_ENABLED,
+    RETRY_BASE_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS, RETRY_MAX_ATTEMPTS)
+from core.db_pool import get_pool
+from utils.logger_core import logger
+
+
+class FileRow(sqlite3.Row):
+    """Yengil qator turi: tuple asosidagi sqlite3.Row + dict'ga o'xshash .get()
+
+    Har bir qatorni dict'ga nusxalamasdan row["title"] va row.get("title")
+    ko'rinishida o'qish mumkin. O'zgartirish kerak bo'lsa dict(row) qilinadi.
+    """
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (IndexError, KeyError):
+            return default
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+
+def _dedupe_pages(conn: sqlite3.Connection) -> None:
+    """Unique index qo'yishdan oldin takroriy (config_name, file_page) qatorlarni tozalash
+
+    Har bir sahifadan eng ko'p progress'li qator qoladi: yuklangan, keyin yuklab olingan,
+    keyin file_url'i bor, bo'lmasa eng eskisi. O'chirilganlar config bo'yicha log qilinadi.
+    """
+    ranked = """
+        SELECT id, config_name, ROW_NUMBER() OVER (
+            PARTITION BY config_name, file_page
+            ORDER BY uploaded DESC,
+                     (local_path IS NOT NULL AND local_path != '') DESC,
+                     (file_url IS NOT NULL AND file_url != '') DESC,
+                     id
+        ) AS rn
+        FROM files WHERE file_page IS NOT NULL
+    """
+    removed = conn.execute(
+        f"SELECT config_name, COUNT(*) FROM ({ranked}) WHERE rn > 1 GROUP BY config_name"
+    ).fetchall()
+    if not removed:
+        return
+    conn.execute(f"DELETE FROM files WHERE id IN (SELECT id FROM ({ranked}) WHERE rn > 1)")
+    total = sum(count for _, count in removed)
+    per_config = ", ".join(f"{name}: {count}" for name, count in removed)
+    logger.warning(
+        f"🧹 Migratsiya: {total} ta takroriy sahifa qatori o'chirildi ({per_config}); "
+        f"har sahifadan eng ko'p progress'li qator qoldi")
 
 
 class FileDB:
-    def __init__(self, db_path=DB_PATH):
+    # Pipeline holatlari (files.status):
+    #   pending -> downloading -> downloaded -> uploading -> uploaded
+    #   xato: failed (next_retry_at dan keyin qayta olinadi) -> ... -> dead
+    STATUSES = ("pending", "downloading", "downloaded", "uploading",
+                "uploaded", "failed", "dead")
+
+    def __init__(self, db_path=DB_PATH, pooled: Optional[bool] = None):
+        """
+        Args:
+            db_path: SQLite fayl yo'li
+            pooled: True - thread-local ulanishlarni qayta ishlatish (WAL bilan),
+                False - har bir chaqiruvda yangi ulanish (eski rejim),
+                None - DB_POOL_ENABLED sozlamasidan olinadi
+        """
         self.db_path = db_path
+        self.pooled = DB_POOL_ENABLED if pooled is None else pooled
+        self._pool = get_pool(db_path) if self.pooled else None
         self._init_db()
 
     def _connect(self):
@@ -14,108 +81,568 @@ class FileDB:
         conn.row_factory = sqlite3.Row  # ✅ dict-style natija
         return conn
 
+    @contextmanager
+    def _connection(self):
+        """Ulanish olish: muvaffaqiyatli bo'lsa commit, xato bo'lsa rollback.
+
+        Pool rejimida ulanish yopilmaydi - keyingi chaqiruvda qayta ishlatiladi.
+        """
+        conn = self._pool.acquire() if self._pool else self._connect()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if not self._pool:
+                conn.close()
+
+    def close(self):
+        """Pool ulanishlarini yopish (pool rejimida barcha FileDB'lar uchun umumiy)"""
+        if self._pool:
+            self._pool.close_all()
+
+    # Schema migratsiyalari: (versiya, SQL so'rovlar yoki conn qabul qiluvchi funksiyalar).
+    # PRAGMA user_version orqali kuzatiladi, har bir versiya bir marta qo'llanadi.
+    _MIGRATIONS = [
+        (1, (
+            # Unique index qo'yishdan oldin dublikat (config_name, file_page) larni tozalash
+            _dedupe_pages,
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_files_config_page ON files(config_name, file_page)",
+            # get_undownloaded_files uchun partial index (WHERE shartlari so'rov bilan bir xil)
+            """
+            CREATE INDEX IF NOT EXISTS idx_files_pending ON files(config_name, id)
+            WHERE (uploaded IS NULL OR uploaded=0) AND (local_path IS NULL OR local_path = '')
+            """,
+            # Uploaded hisoblagichlari va reset_uploaded_status uchun
+            "CREATE INDEX IF NOT EXISTS idx_files_config_uploaded ON files(config_name, uploaded)",
+        )),
+        (2, (
+            # search() uchun FTS5 indeks: files jadvalidan o'qiydi (external content),
+            # triggerlar orqali sinxron saqlanadi
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+                title, description, actors, categories, country, file_url,
+                content='files', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files BEGIN
+                INSERT INTO files_fts(rowid, title, description, actors, categories, country, file_url)
+                VALUES (new.id, new.title, new.description, new.actors, new.categories, new.country, new.file_url);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files BEGIN
+                INSERT INTO files_fts(files_fts, rowid, title, description, actors, categories, country, file_url)
+                VALUES ('delete', old.id, old.title, old.description, old.actors, old.categories, old.country, old.file_url);
+            END
+            """,
+            # Faqat indekslangan ustunlar o'zgarganda - local_path/uploaded yangilanishlari indeksga tegmaydi
+            """
+            CREATE TRIGGER IF NOT EXISTS files_fts_update
+            AFTER UPDATE OF title, description, actors, categories, country, file_url ON files BEGIN
+                INSERT INTO files_fts(files_fts, rowid, title, description, actors, categories, country, file_url)
+                VALUES ('delete', old.id, old.title, old.description, old.actors, old.categories, old.country, old.file_url);
+                INSERT INTO files_fts(rowid, title, description, actors, categories, country, file_url)
+                VALUES (new.id, new.title, new.description, new.actors, new.categories, new.country, new.file_url);
+            END
+            """,
+            # Mavjud qatorlarni indekslash
+            "INSERT INTO files_fts(files_fts) VALUES ('rebuild')",
+        )),
+        (3, (
+            # claim_batch: bir nechta worker (WORKER_NAME) navbatni bo'lishib olishi uchun lease
+            "ALTER TABLE files ADD COLUMN claimed_by TEXT",
+            "ALTER TABLE files ADD COLUMN lease_expires_at INTEGER",  # unix vaqt (soniya)
+        )),
+        (4, (
+            # Aniq pipeline holati va xatolar hisobi (STATUSES)
+            "ALTER TABLE files ADD COLUMN status TEXT NOT NULL DEFAULT 'pending'",
+            "ALTER TABLE files ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE files ADD COLUMN last_error TEXT",
+            "ALTER TABLE files ADD COLUMN next_retry_at INTEGER",  # unix vaqt (soniya)
+            # Mavjud qatorlar holatini uploaded/local_path'dan aniqlash
+            """
+            UPDATE files SET status = CASE
+                WHEN uploaded=1 THEN 'uploaded'
+                WHEN local_path IS NOT NULL AND local_path != '' THEN 'downloaded'
+                ELSE 'pending'
+            END
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_files_config_status ON files(config_name, status)",
+            # Navbat endi status bo'yicha tanlanadi - eski partial index o'rniga
+            "DROP INDEX IF EXISTS idx_files_pending",
+            """
+            CREATE INDEX IF NOT EXISTS idx_files_queue ON files(config_name, id)
+            WHERE status IN ('pending', 'failed', 'downloading', 'uploading')
+            """,
+        )),
+        (5, (
+            # Incremental crawl: har config uchun eng yangi ko'rilgan film (high-water mark)
+            """
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                config_name TEXT PRIMARY KEY,
+                high_water_page TEXT,
+                pages_walked INTEGER,
+                new_files INTEGER,
+                updated_at INTEGER
+            )
+            """,
+        )),
+        (6, (
+            # Crawl frontier: to'xtab qolgan scraping keyingi ishga tushirishda davom etadi.
+            # kind: listing | detail; status: queued | in_flight | done | failed
+            """
+            CREATE TABLE IF NOT EXISTS crawl_frontier (
+                config_name TEXT NOT NULL,
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                seq INTEGER NOT NULL DEFAULT 0,
+                payload TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at INTEGER,
+                PRIMARY KEY (config_name, url)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_frontier_status ON crawl_frontier(config_name, kind, status)",
+        )),
+        (7, (
+            # URL metadata cache: scraper va downloaderlar HEAD so'rovini qayta yubormasligi uchun.
+            # accept_ranges: 1 | 0 | NULL (noma'lum)
+            """
+            CREATE TABLE IF NOT EXISTS url_meta (
+                url TEXT PRIMARY KEY,
+                size INTEGER,
+                accept_ranges INTEGER,
+                content_type TEXT,
+                probed_at INTEGER NOT NULL
+            )
+            """,
+        )),
+        (8, (
+            # FTS indeksga year va language ham qo'shiladi ("2019", "uz" qidiruvlari).
+            # FTS5 ustun qo'shishni qo'llamaydi - jadval va triggerlar qayta yaratiladi
+            "DROP TRIGGER IF EXISTS files_fts_insert",
+            "DROP TRIGGER IF EXISTS files_fts_delete",
+            "DROP TRIGGER IF EXISTS files_fts_update",
+            "DROP TABLE IF EXISTS files_fts",
+            """
+            CREATE VIRTUAL TABLE files_fts USING fts5(
+                title, description, actors, categories, country, file_url, year, language,
+                content='files', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """,
+            """
+            CREATE TRIGGER files_fts_insert AFTER INSERT ON files BEGIN
+                INSERT INTO files_fts(rowid, title, description, actors, categories, country, file_url, year, language)
+                VALUES (new.id, new.title, new.description, new.actors, new.categories, new.country, new.file_url,
+                        new.year, new.language);
+            END
+            """,
+            """
+            CREATE TRIGGER files_fts_delete AFTER DELETE ON files BEGIN
+                INSERT INTO files_fts(files_fts, rowid, title, description, actors, categories, country, file_url,
+                                      year, language)
+                VALUES ('delete', old.id, old.title, old.description, old.actors, old.categories, old.country,
+                        old.file_url, old.year, old.language);
+            END
+            """,
+            """
+            CREATE TRIGGER files_fts_update
+            AFTER UPDATE OF title, description, actors, categories, country, file_url, year, language ON files BEGIN
+                INSERT INTO files_fts(files_fts, rowid, title, description, actors, categories, country, file_url,
+                                      year, language)
+                VALUES ('delete', old.id, old.title, old.description, old.actors, old.categories, old.country,
+                        old.file_url, old.year, old.language);
+                INSERT INTO files_fts(rowid, title, description, actors, categories, country, file_url, year, language)
+                VALUES (new.id, new.title, new.description, new.actors, new.categories, new.country, new.file_url,
+                        new.year, new.language);
+            END
+            """,
+            "INSERT INTO files_fts(files_fts) VALUES ('rebuild')",
+        )),
+        (9, (
+            # Oxirgi crawl oxirigacha ishladimi (1) yoki to'xtab qoldimi (0); NULL - noma'lum
+            # (marker'dan oldingi baza). Faqat to'xtab qolgan crawl avtomatik davom ettiriladi
+            "ALTER TABLE crawl_state ADD COLUMN crawl_finished INTEGER",
+        )),
+    ]
+
     def _init_db(self):
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute(
+        with self._connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                config_name TEXT,
+                file_page TEXT,
+                title TEXT,
+                categories TEXT,
+                language TEXT,
+                description TEXT,
+                file_url TEXT,
+                image TEXT,
+                year TEXT,
+                country TEXT,
+                actors TEXT,
+                local_path TEXT,
+                file_size INTEGER,
+                mime TEXT,
+                telegram_type TEXT,
+                uploaded BOOLEAN DEFAULT 0,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                uploaded_at TEXT
+            )
             """
-        CREATE TABLE IF NOT EXISTS files (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            config_name TEXT,
-            file_page TEXT,
-            title TEXT,
-            categories TEXT,
-            language TEXT,
-            description TEXT,
-            file_url TEXT,
-            image TEXT,
-            year TEXT,
-            country TEXT,
-            actors TEXT,
-            local_path TEXT,
-            file_size INTEGER,
-            mime TEXT,
-            telegram_type TEXT,
-            uploaded BOOLEAN DEFAULT 0,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            uploaded_at TEXT
-        )
-        """
-        )
-        conn.commit()
-        conn.close()
+            )
+            self._migrate(conn)
+
+    def _migrate(self, conn):
+        """Hali qo'llanmagan schema migratsiyalarini ishga tushirish"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in self._MIGRATIONS:
+            if version >= target:
+                continue
+            for sql in statements:
+                if callable(sql):
+                    sql(conn)
+                    continue
+                try:
+                    conn.execute(sql)
+                except sqlite3.OperationalError as e:
+                    # Qisman qo'llangan migratsiya - ustun allaqachon qo'shilgan
+                    if "duplicate column name" not in str(e):
+                        raise
+            conn.execute(f"PRAGMA user_version={target}")
+            version = target
 
     # --- CRUD funksiyalar ---
 
     def get_files(self, config_name, sort_by_size=None):
+        order_by = "id"
+        if sort_by_size == 1:
+            order_by = "file_size ASC"  # 1 = eng kichikdan boshla
+        elif sort_by_size == 0:
+            order_by = "file_size DESC"  # 0 = eng kattadan boshla
+        # boshqa qiymatlarda sort qilinmaydi
+
+        # ✅ dict sifatida qaytaradi (katta config'lar uchun iter_files afzal)
+        return [dict(r) for r in self.iter_files(config_name, order_by=order_by)]
+
+    # iter_files(where=...) uchun tayyor filtrlar
+    _WHERE_PRESETS = {
+        # Navbatga tayyor qatorlar: pending, backoff muddati o'tgan failed va
+        # egasiz (lease'i yo'q yoki muddati o'tgan - worker to'xtab qolgan) downloading/uploading.
+        # Upload qilingan fayl status'i qanday bo'lmasin qayta navbatga tushmaydi
+        "undownloaded": """
+            status IN ('pending', 'failed', 'downloading', 'uploading')
+            AND (next_retry_at IS NULL OR next_retry_at <= CAST(strftime('%s', 'now') AS INTEGER))
+            AND (status IN ('pending', 'failed') OR lease_expires_at IS NULL
+                 OR lease_expires_at <= CAST(strftime('%s', 'now') AS INTEGER))
+            AND file_url IS NOT NULL
+            AND file_url != ''
+            AND file_url NOT LIKE '%t.me%'
+            AND (uploaded IS NULL OR uploaded=0)
+        """,
+        "downloaded": "local_path IS NOT NULL AND local_path != ''",
+        "uploaded": "uploaded=1",
+        "not_uploaded": "(uploaded IS NULL OR uploaded=0)",
+        "failed": "status IN ('failed', 'dead')",
+    }
+
+    def iter_files(
+        self,
+        config_name: str,
+        where: Optional[str] = None,
+        params: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        order_by: Optional[str] = "id",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        batch_size: int = 500,
+    ) -> Iterator[FileRow]:
+        """Fayllarni fetchmany orqali partiyalab o'qish (xotira sarfi o'zgarmaydi)
+
+        Iteratsiya uchun alohida ulanish ochiladi, shuning uchun iteratsiya davomida
+        shu FileDB orqali update_file va boshqa yozishlarni bemalol chaqirish mumkin.
+
+        Args:
+            config_name: Config nomi
+            where: Tayyor filtr nomi (_WHERE_PRESETS) yoki qo'shimcha SQL shart
+            params: where shartidagi ? parametrlar
+            columns: Faqat kerakli ustunlar (None - barchasi)
+            order_by: Tartiblash (None - tartiblanmaydi)
+            limit / offset: Sahifalash uchun
+            batch_size: Bitta fetchmany'dagi qatorlar soni
+
+        Yields:
+            FileRow: row["col"] va row.get("col") bilan o'qiladigan qator
+        """
+        select = ", ".join(columns) if columns else "*"
+        sql = f"SELECT {select} FROM files WHERE config_name=?"
+        args = [config_name]
+        if where:
+            sql += f" AND ({self._WHERE_PRESETS.get(where, where)})"
+            args.extend(params)
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            args.extend((-1 if limit is None else int(limit), int(offset)))
+
         conn = self._connect()
-        conn.row_factory = sqlite3.Row  # 🔑 Har bir natija Row obyekt bo'ladi
-        c = conn.cursor()
-
-        sql = "SELECT * FROM files WHERE config_name=?"
-        if sort_by_size is not None:
-            if sort_by_size == 1:
-                sql += " ORDER BY file_size ASC"  # 1 = eng kichikdan boshla
-            elif sort_by_size == 0:
-                sql += " ORDER BY file_size DESC"  # 0 = eng kattadan boshla
-            # boshqa qiymatlarda sort qilinmaydi
-
-        c.execute(sql, (config_name,))
-        rows = c.fetchall()
-        conn.close()
-        return [dict(r) for r in rows]  # ✅ endi dict sifatida qaytaradi
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = FileRow
+            cursor.execute(sql, args)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    # search() natijalarini tartiblash uchun bm25 ustun og'irliklari (files_fts ustunlari tartibida):
+    # title, description, actors, categories, country, file_url, year, language
+    _SEARCH_WEIGHTS = (10.0, 1.0, 3.0, 2.0, 2.0, 0.5, 1.0, 1.0)
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Foydalanuvchi matnini xavfsiz FTS5 so'roviga aylantirish.
+
+        Har bir so'z qo'shtirnoq ichida prefiks sifatida qidiriladi ("oil"* -> "Oila"),
+        so'zlar orasida AND. FTS5 operatorlari (OR, NEAR, -, :) oddiy matn sifatida olinadi.
+        """
+        terms = [term.replace('"', '') for term in query.split()]
+        return " ".join(f'"{term}"*' for term in terms if term.strip('"'))
+
+    def search(self, config_name: str, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """FTS5 indeks orqali to'liq matnli qidiruv (nom, tavsif, aktyorlar,
+        kategoriyalar, mamlakat, URL, yil, til)
+
+        Args:
+            config_name: Config nomi
+            query: Qidiruv matni (har bir so'z prefiks sifatida moslanadi)
+            limit: Maksimal natijalar soni
+
+        Returns:
+            List[dict]: Eng mos natijalar birinchi; har birida "_rank" (bm25, kichigi yaxshi)
+        """
+        match = self._fts_query(query)
+        if not match:
+            return []
+
+        weights = ", ".join(str(w) for w in self._SEARCH_WEIGHTS)
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT f.*, bm25(files_fts, {weights}) AS _rank
+                FROM files_fts
+                JOIN files f ON f.id = files_fts.rowid
+                WHERE files_fts MATCH ? AND f.config_name=?
+                ORDER BY _rank
+                LIMIT ?
+                """,
+                (match, config_name, int(limit)),
+            ).fetchall()
+        return [dict(row) for row in rows]
 
     def get_file(self, file_id):
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute("SELECT * FROM files WHERE id=?", (file_id,))
-        row = c.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT * FROM files WHERE id=?", (file_id,))
+            row = c.fetchone()
         return dict(row) if row else None  # ✅ dict yoki None
 
+    # insert_file / insert_files uchun umumiy ustunlar tartibi
+    _INSERT_COLUMNS = (
+        "config_name", "file_page", "title", "categories", "language", "description",
+        "file_url", "image", "year", "country", "actors",
+        "local_path", "file_size", "mime", "telegram_type", "uploaded", "status",
+    )
+
+    # Upsert paytida yangilanadigan (scraping natijasidagi) metadata ustunlari
+    _UPSERT_COLUMNS = (
+        "title", "categories", "language", "description",
+        "file_url", "image", "year", "country", "actors", "file_size",
+    )
+
+    @staticmethod
+    def _derived_status(fields) -> Optional[str]:
+        """uploaded/local_path o'zgarishidan kelib chiqadigan status (aniq berilmagan bo'lsa)"""
+        if fields.get("uploaded"):
+            return "uploaded"
+        if fields.get("local_path"):
+            return "downloaded"
+        return None
+
+    @classmethod
+    def _insert_values(cls, config_name, item) -> tuple:
+        return (
+            config_name,
+            item.get("file_page"),
+            item.get("title"),
+            item.get("categories"),
+            item.get("language") or "uz",
+            item.get("description"),
+            item.get("file_url"),
+            item.get("image"),
+            item.get("year"),
+            item.get("country"),
+            item.get("actors"),
+            item.get("local_path"),
+            item.get("file_size"),
+            item.get("mime"),
+            item.get("telegram_type"),
+            int(item.get("uploaded", False)),
+            cls._derived_status(item) or item.get("status") or "pending",
+        )
+
     def insert_file(self, config_name, item):
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute(
-            """
-        INSERT INTO files (
-            config_name, file_page, title, categories, language, description,
-            file_url, image, year, country, actors,
-            local_path, file_size, mime, telegram_type, uploaded
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                config_name,
-                item.get("file_page"),
-                item.get("title"),
-                item.get("categories"),
-                item.get("language") or "uz",
-                item.get("description"),
-                item.get("file_url"),
-                item.get("image"),
-                item.get("year"),
-                item.get("country"),
-                item.get("actors"),
-                item.get("local_path"),
-                item.get("file_size"),
-                item.get("mime"),
-                item.get("telegram_type"),
-                int(item.get("uploaded", False)),
-            ),
+        columns = ", ".join(self._INSERT_COLUMNS)
+        placeholders = ", ".join("?" * len(self._INSERT_COLUMNS))
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT INTO files ({columns}) VALUES ({placeholders})",
+                self._insert_values(config_name, item),
+            )
+
+    def insert_files(self, config_name: str, items: List[Dict[str, Any]],
+                     on_conflict: str = "ignore", chunk_size: int = 500) -> Dict[str, int]:
+        """Ko'p itemlarni bitta tranzaksiyada yozish (executemany, chunk'lar bilan)
+
+        Args:
+            config_name: Config nomi
+            items: Yoziladigan itemlar (file_page bo'lishi shart)
+            on_conflict: DB'da yoki ro'yxatda shu file_page allaqachon bo'lsa:
+                "ignore" - tashlab ketish, "upsert" - metadata ustunlarini yangilash
+            chunk_size: Bitta executemany dagi qatorlar soni
+
+        Returns:
+            Dict: {"inserted": ..., "updated": ..., "skipped": ...}
+        """
+        if on_conflict not in ("ignore", "upsert"):
+            raise ValueError(f"Noma'lum on_conflict: {on_conflict}")
+
+        stats = {"inserted": 0, "updated": 0, "skipped": 0}
+        columns = ", ".join(self._INSERT_COLUMNS)
+        placeholders = ", ".join("?" * len(self._INSERT_COLUMNS))
+        insert_sql = f"INSERT INTO files ({columns}) VALUES ({placeholders})"
+        # None qiymatlar mavjud ma'lumotni o'chirmasligi uchun COALESCE
+        update_sql = "UPDATE files SET {} WHERE config_name=? AND file_page=?".format(
+            ", ".join(f"{col}=COALESCE(?, {col})" for col in self._UPSERT_COLUMNS)
         )
-        conn.commit()
-        conn.close()
 
-    def update_file(self, file_id, **kwargs):
-        if not kwargs:
-            return
+        seen = set()
+        with self._connection() as conn:
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                pages = [item.get("file_page") for item in chunk if item.get("file_page")]
+                existing = self._existing_pages_in(conn, config_name, pages)
 
-        conn = self._connect()
-        c = conn.cursor()
+                to_insert, to_update = [], []
+                for item in chunk:
+                    page = item.get("file_page")
+                    if not page:
+                        stats["skipped"] += 1
+                        continue
+                    if page in existing or page in seen:
+                        if on_conflict == "upsert":
+                            to_update.append(
+                                tuple(item.get(col) for col in self._UPSERT_COLUMNS)
+                                + (config_name, page)
+                            )
+                        else:
+                            stats["skipped"] += 1
+                        continue
+                    seen.add(page)
+                    to_insert.append(self._insert_values(config_name, item))
+
+                if to_insert:
+                    conn.executemany(insert_sql, to_insert)
+                    stats["inserted"] += len(to_insert)
+                if to_update:
+                    conn.executemany(update_sql, to_update)
+                    stats["updated"] += len(to_update)
 
+        return stats
+
+    # SQLite bitta so'rovdagi parametrlar soni cheklangan - IN ro'yxati shu hajmdan oshmaydi
+    _IN_CHUNK = 900
+
+    def _existing_pages_in(self, conn, config_name: str, pages: List[str]) -> set:
+        """Berilgan file_page'lardan DB'da mavjudlarini topish.
+
+        Kichik ro'yxat uchun bitta IN so'rov, katta ro'yxat uchun vaqtinchalik
+        jadval bilan JOIN ishlatiladi (unique index orqali).
+        """
+        if not pages:
+            return set()
+
+        if len(pages) <= self._IN_CHUNK:
+            placeholders = ", ".join("?" * len(pages))
+            rows = conn.execute(
+                f"SELECT file_page FROM files WHERE config_name=? AND file_page IN ({placeholders})",
+                (config_name, *pages),
+            ).fetchall()
+            return {row[0] for row in rows}
+
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS page_lookup (file_page TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM page_lookup")
+        conn.executemany(
+            "INSERT OR IGNORE INTO page_lookup (file_page) VALUES (?)",
+            ((page,) for page in pages),
+        )
+        rows = conn.execute(
+            """
+            SELECT f.file_page FROM page_lookup p
+            JOIN files f ON f.config_name=? AND f.file_page=p.file_page
+            """,
+            (config_name,),
+        ).fetchall()
+        conn.execute("DELETE FROM page_lookup")
+        return {row[0] for row in rows}
+
+    def existing_pages(self, config_name: str, pages: List[str]) -> set:
+        """Bir nechta file_page'dan DB'da mavjudlarini bitta so'rovda qaytarish
+
+        Args:
+            config_name: Config nomi
+            pages: Tekshiriladigan file_page URL'lari
+
+        Returns:
+            set: DB'da mavjud file_page'lar
+        """
+        pages = [page for page in pages if page]
+        with self._connection() as conn:
+            return self._existing_pages_in(conn, config_name, pages)
+
+    @classmethod
+    def _update_statement(cls, kwargs) -> tuple:
+        """update_file uchun (sql, qiymatlar) - oxirgi ? parametr file_id uchun"""
         fields = []
         values = []
 
+        # uploaded=True / local_path=... status'ni ham o'zgartiradi
+        if "status" not in kwargs:
+            status = cls._derived_status(kwargs)
+            if status:
+                kwargs = {**kwargs, "status": status}
+            elif "local_path" in kwargs and "uploaded" not in kwargs:
+                # Fayl diskdan olib tashlandi: yuklab olingan bo'lsa qayta navbatga
+                fields.append(
+                    "status=CASE WHEN uploaded=1 THEN 'uploaded' "
+                    "WHEN status IN ('downloaded', 'uploading') THEN 'pending' ELSE status END")
+
         for key, val in kwargs.items():
             if key == "uploaded" and val:
                 fields.append("uploaded_at=?")
@@ -123,32 +650,106 @@ class FileDB:
             fields.append(f"{key}=?")
             values.append(val)
 
+        return f"UPDATE files SET {', '.join(fields)} WHERE id=?", values
+
+    def update_file(self, file_id, **kwargs):
+        if not kwargs:
+            return
+
+        sql, values = self._update_statement(kwargs)
         values.append(file_id)
-        sql = f"UPDATE files SET {', '.join(fields)} WHERE id=?"
-        c.execute(sql, tuple(values))
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            conn.execute(sql, tuple(values))
+
+    def update_files(self, updates: Dict[int, Dict[str, Any]]) -> int:
+        """Bir nechta qatorni bitta tranzaksiyada yangilash
+
+        Args:
+            updates: {file_id: {ustun: qiymat}} - update_file kwargs'lari bilan bir xil
+
+        Returns:
+            int: Yangilangan qatorlar soni
+        """
+        # Bir xil ustunlar to'plami bitta executemany bilan yoziladi
+        grouped: Dict[str, List[tuple]] = {}
+        for file_id, fields in updates.items():
+            if not fields:
+                continue
+            sql, values = self._update_statement(fields)
+            grouped.setdefault(sql, []).append((*values, file_id))
+
+        if not grouped:
+            return 0
+
+        with self._connection() as conn:
+            for sql, rows in grouped.items():
+                conn.executemany(sql, rows)
+        return sum(len(rows) for rows in grouped.values())
+
+    def mark_file_uploaded(self, file_id):
+        """Faylni Telegramga yuklangan deb belgilash (uploaded_at ham yoziladi)"""
+        self.update_file(file_id, uploaded=True)
+
+    def record_failure(self, file_id, error: str, max_attempts: Optional[int] = None) -> Optional[str]:
+        """Download/upload xatosini qayd qilish va keyingi urinishni rejalashtirish
+
+        attempts oshiriladi, keyingi urinish exponential backoff bilan
+        (RETRY_BASE_DELAY_SECONDS * 2^(attempts-1), RETRY_MAX_DELAY_SECONDS gacha)
+        next_retry_at ga yoziladi. max_attempts ga yetganda status='dead' -
+        fayl navbatga boshqa qaytmaydi (reset_failed_status bilan qaytariladi).
+
+        Returns:
+            str: Yangi status ("failed" yoki "dead"), qator topilmasa None
+        """
+        max_attempts = RETRY_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        with self._connection() as conn:
+            # SET ichidagi attempts - eski qiymat
+            row = conn.execute(
+                """
+                UPDATE files SET
+                    attempts = attempts + 1,
+                    last_error = ?,
+                    status = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'failed' END,
+                    next_retry_at = CAST(strftime('%s', 'now') AS INTEGER)
+                        + MIN(?, ? * (1 << MIN(attempts, 30)))
+                WHERE id=?
+                RETURNING status
+                """,
+                ((error or "")[:1000], max_attempts, RETRY_MAX_DELAY_SECONDS,
+                 RETRY_BASE_DELAY_SECONDS, file_id),
+            ).fetchone()
+        return row["status"] if row else None
+
+    def reset_failed_status(self, config_name: str, include_dead: bool = True) -> int:
+        """failed (va dead) fayllarni darhol qayta urinish uchun pending holatiga qaytarish
+
+        Returns:
+            int: Reset qilingan fayllar soni
+        """
+        statuses = ("failed", "dead") if include_dead else ("failed",)
+        placeholders = ", ".join("?" * len(statuses))
+        with self._connection() as conn:
+            return conn.execute(
+                f"UPDATE files SET status='pending', attempts=0, next_retry_at=NULL "
+                f"WHERE config_name=? AND status IN ({placeholders})",
+                (config_name, *statuses),
+            ).rowcount
 
     def delete_file(self, file_id):
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute("DELETE FROM files WHERE id=?", (file_id,))
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            conn.execute("DELETE FROM files WHERE id=?", (file_id,))
 
     def delete_files(self, config_name):
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM files WHERE config_name=?",
-                  (config_name,))
-        count = c.fetchone()[0]
-        c.execute("DELETE FROM files WHERE config_name=?", (config_name,))
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT COUNT(*) FROM files WHERE config_name=?",
+                      (config_name,))
+            count = c.fetchone()[0]
+            c.execute("DELETE FROM files WHERE config_name=?", (config_name,))
         return count
 
     def get_undownloaded_files(self, config_name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Yuklanmagan fayllarni olish (local_path bo'sh bo'lganlar)
+        """Navbatga tayyor fayllarni olish (pending va backoff muddati o'tgan failed)
 
         Args:
             config_name: Config nomi
@@ -157,82 +758,244 @@ class FileDB:
         Returns:
             List of undownloaded files
         """
-        conn = self._connect()
-        c = conn.cursor()
+        # dead va qayta urinish vaqti kelmagan failed fayllar qaytarilmaydi
+        rows = self.iter_files(config_name, where="undownloaded", limit=limit or None)
+        return [dict(row) for row in rows]
 
-        # Base query - telegramga yuklanmagan (uploaded=0) va localga ham yuklanmagan fayllar
-        query = """
-            SELECT * FROM files 
-            WHERE config_name=? 
-            AND (uploaded IS NULL OR uploaded=0)
-            AND (local_path IS NULL OR local_path = '')
-            AND file_url IS NOT NULL 
-            AND file_url != ''
-            AND file_url NOT LIKE '%t.me%'
-            ORDER BY id
+    def claim_batch(self, config_name: str, worker: str, n: int,
+                    lease_seconds: int, order_by: str = "id") -> List[Dict[str, Any]]:
+        """Yuklanmagan fayllardan n tasini worker nomiga atomik band qilish (lease)
+
+        Bitta UPDATE ... RETURNING bilan bajariladi, shuning uchun bir xil DB'ni
+        ishlatayotgan bir nechta server bir xil qatorni ololmaydi. Muddati o'tgan
+        lease'lar (worker to'xtab qolgan) qayta band qilinadi. Worker o'zining amaldagi
+        lease'larini qayta olmaydi - ular renew_leases bilan uzaytiriladi.
+
+        Args:
+            config_name: Config nomi
+            worker: Worker nomi (WORKER_NAME)
+            n: Maksimal qatorlar soni
+            lease_seconds: Lease muddati (soniya)
+            order_by: Qaysi tartibda olish ("id" yoki "file_size ASC")
+
+        Returns:
+            List[dict]: Band qilingan qatorlar (order_by tartibida)
         """
+        now = int(time.time())
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"""
+                UPDATE files SET claimed_by=?, lease_expires_at=?, status='downloading'
+                WHERE id IN (
+                    SELECT id FROM files
+                    WHERE config_name=?
+                    AND ({self._WHERE_PRESETS["undownloaded"]})
+                    AND (claimed_by IS NULL OR lease_expires_at IS NULL OR lease_expires_at <= ?)
+                    ORDER BY {order_by}
+                    LIMIT ?
+                )
+                RETURNING *
+                """,
+                (worker, now + int(lease_seconds), config_name, now, int(n)),
+            ).fetchall()
 
-        if limit:
-            query += f" LIMIT {limit}"
+        # RETURNING tartibi kafolatlanmagan
+        items = [dict(row) for row in rows]
+        if order_by == "file_size ASC":
+            items.sort(key=lambda item: (item.get("file_size") or 0, item["id"]))
+        else:
+            items.sort(key=lambda item: item["id"])
+        return items
 
-        c.execute(query, (config_name,))
-        results = c.fetchall()
-        conn.close()
+    def claim_file(self, file_id: int, worker: str, lease_seconds: int) -> bool:
+        """Bitta faylni worker nomiga band qilish (claim_batch bilan bir xil lease qoidalari)
 
-        # Convert to dict format
-        files = []
-        columns = [desc[0] for desc in c.description]
-        for row in results:
-            file_dict = dict(zip(columns, row))
-            files.append(file_dict)
+        Qator boshqa worker'ning amaldagi lease'ida bo'lsa yoki allaqachon upload
+        qilingan bo'lsa band qilinmaydi.
 
-        return files
+        Returns:
+            bool: Fayl shu worker'ga band qilindi (yoki uning lease'i uzaytirildi)
+        """
+        now = int(time.time())
+        with self._connection() as conn:
+            claimed = conn.execute(
+                """
+                UPDATE files SET claimed_by=?, lease_expires_at=?, status='downloading'
+                WHERE id=?
+                AND (uploaded IS NULL OR uploaded=0)
+                AND (claimed_by IS NULL OR claimed_by=?
+                     OR lease_expires_at IS NULL OR lease_expires_at <= ?)
+                """,
+                (worker, now + int(lease_seconds), file_id, worker, now),
+            ).rowcount
+        return claimed == 1
+
+    def renew_leases(self, config_name: str, worker: str, file_ids: List[int],
+                     lease_seconds: int) -> int:
+        """Worker hali ishlayotgan qatorlarning lease muddatini uzaytirish
+
+        Returns:
+            int: Uzaytirilgan lease'lar soni (boshqa worker olib qo'yganlari hisobga kirmaydi)
+        """
+        if not file_ids:
+            return 0
+        expires = int(time.time()) + int(lease_seconds)
+        renewed = 0
+        with self._connection() as conn:
+            for start in range(0, len(file_ids), self._IN_CHUNK):
+                chunk = file_ids[start:start + self._IN_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                renewed += conn.execute(
+                    f"UPDATE files SET lease_expires_at=? "
+                    f"WHERE config_name=? AND claimed_by=? AND id IN ({placeholders})",
+                    (expires, config_name, worker, *chunk),
+                ).rowcount
+        return renewed
+
+    def release_claims(self, config_name: str, worker: str,
+                       file_ids: Optional[List[int]] = None) -> int:
+        """Worker lease'larini bo'shatish (boshqa workerlar darhol olishi uchun)
+
+        Args:
+            file_ids: Faqat shu qatorlar (None - worker'ning shu config'dagi barcha lease'lari)
+        """
+        sql = ("UPDATE files SET claimed_by=NULL, lease_expires_at=NULL "
+               "WHERE config_name=? AND claimed_by=?")
+        with self._connection() as conn:
+            if file_ids is None:
+                return conn.execute(sql, (config_name, worker)).rowcount
+            released = 0
+            for start in range(0, len(file_ids), self._IN_CHUNK):
+                chunk = file_ids[start:start + self._IN_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                released += conn.execute(
+                    f"{sql} AND id IN ({placeholders})", (config_name, worker, *chunk),
+                ).rowcount
+        return released
+
+    def count_files(self, config_name: str, where: Optional[str] = None,
+                    params: Sequence[Any] = ()) -> int:
+        """iter_files bilan bir xil filtr bo'yicha qatorlar soni"""
+        sql = "SELECT COUNT(*) FROM files WHERE config_name=?"
+        if where:
+            sql += f" AND ({self._WHERE_PRESETS.get(where, where)})"
+        with self._connection() as conn:
+            return conn.execute(sql, (config_name, *params)).fetchone()[0]
 
     def file_exists(self, config_name: str, file_page: str) -> bool:
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute(
-            "SELECT 1 FROM files WHERE config_name=? AND file_page=? LIMIT 1",
-            (config_name, file_page),
-        )
-        exists = c.fetchone() is not None
-        conn.close()
+        with self._connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                "SELECT 1 FROM files WHERE config_name=? AND file_page=? LIMIT 1",
+                (config_name, file_page),
+            )
+            exists = c.fetchone() is not None
         return exists
 
     def get_files_count(self, config_name: str) -> int:
         """Bitta config'dagi jami fayllar sonini qaytarish"""
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM files WHERE config_name=?",
-                  (config_name,))
-        count = c.fetchone()[0]
-        conn.close()
+        with self._connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT COUNT(*) FROM files WHERE config_name=?",
+                      (config_name,))
+            count = c.fetchone()[0]
         return count
 
     def get_downloaded_files_count(self, config_name: str) -> int:
         """Yuklangan fayllar sonini qaytarish (local_path mavjud)"""
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute(
-            "SELECT COUNT(*) FROM files WHERE config_name=? AND local_path IS NOT NULL AND local_path != ''",
-            (config_name,)
-        )
-        count = c.fetchone()[0]
-        conn.close()
+        with self._connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                "SELECT COUNT(*) FROM files WHERE config_name=? AND local_path IS NOT NULL AND local_path != ''",
+                (config_name,)
+            )
+            count = c.fetchone()[0]
         return count
 
     def get_uploaded_files_count(self, config_name: str) -> int:
         """Telegramga yuklangan fayllar sonini qaytarish"""
-        conn = self._connect()
-        c = conn.cursor()
-        c.execute(
-            "SELECT COUNT(*) FROM files WHERE config_name=? AND uploaded=1",
-            (config_name,)
-        )
-        count = c.fetchone()[0]
-        conn.close()
+        with self._connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                "SELECT COUNT(*) FROM files WHERE config_name=? AND uploaded=1",
+                (config_name,)
+            )
+            count = c.fetchone()[0]
         return count
 
+    # get_stats uchun agregatlar - bitta so'rovda barcha hisoblagichlar
+    _STATS_COLUMNS = """
+        COUNT(*) AS total,
+        SUM(CASE WHEN local_path IS NOT NULL AND local_path != '' THEN 1 ELSE 0 END) AS downloaded,
+        SUM(CASE WHEN status IN ('pending', 'failed', 'downloading', 'uploading')
+                  AND file_url IS NOT NULL AND file_url != '' THEN 1 ELSE 0 END) AS pending,
+        SUM(CASE WHEN status='failed' THEN 1 ELSE 0 END) AS failed,
+        SUM(CASE WHEN status='dead' THEN 1 ELSE 0 END) AS dead,
+        SUM(CASE WHEN file_url IS NULL OR file_url = '' THEN 1 ELSE 0 END) AS no_url,
+        SUM(CASE WHEN uploaded=1 THEN 1 ELSE 0 END) AS uploaded,
+        SUM(COALESCE(file_size, 0)) AS total_size,
+        SUM(CASE WHEN local_path IS NOT NULL AND local_path != ''
+                 THEN COALESCE(file_size, 0) ELSE 0 END) AS downloaded_size,
+        SUM(CASE WHEN uploaded=1 THEN COALESCE(file_size, 0) ELSE 0 END) AS uploaded_size
+    """
+    _STATS_KEYS = ("total", "downloaded", "pending", "failed", "dead", "no_url", "uploaded",
+                   "total_size", "downloaded_size", "uploaded_size")
+
+    @classmethod
+    def _stats_row(cls, row) -> Dict[str, int]:
+        stats = {key: row[key] or 0 for key in cls._STATS_KEYS}
+        stats["pending_size"] = stats["total_size"] - stats["downloaded_size"]
+        return stats
+
+    def get_stats(self, config_name: str, by_category: bool = False,
+                  by_year: bool = False) -> Dict[str, Any]:
+        """Config bo'yicha statistikani SQL tomonida hisoblash (qatorlar o'qilmaydi)
+
+        Args:
+            config_name: Config nomi
+            by_category: Kategoriyalar bo'yicha taqsimot ham qaytarilsin
+                (vergul bilan ajratilgan har bir kategoriya alohida sanaladi)
+            by_year: Yillar bo'yicha taqsimot ham qaytarilsin
+
+        Returns:
+            dict: total, downloaded, pending, failed, dead, no_url, uploaded va *_size (bytes);
+                so'ralgan bo'lsa by_category / by_year: {nom: shu kalitlar}
+        """
+        with self._connection() as conn:
+            row = conn.execute(
+                f"SELECT {self._STATS_COLUMNS} FROM files WHERE config_name=?",
+                (config_name,),
+            ).fetchone()
+            stats = self._stats_row(row)
+
+            if by_category:
+                # Har xil kategoriya kombinatsiyalari soni kam - guruhlab olib Python'da bo'linadi
+                rows = conn.execute(
+                    f"SELECT categories, {self._STATS_COLUMNS} FROM files "
+                    "WHERE config_name=? GROUP BY categories",
+                    (config_name,),
+                ).fetchall()
+                breakdown = {}
+                for group in rows:
+                    group_stats = self._stats_row(group)
+                    names = {name.strip() for name in (group["categories"] or "").split(",")}
+                    for name in names - {""} or {"other"}:
+                        totals = breakdown.setdefault(name, dict.fromkeys(group_stats, 0))
+                        for key, value in group_stats.items():
+                            totals[key] += value
+                stats["by_category"] = breakdown
+
+            if by_year:
+                rows = conn.execute(
+                    f"SELECT year, {self._STATS_COLUMNS} FROM files "
+                    "WHERE config_name=? GROUP BY year ORDER BY year",
+                    (config_name,),
+                ).fetchall()
+                stats["by_year"] = {
+                    group["year"] or "unknown": self._stats_row(group) for group in rows}
+
+        return stats
+
     def reset_uploaded_status(self, config_name: str) -> int:
         """Bitta config'dagi barcha fayllarning uploaded statusini reset qilish
 
@@ -242,23 +1005,260 @@ class FileDB:
         Returns:
             int: Reset qilingan fayllar soni
         """
-        conn = self._connect()
-        c = conn.cursor()
+        with self._connection() as conn:
+            c = conn.cursor()
 
-        # Avval nechta fayl reset qilinishini sanash
-        c.execute(
-            "SELECT COUNT(*) FROM files WHERE config_name=? AND uploaded=1",
-            (config_name,)
-        )
-        reset_count = c.fetchone()[0]
+            # Avval nechta fayl reset qilinishini sanash
+            c.execute(
+                "SELECT COUNT(*) FROM files WHERE config_name=? AND uploaded=1",
+                (config_name,)
+            )
+            reset_count = c.fetchone()[0]
 
-        # Uploaded statusni reset qilish (faqat uploaded=1 bo'lgan fayllarni)
-        c.execute(
-            "UPDATE files SET uploaded=0, uploaded_at=NULL WHERE config_name=? AND uploaded=1",
-            (config_name,)
-        )
-
-        conn.commit()
-        conn.close()
+            # Uploaded statusni reset qilish (faqat uploaded=1 bo'lgan fayllarni)
+            c.execute(
+                "UPDATE files SET uploaded=0, uploaded_at=NULL, "
+                "status=CASE WHEN local_path IS NOT NULL AND local_path != '' "
+                "THEN 'downloaded' ELSE 'pending' END "
+                "WHERE config_name=? AND uploaded=1",
+                (config_name,)
+            )
 
         return reset_count
+
+    # --- Crawl holati (incremental scraping) ---
+
+    def get_crawl_state(self, config_name: str) -> Optional[Dict[str, Any]]:
+        """Config uchun oxirgi crawl high-water mark'i (bo'lmasa None)"""
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM crawl_state WHERE config_name=?", (config_name,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def set_high_water_mark(self, config_name: str, file_page: str,
+                            pages_walked: int, new_files: int) -> None:
+        """Eng yangi listing linkini va crawl natijasini saqlash
+
+        Args:
+            config_name: Config nomi
+            file_page: Birinchi listing sahifasidagi birinchi film sahifasi
+            pages_walked: Shu crawl'da o'qilgan listing sahifalar soni
+            new_files: Shu crawl'da topilgan yangi fayllar soni
+        """
+        with self._connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO crawl_state (config_name, high_water_page, pages_walked, new_files, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(config_name) DO UPDATE SET
+                    high_water_page=excluded.high_water_page,
+                    pages_walked=excluded.pages_walked,
+                    new_files=excluded.new_files,
+                    updated_at=excluded.updated_at
+                """,
+                (config_name, file_page, pages_walked, new_files, int(time.time())),
+            )
+
+    def set_crawl_finished(self, config_name: str, finished: bool) -> None:
+        """Crawl boshlanganda (False) va oxirigacha ishlaganda (True) belgilash
+
+        high-water mark ustunlariga tegmaydi.
+        """
+        with self._connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO crawl_state (config_name, crawl_finished) VALUES (?, ?)
+                ON CONFLICT(config_name) DO UPDATE SET crawl_finished=excluded.crawl_finished
+                """,
+                (config_name, int(finished)),
+            )
+
+    # --- Crawl frontier (davom ettiriladigan scraping) ---
+
+    FRONTIER_STATUSES = ("queued", "in_flight", "done", "failed")
+
+    def frontier_add(self, config_name: str, kind: str,
+                     entries: Sequence[tuple]) -> int:
+        """Frontier'ga URL'lar qo'shish (mavjudlari o'zgarmaydi)
+
+        Args:
+            config_name: Config nomi
+            kind: "listing" yoki "detail"
+            entries: (url, seq, payload) - payload JSON matn yoki None
+
+        Returns:
+            int: Qo'shilgan qatorlar soni
+        """
+        now = int(time.time())
+        with self._connection() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO crawl_frontier "
+                "(config_name, url, kind, status, seq, payload, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                [(config_name, url, kind, seq, payload, now) for url, seq, payload in entries],
+            )
+            return conn.total_changes - before
+
+    def frontier_mark(self, config_name: str, urls: Sequence[str], status: str,
+                      error: Optional[str] = None) -> None:
+        """URL'lar holatini o'zgartirish; in_flight urinishlar sonini oshiradi"""
+        if status not in self.FRONTIER_STATUSES:
+            raise ValueError(f"Noma'lum frontier status: {status}")
+        if not urls:
+            return
+        now = int(time.time())
+        attempts = "attempts + 1" if status == "in_flight" else "attempts"
+        with self._connection() as conn:
+            conn.executemany(
+                f"UPDATE crawl_frontier SET status=?, attempts={attempts}, "
+                "last_error=COALESCE(?, last_error), updated_at=? "
+                "WHERE config_name=? AND url=?",
+                [(status, error, now, config_name, url) for url in urls],
+            )
+
+    def frontier_listing_done(self, config_name: str, url: str,
+                              details: Sequence[tuple]) -> None:
+        """Listing sahifasini done qilish va uning yangi detail URL'larini bitta tranzaksiyada qo'shish
+
+        Args:
+            config_name: Config nomi
+            url: Listing sahifa URL
+            details: (url, seq, payload) - detail sahifalar
+        """
+        now = int(time.time())
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO crawl_frontier "
+                "(config_name, url, kind, status, seq, payload, updated_at) "
+                "VALUES (?, ?, 'detail', 'queued', ?, ?, ?)",
+                [(config_name, d_url, seq, payload, now) for d_url, seq, payload in details],
+            )
+            conn.execute(
+                "UPDATE crawl_frontier SET status='done', updated_at=? "
+                "WHERE config_name=? AND url=?",
+                (now, config_name, url),
+            )
+
+    def frontier_pending(self, config_name: str, kind: str,
+                         max_attempts: int = 3) -> List[Dict[str, Any]]:
+        """Tugallanmagan URL'lar: queued va urinishlari tugamagan in_flight/failed (seq bo'yicha)
+
+        in_flight ham attempts bilan cheklanadi - jarayonni yiqitadigan URL har
+        ishga tushirishda qayta-qayta davom ettirilmaydi.
+        """
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT url, seq, payload, status, attempts FROM crawl_frontier "
+                "WHERE config_name=? AND kind=? AND "
+                "(status='queued' OR (status IN ('in_flight', 'failed') AND attempts < ?)) "
+                "ORDER BY seq, rowid",
+                (config_name, kind, max_attempts),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def frontier_counts(self, config_name: str) -> Dict[str, Dict[str, int]]:
+        """{kind: {status: soni}} - frontier holati"""
+        counts: Dict[str, Dict[str, int]] = {}
+        with self._connection() as conn:
+            for kind, status, n in conn.execute(
+                "SELECT kind, status, COUNT(*) FROM crawl_frontier "
+                "WHERE config_name=? GROUP BY kind, status",
+                (config_name,),
+            ):
+                counts.setdefault(kind, {})[status] = n
+        return counts
+
+    def frontier_clear(self, config_name: str) -> int:
+        """Config frontier'ini o'chirish (crawl to'liq tugaganda yoki qaytadan boshlashda)"""
+        with self._connection() as conn:
+            return conn.execute(
+                "DELETE FROM crawl_frontier WHERE config_name=?", (config_name,)
+            ).rowcount
+
+    def frontier_prune(self, config_name: str, max_attempts: int = 3) -> int:
+        """Faqat qayta urinadigan URL'larni qoldirish: urinishlari tugamagan failed/in_flight
+
+        done, queued (masalan incremental to'xtatgan sahifalar) va urinishlari
+        tugaganlar o'chiriladi. Crawl tugaganda va yangi crawl boshlanganda chaqiriladi.
+
+        Returns:
+            int: O'chirilgan qatorlar soni
+        """
+        with self._connection() as conn:
+            return conn.execute(
+                "DELETE FROM crawl_frontier WHERE config_name=? AND "
+                "NOT (status IN ('failed', 'in_flight') AND attempts < ?)",
+                (config_name, max_attempts),
+            ).rowcount
+
+    # --- URL metadata cache (hajm, Accept-Ranges, Content-Type) ---
+
+    def get_url_meta(self, urls: Sequence[str], max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """URL'lar uchun saqlangan probe natijalari
+
+        Args:
+            urls: URL'lar
+            max_age: Shundan eski (soniya) yozuvlar qaytarilmaydi (None - hammasi)
+
+        Returns:
+            Dict: {url: {"size", "accept_ranges", "content_type", "probed_at"}}
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        since = time.time() - max_age if max_age is not None else 0
+        result = {}
+        with self._connection() as conn:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT * FROM url_meta WHERE url IN ({placeholders}) AND probed_at >= ?",
+                    (*chunk, since),
+                ):
+                    meta = dict(row)
+                    if meta["accept_ranges"] is not None:
+                        meta["accept_ranges"] = bool(meta["accept_ranges"])
+                    result[meta.pop("url")] = meta
+        return result
+
+    def put_url_meta(self, entries: Dict[str, Dict[str, Any]]) -> int:
+        """Probe natijalarini saqlash (mavjudlari yangilanadi)
+
+        Args:
+            entries: {url: {"size", "accept_ranges", "content_type", "probed_at"}}
+
+        Returns:
+            int: Yozilgan qatorlar soni
+        """
+        now = time.time()
+        rows = []
+        for url, meta in entries.items():
+            ranges = meta.get("accept_ranges")
+            rows.append((url, meta.get("size"), None if ranges is None else int(ranges),
+                         meta.get("content_type"), int(meta.get("probed_at") or now)))
+        if not rows:
+            return 0
+        with self._connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO url_meta (url, size, accept_ranges, content_type, probed_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    size=excluded.size,
+                    accept_ranges=excluded.accept_ranges,
+                    content_type=excluded.content_type,
+                    probed_at=excluded.probed_at
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def purge_url_meta(self, max_age: float) -> int:
+        """max_age (soniya) dan eski probe natijalarini o'chirish"""
+        with self._connection() as conn:
+            return conn.execute(
+                "DELETE FROM url_meta WHERE probed_at < ?", (time.time() - max_age,)
+            ).rowcount
@@ -0,0 +1,256 @@
+"""
+AsyncFileDB - asyncio pipeline'lar uchun FileDB ustidagi bloklamaydigan qatlam.
+
+FileDB metodlari sinxron: event loop ichida chaqirilsa, disk sync bo'lguncha
+barcha parallel download/upload tasklar to'xtab turadi. AsyncFileDB barcha
+so'rovlarni bitta alohida DB thread'iga navbat (queue) orqali yuboradi va
+natijani asyncio future sifatida qaytaradi:
+
+    db = get_async_db()
+    row = await db.get_file(file_id)
+    await db.update_file(file_id, uploaded=True)
+
+FileDB'ning har bir public metodi xuddi shu nom va argumentlar bilan
+awaitable ko'rinishda mavjud. So'rovlar bitta thread'da ketma-ket bajarilgani
+uchun yozishlar tartibi saqlanadi va SQLite lock raqobati bo'lmaydi.
+
+Write-behind: update_file chaqiruvlari darhol qaytadi va bufferda qator (file_id)
+bo'yicha birlashtiriladi. Buffer har DB_FLUSH_INTERVAL_MS da, DB_FLUSH_MAX_UPDATES
+qator yig'ilganda, har qanday boshqa so'rovdan oldin (o'qishlar eng so'nggi
+holatni ko'radi), flush() va close() da bitta tranzaksiyada yoziladi.
+"""
+import asyncio
+import atexit
+import itertools
+import queue
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from core.config import (
+    DB_FLUSH_INTERVAL_MS, DB_FLUSH_MAX_UPDATES, DB_PATH, DB_WRITE_BEHIND)
+from core.FileDB import FileDB, FileRow
+from utils.logger_core import logger
+
+
+# Navbatdagi bufferlanadigan update_file so'rovi belgisi
+_BUFFERED_UPDATE = object()
+
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    """Natijani event loop thread'ida future'ga yozish"""
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class AsyncFileDB:
+    """FileDB so'rovlarini alohida thread'da bajaradigan async facade"""
+
+    def __init__(self, db: Optional[FileDB] = None, db_path: str = DB_PATH,
+                 write_behind: Optional[bool] = None,
+                 flush_interval_ms: int = DB_FLUSH_INTERVAL_MS,
+                 flush_max_updates: int = DB_FLUSH_MAX_UPDATES):
+        """
+        Args:
+            db: Tayyor FileDB (None bo'lsa db_path bo'yicha DB thread'ida yaratiladi)
+            db_path: SQLite fayl yo'li
+            write_behind: update_file'ni bufferlash (None - DB_WRITE_BEHIND sozlamasi)
+            flush_interval_ms: Buffer eng ko'pi bilan shuncha ms kutadi
+            flush_max_updates: Shuncha qator yig'ilsa darhol yoziladi
+        """
+        self.db_path = db_path
+        self._db = db
+        self._requests: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.write_behind = DB_WRITE_BEHIND if write_behind is None else write_behind
+        self._flush_interval = max(flush_interval_ms, 0) / 1000
+        self._flush_max_updates = max(flush_max_updates, 1)
+        # Faqat DB thread'ida o'zgartiriladi: {file_id: {ustun: qiymat}}
+        self._pending: Dict[Any, Dict[str, Any]] = {}
+        self._flush_deadline: Optional[float] = None
+        self.write_stats = {"updates": 0, "rows_written": 0, "flushes": 0}
+
+    # --- DB thread ---
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="filedb-worker", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """DB thread: navbatdagi so'rovlarni ketma-ket bajarish"""
+        if self._db is None:
+            self._db = FileDB(db_path=self.db_path)
+
+        while True:
+            timeout = None
+            if self._pending:
+                timeout = max(self._flush_deadline - time.monotonic(), 0)
+            try:
+                request = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_pending()
+                continue
+
+            if request is None:
+                self._flush_pending()
+                break
+
+            if request[0] is _BUFFERED_UPDATE:
+                self._buffer_update(*request[1:])
+                continue
+
+            # O'qish yoki boshqa yozishdan oldin buffer yoziladi - natija eng so'nggi holatni ko'radi
+            self._flush_pending()
+
+            func, args, kwargs, loop, future = request
+            result, error = None, None
+            try:
+                result = func(self._db, *args, **kwargs)
+            except Exception as e:
+                error = e
+
+            try:
+                loop.call_soon_threadsafe(_resolve, future, result, error)
+            except RuntimeError:
+                # Event loop yopilgan - natijani kutayotgan hech kim yo'q
+                pass
+
+    def _buffer_update(self, file_id, fields: Dict[str, Any]) -> None:
+        """update_file'ni bufferga qo'shish (bir qatorga kelgan o'zgarishlar birlashadi)"""
+        if not self._pending:
+            self._flush_deadline = time.monotonic() + self._flush_interval
+        pending = self._pending.setdefault(file_id, {})
+        if "status" not in fields and ("uploaded" in fields or "local_path" in fields):
+            # Keyingi uploaded/local_path o'zgarishi avvalgi aniq status'dan ustun:
+            # status="uploading" + uploaded=True → 'uploaded' (update_file ketma-ketligidek)
+            pending.pop("status", None)
+        pending.update(fields)
+        self.write_stats["updates"] += 1
+        if len(self._pending) >= self._flush_max_updates:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        """Buffer'dagi barcha o'zgarishlarni bitta tranzaksiyada yozish"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._flush_deadline = None
+        try:
+            self.write_stats["rows_written"] += self._db.update_files(pending)
+            self.write_stats["flushes"] += 1
+        except Exception as e:
+            # Write-behind: chaqiruvchi allaqachon davom etgan, xatoni faqat log qilamiz
+            logger.error(f"❌ Write-behind flush xatosi ({len(pending)} qator): {e}")
+
+    async def update_file(self, file_id, **kwargs) -> None:
+        """FileDB.update_file - write-behind yoqilgan bo'lsa bufferga qo'shib darhol qaytadi"""
+        if not self.write_behind:
+            return await self._call("update_file", file_id, **kwargs)
+        if not kwargs:
+            return
+        self._start()
+        self._requests.put((_BUFFERED_UPDATE, file_id, kwargs))
+
+    async def flush(self) -> None:
+        """Buffer'dagi o'zgarishlar DB'ga yozilishini kutish"""
+        await self.run(lambda db: None)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Ixtiyoriy funksiyani DB thread'ida bajarish: func(file_db, *args, **kwargs)
+
+        Bir nechta so'rovni bitta navbat elementida bajarish uchun qulay:
+            await adb.run(lambda db: [db.get_file(i) for i in ids])
+        """
+        self._start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((func, args, kwargs, loop, future))
+        return await future
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        return await self.run(lambda db: getattr(db, name)(*args, **kwargs))
+
+    def __getattr__(self, name: str):
+        # FileDB'ning public metodlari -> awaitable proxy
+        attr = getattr(FileDB, name, None)
+        if name.startswith("_") or not callable(attr):
+            raise AttributeError(f"{type(self).__name__!s} has no attribute {name!r}")
+
+        async def method(*args, **kwargs):
+            return await self._call(name, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+    async def iter_files(self, config_name: str, batch_size: int = 500,
+                         **kwargs) -> AsyncIterator[FileRow]:
+        """FileDB.iter_files ning async varianti - partiyalar DB thread'ida o'qiladi
+
+        Generator va uning ulanishi faqat DB thread'ida ishlatiladi.
+        """
+        rows = await self._call("iter_files", config_name,
+                                batch_size=batch_size, **kwargs)
+        try:
+            while True:
+                batch = await self.run(
+                    lambda db: list(itertools.islice(rows, batch_size)))
+                if not batch:
+                    break
+                for row in batch:
+                    yield row
+        finally:
+            await self.run(lambda db: rows.close())
+
+    def _stop(self) -> Optional[threading.Thread]:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._requests.put(None)
+        return thread
+
+    async def close(self) -> None:
+        """Buffer va navbatdagi so'rovlarni yozib, DB thread'ini to'xtatish"""
+        thread = self._stop()
+        if thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+    def close_sync(self, timeout: Optional[float] = 30) -> None:
+        """close() ning sinxron varianti (event loop'siz, masalan dastur tugashida)"""
+        thread = self._stop()
+        if thread is not None:
+            thread.join(timeout)
+
+    async def __aenter__(self) -> "AsyncFileDB":
+        self._start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+_instances: Dict[str, AsyncFileDB] = {}
+_instances_lock = threading.Lock()
+
+
+def get_async_db(db_path: str = DB_PATH) -> AsyncFileDB:
+    """DB fayli uchun umumiy AsyncFileDB (bitta DB thread barcha pipeline'lar uchun)"""
+    with _instances_lock:
+        instance = _instances.get(db_path)
+        if instance is None:
+            instance = AsyncFileDB(db_path=db_path)
+            _instances[db_path] = instance
+            # Dastur tugashida buffer'dagi yozuvlar yo'qolmasligi uchun
+            atexit.register(instance.close_sync)
+            logger.debug(f"🗄️ AsyncFileDB yaratildi: {db_path}")
+        return instance
@@ -15,6 +15,28 @@ FILE_MIN_SIZE = int(
     os.getenv("FILE_MIN_SIZE", str(1024 * 1024)))  # Default: 1MB
 DB_PATH = f"local_db/{DB_LOCAL_NAME}.db"
 
+# --- SQLite connection pool sozlamalari ---
+# Pool yoqilganda FileDB har bir thread uchun bitta ulanishni qayta ishlatadi
+DB_POOL_ENABLED = os.getenv(
+    "DB_POOL_ENABLED", "true").lower() in ("true", "1", "yes")
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "30000"))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))  # 16MB
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL").upper()
+
+# --- Write-behind buffer (AsyncFileDB) ---
+# update_file chaqiruvlari qator bo'yicha birlashtirilib, bitta tranzaksiyada yoziladi
+DB_WRITE_BEHIND = os.getenv(
+    "DB_WRITE_BEHIND", "true").lower() in ("true", "1", "yes")
+DB_FLUSH_INTERVAL_MS = int(os.getenv("DB_FLUSH_INTERVAL_MS", "250"))
+DB_FLUSH_MAX_UPDATES = int(os.getenv("DB_FLUSH_MAX_UPDATES", "200"))
+
+# --- Xato bo'lgan fayllarni qayta urinish (exponential backoff) ---
+# N-xatodan keyin keyingi urinish: base * 2^(N-1) soniya (max bilan cheklangan),
+# RETRY_MAX_ATTEMPTS xatodan keyin status='dead' - boshqa urinilmaydi
+RETRY_BASE_DELAY_SECONDS = int(os.getenv("RETRY_BASE_DELAY_SECONDS", "300"))
+RETRY_MAX_DELAY_SECONDS = int(os.getenv("RETRY_MAX_DELAY_SECONDS", "86400"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "6"))
+
 # Worker identification
 WORKER_NAME = os.getenv("WORKER_NAME", "worker_001")
 # --- Umumiy sozlamalar ---
@@ -28,6 +50,9 @@ APP_CONFIG = {
     # Backward compatibility
     "concurrency": int(os.getenv("DOWNLOAD_CONCURRENCY", "2")),
     "scrape_concurrency": int(os.getenv("SCRAPE_CONCURRENCY", "5")),
+    # Ko'p saytli scraping: bir vaqtda N ta sayt, bitta hostda M ta config
+    "multi_site_concurrency": int(os.getenv("MULTI_SITE_CONCURRENCY", "3")),
+    "multi_site_per_host": int(os.getenv("MULTI_SITE_PER_HOST", "1")),
     "download_concurrency": int(os.getenv("DOWNLOAD_CONCURRENCY", "2")),
     "download_base_timeout": int(os.getenv("DOWNLOAD_BASE_TIMEOUT", "1800")),
     "download_max_retries": int(os.getenv("DOWNLOAD_MAX_RETRIES", "3")),
@@ -35,6 +60,51 @@ APP_CONFIG = {
     "upload_concurrency": int(os.getenv("UPLOAD_CONCURRENCY", "2")),
     "upload_workers": int(os.getenv("UPLOAD_WORKERS", "2")),
 
+    # --- Scraper HTTP pool (bitta umumiy aiohttp session) ---
+    "http_pool_limit": int(os.getenv("HTTP_POOL_LIMIT", "100")),
+    "http_limit_per_host": int(os.getenv("HTTP_LIMIT_PER_HOST", "10")),
+    "http_dns_cache_ttl": int(os.getenv("HTTP_DNS_CACHE_TTL", "300")),
+    "http_keepalive_timeout": int(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30")),
+    # Diskdagi HTML cache: ETag/Last-Modified bilan shartli so'rovlar, LRU hajm chegarasi
+    "http_cache_enabled": os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("true", "1", "yes"),
+    "http_cache_path": os.getenv("HTTP_CACHE_PATH", "local_db/http_cache.db"),
+    "http_cache_max_mb": float(os.getenv("HTTP_CACHE_MAX_MB", "512")),
+    "http_cache_offline": os.getenv("HTTP_CACHE_OFFLINE", "false").lower() in ("true", "1", "yes"),
+    # Shuncha javob yig'ilganda cache thread'da bitta tranzaksiyada yoziladi
+    "http_cache_flush_size": int(os.getenv("HTTP_CACHE_FLUSH_SIZE", "64")),
+    # Film sahifalarini parse qilish: auto | selectolax | lxml | bs4 (sayt config'ida ham berish mumkin)
+    "html_parser_backend": os.getenv("HTML_PARSER_BACKEND", "auto"),
+    # > 0 bo'lsa parse + normallash shuncha process'li pool'da (event loop bo'shaydi)
+    "parse_workers": int(os.getenv("PARSE_WORKERS", "0")),
+    # Host bo'yicha adaptiv rate limiter (token bucket + AIMD): scraper, hajm tekshiruvi va yuklab olish uchun umumiy
+    "rate_limit_enabled": os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("true", "1", "yes"),
+    "rate_limit_initial": float(os.getenv("RATE_LIMIT_INITIAL_RPS", "5")),
+    "rate_limit_min": float(os.getenv("RATE_LIMIT_MIN_RPS", "0.5")),
+    "rate_limit_max": float(os.getenv("RATE_LIMIT_MAX_RPS", "50")),
+    "rate_limit_burst": float(os.getenv("RATE_LIMIT_BURST", "5")),
+    "rate_limit_increase": float(os.getenv("RATE_LIMIT_INCREASE", "0.1")),
+    "rate_limit_decrease": float(os.getenv("RATE_LIMIT_DECREASE", "0.5")),
+    "rate_limit_latency_ms": int(os.getenv("RATE_LIMIT_LATENCY_MS", "3000")),
+    # URL metadata cache: fayl hajmi/Accept-Ranges probe natijalari (0 - o'chirilgan)
+    "url_meta_ttl": float(os.getenv("URL_META_TTL", "86400")),
+    "url_meta_max_entries": int(os.getenv("URL_META_MAX_ENTRIES", "10000")),
+    "url_meta_persist": os.getenv("URL_META_PERSIST", "true").lower() in ("true", "1", "yes"),
+    # Browser fallback: scrape_concurrency hajmli kontekst/sahifa pool'i, N marta ishlatilgach yangilanadi
+    "browser_pool_enabled": os.getenv("BROWSER_POOL_ENABLED", "true").lower() in ("true", "1", "yes"),
+    "browser_pool_max_uses": int(os.getenv("BROWSER_POOL_MAX_USES", "50")),
+    "browser_pool_warm": int(os.getenv("BROWSER_POOL_WARM", "1")),
+
+    # --- Scrape pipeline (listing → detail → DB yozish navbatlari) ---
+    "scrape_queue_size": int(os.getenv("SCRAPE_QUEUE_SIZE", "100")),
+    "scrape_write_batch": int(os.getenv("SCRAPE_WRITE_BATCH", "50")),
+    "scrape_flush_interval": float(os.getenv("SCRAPE_FLUSH_INTERVAL", "5.0")),
+    # Incremental crawl: K ta ketma-ket to'liq ma'lum listing sahifadan keyin to'xtash
+    "incremental_crawl": os.getenv("INCREMENTAL_CRAWL", "false").lower() in ("true", "1", "yes"),
+    "incremental_stop_pages": int(os.getenv("INCREMENTAL_STOP_PAGES", "2")),
+    # Crawl frontier: to'xtagan crawl keyingi ishga tushirishda davom ettiriladi
+    "crawl_resume": os.getenv("CRAWL_RESUME", "true").lower() in ("true", "1", "yes"),
+    "crawl_max_attempts": int(os.getenv("CRAWL_MAX_ATTEMPTS", "3")),
+
     # --- Timing Settings - Environment'dan o'qiladi ---
     "sleep_min": float(os.getenv("SLEEP_MIN", "0.5")),
     "sleep_max": float(os.getenv("SLEEP_MAX", "2.5")),
@@ -46,6 +116,9 @@ APP_CONFIG = {
     "stop_limit_page": False,  # Internal setting, hardcoded
     "stop_limit": False,       # Internal setting, hardcoded
     "stop_download_limit": False,  # Internal setting, hardcoded
+    # Lease-based claiming: bir nechta WORKER_NAME server bitta DB'ni bo'lishadi
+    "claim_batch_size": int(os.getenv("CLAIM_BATCH_SIZE", "20")),
+    "claim_lease_seconds": int(os.getenv("CLAIM_LEASE_SECONDS", "1800")),
 
     # --- Notification Settings - Environment'dan o'qiladi ---
     "send_startup_notifications": os.getenv("SEND_STARTUP_NOTIFICATIONS", "true").lower() in ("true", "1", "yes"),
@@ -97,6 +170,18 @@ BROWSER_CONFIG = {
     "locale": "uz-UZ",
     "geolocation": None,
     "permissions": ["geolocation"],
+    # Fallback sahifalarda bekor qilinadigan so'rovlar (sayt config'ida ham berish mumkin)
+    "block_resources": [t for t in os.getenv("BROWSER_BLOCK_RESOURCES", "image,media,font").split(",") if t.strip()],
+    "block_domains": [d for d in os.getenv(
+        "BROWSER_BLOCK_DOMAINS",
+        "google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,"
+        "mc.yandex.ru,top-fwz1.mail.ru,counter.yadro.ru,facebook.net,hotjar.com",
+    ).split(",") if d.strip()],
+    # page.goto: load | domcontentloaded | networkidle; wait_selector - detail sahifada kutiladigan selector
+    "wait_until": os.getenv("BROWSER_WAIT_UNTIL", "domcontentloaded"),
+    "wait_selector": os.getenv("BROWSER_WAIT_SELECTOR") or None,
+    "nav_timeout": int(os.getenv("BROWSER_NAV_TIMEOUT", "30000")),
+    "selector_timeout": int(os.getenv("BROWSER_SELECTOR_TIMEOUT", "10000")),
 }
 
 
@@ -0,0 +1,94 @@
+"""
+SQLite connection pool - FileDB uchun qayta ishlatiladigan ulanishlar.
+
+Har bir thread o'z ulanishini oladi (sqlite3 ulanishlari threadlar orasida
+bo'lishib ishlatilmaydi). Asyncio pipeline'lar bitta event loop thread'ida
+ishlaydi, shuning uchun barcha tasklar bitta ulanishni navbat bilan ishlatadi -
+har bir FileDB metodi sinxron bo'lgani uchun ular bir-biriga aralashmaydi.
+
+Ulanish ochilganda WAL journal va sozlangan pragmalar yoqiladi:
+- journal_mode=WAL: o'quvchilar yozuvchini bloklamaydi ("database is locked" kamayadi)
+- synchronous=NORMAL: WAL rejimida har commit'da fsync qilinmaydi
+- cache_size / temp_store: ko'proq sahifa xotirada saqlanadi
+- busy_timeout: boshqa jarayon yozayotganda darhol xato o'rniga kutadi
+"""
+import sqlite3
+import threading
+from typing import Dict, List
+
+from core.config import DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB, DB_SYNCHRONOUS
+
+
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Ulanishga WAL va performance pragmalarini qo'llash"""
+    synchronous = DB_SYNCHRONOUS if DB_SYNCHRONOUS in _SYNCHRONOUS_MODES else "NORMAL"
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.execute(f"PRAGMA cache_size=-{int(DB_CACHE_SIZE_KB)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)}")
+
+
+class ConnectionPool:
+    """Bitta DB fayli uchun thread-local ulanishlar pool'i"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Joriy thread uchun ulanishni olish (yo'q bo'lsa ochiladi)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close_all(self) -> None:
+        """Pool'dagi barcha ulanishlarni yopish"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Boshqa thread'da ochilgan ulanish - jarayon tugaganda yopiladi
+                pass
+        self._local = threading.local()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """DB fayli uchun umumiy pool'ni olish (barcha FileDB instance'lari bo'lishadi)"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+        return pool
+
+
+def close_all_pools() -> None:
+    """Barcha pool'larni yopish (dastur tugashida)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
@@ -3,18 +3,28 @@ Database operations for file downloader
 """
 from typing import List, Dict, Any, Optional
 
-from core.FileDB import FileDB
+from core.async_db import get_async_db
+from core.config import APP_CONFIG, WORKER_NAME
 from utils.logger_core import logger
+from utils.url_meta import get_url_meta_cache
 from utils.telegram import detect_telegram_type
 
 
 class FileDownloaderDB:
-    """Database operations specifically for file downloader"""
+    """Database operations specifically for file downloader
     
-    def __init__(self):
-        self.db = FileDB()
+    Barcha so'rovlar AsyncFileDB orqali alohida DB thread'ida bajariladi,
+    shuning uchun parallel downloadlar DB yozilishini kutib to'xtamaydi.
+    """
     
-    def get_files_for_download(self, site_name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def __init__(self, worker_name: Optional[str] = None, lease_seconds: Optional[int] = None):
+        self.db = get_async_db()
+        # Download paytida fayl shu worker'ga band qilinadi - boshqa worker yoki
+        # Telegram orchestrator claim_batch uni olmaydi
+        self.worker_name = worker_name or WORKER_NAME
+        self.lease_seconds = max(lease_seconds or APP_CONFIG.get("claim_lease_seconds", 1800), 30)
+    
+    async def get_files_for_download(self, site_name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Download uchun fayllarni olish (faqat yuklanmagan fayllar)
         
@@ -26,12 +36,28 @@ class FileDownloaderDB:
             List of files ready for download
         """
         # To'g'ridan-to'g'ri database'dan yuklanmagan fayllarni olish
-        download_needed = self.db.get_undownloaded_files(site_name, limit)
+        download_needed = await self.db.get_undownloaded_files(site_name, limit)
+        # Scraping'da aniqlangan hajmlar - download paytida HEAD so'rovlarisiz
+        cached = await get_url_meta_cache().preload([f.get("file_url") for f in download_needed])
         
-        logger.info(f"📂 {len(download_needed)} fayl download uchun tayyor (yuklanmagan)")
+        logger.info(f"📂 {len(download_needed)} fayl download uchun tayyor (yuklanmagan, "
+                    f"{cached} ta hajm cache'dan)")
         return download_needed
     
-    def update_download_success(self, file_id: int, local_path: str, file_size: int) -> bool:
+    async def mark_downloading(self, file_id: int) -> bool:
+        """
+        Download boshlanganini belgilash: status='downloading' + worker lease
+
+        Returns:
+            bool: Fayl band qilindi (False - boshqa worker ishlayapti yoki upload qilingan)
+        """
+        return await self.db.claim_file(file_id, self.worker_name, self.lease_seconds)
+
+    async def release(self, file_id: int) -> None:
+        """Worker lease'ini bo'shatish (download tugadi yoki xato)"""
+        await self.db.update_file(file_id, claimed_by=None, lease_expires_at=None)
+    
+    async def update_download_success(self, file_id: int, local_path: str, file_size: int) -> bool:
         """
         Muvaffaqiyatli download qilingan faylni yangilash
         
@@ -48,12 +74,14 @@ class FileDownloaderDB:
             mime_type = "video/mp4"  # Default
             telegram_type = detect_telegram_type(mime_type)
             
-            self.db.update_file(
+            await self.db.update_file(
                 file_id,
                 local_path=local_path,
                 file_size=file_size,
                 mime=mime_type,
-                telegram_type=telegram_type
+                telegram_type=telegram_type,
+                claimed_by=None,
+                lease_expires_at=None
             )
             
             logger.info(f"💾 DB updated: file_id={file_id}, size={file_size}")
@@ -63,7 +91,7 @@ class FileDownloaderDB:
             logger.error(f"❌ DB update failed: file_id={file_id} | {e}")
             return False
     
-    def update_download_failed(self, file_id: int, error_reason: str) -> bool:
+    async def update_download_failed(self, file_id: int, error_reason: str) -> bool:
         """
         Download fail bo'lgan faylni belgilash
         
@@ -75,15 +103,24 @@ class FileDownloaderDB:
             True if successful
         """
         try:
-            # Hozircha faqat log qilamiz, keyinchalik error tracking qo'shish mumkin
-            logger.error(f"❌ Download failed: file_id={file_id} | {error_reason}")
+            # attempts/last_error yoziladi, keyingi urinish backoff bilan rejalashtiriladi
+            status = await self.db.record_failure(file_id, error_reason)
+            await self.release(file_id)
+            if status == "dead":
+                logger.error(f"💀 Download failed, retry limiti tugadi: file_id={file_id} | {error_reason}")
+            else:
+                logger.error(f"❌ Download failed: file_id={file_id} | {error_reason}")
             return True
             
         except Exception as e:
             logger.error(f"❌ DB error logging failed: {e}")
             return False
     
-    def get_download_statistics(self, site_name: str) -> Dict[str, Any]:
+    async def flush(self) -> None:
+        """Bufferlangan (write-behind) status yangilanishlarini DB'ga yozish"""
+        await self.db.flush()
+    
+    async def get_download_statistics(self, site_name: str) -> Dict[str, Any]:
         """
         Download statistikalarini olish
         
@@ -93,23 +130,20 @@ class FileDownloaderDB:
         Returns:
             Statistics dictionary
         """
-        all_files = self.db.get_files(site_name)
-        
-        total_files = len(all_files)
-        downloaded = len([f for f in all_files if f.get("local_path")])
-        pending = len([f for f in all_files if not f.get("local_path") and f.get("file_url")])
-        no_url = len([f for f in all_files if not f.get("file_url")])
-        
-        total_size = sum(f.get("file_size", 0) for f in all_files if f.get("file_size"))
-        downloaded_size = sum(f.get("file_size", 0) for f in all_files if f.get("local_path") and f.get("file_size"))
+        # Barcha hisob-kitob bitta SQL so'rovda - qatorlar Python'ga yuklanmaydi
+        stats = await self.db.get_stats(site_name)
+        total_files = stats["total"]
         
         return {
             "total_files": total_files,
-            "downloaded": downloaded,
-            "pending": pending,
-            "no_url": no_url,
-            "download_rate": (downloaded / total_files * 100) if total_files else 0,
-            "total_size_gb": total_size / (1024**3),
-            "downloaded_size_gb": downloaded_size / (1024**3),
-            "pending_size_gb": (total_size - downloaded_size) / (1024**3)
+            "downloaded": stats["downloaded"],
+            "pending": stats["pending"],
+            "failed": stats["failed"],
+            "dead": stats["dead"],
+            "no_url": stats["no_url"],
+            "uploaded": stats["uploaded"],
+            "download_rate": (stats["downloaded"] / total_files * 100) if total_files else 0,
+            "total_size_gb": stats["total_size"] / (1024**3),
+            "downloaded_size_gb": stats["downloaded_size"] / (1024**3),
+            "pending_size_gb": stats["pending_size"] / (1024**3)
         }
\ No newline at end of file
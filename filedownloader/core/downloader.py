@@ -9,6 +9,8 @@ from typing import Optional, Dict, Any, Tuple
 from tqdm.asyncio import tqdm
 
 from utils.logger_core import logger
+from utils.rate_limiter import throttle
+from utils.url_meta import get_url_meta_cache
 from utils.files import safe_filename
 from utils.text import clean_title
 
@@ -95,11 +97,14 @@ class FileDownloader:
                     if start_byte > 0 and resume_supported:
                         headers["Range"] = f"bytes={start_byte}-"
                     
-                    async with session.get(file_url, headers=headers, timeout=timeout) as resp:
+                    async with throttle(file_url) as outcome, \
+                            session.get(file_url, headers=headers, timeout=timeout) as resp:
+                        outcome.observe(resp)
                         # Status code tekshirish
                         expected_status = 206 if start_byte > 0 else 200
                         if resp.status not in [200, 206]:
                             logger.error(f"❌ HTTP {resp.status}: {file_url}")
+                            get_url_meta_cache().invalidate(file_url)
                             if attempt == self.max_retries - 1:
                                 return None
                             continue
@@ -145,6 +150,7 @@ class FileDownloader:
                         actual_size = os.path.getsize(output_path)
                         if actual_total_size > 0 and abs(actual_size - actual_total_size) > 1024:  # 1KB tolerance
                             logger.warning(f"⚠️ Size mismatch: expected {actual_total_size}, got {actual_size}")
+                            get_url_meta_cache().invalidate(file_url)
                         
                         logger.info(f"✅ Downloaded: {filename} ({actual_size / (1024*1024):.2f} MB)")
                         return actual_size
@@ -181,7 +187,7 @@ class FileDownloader:
 
     async def get_file_size(self, session: aiohttp.ClientSession, file_url: str) -> int:
         """
-        URL dan fayl hajmini olish (HEAD request bilan)
+        URL dan fayl hajmini olish (URL metadata cache, kerak bo'lsa HEAD / Range GET)
         
         Args:
             session: aiohttp session
@@ -190,15 +196,8 @@ class FileDownloader:
         Returns:
             File size in bytes, 0 if failed
         """
-        try:
-            timeout = aiohttp.ClientTimeout(total=30)  # Quick timeout for HEAD request
-            async with session.head(file_url, timeout=timeout) as resp:
-                if resp.status == 200:
-                    return int(resp.headers.get("Content-Length", 0))
-                return 0
-        except Exception as e:
-            logger.debug(f"🔍 HEAD request failed: {e}")
-            return 0
+        meta = await get_url_meta_cache().get(session, file_url)
+        return meta["size"]
 
     async def check_resume_support(self, session: aiohttp.ClientSession, file_url: str) -> bool:
         """
@@ -211,12 +210,20 @@ class FileDownloader:
         Returns:
             True if resume supported, False otherwise
         """
+        cache = get_url_meta_cache()
+        meta = cache.peek(file_url)
+        if meta is not None and meta["accept_ranges"] is not None:
+            return meta["accept_ranges"]
         try:
             timeout = aiohttp.ClientTimeout(total=30)
             headers = {"Range": "bytes=0-0"}  # Test range request
-            async with session.get(file_url, headers=headers, timeout=timeout) as resp:
+            async with throttle(file_url) as outcome, \
+                    session.get(file_url, headers=headers, timeout=timeout) as resp:
+                outcome.observe(resp)
                 # 206 Partial Content yoki Accept-Ranges header mavjudligi
-                return resp.status == 206 or "bytes" in resp.headers.get("Accept-Ranges", "")
+                supported = resp.status == 206 or "bytes" in resp.headers.get("Accept-Ranges", "")
+                cache.update(file_url, accept_ranges=supported)
+                return supported
         except Exception as e:
             logger.warning(f"⚠️ Resume support check failed: {e}")
             return False
@@ -232,18 +239,9 @@ class FileDownloader:
         Returns:
             Tuple[file_size, resume_supported]
         """
-        try:
-            # Head request bilan file size olish
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with session.head(file_url, timeout=timeout) as resp:
-                if resp.status == 200:
-                    file_size = int(resp.headers.get("Content-Length", 0))
-                    resume_supported = "bytes" in resp.headers.get("Accept-Ranges", "")
-                    return file_size, resume_supported
-                return 0, False
-        except Exception as e:
-            logger.warning(f"⚠️ Get file info failed: {e}")
-            return 0, False
+        # Scraper yoki oldingi run'da tekshirilgan bo'lsa - HEAD so'rovsiz
+        meta = await get_url_meta_cache().get(session, file_url)
+        return meta["size"], bool(meta["accept_ranges"])
 
     def prepare_download_path(self, title: str, file_url: str, download_dir: str) -> Tuple[str, str]:
         """
@@ -33,7 +33,7 @@ async def download(config: Dict[str, Any]) -> None:
         orchestrator = FileDownloaderOrchestrator(config)
         
         # Download statistikalarini ko'rsatish
-        orchestrator.log_download_statistics(site_name)
+        await orchestrator.log_download_statistics(site_name)
         
         # Download mode bo'yicha ishga tushirish
         if mode == "sequential":
@@ -83,13 +83,13 @@ async def download_with_stats(config: Dict[str, Any]) -> Dict[str, Any]:
     orchestrator = FileDownloaderOrchestrator(config)
     
     # Statistics olish
-    initial_stats = orchestrator.get_download_statistics(site_name)
+    initial_stats = await orchestrator.get_download_statistics(site_name)
     
     # Download qilish
     result = await orchestrator.download_files(site_name, debug_mode=config.get("debug", False))
     
     # Final statistics
-    final_stats = orchestrator.get_download_statistics(site_name)
+    final_stats = await orchestrator.get_download_statistics(site_name)
     
     return {
         "download_result": result,
@@ -122,9 +122,9 @@ async def debug_download_single_file(config: Dict[str, Any]) -> None:
     await download(config_copy)
 
 
-def get_download_status(site_name: str) -> Dict[str, Any]:
+async def get_download_status(site_name: str) -> Dict[str, Any]:
     """Get current download status for a site"""
     # Temporary config for database access
     temp_config = {"download_dir": "../downloads", "download_concurrency": 1}
     orchestrator = FileDownloaderOrchestrator(temp_config)
-    return orchestrator.get_download_statistics(site_name)
\ No newline at end of file
+    return await orchestrator.get_download_statistics(site_name)
\ No newline at end of file
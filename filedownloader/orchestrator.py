@@ -7,6 +7,7 @@ from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 from utils.logger_core import logger
+from utils.rate_limiter import get_rate_limiter
 from .core import FileDownloader, ProgressTracker, FileDownloaderDB
 from .workers import DownloadProducer, DownloadConsumer
 from .handlers import ProgressHandler, ErrorHandler
@@ -64,7 +65,7 @@ class FileDownloaderOrchestrator:
         logger.info(f"📂 Starting download session for: {site_name}")
         
         # Get files to download
-        files = self.db.get_files_for_download(site_name, limit)
+        files = await self.db.get_files_for_download(site_name, limit)
         
         if not files:
             logger.warning(f"⚠️ No files found for download: {site_name}")
@@ -98,12 +99,18 @@ class FileDownloaderOrchestrator:
         async with aiohttp.ClientSession() as session:
             results = await self.producer.batch_process(session, semaphore, files, self.config)
         
+        # Bufferlangan DB yangilanishlarini yozish (statistika eng so'nggi holatni ko'rsatadi)
+        await self.db.flush()
+        
         # Process results
         stats = self.consumer.batch_process_results(results, self.config)
         
         # Log summaries
         self.progress_handler.log_session_summary()
         self.error_handler.log_error_summary()
+        limiter = get_rate_limiter()
+        if limiter is not None:
+            limiter.log_snapshot()
         
         # Prepare return data
         return {
@@ -112,7 +119,8 @@ class FileDownloaderOrchestrator:
             "results": results,
             "statistics": stats,
             "progress": self.progress_handler.get_session_summary(),
-            "errors": self.error_handler.get_error_summary()
+            "errors": self.error_handler.get_error_summary(),
+            "rate_limits": limiter.snapshot() if limiter is not None else {}
         }
     
     async def _debug_file_selection(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -149,7 +157,7 @@ class FileDownloaderOrchestrator:
         
         return [top10[selected - 1]]
     
-    def get_download_statistics(self, site_name: str) -> Dict[str, Any]:
+    async def get_download_statistics(self, site_name: str) -> Dict[str, Any]:
         """
         Site uchun download statistikalarini olish
         
@@ -159,11 +167,11 @@ class FileDownloaderOrchestrator:
         Returns:
             Statistics dictionary
         """
-        return self.db.get_download_statistics(site_name)
+        return await self.db.get_download_statistics(site_name)
     
-    def log_download_statistics(self, site_name: str):
+    async def log_download_statistics(self, site_name: str):
         """Download statistikalarini log qilish"""
-        stats = self.get_download_statistics(site_name)
+        stats = await self.get_download_statistics(site_name)
         
         logger.info("="*60)
         logger.info(f"📊 DOWNLOAD STATISTICS - {site_name}")
@@ -171,7 +179,10 @@ class FileDownloaderOrchestrator:
         logger.info(f"📁 Total files:        {stats['total_files']}")
         logger.info(f"✅ Downloaded:         {stats['downloaded']}")
         logger.info(f"⏳ Pending:            {stats['pending']}")
+        logger.info(f"🔁 Failed (retry):     {stats['failed']}")
+        logger.info(f"💀 Dead:               {stats['dead']}")
         logger.info(f"❌ No URL:             {stats['no_url']}")
+        logger.info(f"📤 Uploaded:           {stats['uploaded']}")
         logger.info(f"📊 Download rate:      {stats['download_rate']:.1f}%")
         logger.info(f"💾 Total size:         {stats['total_size_gb']:.2f} GB")
         logger.info(f"✅ Downloaded size:    {stats['downloaded_size_gb']:.2f} GB")
@@ -54,7 +54,7 @@ class DownloadProducer:
                 logger.info(f"♻️ File already exists: {filename}")
                 # Update database with existing file
                 actual_size = os.path.getsize(output_path)
-                self.db.update_download_success(file_id, output_path, actual_size)
+                await self.db.update_download_success(file_id, output_path, actual_size)
                 return {
                     "status": "exists",
                     "file_id": file_id,
@@ -64,13 +64,16 @@ class DownloadProducer:
             
             # Download file
             logger.info(f"🚀 Starting download: {title}")
+            if not await self.db.mark_downloading(file_id):
+                logger.info(f"⏭️ Boshqa worker band qilgan: {title}")
+                return {"status": "skipped", "file_id": file_id, "reason": "Claimed by another worker"}
             file_size = await self.downloader.download_file(
                 session, semaphore, file_url, output_path, filename
             )
             
             if file_size:
                 # Update database
-                self.db.update_download_success(file_id, output_path, file_size)
+                await self.db.update_download_success(file_id, output_path, file_size)
                 logger.info(f"✅ Download completed: {filename}")
                 return {
                     "status": "success",
@@ -81,7 +84,7 @@ class DownloadProducer:
                 }
             else:
                 # Download failed
-                self.db.update_download_failed(file_id, "Download failed")
+                await self.db.update_download_failed(file_id, "Download failed")
                 logger.error(f"❌ Download failed: {title}")
                 return {
                     "status": "failed",
@@ -91,7 +94,7 @@ class DownloadProducer:
                 
         except Exception as e:
             logger.error(f"❌ Process file error: {title} | {e}")
-            self.db.update_download_failed(file_id, str(e))
+            await self.db.update_download_failed(file_id, str(e))
             return {
                 "status": "error",
                 "file_id": file_id,
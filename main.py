@@ -578,14 +578,17 @@ async def show_files_stats(site_name: str):
     """Fayllar statistikasini ko'rsatish"""
     db = FileDB()
     try:
+        # Barcha hisoblagichlar bitta SQL so'rovda
+        stats = db.get_stats(site_name, by_category=True)
+
         # Jami fayllar soni
-        total_files = db.get_files_count(site_name)
+        total_files = stats["total"]
 
         # Yuklangan fayllar (local_path mavjud)
-        downloaded_files = db.get_downloaded_files_count(site_name)
+        downloaded_files = stats["downloaded"]
 
         # Telegramga yuklangan fayllar
-        uploaded_files = db.get_uploaded_files_count(site_name)
+        uploaded_files = stats["uploaded"]
 
         # Yuklanmagan fayllar
         not_downloaded = total_files - downloaded_files
@@ -600,11 +603,26 @@ async def show_files_stats(site_name: str):
         logger.info(f"⬆️ Telegramga yuklangan: {uploaded_files}")
         logger.info(f"⏳ Yuklanmagan: {not_downloaded}")
         logger.info(f"📤 Upload qilinmagan: {not_uploaded}")
+        logger.info(f"🔗 URL yo'q: {stats['no_url']}")
+        logger.info(f"🔁 Xato (qayta urinadi): {stats['failed']}")
+        logger.info(f"💀 Dead (urinishlar tugagan): {stats['dead']}")
+        logger.info(
+            f"💾 Hajm: {stats['downloaded_size'] / (1024**3):.2f} / {stats['total_size'] / (1024**3):.2f} GB")
         logger.info(
             f"📈 Yuklanish foizi: {(downloaded_files/total_files*100) if total_files > 0 else 0:.1f}%")
         logger.info(
             f"📊 Upload foizi: {(uploaded_files/downloaded_files*100) if downloaded_files > 0 else 0:.1f}%")
 
+        # Eng ko'p fayl bo'lgan kategoriyalar
+        top_categories = sorted(
+            stats["by_category"].items(), key=lambda kv: kv[1]["total"], reverse=True)[:5]
+        if top_categories:
+            logger.info("🏷️ Top kategoriyalar:")
+            for name, category_stats in top_categories:
+                logger.info(
+                    f"   {name}: {category_stats['total']} ta "
+                    f"(⬇️ {category_stats['downloaded']}, ⬆️ {category_stats['uploaded']})")
+
     except Exception as e:
         logger.error(f"❌ Statistika olishda xato: {e}")
 
@@ -661,6 +679,7 @@ async def handle_scraping(CONFIG, site_name):
     logger.info("\n🔍 Scraping rejimini tanlang:")
     logger.info("[1] Oddiy scraping")
     logger.info("[2] Quick scraping")
+    logger.info("[3] Incremental scraping (faqat yangi sahifalar)")
 
     scrape_mode = safe_input("Scraping turi → ")
 
@@ -673,6 +692,10 @@ async def handle_scraping(CONFIG, site_name):
         logger.info("⚡ Quick scraping boshlandi...")
         result = await quick_scrape(CONFIG, BROWSER_CONFIG, pages_selection)
         await show_scraping_results(result)
+    elif scrape_mode == "3":
+        logger.info("🔁 Incremental scraping boshlandi...")
+        result = await scrape(CONFIG, BROWSER_CONFIG, incremental=True)
+        await show_scraping_results(result)
     else:
         logger.info("❌ Noto'g'ri tanlov!")
 
@@ -687,6 +710,28 @@ async def show_scraping_results(result):
             logger.info(f"   ✅ Muvaffaqiyatli: {result.get('successful', 0)}")
             logger.info(f"   � DB ga qo'shildi: {result.get('inserted', 0)}")
             logger.info(f"   ⏭️ Tashlab ketildi: {result.get('skipped', 0)}")
+            cache = result.get('http_cache')
+            if cache:
+                logger.info(
+                    f"   🗄️ HTTP cache: {cache['hits'] + cache['offline_hits']} hit, "
+                    f"{cache['misses']} miss ({cache['hit_rate']:.1f}%)")
+            lag = result.get('loop_lag')
+            if lag:
+                logger.info(
+                    f"   ⏱️ Loop kechikishi: p95 {lag['p95_ms']:.1f} ms, max {lag['max_ms']:.1f} ms")
+            for host, rate in (result.get('rate_limits') or {}).items():
+                logger.info(
+                    f"   🚦 {host}: {rate['rate']:.1f} so'rov/s "
+                    f"({rate['throttled']} throttled, {rate['errors']} xato)")
+            pool = result.get('browser_pool')
+            if pool and pool['checkouts']:
+                logger.info(
+                    f"   🧭 Browser fallback: {pool['checkouts']} ta, "
+                    f"{pool['reused']} qayta ishlatilgan sahifa")
+            listing = result.get('listing', {})
+            if listing.get('stopped_at'):
+                logger.info(
+                    f"   🔁 Incremental: {listing['walked']}/{listing['pages']} sahifa o'qildi")
 
             # Performance statistika
             stats = result.get('stats', {})
@@ -697,6 +742,8 @@ async def show_scraping_results(result):
                     f"   🏃 Tezlik: {stats.get('items_per_second', 0):.2f} item/s")
                 logger.info(
                     f"   📊 Muvaffaqiyat: {stats.get('success_rate', 0):.1f}%")
+        elif result.get('status') == 'completed':
+            logger.info(f"   ✅ {result.get('reason', '')} (tashlab ketildi: {result.get('skipped', 0)})")
         elif result.get('status') == 'cancelled':
             logger.info("   🚫 Foydalanuvchi tomonidan bekor qilindi")
         elif result.get('status') == 'failed':
@@ -750,13 +797,13 @@ async def list_all_files(site_name):
         logger.info(f"\n📋 {site_name} - Barcha fayllar ro'yxati")
 
         db = FileDB()
-        files = db.get_files(site_name)
+        stats = db.get_stats(site_name)
+        total_files = stats["total"]
 
-        if not files:
+        if not total_files:
             logger.info("❌ Hech qanday fayl topilmadi")
             return
 
-        total_files = len(files)
         logger.info(f"📊 Jami fayllar soni: {total_files}")
 
         # Ko'rsatish rejimini tanlash
@@ -769,31 +816,35 @@ async def list_all_files(site_name):
 
         display_mode = safe_input("Rejimni tanlang → ")
 
+        # Fayllar ro'yxatga yig'ilmaydi - DB'dan partiyalab o'qib ko'rsatiladi
         if display_mode == "1":
-            await show_files_brief(files)
+            await show_files_brief(db.iter_files(site_name), total_files)
         elif display_mode == "2":
-            await show_files_detailed(files)
+            await show_files_detailed(db.iter_files(site_name), total_files)
         elif display_mode == "3":
-            filtered_files = [f for f in files if not f.get('uploaded', False)]
-            logger.info(f"📤 Yuklanmagan fayllar: {len(filtered_files)} ta")
-            await show_files_detailed(filtered_files)
+            not_uploaded = total_files - stats["uploaded"]
+            logger.info(f"📤 Yuklanmagan fayllar: {not_uploaded} ta")
+            await show_files_detailed(
+                db.iter_files(site_name, where="not_uploaded"), not_uploaded)
         elif display_mode == "4":
-            filtered_files = [f for f in files if f.get('uploaded', False)]
-            logger.info(f"✅ Yuklangan fayllar: {len(filtered_files)} ta")
-            await show_files_detailed(filtered_files)
+            uploaded = stats["uploaded"]
+            logger.info(f"✅ Yuklangan fayllar: {uploaded} ta")
+            await show_files_detailed(
+                db.iter_files(site_name, where="uploaded"), uploaded)
         elif display_mode == "5":
-            await show_files_paginated(files)
+            await show_files_paginated(db, site_name, total_files)
         else:
             logger.info("❌ Noto'g'ri tanlov, qisqacha ko'rsatiladi")
-            await show_files_brief(files)
+            await show_files_brief(db.iter_files(site_name), total_files)
 
     except Exception as e:
         logger.error(f"❌ Fayllar ro'yxatini ko'rsatishda xato: {e}")
 
 
-async def show_files_brief(files):
-    """Qisqacha fayllar ro'yxati"""
-    logger.info(f"\n📋 Qisqacha ro'yxat ({len(files)} ta fayl):")
+async def show_files_brief(files, total=None):
+    """Qisqacha fayllar ro'yxati (files - list yoki FileDB.iter_files iteratori)"""
+    total = len(files) if total is None else total
+    logger.info(f"\n📋 Qisqacha ro'yxat ({total} ta fayl):")
     logger.info("=" * 80)
 
     for i, file in enumerate(files, 1):
@@ -810,9 +861,10 @@ async def show_files_brief(files):
         logger.info(f"{i:3d}. [{file_id:4}] {uploaded} {local_exists} {title}")
 
 
-async def show_files_detailed(files):
-    """Batafsil fayllar ro'yxati"""
-    logger.info(f"\n📋 Batafsil ro'yxat ({len(files)} ta fayl):")
+async def show_files_detailed(files, total=None):
+    """Batafsil fayllar ro'yxati (files - list yoki FileDB.iter_files iteratori)"""
+    total = len(files) if total is None else total
+    logger.info(f"\n📋 Batafsil ro'yxat ({total} ta fayl):")
     logger.info("=" * 80)
 
     for i, file in enumerate(files, 1):
@@ -843,16 +895,16 @@ async def show_files_detailed(files):
         logger.info(f"📅 Qo'shilgan: {created_at}")
 
 
-async def show_files_paginated(files, page_size=20):
-    """Sahifa bo'yicha fayllarni ko'rsatish"""
-    total_files = len(files)
+async def show_files_paginated(db, site_name, total_files, page_size=20):
+    """Sahifa bo'yicha fayllarni ko'rsatish (har sahifa DB'dan alohida o'qiladi)"""
     total_pages = (total_files + page_size - 1) // page_size
     current_page = 1
 
     while True:
         start_idx = (current_page - 1) * page_size
         end_idx = min(start_idx + page_size, total_files)
-        page_files = files[start_idx:end_idx]
+        page_files = list(db.iter_files(
+            site_name, limit=page_size, offset=start_idx))
 
         logger.info(
             f"\n📋 Sahifa {current_page}/{total_pages} ({start_idx + 1}-{end_idx} fayllar)")
@@ -896,7 +948,7 @@ async def search_files(site_name):
         logger.info(f"\n🔍 {site_name} da kengaytirilgan fayl qidirish")
         logger.info("📋 Qidirish imkoniyatlari:")
         logger.info("   • Fayl ID (masalan: 123)")
-        logger.info("   • Fayl nomi (masalan: Oila)")
+        logger.info("   • Fayl nomi yoki so'z boshi (masalan: Oila, oil)")
         logger.info("   • Fayl path (masalan: downloads/film.mp4)")
         logger.info("   • Kategoriya, aktyorlar, mamlakat, til, yil")
         logger.info("   • Tavsif yoki URL qismi")
@@ -907,46 +959,53 @@ async def search_files(site_name):
             return
 
         db = FileDB()
-        files = db.get_files(site_name)
 
-        # Kengaytirilgan qidiruv - ID, nom, filepath, description va boshqalar
+        # Kengaytirilgan qidiruv - ID, filepath va FTS indeks (nom, tavsif va boshqalar)
         found_files = []
-        search_lower = search_query.lower()
+        found_ids = set()
 
         # ID bo'yicha qidirish (raqam bo'lsa)
         if search_query.isdigit():
-            file_id = int(search_query)
-            for file in files:
-                if file.get("id") == file_id:
-                    found_files.append(file)
-
-        # Barcha fieldlar bo'yicha qidirish (oxshashlik)
-        for file in files:
+            file = db.get_file(int(search_query))
+            if file and file.get("config_name") == site_name:
+                found_files.append(file)
+                found_ids.add(file["id"])
+
+        # Path bo'yicha qidirish (local_path FTS indeksida yo'q)
+        if "/" in search_query or "\\" in search_query:
+            for row in db.iter_files(site_name, where="local_path LIKE ?",
+                                     params=(f"%{search_query}%",), limit=50):
+                file = dict(row)
+                file["_matched_field"] = "📁 Path"
+                file["_matched_value"] = file["local_path"]
+                found_files.append(file)
+                found_ids.add(file["id"])
+
+        # FTS5 qidiruv - natijalar moslik darajasi bo'yicha tartiblangan
+        search_lower = search_query.lower().split()[0]
+        fields_to_search = [
+            ("title", "📄 Nom"),
+            ("description", "📝 Tavsif"),
+            ("categories", "🏷️ Kategoriya"),
+            ("actors", "🎭 Aktyorlar"),
+            ("country", "🌍 Mamlakat"),
+            ("language", "🌐 Til"),
+            ("year", "📅 Yil"),
+            ("file_url", "🔗 URL"),
+        ]
+        for file in db.search(site_name, search_query, limit=50):
             # Faylni qo'shmaslik uchun tekshirish (ID bo'yicha allaqachon qo'shilgan bo'lishi mumkin)
-            if file in found_files:
+            if file["id"] in found_ids:
                 continue
 
-            # Qidirish fieldlari va ularning nomlari
-            fields_to_search = [
-                ("title", file.get("title", ""), "📄 Nom"),
-                ("local_path", file.get("local_path", ""), "📁 Path"),
-                ("description", file.get("description", ""), "📝 Tavsif"),
-                ("categories", file.get("categories", ""), "🏷️ Kategoriya"),
-                ("actors", file.get("actors", ""), "🎭 Aktyorlar"),
-                ("country", file.get("country", ""), "🌍 Mamlakat"),
-                ("language", file.get("language", ""), "🌐 Til"),
-                ("year", file.get("year", ""), "📅 Yil"),
-                ("file_url", file.get("file_url", ""), "🔗 URL"),
-            ]
-
-            # Har bir field da qidiruv
-            for field_name, field_value, field_display in fields_to_search:
+            # Qaysi field da topilganini ko'rsatish uchun
+            for field_name, field_display in fields_to_search:
+                field_value = file.get(field_name)
                 if field_value and search_lower in str(field_value).lower():
-                    # Topilgan fieldni saqlab qo'yamiz
                     file["_matched_field"] = field_display
                     file["_matched_value"] = str(field_value)
-                    found_files.append(file)
-                    break  # Bitta field da topilsa, boshqa fieldlarni tekshirmaslik
+                    break
+            found_files.append(file)
 
         if not found_files:
             logger.info(f"❌ '{search_query}' bo'yicha hech narsa topilmadi")
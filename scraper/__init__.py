@@ -9,6 +9,7 @@ Bu modul quyidagi komponentlardan iborat:
 """
 
 from .scraping import scrape, quick_scrape, batch_scrape_multiple_sites, ScrapingOrchestrator
+from .multi_site import MultiSiteScheduler
 from .browser import launch_browser, create_browser_context, cleanup_browser
 from .workers import collect_items_parallel, process_batch_parallel, WorkerPool
 
@@ -17,6 +18,7 @@ __all__ = [
     'quick_scrape',
     'batch_scrape_multiple_sites',
     'ScrapingOrchestrator',
+    'MultiSiteScheduler',
     'launch_browser', 
     'create_browser_context',
     'cleanup_browser',
@@ -5,16 +5,144 @@ Bu modul Playwright orqali browser sesssiyalarini boshqaradi va
 optimal browser konfiguratsiyasini ta'minlaydi.
 """
 import asyncio
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route
+
+from core.config import BROWSER_CONFIG
 from utils.logger_core import logger
 
+# Sayt config'ida BROWSER_CONFIG ustidan yozish mumkin bo'lgan navigatsiya sozlamalari
+NAVIGATION_DEFAULTS = {
+    "block_resources": (),      # bekor qilinadigan resource_type'lar: image, media, font, ...
+    "block_domains": (),        # bekor qilinadigan domenlar (subdomenlari bilan)
+    "wait_until": "load",       # page.goto: load | domcontentloaded | networkidle | commit
+    "wait_selector": None,      # detail sahifada goto'dan keyin kutiladigan selector
+    "nav_timeout": 30000,       # ms
+    "selector_timeout": 10000,  # ms
+}
+
+
+def navigation_options(site_config: Optional[dict] = None,
+                       browser_config: Optional[dict] = None) -> dict:
+    """
+    Navigatsiya sozlamalari: BROWSER_CONFIG qiymatlari, sayt config'idagilari ustun.
+
+    Args:
+        site_config: Sayt konfiguratsiyasi (None qiymatlar e'tiborga olinmaydi)
+        browser_config: Browser konfiguratsiyasi (default - core.config.BROWSER_CONFIG)
+    """
+    base = BROWSER_CONFIG if browser_config is None else browser_config
+    options = {key: base.get(key, default) for key, default in NAVIGATION_DEFAULTS.items()}
+    for key in NAVIGATION_DEFAULTS:
+        if site_config and site_config.get(key) is not None:
+            options[key] = site_config[key]
+    return options
+
+
+class ResourceBlocker:
+    """
+    Kontekst darajasidagi route interception: rasm, video, shrift va tracker
+    so'rovlarini bekor qiladi - fallback sahifalar faqat HTML va kerakli
+    skriptlar bilan yuklanadi.
+    """
+
+    def __init__(self, resource_types: Iterable[str] = (), domains: Iterable[str] = ()):
+        self.resource_types = frozenset(t.strip().lower() for t in resource_types if t.strip())
+        self.domains = tuple(d.strip().lower().lstrip(".") for d in domains if d.strip())
+        self.stats = {"allowed": 0, "blocked": 0}
+
+    @classmethod
+    def from_options(cls, options: dict) -> "ResourceBlocker":
+        return cls(options.get("block_resources") or (), options.get("block_domains") or ())
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.resource_types or self.domains)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        if self.domains:
+            host = (urlparse(url).hostname or "").lower()
+            return any(host == d or host.endswith("." + d) for d in self.domains)
+        return False
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        try:
+            if self.should_block(request.resource_type, request.url):
+                self.stats["blocked"] += 1
+                await route.abort()
+            else:
+                self.stats["allowed"] += 1
+                await route.continue_()
+        except Exception as e:
+            # Sahifa yopilgan bo'lsa route allaqachon bekor qilingan bo'ladi
+            logger.debug(f"Route qayta ishlanmadi: {request.url} | {e}")
+
+    async def install(self, context: BrowserContext) -> None:
+        """Kontekstdagi barcha so'rovlarni handle() orqali o'tkazish (bloklash yoqilgan bo'lsa)"""
+        if self.enabled:
+            await context.route("**/*", self.handle)
+
 
-async def launch_browser(browser_config: dict) -> tuple:
+async def goto_page(page: Page, url: str, config: Optional[dict] = None,
+                    wait_selector: Optional[str] = None):
+    """
+    Sahifaga yengil navigatsiya: wait_until (masalan domcontentloaded) gacha kutish,
+    keyin ixtiyoriy selector paydo bo'lishini kutish.
+
+    Faol BrowserPagePool bo'lsa uning sozlamalari, aks holda
+    navigation_options(config) ishlatiladi.
+
+    Args:
+        page: Page instance
+        url: O'tish uchun URL
+        config: Sayt konfiguratsiyasi
+        wait_selector: Kutiladigan selector (default - options["wait_selector"])
+
+    Returns:
+        Response | None: page.goto natijasi
+    """
+    pool = get_page_pool()
+    options = pool.navigation if pool is not None else navigation_options(config)
+    response = await page.goto(url, timeout=options["nav_timeout"], wait_until=options["wait_until"])
+    selector = wait_selector or options["wait_selector"]
+    if selector:
+        try:
+            await page.wait_for_selector(selector, timeout=options["selector_timeout"])
+        except Exception as e:
+            logger.debug(f"Selector kutilmadi: {selector} | {url} | {e}")
+    return response
+
+
+def browser_context_options(browser_config: dict) -> dict:
+    """BROWSER_CONFIG dan browser.new_context() argumentlari"""
+    return {
+        "viewport": browser_config["viewport"],
+        "user_agent": browser_config["user_agent"],
+        "locale": browser_config["locale"],
+        "device_scale_factor": browser_config["device_scale_factor"],
+        "proxy": browser_config["proxy"],
+        "geolocation": browser_config["geolocation"],
+        "permissions": browser_config["permissions"],
+    }
+
+
+async def launch_browser(browser_config: dict, site_config: Optional[dict] = None) -> tuple:
     """
     Playwright browser ochish va asosiy sahifa yaratish.
+
+    Asosiy kontekstga navigation_options(site_config, browser_config) bo'yicha
+    resurs bloklash o'rnatiladi.
     
     Args:
         browser_config: Browser konfiguratsiyasi
+        site_config: Sayt konfiguratsiyasi (bloklash sozlamalari uchun)
         
     Returns:
         tuple: (playwright_instance, browser, page)
@@ -28,15 +156,9 @@ async def launch_browser(browser_config: dict) -> tuple:
             slow_mo=browser_config["slow_mo"]
         )
         
-        context = await browser.new_context(
-            viewport=browser_config["viewport"],
-            user_agent=browser_config["user_agent"],
-            locale=browser_config["locale"],
-            device_scale_factor=browser_config["device_scale_factor"],
-            proxy=browser_config["proxy"],
-            geolocation=browser_config["geolocation"],
-            permissions=browser_config["permissions"],
-        )
+        context = await browser.new_context(**browser_context_options(browser_config))
+        await ResourceBlocker.from_options(
+            navigation_options(site_config, browser_config)).install(context)
         
         page = await context.new_page()
         logger.info("🌐 Browser muvaffaqiyatli ishga tushirildi")
@@ -48,13 +170,15 @@ async def launch_browser(browser_config: dict) -> tuple:
         raise
 
 
-async def create_browser_context(browser: Browser, config: dict = None) -> BrowserContext:
+async def create_browser_context(browser: Browser, config: dict = None,
+                                 blocker: Optional["ResourceBlocker"] = None) -> BrowserContext:
     """
     Yangi browser kontekst yaratish.
     
     Args:
         browser: Playwright browser instance
         config: Qo'shimcha kontekst konfiguratsiyasi
+        blocker: Kontekstga o'rnatiladigan ResourceBlocker (ixtiyoriy)
         
     Returns:
         BrowserContext: Yangi kontekst
@@ -62,6 +186,8 @@ async def create_browser_context(browser: Browser, config: dict = None) -> Brows
     try:
         context_config = config or {}
         context = await browser.new_context(**context_config)
+        if blocker is not None:
+            await blocker.install(context)
         return context
     except Exception as e:
         logger.error(f"❌ Browser kontekst yaratishda xato: {e}")
@@ -118,6 +244,223 @@ async def safe_page_goto(page: Page, url: str, retries: int = 3) -> bool:
     return False
 
 
+class _PooledPage:
+    """Pool'dagi bitta kontekst + sahifa juftligi"""
+
+    __slots__ = ("context", "page", "uses")
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+
+
+class BrowserPagePool:
+    """
+    Fallback so'rovlar uchun qayta ishlatiladigan kontekst/sahifalar pool'i.
+
+    Har fallback URL uchun new_context() + new_page() qilib yopish o'rniga
+    tayyor (warm) sahifa olinadi va ishdan keyin qaytariladi. Bir vaqtda
+    ko'pi bilan size ta sahifa band bo'ladi (scrape_concurrency), har sahifa
+    max_uses marta ishlatilgach yoki sog'ligi yo'qolsa (yopilgan, crash,
+    about:blank ga qaytmadi) yopilib, keyingi so'rovda yangisi yaratiladi.
+
+        pool = BrowserPagePool(browser, size=5)
+        await pool.warm(2)
+        async with pool.page() as page:
+            await page.goto(url)
+        await pool.close()
+    """
+
+    def __init__(self, browser: Browser, size: int, max_uses: int = 50,
+                 context_options: Optional[dict] = None,
+                 navigation: Optional[dict] = None):
+        self.browser = browser
+        self.size = max(int(size), 1)
+        self.max_uses = max(int(max_uses), 1)
+        self.context_options = context_options or {}
+        # goto_page sozlamalari va har yangi kontekstga o'rnatiladigan bloklash
+        self.navigation = navigation or navigation_options()
+        self.blocker = ResourceBlocker.from_options(self.navigation)
+        self._idle: List[_PooledPage] = []
+        self._semaphore = asyncio.Semaphore(self.size)
+        self._closed = False
+        self.stats = {"checkouts": 0, "created": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    async def _create(self) -> _PooledPage:
+        context = await self.browser.new_context(**self.context_options)
+        try:
+            await self.blocker.install(context)
+            page = await context.new_page()
+        except Exception:
+            await context.close()
+            raise
+        self.stats["created"] += 1
+        return _PooledPage(context, page)
+
+    @staticmethod
+    async def _discard(slot: _PooledPage) -> None:
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Browser kontekst yopilmadi: {e}")
+
+    @staticmethod
+    def _is_healthy(slot: _PooledPage) -> bool:
+        try:
+            return not slot.page.is_closed()
+        except Exception:
+            return False
+
+    async def warm(self, count: Optional[int] = None) -> int:
+        """count ta (default size) sahifani oldindan yaratish"""
+        target = min(self.size if count is None else count, self.size)
+        while len(self._idle) < target and not self._closed:
+            self._idle.append(await self._create())
+        return len(self._idle)
+
+    async def checkout(self) -> _PooledPage:
+        """Bo'sh sahifa olish (limit to'lgan bo'lsa kutadi); release() bilan qaytariladi"""
+        if self._closed:
+            raise RuntimeError("BrowserPagePool yopilgan")
+        await self._semaphore.acquire()
+        try:
+            self.stats["checkouts"] += 1
+            while self._idle:
+                slot = self._idle.pop()
+                if self._is_healthy(slot):
+                    self.stats["reused"] += 1
+                    slot.uses += 1
+                    return slot
+                self.stats["unhealthy"] += 1
+                await self._discard(slot)
+            slot = await self._create()
+            slot.uses += 1
+            return slot
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def release(self, slot: _PooledPage, healthy: bool = True) -> None:
+        """
+        Sahifani pool'ga qaytarish.
+
+        Sahifa about:blank ga qaytariladi (oldingi DOM va timerlar tozalanadi);
+        bu muvaffaqiyatsiz bo'lsa, healthy=False bo'lsa yoki max_uses ga
+        yetgan bo'lsa kontekst yopiladi.
+        """
+        try:
+            if self._closed or not healthy or not self._is_healthy(slot):
+                if not self._closed:
+                    self.stats["unhealthy"] += 1
+                await self._discard(slot)
+                return
+            if slot.uses >= self.max_uses:
+                self.stats["recycled"] += 1
+                await self._discard(slot)
+                return
+            try:
+                await slot.page.goto("about:blank", timeout=5000)
+            except Exception:
+                self.stats["unhealthy"] += 1
+                await self._discard(slot)
+                return
+            self._idle.append(slot)
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """async with pool.page() as page: ... - checkout/release avtomatik"""
+        slot = await self.checkout()
+        healthy = True
+        try:
+            yield slot.page
+        except Exception:
+            # Xatodan keyin sahifa holati noma'lum - qayta ishlatmaymiz
+            healthy = False
+            raise
+        finally:
+            await self.release(slot, healthy=healthy)
+
+    def report(self) -> Dict:
+        """Pool statistikasi: checkouts, created, reused, recycled, unhealthy, blocked, idle, size"""
+        return {**self.stats, "blocked": self.blocker.stats["blocked"],
+                "idle": len(self._idle), "size": self.size}
+
+    async def close(self) -> None:
+        """Barcha bo'sh kontekstlarni yopish (band sahifalar release'da yopiladi)"""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for slot in idle:
+            await self._discard(slot)
+
+
+_active_pool: ContextVar[Optional[BrowserPagePool]] = ContextVar(
+    "scraper_browser_pool", default=None)
+
+
+def create_page_pool(browser: Browser, config: dict,
+                     context_options: Optional[dict] = None,
+                     browser_config: Optional[dict] = None) -> Optional[BrowserPagePool]:
+    """
+    config bo'yicha BrowserPagePool yaratish (browser_pool_enabled=False bo'lsa None).
+
+    Pool hajmi scrape_concurrency ga teng - listing va detail workerlar
+    bir vaqtda shundan ortiq browser sahifa ocha olmaydi. Navigatsiya va
+    bloklash sozlamalari navigation_options(config, browser_config) dan.
+    """
+    if browser is None or not config.get("browser_pool_enabled", True):
+        return None
+    return BrowserPagePool(
+        browser,
+        size=config.get("scrape_concurrency", 5),
+        max_uses=config.get("browser_pool_max_uses", 50),
+        context_options=context_options,
+        navigation=navigation_options(config, browser_config),
+    )
+
+
+def activate_page_pool(pool: Optional[BrowserPagePool]) -> Token:
+    """Pool'ni joriy context uchun o'rnatish (qaytgan token bilan reset qilinadi)"""
+    return _active_pool.set(pool)
+
+
+def deactivate_page_pool(token: Token) -> None:
+    _active_pool.reset(token)
+
+
+def get_page_pool() -> Optional[BrowserPagePool]:
+    return _active_pool.get()
+
+
+@asynccontextmanager
+async def browser_page(browser: Browser, config: Optional[dict] = None) -> AsyncIterator[Page]:
+    """
+    Fallback uchun sahifa: faol pool bo'lsa undan, bo'lmasa vaqtinchalik kontekst
+    (navigation_options(config) bo'yicha resurs bloklash bilan).
+
+        async with browser_page(browser) as page:
+            await page.goto(url)
+    """
+    pool = get_page_pool()
+    if pool is not None and pool.browser is browser:
+        async with pool.page() as page:
+            yield page
+        return
+
+    context = await create_browser_context(
+        browser, blocker=ResourceBlocker.from_options(navigation_options(config)))
+    try:
+        page = await context.new_page()
+        try:
+            yield page
+        finally:
+            await page.close()
+    finally:
+        await context.close()
+
+
 async def cleanup_browser(pw, browser: Browser) -> None:
     """
     Browser va playwright resurslarini tozalash.
@@ -0,0 +1,120 @@
+"""
+Crawl frontier - scraping holatini DB da saqlash va to'xtagan joydan davom ettirish.
+
+Har config uchun listing va detail URL'lar crawl_frontier jadvalida turadi:
+
+    queued ──▶ in_flight ──▶ done
+                   │
+                   └──────▶ failed (attempts < crawl_max_attempts bo'lsa qayta urinadi)
+
+- Listing sahifa tugaganda uning yangi film linklari detail sifatida shu
+  tranzaksiyada qo'shiladi - jarayon to'xtasa ham linklar yo'qolmaydi
+- Detail sahifa natijasi DB ga yozilgandan keyingina done bo'ladi
+- crawl_state.crawl_finished: start() 0 ga, finish() 1 ga o'rnatadi. Faqat
+  to'xtab qolgan crawl (0) keyingi run_scraping_process'da sahifa tanlashni
+  so'ramasdan qolgan joydan davom ettiriladi
+- Crawl oxirigacha ishlasa faqat urinishlari qolgan failed/in_flight URL'lar
+  saqlanadi; ular keyingi oddiy crawl'ning tanloviga qo'shiladi (start())
+- in_flight ham attempts bilan cheklanadi - jarayonni yiqitadigan URL abadiy
+  davom ettirilmaydi
+- Qayta o'ynash xavfsiz: insert_files (on_conflict="ignore") va
+  (config_name, file_page) unique index dublikat yozmaydi
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+from core.async_db import AsyncFileDB
+from utils.logger_core import logger
+
+
+class CrawlFrontier:
+    """Bitta config uchun frontier (AsyncFileDB orqali - event loop bloklanmaydi)"""
+
+    def __init__(self, db: AsyncFileDB, config_name: str, max_attempts: int = 3):
+        self.db = db
+        self.config_name = config_name
+        self.max_attempts = max(max_attempts, 1)
+
+    @staticmethod
+    def _detail_entries(items: List[dict], seq: int) -> List[Tuple[str, int, str]]:
+        return [(item["file_page"], seq, json.dumps(item, ensure_ascii=False))
+                for item in items if item.get("file_page")]
+
+    async def counts(self) -> Dict[str, Dict[str, int]]:
+        return await self.db.frontier_counts(self.config_name)
+
+    async def load_pending(self) -> Optional[Tuple[List[str], List[dict]]]:
+        """
+        Tugallanmagan crawl bo'lsa uning qolgan qismini qaytarish.
+
+        Returns:
+            (listing URL'lar, detail itemlar) yoki None - davom ettiriladigan crawl yo'q
+        """
+        listing = await self.db.frontier_pending(self.config_name, "listing", self.max_attempts)
+        details = await self.db.frontier_pending(self.config_name, "detail", self.max_attempts)
+        if not listing and not details:
+            return None
+        items = []
+        for row in details:
+            try:
+                items.append(json.loads(row["payload"]) if row["payload"] else {"file_page": row["url"]})
+            except ValueError:
+                items.append({"file_page": row["url"]})
+        return [row["url"] for row in listing], items
+
+    async def interrupted(self) -> bool:
+        """Oxirgi crawl to'xtab qolganmi (crawl_state.crawl_finished == 0)
+
+        Marker'dan oldingi bazalarda (NULL) tugallanmagan URL'lar borligiga qaraladi.
+        """
+        state = await self.db.get_crawl_state(self.config_name)
+        finished = state.get("crawl_finished") if state else None
+        if finished is not None:
+            return not finished
+        return await self.load_pending() is not None
+
+    async def start(self, page_urls: List[str]) -> Tuple[List[str], List[dict]]:
+        """
+        Yangi crawl: oldingi crawl'dan qolgan qayta urinadigan URL'larni saqlab,
+        tanlangan listing sahifalarni navbatga qo'yish.
+
+        Returns:
+            (qayta urinadigan listing URL'lar - page_urls'da yo'qlari, detail itemlar)
+        """
+        await self.db.frontier_prune(self.config_name, self.max_attempts)
+        retry_pages, retry_items = await self.load_pending() or ([], [])
+        await self.db.set_crawl_finished(self.config_name, False)
+        # INSERT OR IGNORE - qayta urinadigan sahifa tanlovda bo'lsa attempts saqlanadi
+        await self.db.frontier_add(
+            self.config_name, "listing", [(url, i, None) for i, url in enumerate(page_urls)])
+        selected = set(page_urls)
+        return [url for url in retry_pages if url not in selected], retry_items
+
+    async def finish(self) -> None:
+        """Crawl oxirigacha ishladi - faqat qayta urinadigan URL'lar qoladi"""
+        removed = await self.db.frontier_prune(self.config_name, self.max_attempts)
+        await self.db.set_crawl_finished(self.config_name, True)
+        retry = await self.db.frontier_pending(self.config_name, "listing", self.max_attempts)
+        retry += await self.db.frontier_pending(self.config_name, "detail", self.max_attempts)
+        logger.debug(f"🧭 Frontier tozalandi: {removed} ta URL")
+        if retry:
+            logger.info(f"🧭 {len(retry)} ta xato URL keyingi crawl'ga qo'shiladi")
+
+    async def listing_started(self, url: str) -> None:
+        await self.db.frontier_mark(self.config_name, [url], "in_flight")
+
+    async def listing_done(self, url: str, new_items: List[dict], seq: int) -> None:
+        await self.db.frontier_listing_done(
+            self.config_name, url, self._detail_entries(new_items, seq))
+
+    async def listing_failed(self, url: str, error: str) -> None:
+        await self.db.frontier_mark(self.config_name, [url], "failed", error=error)
+
+    async def detail_started(self, file_page: str) -> None:
+        await self.db.frontier_mark(self.config_name, [file_page], "in_flight")
+
+    async def details_done(self, file_pages: List[str]) -> None:
+        await self.db.frontier_mark(self.config_name, file_pages, "done")
+
+    async def details_failed(self, file_pages: List[str], error: str) -> None:
+        await self.db.frontier_mark(self.config_name, file_pages, "failed", error=error)
@@ -0,0 +1,395 @@
+"""
+Scraper uchun diskdagi HTTP javob cache'i - shartli so'rovlar (ETag / Last-Modified).
+
+Listing va film sahifalari har ishga tushirishda to'liq qayta yuklanardi, vaholanki
+ularning ko'pchiligi o'zgarmaydi. HttpCache HTML'ni URL bo'yicha zlib bilan siqib
+SQLite faylida saqlaydi:
+
+- Keyingi so'rovda If-None-Match / If-Modified-Since yuboriladi, 304 javobda
+  HTML cache'dan olinadi (tarmoqdan faqat sarlavhalar keladi)
+- Umumiy hajm http_cache_max_mb dan oshsa eng uzoq ishlatilmagan yozuvlar
+  o'chiriladi (LRU)
+- offline rejimda cache'dagi sahifalar tarmoqqa umuman chiqmasdan qaytariladi -
+  yangi selectorlar bilan saytlarni qayta bezovta qilmasdan qayta parse qilish uchun
+- report(): hit/miss hisoboti
+
+Yozuvlar event loop'ni to'sib qo'ymaydi (AsyncFileDB write-behind kabi): store()
+va mark_hit() faqat xotiradagi buferga yozadi, flush_size ta yozuv yig'ilganda
+fetch_text buferni alohida thread'da siqib, bitta tranzaksiyada saqlaydi
+(har javob uchun emas, har flush uchun bitta commit). Hali yozilmagan javoblar
+lookup() da buferdan beriladi; close() / aclose() qolganini yozadi. fetch_text
+o'qishni ham thread'da bajaradi (lookup_async) - har thread o'z ulanishi bilan,
+yozuvchi lock'ini kutmasdan (WAL).
+
+Cache ScrapingOrchestrator tomonidan yaratiladi va activate_http_cache() bilan
+joriy context'ga o'rnatiladi; fetch helperlar uni fetch_text() orqali ishlatadi.
+Cache o'rnatilmagan bo'lsa (eski chaqiruvlar) oddiy GET bajariladi.
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextvars import ContextVar, Token
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from core.db_pool import ConnectionPool, apply_pragmas
+from utils.logger_core import logger
+from utils.rate_limiter import throttle
+
+# Eviction chegaradan biroz pastgacha o'chiradi - har yozuvda qayta tozalamaslik uchun
+_EVICT_TARGET = 0.9
+# Bitta flush'da yoziladigan javoblar (store + LRU vaqti) soni
+FLUSH_SIZE = 64
+
+
+class CacheEntry(NamedTuple):
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int  # siqilgan hajm (bayt), buferdagi yozuvda 0
+
+
+class HttpCache:
+    """URL -> siqilgan HTML cache'i, LRU hajm chegarasi bilan"""
+
+    def __init__(self, path: str, max_bytes: int, offline: bool = False,
+                 flush_size: int = FLUSH_SIZE):
+        """
+        Args:
+            path: SQLite fayl yo'li
+            max_bytes: Siqilgan HTML'larning umumiy hajm chegarasi
+            offline: True bo'lsa cache'dagi sahifalar uchun tarmoqqa chiqilmaydi
+            flush_size: Shuncha yozuv yig'ilganda bufer thread'da DB ga yoziladi
+        """
+        self.path = path
+        self.max_bytes = max(max_bytes, 0)
+        self.offline = offline
+        self.flush_size = max(int(flush_size), 1)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Yozuvchi ulanish (flush, eviction) - thread'lar orasida _db_lock bilan bo'linadi;
+        # lookup har thread'ning o'z o'quvchi ulanishidan foydalanadi
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._db_lock = threading.RLock()
+        apply_pragmas(self._conn)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                stored_at INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._readers = ConnectionPool(path)
+
+        self.counters = {
+            "hits": 0,          # 304 - cache'dan berildi
+            "offline_hits": 0,  # tarmoqsiz cache'dan berildi
+            "misses": 0,        # to'liq 200 javob yuklandi
+            "stored": 0,
+            "evicted": 0,
+            "bytes_saved": 0,   # 304 tufayli qayta yuklanmagan HTML hajmi
+            "flushes": 0,
+        }
+
+        # Write-behind bufer: url -> (html, etag, last_modified, saqlangan vaqt) va
+        # url -> oxirgi ishlatilgan vaqt. Faqat chaqiruvchi thread (event loop) o'zgartiradi
+        self._pending: Dict[str, Tuple[str, Optional[str], Optional[str], float]] = {}
+        self._touched: Dict[str, float] = {}
+        # Hozir yozilayotgan partiyalar - yozilguncha lookup() ulardan oladi
+        self._inflight: List[Dict] = []
+        self._flushing = False
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["HttpCache"]:
+        """APP_CONFIG sozlamalaridan cache yaratish (o'chirilgan bo'lsa None)"""
+        if not config.get("http_cache_enabled", False):
+            return None
+        try:
+            return cls(
+                config.get("http_cache_path", "local_db/http_cache.db"),
+                int(config.get("http_cache_max_mb", 512) * 1024 * 1024),
+                offline=config.get("http_cache_offline", False),
+                flush_size=config.get("http_cache_flush_size", FLUSH_SIZE),
+            )
+        except sqlite3.Error as e:
+            logger.error(f"❌ HTTP cache ochilmadi, cache'siz davom etiladi: {e}")
+            return None
+
+    def _buffered(self, url: str) -> Optional[CacheEntry]:
+        """Hali yozilmagan (bufer yoki yozilayotgan partiya) javob"""
+        for batch in (self._pending, *self._inflight):
+            if url in batch:
+                text, etag, last_modified, _ = batch[url]
+                return CacheEntry(text, etag, last_modified, 0)
+        return None
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """URL uchun saqlangan javob (bo'lmasa None) - joriy thread'da o'qiydi"""
+        entry = self._buffered(url)
+        return entry if entry is not None else self._read(url)
+
+    async def lookup_async(self, url: str) -> Optional[CacheEntry]:
+        """lookup() - SELECT va zlib decompress thread'da, event loop to'silmaydi"""
+        entry = self._buffered(url)
+        if entry is not None:
+            return entry
+        return await asyncio.to_thread(self._read, url)
+
+    def _read(self, url: str) -> Optional[CacheEntry]:
+        # O'qish thread-local ulanish orqali, _db_lock'siz: WAL'da flush yozayotganda ham o'qiladi
+        row = self._readers.acquire().execute(
+            "SELECT body, etag, last_modified, size FROM responses WHERE url=?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        try:
+            text = zlib.decompress(row[0]).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError):
+            self._delete([url])
+            return None
+        return CacheEntry(text, row[1], row[2], row[3])
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Saqlangan validatorlardan shartli so'rov sarlavhalari"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def mark_hit(self, url: str, entry: CacheEntry, offline: bool = False) -> None:
+        """Cache'dan berilgan javobni hisoblash; LRU vaqti keyingi flush'da yoziladi"""
+        self.counters["offline_hits" if offline else "hits"] += 1
+        if not offline:
+            self.counters["bytes_saved"] += len(entry.text.encode("utf-8"))
+        self._touched[url] = time.time()
+
+    def store(self, url: str, text: str, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """200 javobni buferga qo'yish (siqish va yozish - flush'da)"""
+        self.counters["misses"] += 1
+        self._pending[url] = (text, etag, last_modified, time.time())
+        self._touched.pop(url, None)
+
+    @property
+    def flush_due(self) -> bool:
+        return len(self._pending) + len(self._touched) >= self.flush_size
+
+    def _take_pending(self):
+        """Buferni partiya sifatida olish (chaqiruvchi thread'da)"""
+        batch, touched = self._pending, self._touched
+        self._pending, self._touched = {}, {}
+        self._inflight.append(batch)
+        return batch, touched
+
+    def _write(self, batch: Dict, touched: Dict[str, float]) -> None:
+        """Partiyani siqib bitta tranzaksiyada yozish va kerak bo'lsa LRU eviction"""
+        rows = []
+        for url, (text, etag, last_modified, stored_at) in batch.items():
+            body = zlib.compress(text.encode("utf-8"), 6)
+            if self.max_bytes and len(body) > self.max_bytes:
+                continue
+            rows.append((url, body, etag, last_modified, len(body), int(stored_at), stored_at))
+
+        with self._db_lock:
+            with self._conn:
+                delta = 0
+                for row in rows:
+                    old = self._conn.execute(
+                        "SELECT size FROM responses WHERE url=?", (row[0],)).fetchone()
+                    delta += row[4] - (old[0] if old else 0)
+                self._conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO responses
+                        (url, body, etag, last_modified, size, stored_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                self._conn.executemany(
+                    "UPDATE responses SET accessed_at=? WHERE url=?",
+                    [(accessed_at, url) for url, accessed_at in touched.items()])
+            self._total_bytes += delta
+            self.counters["stored"] += len(rows)
+            self.counters["flushes"] += 1
+
+            if self.max_bytes and self._total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * _EVICT_TARGET))
+
+    def flush(self) -> None:
+        """Buferdagi javoblarni shu thread'da yozish (sinxron chaqiruvlar va yopish uchun)"""
+        if not self._pending and not self._touched:
+            return
+        batch, touched = self._take_pending()
+        try:
+            self._write(batch, touched)
+        finally:
+            self._inflight.remove(batch)
+
+    async def flush_async(self) -> None:
+        """Buferni alohida thread'da yozish - event loop to'silmaydi"""
+        if self._flushing or (not self._pending and not self._touched):
+            return
+        self._flushing = True
+        batch, touched = self._take_pending()
+        try:
+            await asyncio.to_thread(self._write, batch, touched)
+        finally:
+            self._inflight.remove(batch)
+            self._flushing = False
+
+    async def maybe_flush(self) -> None:
+        """flush_size ta yozuv yig'ilgan bo'lsa thread'da yozish"""
+        if not self.flush_due:
+            return
+        try:
+            await self.flush_async()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ HTTP cache'ga yozilmadi: {e}")
+
+    def _evict(self, target_bytes: int) -> None:
+        """Eng uzoq ishlatilmagan yozuvlarni target_bytes gacha o'chirish"""
+        victims = []
+        freed = 0
+        with self._db_lock:
+            for url, size in self._conn.execute(
+                    "SELECT url, size FROM responses ORDER BY accessed_at"):
+                if self._total_bytes - freed <= target_bytes:
+                    break
+                victims.append(url)
+                freed += size
+            self._delete(victims)
+        self.counters["evicted"] += len(victims)
+        logger.debug(f"🗑️ HTTP cache: {len(victims)} ta yozuv o'chirildi ({freed} bayt)")
+
+    def _delete(self, urls) -> None:
+        if not urls:
+            return
+        with self._db_lock:
+            with self._conn:
+                freed = 0
+                for url in urls:
+                    row = self._conn.execute(
+                        "DELETE FROM responses WHERE url=? RETURNING size", (url,)).fetchone()
+                    freed += row[0] if row else 0
+            self._total_bytes -= freed
+
+    def report(self) -> Dict:
+        """Hit/miss hisoboti va cache hajmi (buferda qolgan yozuvlar avval yoziladi)"""
+        self.flush()
+        c = self.counters
+        served = c["hits"] + c["offline_hits"]
+        requests = served + c["misses"]
+        with self._db_lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            size_bytes = self._total_bytes
+        return {
+            **c,
+            "hit_rate": (served / requests * 100) if requests else 0.0,
+            "entries": entries,
+            "size_bytes": size_bytes,
+            "max_bytes": self.max_bytes,
+            "offline": self.offline,
+        }
+
+    def log_report(self) -> None:
+        r = self.report()
+        logger.info(
+            f"🗄️ HTTP cache: {r['hits']} hit (304), {r['offline_hits']} offline, "
+            f"{r['misses']} miss, hit rate {r['hit_rate']:.1f}%, "
+            f"{r['entries']} yozuv / {r['size_bytes'] / 1024 / 1024:.1f} MB, "
+            f"{r['evicted']} evicted")
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._readers.close_all()
+            self._conn.close()
+
+    async def aclose(self) -> None:
+        """Qolgan buferni thread'da yozib yopish"""
+        try:
+            await self.flush_async()
+        finally:
+            self.close()
+
+
+# Joriy scraping jarayonining cache'i (tasklar context'ni meros oladi)
+_active_cache: ContextVar[Optional[HttpCache]] = ContextVar("scraper_http_cache", default=None)
+
+
+def activate_http_cache(cache: Optional[HttpCache]) -> Token:
+    """Cache'ni joriy context uchun o'rnatish (qaytgan token bilan reset qilinadi)"""
+    return _active_cache.set(cache)
+
+
+def deactivate_http_cache(token: Token) -> None:
+    _active_cache.reset(token)
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    return _active_cache.get()
+
+
+async def fetch_text(client: aiohttp.ClientSession, url: str,
+                     timeout: int) -> Tuple[int, Optional[str]]:
+    """
+    GET so'rovi - faol cache bo'lsa shartli so'rov va 304 ni cache'dan berish.
+
+    Args:
+        client: aiohttp session
+        url: Sahifa URL
+        timeout: Timeout sekundlarda
+
+    Returns:
+        tuple: (HTTP status, HTML yoki None). 304 javob 200 sifatida qaytariladi
+    """
+    cache = get_http_cache()
+    entry = await cache.lookup_async(url) if cache is not None else None
+    if entry is not None and cache.offline:
+        cache.mark_hit(url, entry, offline=True)
+        await cache.maybe_flush()
+        return 200, entry.text
+
+    headers = HttpCache.conditional_headers(entry)
+    async with throttle(url) as outcome, \
+            client.get(url, timeout=aiohttp.ClientTimeout(total=timeout),
+                       headers=headers or None) as resp:
+        outcome.observe(resp)
+        status = resp.status
+        if status == 200:
+            text = await resp.text()
+            validators = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+
+    # Cache yozuvi ulanish va throttle slotini band qilmasdan (flush thread'da)
+    if status == 304 and entry is not None:
+        cache.mark_hit(url, entry)
+        await cache.maybe_flush()
+        return 200, entry.text
+    if status != 200:
+        return status, None
+    if cache is not None:
+        cache.store(url, text, *validators)
+        await cache.maybe_flush()
+    return 200, text
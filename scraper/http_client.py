@@ -0,0 +1,62 @@
+"""
+Scraper uchun umumiy HTTP client - bitta pooled aiohttp.ClientSession.
+
+Har bir URL uchun yangi ClientSession ochilsa, har bir sahifa DNS so'rovi,
+TCP va TLS handshake uchun qayta to'laydi (hajm tekshiruvi bilan ikki marta).
+Bu modul ScrapingOrchestrator egalik qiladigan bitta session yaratadi:
+keep-alive ulanishlar qayta ishlatiladi, host bo'yicha limit va DNS cache bor.
+
+    session = create_http_session(config)
+    try:
+        html = await fetch_page_html(url, session=session)
+    finally:
+        await session.close()
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+from utils.logger_core import logger
+
+
+def create_http_session(config: Optional[dict] = None) -> aiohttp.ClientSession:
+    """
+    Scraper uchun sozlangan TCPConnector bilan ClientSession yaratish.
+
+    Args:
+        config: Sayt konfiguratsiyasi (APP_CONFIG + SITE_CONFIG)
+
+    Returns:
+        aiohttp.ClientSession: Chaqiruvchi yopishi kerak (close)
+    """
+    config = config or {}
+    connector = aiohttp.TCPConnector(
+        limit=config.get("http_pool_limit", 100),
+        limit_per_host=config.get("http_limit_per_host", 10),
+        ttl_dns_cache=config.get("http_dns_cache_ttl", 300),
+        keepalive_timeout=config.get("http_keepalive_timeout", 30),
+        enable_cleanup_closed=True,
+    )
+    logger.debug(
+        f"🌐 HTTP pool: limit={connector.limit}, per_host={connector.limit_per_host}")
+    return aiohttp.ClientSession(connector=connector)
+
+
+@asynccontextmanager
+async def http_session(session: Optional[aiohttp.ClientSession] = None,
+                       config: Optional[dict] = None) -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    Berilgan session'ni ishlatish, bo'lmasa vaqtinchalik session ochish.
+
+    Fetch helperlar orchestrator'siz ham (eski chaqiruvlar) ishlashi uchun.
+    """
+    if session is not None:
+        yield session
+        return
+
+    temporary = create_http_session(config)
+    try:
+        yield temporary
+    finally:
+        await temporary.close()
@@ -0,0 +1,62 @@
+"""
+Event loop kechikishini (loop lag) o'lchash.
+
+Fon task har interval soniyada uxlaydi va qancha kech uyg'onganini yozib boradi:
+loop CPU ishi bilan band bo'lsa (HTML parse, regexlar) kechikish oshadi va shu
+vaqt davomida tarmoq javoblari ham qayta ishlanmay turadi.
+
+    async with LoopLagMonitor() as monitor:
+        await pipeline.run(pages)
+    logger.info(monitor.report())
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+
+class LoopLagMonitor:
+    """Event loop kechikishi statistikasi (ms): o'rtacha, p95, maksimal"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0.0))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def report(self) -> Dict:
+        """{"samples", "mean_ms", "p95_ms", "max_ms"}"""
+        if not self.samples:
+            return {"samples": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.samples)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        return {
+            "samples": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p95_ms": p95 * 1000,
+            "max_ms": ordered[-1] * 1000,
+        }
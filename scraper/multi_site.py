@@ -0,0 +1,152 @@
+"""
+Ko'p saytli scheduler - saytlarni parallel, host bo'yicha cheklov bilan scraping qilish.
+
+Eski batch_scrape_multiple_sites saytlarni ketma-ket (orasida 5 s tanaffus)
+ishlatar va har sayt o'z Playwright browserini ochardi. Saytlar turli hostlarda,
+shuning uchun ular bir-birini kutishi shart emas:
+
+    MultiSiteScheduler
+    ├── bitta Playwright browser   (har sayt o'z kontekstida)
+    ├── bitta pooled HTTP session  (limit_per_host - host bo'yicha ulanishlar)
+    ├── bitta HTML cache va parse process pool
+    └── sayt tasklari: max_sites tadan ko'p emas, bitta hostda max_per_host ta
+
+Host bo'yicha so'rov tezligini umumiy RateLimiter boshqaradi; bitta hostdagi
+configlar (masalan asilmedia bo'limlari) navbat bilan ishlaydi.
+
+    scheduler = MultiSiteScheduler(configs, BROWSER_CONFIG, page_selection="*")
+    results = await scheduler.run()
+    summary = get_scraping_summary(results, elapsed=scheduler.elapsed)
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from core.site_configs import SITE_CONFIGS
+from utils.logger_core import logger
+
+from .browser import cleanup_browser, launch_browser
+from .http_cache import HttpCache
+from .http_client import create_http_session
+from .parse_pool import create_parse_executor
+from .scraping import ScrapingOrchestrator
+
+
+def all_site_configs(app_config: Optional[dict] = None) -> List[dict]:
+    """SITE_CONFIGS dagi barcha saytlar uchun APP_CONFIG + SITE_CONFIG (name bilan)"""
+    if app_config is None:
+        from core.config import APP_CONFIG
+        app_config = APP_CONFIG
+    return [{**app_config, **site, "name": name} for name, site in SITE_CONFIGS.items()]
+
+
+def site_host(config: dict) -> str:
+    """Sayt hosti (base_url bo'yicha; bo'lmasa config nomi)"""
+    return (urlparse(config.get("base_url") or "").hostname or config.get("name") or "").lower()
+
+
+class MultiSiteScheduler:
+    """
+    Saytlarni umumiy browser va HTTP pool bilan parallel ishlatish.
+
+    Args:
+        sites_configs: Saytlar konfiguratsiyasi (APP_CONFIG + SITE_CONFIG, name bilan)
+        browser_config: Browser konfiguratsiyasi
+        max_sites: Bir vaqtda ishlaydigan saytlar (None - multi_site_concurrency)
+        max_per_host: Bitta hostda bir vaqtda ishlaydigan configlar (None - multi_site_per_host)
+        page_selection: Har sayt uchun sahifa tanlash - parallel ishda input() so'ralmaydi
+        incremental: Incremental crawl (None - har config o'zi)
+    """
+
+    def __init__(self, sites_configs: List[dict], browser_config: dict,
+                 max_sites: Optional[int] = None, max_per_host: Optional[int] = None,
+                 page_selection: str = "*", incremental: Optional[bool] = None):
+        self.sites = list(sites_configs)
+        self.browser_config = browser_config
+        base = self.sites[0] if self.sites else {}
+        self.max_sites = max(max_sites or base.get("multi_site_concurrency", 3), 1)
+        self.max_per_host = max(max_per_host or base.get("multi_site_per_host", 1), 1)
+        self.page_selection = page_selection
+        self.incremental = incremental
+        self.elapsed: Optional[float] = None
+
+        self._slots = asyncio.Semaphore(self.max_sites)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._pw = None
+        self._browser = None
+        self._http_session = None
+        self._http_cache: Optional[HttpCache] = None
+        self._parse_pool = None
+
+    async def _open_shared(self) -> None:
+        """Barcha saytlar uchun umumiy resurslar (birinchi config sozlamalari bilan)"""
+        base = self.sites[0]
+        self._http_session = create_http_session(base)
+        self._http_cache = HttpCache.from_config(base)
+        self._parse_pool = create_parse_executor(base)
+        try:
+            self._pw, self._browser, page = await launch_browser(self.browser_config, base)
+            # Asosiy sahifa kerak emas - har sayt o'z kontekstini ochadi
+            await page.context.close()
+        except Exception as e:
+            # Browser bo'lmasa ham aiohttp bilan ishlaydigan saytlar davom etadi
+            logger.error(f"❌ Umumiy browser ochilmadi: {e}")
+            self._pw, self._browser = None, None
+
+    async def _close_shared(self) -> None:
+        if self._http_session is not None:
+            await self._http_session.close()
+        if self._http_cache is not None:
+            await self._http_cache.flush_async()
+            self._http_cache.log_report()
+            await self._http_cache.aclose()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(cancel_futures=True)
+        if self._browser is not None:
+            await cleanup_browser(self._pw, self._browser)
+
+    async def _run_site(self, index: int, config: dict) -> Dict:
+        name = config.get("name", f"Site_{index}")
+        host = site_host(config)
+        host_slots = self._hosts.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with host_slots, self._slots:
+            logger.info(f"🌐 Sayt {index}/{len(self.sites)}: {name} ({host})")
+            start = time.monotonic()
+            try:
+                # Umumiy browser ochilmagan bo'lsa orchestrator o'zinikini ochishga urinadi
+                orchestrator = ScrapingOrchestrator(
+                    config, self.browser_config, incremental=self.incremental,
+                    page_selection=self.page_selection, browser=self._browser,
+                    http_session=self._http_session, http_cache=self._http_cache,
+                    parse_pool=self._parse_pool)
+                result = await orchestrator.run_scraping_process()
+                logger.info(f"✅ Sayt {index} yakunlandi: {name} - {result.get('status')}")
+            except Exception as e:
+                logger.error(f"❌ Sayt {index} da xato: {e}")
+                result = {"status": "error", "error": str(e)}
+            result["site_name"] = name
+            result["duration"] = round(time.monotonic() - start, 2)
+            return result
+
+    async def run(self) -> List[Dict]:
+        """
+        Barcha saytlarni ishga tushirish.
+
+        Returns:
+            List[Dict]: Har bir sayt natijasi (sites_configs tartibida, site_name va duration bilan)
+        """
+        if not self.sites:
+            return []
+        start = time.monotonic()
+        logger.info(
+            f"🚦 {len(self.sites)} ta sayt: bir vaqtda {self.max_sites} ta, "
+            f"har hostda {self.max_per_host} ta")
+        await self._open_shared()
+        try:
+            results = await asyncio.gather(
+                *(self._run_site(i, config) for i, config in enumerate(self.sites, 1)))
+        finally:
+            await self._close_shared()
+        self.elapsed = round(time.monotonic() - start, 2)
+        return list(results)
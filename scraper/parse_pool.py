@@ -0,0 +1,52 @@
+"""
+CPU-bound parsing uchun process pool - event loop'ni HTML parse va normallashdan bo'shatish.
+
+parse_page_fields + normalize_extracted_data (clean_title regexlari, transliteratsiya,
+kategoriyalar) event loop ichida bajarilsa, scrape_concurrency oshganda loop
+CPU bilan band bo'lib, tarmoq I/O kutib qoladi. parse_workers > 0 bo'lsa
+ScrapingOrchestrator ProcessPoolExecutor yaratadi va joriy context'ga o'rnatadi;
+scrape_file_page_safe HTML'ni (str) pool'ga yuboradi va tayyor dict oladi.
+
+    executor = create_parse_executor(config)
+    token = activate_parse_pool(executor)
+    ...
+    deactivate_parse_pool(token)
+    executor.shutdown()
+
+Pool'ga faqat oddiy tiplar boradi: fields (dict[str, str]), backend nomi, HTML va URL.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from utils.logger_core import logger
+
+_active_pool: ContextVar[Optional[ProcessPoolExecutor]] = ContextVar(
+    "scraper_parse_pool", default=None)
+
+
+def create_parse_executor(config: dict) -> Optional[ProcessPoolExecutor]:
+    """
+    config["parse_workers"] > 0 bo'lsa process pool yaratish.
+
+    Returns:
+        ProcessPoolExecutor | None: Chaqiruvchi shutdown qilishi kerak
+    """
+    workers = int(config.get("parse_workers", 0) or 0)
+    if workers <= 0:
+        return None
+    logger.info(f"🧮 Parse process pool: {workers} ta worker")
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def activate_parse_pool(executor: Optional[ProcessPoolExecutor]) -> Token:
+    """Pool'ni joriy context uchun o'rnatish (qaytgan token bilan reset qilinadi)"""
+    return _active_pool.set(executor)
+
+
+def deactivate_parse_pool(token: Token) -> None:
+    _active_pool.reset(token)
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    return _active_pool.get()
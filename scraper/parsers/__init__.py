@@ -3,11 +3,12 @@ Parsers moduli - HTML parsing va ma'lumot ajratish.
 """
 
 from .parse_file_page import scrape_file_page_safe, parse_page_fields
-from .parse_file_pages import collect_links, scrape_page_list_safe
+from .parse_file_pages import ListingFetchError, collect_links, scrape_page_list_safe
 
 __all__ = [
     'scrape_file_page_safe',
     'parse_page_fields', 
     'collect_links',
-    'scrape_page_list_safe'
+    'scrape_page_list_safe',
+    'ListingFetchError'
 ]
\ No newline at end of file
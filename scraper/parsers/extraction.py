@@ -0,0 +1,291 @@
+"""
+Film sahifasidan maydonlarni ajratish - kompilyatsiya qilingan extraction plan va HTML backendlar.
+
+Sayt config'idagi "fields" bir marta ExtractionPlan ga aylantiriladi: "|" bilan
+ajratilgan muqobil selectorlar, ::text / ::attr() qo'shimchalari va meta:Key
+havolalari oldindan ajratiladi, CSS selectorlar esa backend uchun kompilyatsiya
+qilinib plan ichida saqlanadi. Har sahifada faqat tayyor plan bajariladi.
+
+Backendlar (config["html_parser_backend"] / HTML_PARSER_BACKEND):
+- selectolax - Lexbor (C) parser, eng tez
+- lxml       - libxml2 parser, CSS selectorlar XPath'ga bir marta kompilyatsiya (cssselect)
+- bs4        - BeautifulSoup + html.parser (eski xatti-harakat, qo'shimcha paketsiz)
+- auto       - o'rnatilganlari ichidan selectolax → lxml → bs4
+
+Matn ajratish barcha backendlarda BeautifulSoup get_text(sep, strip=True) bilan
+bir xil: script/style/comment tashlanadi, har matn bo'lagi strip qilinadi,
+bo'shlari o'tkazib yuboriladi. Buzilgan HTML'da parserlar daraxtni turlicha
+tiklashi mumkin - bunday sayt uchun backend'ni bs4 ga qo'yish kifoya.
+"""
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from utils.logger_core import logger
+
+# To'liq URL ga aylantiriladigan maydonlar
+URL_FIELDS = ("image", "file_url", "file_picture")
+# Matni olinmaydigan teglar (BeautifulSoup get_text bilan bir xil)
+_SKIP_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+BACKENDS = ("selectolax", "lxml", "bs4")
+
+
+class Selector(NamedTuple):
+    css: str
+    attr: Optional[str]  # None - element matni
+
+
+class FieldRule(NamedTuple):
+    key: str
+    meta_key: Optional[str]            # "meta:Key" maydonlari uchun
+    alternatives: Tuple[Selector, ...]  # birinchi bo'sh bo'lmagan natija olinadi
+
+
+class ExtractionPlan(NamedTuple):
+    meta_css: Optional[str]
+    rules: Tuple[FieldRule, ...]
+    css: Tuple[str, ...]  # plan'dagi barcha noyob CSS selectorlar
+
+
+def _parse_selector(raw: str) -> Selector:
+    raw = raw.strip()
+    if "::text" in raw:
+        return Selector(raw.replace("::text", "").strip(), None)
+    if "::attr(" in raw:
+        css, attr = raw.split("::attr(", 1)
+        return Selector(css.strip(), attr.replace(")", "").strip())
+    return Selector(raw, None)
+
+
+@lru_cache(maxsize=64)
+def _compile_plan(fields: Tuple[Tuple[str, Optional[str]], ...]) -> ExtractionPlan:
+    meta_css = None
+    rules: List[FieldRule] = []
+    for key, sel in fields:
+        if not sel:
+            continue
+        if key == "meta":
+            meta_css = sel.replace("::text", "").strip()
+        elif sel.startswith("meta:"):
+            rules.append(FieldRule(key, sel.split("meta:")[1].strip(), ()))
+        else:
+            alternatives = tuple(_parse_selector(s) for s in sel.split("|"))
+            rules.append(FieldRule(key, None, alternatives))
+
+    css = []
+    for selector in ([meta_css] if meta_css else []) + [
+            s.css for rule in rules for s in rule.alternatives]:
+        if selector not in css:
+            css.append(selector)
+    return ExtractionPlan(meta_css, tuple(rules), tuple(css))
+
+
+def compile_plan(fields: Dict[str, Optional[str]]) -> ExtractionPlan:
+    """Sayt config'idagi fields'ni plan'ga aylantirish (bir xil fields uchun cache'dan)"""
+    return _compile_plan(tuple(fields.items()))
+
+
+class Bs4Backend:
+    """BeautifulSoup + html.parser; selectorlar soupsieve bilan oldindan kompilyatsiya"""
+
+    name = "bs4"
+
+    def __init__(self):
+        import soupsieve
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+        self._compile = soupsieve.compile
+
+    def compile(self, css: str):
+        return self._compile(css)
+
+    def parse(self, html: str):
+        return self._soup(html, "html.parser")
+
+    @staticmethod
+    def select_one(doc, compiled):
+        return compiled.select_one(doc)
+
+    @staticmethod
+    def text(node, separator: str) -> str:
+        return node.get_text(separator, strip=True)
+
+    @staticmethod
+    def attr(node, name: str):
+        return node.get(name)
+
+
+class LxmlBackend:
+    """lxml.html; CSS -> XPath bir marta kompilyatsiya (cssselect)"""
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        from lxml.cssselect import CSSSelector
+        self._parse = lxml.html.document_fromstring
+        self._selector = CSSSelector
+        self._texts = etree.XPath(
+            ".//text()[not(parent::script or parent::style or parent::template)]")
+
+    def compile(self, css: str):
+        return self._selector(css, translator="html")
+
+    def parse(self, html: str):
+        return self._parse(html)
+
+    @staticmethod
+    def select_one(doc, compiled):
+        found = compiled(doc)
+        return found[0] if found else None
+
+    def text(self, node, separator: str) -> str:
+        return separator.join(
+            part for part in (s.strip() for s in self._texts(node)) if part)
+
+    @staticmethod
+    def attr(node, name: str):
+        return node.get(name)
+
+
+class SelectolaxBackend:
+    """selectolax (Lexbor) - CSS selectorlar C tomonida bajariladi"""
+
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    @staticmethod
+    def compile(css: str):
+        return css
+
+    def parse(self, html: str):
+        return self._parser(html)
+
+    @staticmethod
+    def select_one(doc, compiled):
+        return doc.css_first(compiled)
+
+    @staticmethod
+    def text(node, separator: str) -> str:
+        parts = []
+        for child in node.traverse(include_text=True, skip_empty=True):
+            if child.is_text_node and child.parent.tag not in _SKIP_TEXT_TAGS:
+                part = child.text_content.strip()
+                if part:
+                    parts.append(part)
+        return separator.join(parts)
+
+    @staticmethod
+    def attr(node, name: str):
+        return node.attributes.get(name)
+
+
+_BACKEND_CLASSES = {
+    "selectolax": SelectolaxBackend,
+    "lxml": LxmlBackend,
+    "bs4": Bs4Backend,
+}
+_backends: Dict[str, object] = {}
+# (plan, backend) -> {css: compiled}
+_compiled: Dict[Tuple[ExtractionPlan, str], Dict[str, object]] = {}
+
+
+def _load_backend(name: str):
+    if name not in _backends:
+        _backends[name] = _BACKEND_CLASSES[name]()
+    return _backends[name]
+
+
+@lru_cache(maxsize=8)
+def get_backend(name: Optional[str] = None):
+    """
+    Nomi bo'yicha HTML backend (o'rnatilmagan bo'lsa keyingi mavjudi).
+
+    Args:
+        name: "auto" | "selectolax" | "lxml" | "bs4" (None - auto)
+    """
+    name = (name or "auto").lower()
+    if name != "auto" and name not in _BACKEND_CLASSES:
+        logger.warning(f"⚠️ Noma'lum HTML backend: {name}, auto ishlatiladi")
+        name = "auto"
+    candidates = list(BACKENDS) if name == "auto" else [name, "bs4"]
+
+    for candidate in candidates:
+        try:
+            backend = _load_backend(candidate)
+        except ImportError as e:
+            if candidate == name:
+                logger.warning(f"⚠️ {candidate} o'rnatilmagan ({e}), zaxira backend ishlatiladi")
+            continue
+        logger.debug(f"🧩 HTML backend: {backend.name}")
+        return backend
+    raise ImportError("Hech bir HTML backend mavjud emas (beautifulsoup4 o'rnating)")
+
+
+def _compiled_selectors(plan: ExtractionPlan, backend) -> Dict[str, object]:
+    key = (plan, backend.name)
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = _compiled[key] = {css: backend.compile(css) for css in plan.css}
+    return compiled
+
+
+def extract_fields(plan: ExtractionPlan, backend, html: str, base_url: str,
+                   item: Optional[dict] = None) -> dict:
+    """
+    Plan bo'yicha HTML'dan maydonlarni ajratish.
+
+    Args:
+        plan: compile_plan() natijasi
+        backend: get_backend() natijasi
+        html: Sahifa HTML
+        base_url: Sahifa URL (nisbiy linklar uchun)
+        item: To'ldiriladigan dict (None bo'lsa yangi)
+
+    Returns:
+        dict: Ajratilgan maydonlar
+    """
+    item = {} if item is None else item
+    doc = backend.parse(html)
+    compiled = _compiled_selectors(plan, backend)
+    base_domain = None
+
+    # 🧾 meta blokdan "Kalit: qiymat" qatorlari
+    meta_data = {}
+    if plan.meta_css:
+        el = backend.select_one(doc, compiled[plan.meta_css])
+        if el is not None:
+            for line in backend.text(el, "\n").split("\n"):
+                parts = line.split(":", 1)
+                if len(parts) == 2:
+                    meta_data[parts[0].strip()] = parts[1].strip()
+
+    for rule in plan.rules:
+        if rule.meta_key is not None:
+            item[rule.key] = meta_data.get(rule.meta_key)
+            continue
+
+        value = None
+        for selector in rule.alternatives:
+            el = backend.select_one(doc, compiled[selector.css])
+            if el is not None:
+                if selector.attr is None:
+                    value = backend.text(el, " ")
+                else:
+                    value = backend.attr(el, selector.attr)
+            if value:
+                break
+
+        # URL larni to'liq URLga aylantirish
+        if value and rule.key in URL_FIELDS and not value.startswith("http"):
+            if base_domain is None:
+                base_domain = "{uri.scheme}://{uri.netloc}".format(uri=urlparse(base_url))
+            value = urljoin(base_domain, value)
+
+        item[rule.key] = value
+    return item
@@ -7,39 +7,48 @@ Bu modul bitta film sahifasidan barcha kerakli ma'lumotlarni ajratib oladi:
 - Tavsif va boshqa meta-ma'lumotlar
 """
 import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
 import aiohttp
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 
 from core.config import FILE_MIN_SIZE, MAX_SIZE_BYTES
 from utils.files import get_file_size, get_small_url
-from utils.helpers import normalize_item_categories, normalize_category
+from utils.helpers import normalize_categories, normalize_item_categories
 from utils.logger_core import logger
+from utils.url_meta import get_url_meta_cache
 from utils.text import (
     normalize_description,
     normalize_item_fields,
     normalize_item_title,
 )
+from ..browser import browser_page, goto_page
+from ..http_cache import fetch_text
+from ..http_client import http_session
+from ..parse_pool import get_parse_pool
+from .extraction import compile_plan, extract_fields, get_backend
 
 
-async def fetch_page_html(url: str, timeout: int = 20) -> str | None:
+async def fetch_page_html(url: str, timeout: int = 20,
+                          session: Optional[aiohttp.ClientSession] = None) -> str | None:
     """
     Aiohttp orqali sahifani olish.
 
     Args:
         url: Yuklab olinadigan URL
         timeout: Timeout sekundlarda
+        session: Umumiy pooled session (None bo'lsa vaqtinchalik ochiladi)
 
     Returns:
         str | None: HTML matn yoki None
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=timeout) as resp:
-                if resp.status == 200:
-                    return await resp.text()
-                logger.warning(f"⚠️ HTTP status {resp.status}: {url}")
-                return None
+        async with http_session(session) as client:
+            status, html = await fetch_text(client, url, timeout)
+            if status == 200:
+                return html
+            logger.warning(f"⚠️ HTTP status {status}: {url}")
+            return None
     except asyncio.TimeoutError:
         logger.warning(f"⚠️ Timeout: {url}")
         return None
@@ -48,32 +57,44 @@ async def fetch_page_html(url: str, timeout: int = 20) -> str | None:
         return None
 
 
-async def fetch_page_with_browser(browser, url: str) -> str | None:
+async def fetch_page_with_browser(browser, url: str, config: Optional[dict] = None) -> str | None:
     """
     Playwright orqali sahifani ochib HTML qaytaradi.
 
+    Faol BrowserPagePool bo'lsa tayyor sahifa undan olinadi.
+
     Args:
         browser: Browser instance
         url: Yuklab olinadigan URL
+        config: Sayt konfiguratsiyasi (navigatsiya va bloklash sozlamalari)
 
     Returns:
         str | None: HTML matn yoki None
     """
-    context = await browser.new_context()
-    page = await context.new_page()
     try:
-        await page.goto(url, timeout=30000)
-        html = await page.content()
-        return html
+        async with browser_page(browser, config) as page:
+            await goto_page(page, url, config)
+            return await page.content()
     except Exception as e:
         logger.warning(f"❌ Browser orqali ochilmadi: {url} | {e}")
         return None
-    finally:
-        await page.close()
-        await context.close()
 
 
 def parse_page_fields(config: dict, html: str, base_url: str) -> dict:
+    """
+    Film sahifasidan config["fields"] bo'yicha maydonlarni ajratish.
+
+    fields bir marta ExtractionPlan ga kompilyatsiya qilinadi (extraction.py),
+    HTML config["html_parser_backend"] bo'yicha tanlangan backend bilan o'qiladi.
+
+    Args:
+        config: Sayt konfiguratsiyasi
+        html: Sahifa HTML
+        base_url: Sahifa URL
+
+    Returns:
+        dict: Ajratilgan maydonlar
+    """
     item = {
         "file_page": base_url,
         "title": None,
@@ -83,79 +104,19 @@ def parse_page_fields(config: dict, html: str, base_url: str) -> dict:
         "file_url": None,
         "image": None,
     }
-
-    soup = BeautifulSoup(html, "html.parser")
-    base_domain = "{uri.scheme}://{uri.netloc}".format(uri=urlparse(base_url))
-
-    # 🧾 Avval meta matnni oldindan ajratamiz
-    meta_text = None
-    if config["fields"].get("meta"):
-        sel = config["fields"]["meta"].replace("::text", "").strip()
-        el = soup.select_one(sel)
-        if el:
-            # Faqat ichki textni olish, HTML taglarni olib tashlash
-            meta_text = el.get_text("\n", strip=True)
-
-    # 🔹 meta_textni key-value dictionaryga ajratamiz
-    meta_data = {}
-    if meta_text:
-        # Har bir qatorni parse qilamiz
-        for line in meta_text.split("\n"):
-            # Masalan: "Mamlakat: AQSh, Xorvatiya"
-            parts = line.split(":", 1)
-            if len(parts) == 2:
-                key = parts[0].strip()
-                val = parts[1].strip()
-                meta_data[key] = val
-
-    # 🧠 Endi boshqa fieldlarni qayta ishlaymiz
-    for key, sel in config["fields"].items():
-        if not sel or key == "meta":
-            continue
-
-        # Agar meta:Key ko‘rinishida bo‘lsa
-        if sel.startswith("meta:"):
-            meta_key = sel.split("meta:")[1].strip()
-            value = meta_data.get(meta_key)
-        else:
-            # Standart selector ishlaydi
-            selectors = [s.strip() for s in sel.split("|")]
-            value = None
-            for s in selectors:
-                if "::text" in s:
-                    el = soup.select_one(s.replace("::text", "").strip())
-                    if el:
-                        # Faqat ichki textni olish, HTML taglarni olib tashlash, bo'shliqlarni saqlash
-                        value = el.get_text(" ", strip=True)
-                elif "::attr(" in s:
-                    q = s.split("::attr(")[0].strip()
-                    attr = s.split("::attr(")[1].replace(")", "").strip()
-                    el = soup.select_one(q)
-                    if el:
-                        value = el.get(attr)
-                else:
-                    el = soup.select_one(s)
-                    if el:
-                        # Faqat ichki textni olish, HTML taglarni olib tashlash, bo'shliqlarni saqlash
-                        value = el.get_text(" ", strip=True)
-                if value:
-                    break
-
-            # URL larni to‘liq URLga aylantirish
-            if value and key in ["image", "file_url", "file_picture"]:
-                if not value.startswith("http"):
-                    value = urljoin(base_domain, value)
-
-        item[key] = value
-    return item
+    plan = compile_plan(config["fields"])
+    backend = get_backend(config.get("html_parser_backend"))
+    return extract_fields(plan, backend, html, base_url, item)
 
 
-async def validate_and_optimize_file(item: dict) -> dict:
+async def validate_and_optimize_file(item: dict,
+                                     session: Optional[aiohttp.ClientSession] = None) -> dict:
     """
     Fayl hajmini tekshiradi, kerak bo'lsa kichikroq variantni topadi.
 
     Args:
         item: Film ma'lumotlari
+        session: Umumiy pooled session (None bo'lsa vaqtinchalik ochiladi)
 
     Returns:
         dict: Optimallashtirilgan ma'lumotlar
@@ -165,7 +126,7 @@ async def validate_and_optimize_file(item: dict) -> dict:
         return item
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with http_session(session) as session:
             size = await get_file_size(session, item["file_url"])
             item["file_size"] = size  # Fayl hajmini saqlash
 
@@ -184,13 +145,17 @@ async def validate_and_optimize_file(item: dict) -> dict:
             # Agar fayl katta bo'lsa, kichikroq variantni izlaymiz
             if size > MAX_SIZE_BYTES:
                 # logger.warning("🔍 Kichikroq variant izlanmoqda...")
-
-                for attempt, quality in enumerate(["1080p", "720p", "480p"], start=1):
+                variants = {}
+                # get_small_url: 1-urinish 720p, 2-urinish 480p (3-urinish 2-sining takrori edi)
+                for attempt, quality in enumerate(["720p", "480p"], start=1):
                     small_url = await get_small_url(item["file_page"], attempt)
-                    if not small_url:
-                        continue
+                    if small_url:
+                        variants.setdefault(small_url, quality)
 
-                    new_size = await get_file_size(session, small_url)
+                # Variantlar parallel tekshiriladi, tanlov esa sifat tartibida
+                metas = await get_url_meta_cache().get_many(session, list(variants))
+                for small_url, quality in variants.items():
+                    new_size = metas[small_url]["size"]
                     if new_size > FILE_MIN_SIZE:
                         logger.info(
                             f"🔁 {quality} variant hajmi: {new_size / (1024**3):.2f} GB")
@@ -230,14 +195,8 @@ def clean_and_normalize_categories(raw_categories: str) -> str:
 
     try:
         # Kategoriyalarni ajratish
-        cats = raw_categories.split(",")
-        mapped = set()
-
-        for raw in cats:
-            raw = raw.strip()
-            if raw:
-                normalized = normalize_category(raw)
-                mapped.add(normalized)
+        cats = [raw.strip() for raw in raw_categories.split(",") if raw.strip()]
+        mapped = set(normalize_categories(cats))
 
         # Agar hech qanday kategoriya topilmasa
         if not mapped:
@@ -261,6 +220,11 @@ async def normalize_extracted_data(item: dict) -> dict:
     Returns:
         dict: Normallashtirilgan ma'lumotlar
     """
+    return normalize_item(item)
+
+
+def normalize_item(item: dict) -> dict:
+    """normalize_extracted_data ning sinxron tanasi (process pool'da ham ishlaydi)"""
     try:
         # Title ni normallash
         item = normalize_item_title(item)
@@ -292,7 +256,41 @@ async def normalize_extracted_data(item: dict) -> dict:
         return item
 
 
-async def scrape_file_page_safe(config: dict, browser, file_url: str) -> dict:
+def parse_and_normalize(fields: dict, backend: Optional[str], html: str, file_url: str) -> dict:
+    """
+    parse_page_fields + normallash - process pool worker'ida bajariladigan qism.
+
+    Argumentlar va natija oddiy tiplardan iborat (pickle qilinadi).
+
+    Args:
+        fields: config["fields"]
+        backend: config["html_parser_backend"]
+        html: Sahifa HTML
+        file_url: Film sahifa URL
+
+    Returns:
+        dict: Ajratilgan va normallashtirilgan ma'lumotlar
+    """
+    item = parse_page_fields({"fields": fields, "html_parser_backend": backend}, html, file_url)
+    return normalize_item(item)
+
+
+async def _parse_in_pool(config: dict, html: str, file_url: str) -> Optional[dict]:
+    """Faol process pool bo'lsa parse + normallashni unga yuborish (bo'lmasa None)"""
+    executor = get_parse_pool()
+    if executor is None:
+        return None
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, parse_and_normalize,
+            config["fields"], config.get("html_parser_backend"), html, file_url)
+    except BrokenProcessPool as e:
+        logger.error(f"❌ Parse pool ishdan chiqdi, event loop'da davom etiladi: {e}")
+        return None
+
+
+async def scrape_file_page_safe(config: dict, browser, file_url: str,
+                                session: Optional[aiohttp.ClientSession] = None) -> dict:
     """
     Sahifani yuklab, ma'lumotlarni ajratadi (aiohttp → browser fallback).
 
@@ -300,31 +298,32 @@ async def scrape_file_page_safe(config: dict, browser, file_url: str) -> dict:
         config: Sayt konfiguratsiyasi
         browser: Browser instance
         file_url: Film sahifa URL
+        session: Umumiy pooled session (sahifa va hajm tekshiruvi uchun)
 
     Returns:
         dict: Ajratilgan va normallashtirilgan ma'lumotlar
     """
     try:
         # Birinchi aiohttp orqali urinish
-        html = await fetch_page_html(file_url)
+        html = await fetch_page_html(file_url, session=session)
 
         # Agar aiohttp bilan yuklanmasa, browser ishlatish
         if not html:
-            html = await fetch_page_with_browser(browser, file_url)
+            html = await fetch_page_with_browser(browser, file_url, config)
 
         # Agar hali ham HTML topilmasa
         if not html:
             logger.error(f"❌ HTML yuklab olinmadi: {file_url}")
-            return {"file_page": file_url, "file_url": None}
-
-        # HTML dan ma'lumotlarni ajratish
-        item = parse_page_fields(config, html, file_url)
+            return {"file_page": file_url, "file_url": None, "error": "HTML yuklab olinmadi"}
 
-        # Ma'lumotlarni normallash
-        item = await normalize_extracted_data(item)
+        # HTML dan ma'lumotlarni ajratish va normallash (parse_workers > 0 - process pool'da)
+        item = await _parse_in_pool(config, html, file_url)
+        if item is None:
+            item = parse_page_fields(config, html, file_url)
+            item = await normalize_extracted_data(item)
 
         # Fayl hajmini tekshirish va optimallash
-        item = await validate_and_optimize_file(item)
+        item = await validate_and_optimize_file(item, session=session)
 
         return item
 
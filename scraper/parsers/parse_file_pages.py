@@ -5,38 +5,73 @@ Bu modul listing sahifalar (pagination) bilan ishlaydi:
 - Sahifa linklarini to'plash
 - Har bir sahifadan film linklarini ajratish
 - Pagination bilan ishlash
+
+Sahifa o'qilmasa (HTTP xato, timeout, browser xatosi) scrape_page_list_safe
+ListingFetchError ko'taradi - bo'sh ro'yxat faqat haqiqatan kartasiz sahifa
+uchun qaytadi, shuning uchun hisobotlarda "failed" va "empty" ajralib turadi.
 """
 import asyncio
-import aiohttp
 import re
+from typing import Optional
+
+import aiohttp
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
 from utils.logger_core import logger
+from ..browser import browser_page, goto_page
+from ..http_cache import fetch_text
+from ..http_client import http_session
+
 
+class ListingFetchError(Exception):
+    """Listing sahifa yuklanmadi yoki tahlil qilinmadi"""
 
-async def fetch_page_html_safe(url: str, timeout: int = 20) -> str | None:
+
+async def fetch_listing_html(url: str, timeout: int = 20,
+                             session: Optional[aiohttp.ClientSession] = None) -> str:
     """
-    Xavfsiz ravishda HTML yuklab olish.
+    Listing sahifa HTML'ini yuklab olish.
 
     Args:
         url: Yuklab olinadigan URL
         timeout: Timeout sekundlarda
+        session: Umumiy pooled session (None bo'lsa vaqtinchalik ochiladi)
 
     Returns:
-        str | None: HTML matn yoki None
+        str: HTML matn
+
+    Raises:
+        ListingFetchError: HTTP status 200 emas, timeout yoki ulanish xatosi
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=timeout) as resp:
-                if resp.status == 200:
-                    return await resp.text()
-                logger.warning(f"⚠️ HTTP {resp.status}: {url}")
-                return None
+        async with http_session(session) as client:
+            status, html = await fetch_text(client, url, timeout)
     except asyncio.TimeoutError:
-        logger.warning(f"⚠️ Timeout: {url}")
-        return None
+        raise ListingFetchError(f"Timeout ({timeout}s)") from None
     except Exception as e:
+        raise ListingFetchError(str(e) or type(e).__name__) from e
+    if status != 200:
+        raise ListingFetchError(f"HTTP {status}")
+    return html
+
+
+async def fetch_page_html_safe(url: str, timeout: int = 20,
+                               session: Optional[aiohttp.ClientSession] = None) -> str | None:
+    """
+    Xavfsiz ravishda HTML yuklab olish.
+
+    Args:
+        url: Yuklab olinadigan URL
+        timeout: Timeout sekundlarda
+        session: Umumiy pooled session (None bo'lsa vaqtinchalik ochiladi)
+
+    Returns:
+        str | None: HTML matn yoki None
+    """
+    try:
+        return await fetch_listing_html(url, timeout, session=session)
+    except ListingFetchError as e:
         logger.warning(f"⚠️ HTML yuklanmadi: {url} | {e}")
         return None
 
@@ -53,7 +88,7 @@ async def get_last_page_number(config: dict, page) -> int:
         int: Oxirgi sahifa raqami
     """
     try:
-        await page.goto(config["base_url"], timeout=30000)
+        await goto_page(page, config["base_url"], config)
 
         # Agar configda aniq sahifa soni berilgan bo'lsa
         if (isinstance(config.get("pagination_pages"), int)
@@ -82,13 +117,16 @@ async def get_last_page_number(config: dict, page) -> int:
         return 1
 
 
-async def collect_links(config: dict, page) -> list[str]:
+async def collect_links(config: dict, page, incremental: bool = False) -> list[str]:
     """
     Pagination linklarini yig'ish.
 
     Args:
         config: Sayt konfiguratsiyasi
         page: Browser page instance
+        incremental: Eng yangi sahifalar birinchi bo'lishi kerak (incremental crawl).
+            Odatda 1-sahifa eng yangisi; config["pagination_oldest_first"] bo'lsa
+            tartib teskari qilinadi
 
     Returns:
         list[str]: Sahifa URLlari ro'yxati
@@ -104,6 +142,9 @@ async def collect_links(config: dict, page) -> list[str]:
                 link = config["pagination_link"].format(page=page_num)
                 links.append(link)
 
+        if incremental and config.get("pagination_oldest_first"):
+            links.reverse()
+
         logger.info(f"🔗 Yaratilgan sahifa linklari: {len(links)}")
         return links
 
@@ -124,51 +165,48 @@ async def parse_page_links_from_html(config: dict, html: str, base_url: str) ->
     Returns:
         list[dict]: Film linklari ro'yxati
     """
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-        base_domain = "{uri.scheme}://{uri.netloc}".format(
-            uri=urlparse(base_url))
+    soup = BeautifulSoup(html, "html.parser")
+    base_domain = "{uri.scheme}://{uri.netloc}".format(
+        uri=urlparse(base_url))
 
-        cards = soup.select(config["card_selector"])
-        items = []
+    cards = soup.select(config["card_selector"])
+    items = []
 
-        for card in cards:
-            link_el = card.select_one("a")
-            if not link_el:
-                continue
+    for card in cards:
+        link_el = card.select_one("a")
+        if not link_el:
+            continue
 
-            href = link_el.get("href")
-            if not href:
-                continue
+        href = link_el.get("href")
+        if not href:
+            continue
 
-            # Relative URLni absolute ga aylantirish
-            if not href.startswith("http"):
-                href = urljoin(base_domain, href)
+        # Relative URLni absolute ga aylantirish
+        if not href.startswith("http"):
+            href = urljoin(base_domain, href)
 
-            items.append({"file_page": href})
+        items.append({"file_page": href})
 
-        return items
+    return items
 
-    except Exception as e:
-        logger.error(f"❌ HTML dan linklar ajratishda xato: {e}")
-        return []
 
-
-async def scrape_page_list_with_aiohttp(config: dict, url: str) -> list[dict]:
+async def scrape_page_list_with_aiohttp(config: dict, url: str,
+                                       session: Optional[aiohttp.ClientSession] = None) -> list[dict]:
     """
     Aiohttp orqali listing sahifasini tahlil qilish.
 
     Args:
         config: Sayt konfiguratsiyasi
         url: Sahifa URL
+        session: Umumiy pooled session
 
     Returns:
         list[dict]: Film linklari
-    """
-    html = await fetch_page_html_safe(url)
-    if not html:
-        return []
 
+    Raises:
+        ListingFetchError: Sahifa yuklanmadi
+    """
+    html = await fetch_listing_html(url, session=session)
     return await parse_page_links_from_html(config, html, url)
 
 
@@ -182,37 +220,33 @@ async def scrape_page_list_with_browser(config: dict, page, url: str) -> list[di
         url: Sahifa URL
 
     Returns:
-        list[dict]: Film linklari
+        list[dict]: Film linklari (navigatsiya xatolari chaqiruvchiga o'tadi)
     """
-    try:
-        await page.goto(url, timeout=30000)
-        cards = await page.query_selector_all(config["card_selector"])
-        items = []
-
-        for card in cards:
-            link_el = await card.query_selector("a")
-            if not link_el:
-                continue
+    await goto_page(page, url, config, wait_selector=config["card_selector"])
+    cards = await page.query_selector_all(config["card_selector"])
+    items = []
 
-            file_page = await link_el.get_attribute("href")
-            if not file_page:
-                continue
+    for card in cards:
+        link_el = await card.query_selector("a")
+        if not link_el:
+            continue
 
-            # Relative URLni absolute ga aylantirish
-            if not file_page.startswith("http"):
-                base_domain = f"{page.url.split('/')[0]}//{page.url.split('/')[2]}"
-                file_page = urljoin(base_domain, file_page)
+        file_page = await link_el.get_attribute("href")
+        if not file_page:
+            continue
 
-            items.append({"file_page": file_page})
+        # Relative URLni absolute ga aylantirish
+        if not file_page.startswith("http"):
+            base_domain = f"{page.url.split('/')[0]}//{page.url.split('/')[2]}"
+            file_page = urljoin(base_domain, file_page)
 
-        return items
+        items.append({"file_page": file_page})
 
-    except Exception as e:
-        logger.error(f"❌ Browser orqali sahifa tahlilida xato: {url} | {e}")
-        return []
+    return items
 
 
-async def scrape_page_list_safe(config: dict, browser, url: str) -> list[dict]:
+async def scrape_page_list_safe(config: dict, browser, url: str,
+                                session: Optional[aiohttp.ClientSession] = None) -> list[dict]:
     """
     Xavfsiz ravishda listing sahifasini tahlil qilish (aiohttp → browser fallback).
 
@@ -220,105 +254,34 @@ async def scrape_page_list_safe(config: dict, browser, url: str) -> list[dict]:
         config: Sayt konfiguratsiyasi
         browser: Browser instance (fallback uchun)
         url: Sahifa URL
+        session: Umumiy pooled session
 
     Returns:
-        list[dict]: Film linklari
+        list[dict]: Film linklari (sahifa o'qildi, lekin karta yo'q bo'lsa - bo'sh)
+
+    Raises:
+        ListingFetchError: Sahifa na aiohttp, na browser orqali o'qilmadi
     """
+    errors = []
+    # Birinchi aiohttp orqali urinish
     try:
-        # Birinchi aiohttp orqali urinish
-        items = await scrape_page_list_with_aiohttp(config, url)
-
+        items = await scrape_page_list_with_aiohttp(config, url, session=session)
         if items:
             logger.debug(
                 f"✅ Aiohttp orqali {len(items)} ta link topildi: {url}")
             return items
+    except Exception as e:
+        errors.append(f"aiohttp: {e}")
 
-        # Agar aiohttp bilan natija bo'lmasa, browser ishlatish
-        logger.info(f"🔄 Browser fallback: {url}")
-        context = await browser.new_context()
-        page = await context.new_page()
-
-        try:
+    # Agar aiohttp bilan natija bo'lmasa, browser ishlatish
+    logger.info(f"🔄 Browser fallback: {url}")
+    try:
+        async with browser_page(browser, config) as page:
             items = await scrape_page_list_with_browser(config, page, url)
-            logger.debug(
-                f"✅ Browser orqali {len(items)} ta link topildi: {url}")
-            return items
-        finally:
-            await page.close()
-            await context.close()
-
     except Exception as e:
-        logger.error(f"❌ Sahifa tahlilida xato: {url} | {e}")
-        return []
-
-
-async def collect_all_film_links(config: dict, browser, page_urls: list[str]) -> list[dict]:
-    """
-    Barcha listing sahifalardan film linklarini yig'ish.
-
-    Args:
-        config: Sayt konfiguratsiyasi
-        browser: Browser instance
-        page_urls: Listing sahifa URLlari
-
-    Returns:
-        list[dict]: Barcha film linklari
-    """
-    all_links = []
-
-    for url in page_urls:
-        try:
-            links = await scrape_page_list_safe(config, browser, url)
-            all_links.extend(links)
-            logger.info(f"📄 {url} dan {len(links)} ta link topildi")
-        except Exception as e:
-            logger.error(f"❌ Sahifani o'qishda xato: {url} | {e}")
-
-    logger.info(f"📊 Jami topilgan film linklari: {len(all_links)}")
-    return all_links
-
-
-async def batch_collect_links(config: dict, browser, page_urls: list[str],
-                              batch_size: int = 5) -> list[dict]:
-    """
-    Listing sahifalarni batch'larda parallel tahlil qilish.
-
-    Args:
-        config: Sayt konfiguratsiyasi
-        browser: Browser instance
-        page_urls: Sahifa URLlari
-        batch_size: Parallel tahlil uchun batch hajmi
-
-    Returns:
-        list[dict]: Barcha film linklari
-    """
-    all_links = []
-
-    for i in range(0, len(page_urls), batch_size):
-        batch = page_urls[i:i + batch_size]
-        logger.info(f"📦 Batch {i//batch_size + 1}: {len(batch)} sahifa")
-
-        # Batch ichidagi sahifalarni parallel tahlil qilish
-        tasks = [
-            scrape_page_list_safe(config, browser, url)
-            for url in batch
-        ]
-
-        try:
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    logger.error(
-                        f"❌ Batch sahifada xato: {batch[j]} | {result}")
-                elif isinstance(result, list):
-                    all_links.extend(result)
-
-        except Exception as e:
-            logger.error(f"❌ Batch tahlilida xato: {e}")
-
-        # Batch orasida kichik tanaffus
-        await asyncio.sleep(1)
+        errors.append(f"browser: {e}")
+        raise ListingFetchError("; ".join(errors)) from e
 
-    logger.info(f"📊 Batch jarayoni yakunlandi: {len(all_links)} ta link")
-    return all_links
+    logger.debug(
+        f"✅ Browser orqali {len(items)} ta link topildi: {url}")
+    return items
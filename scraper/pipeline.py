@@ -0,0 +1,314 @@
+"""
+Streaming scrape pipeline - listing → dedupe → detail → DB yozish, bosqichlar orasida to'siqsiz.
+
+Eski oqimda avval barcha listing linklari, keyin filtr, keyin barcha detail
+sahifalar bitta ro'yxatga yig'ilib, oxirida DB ga yozilardi: xato bo'lsa hammasi
+yo'qolar, xotira sayt hajmi bilan o'sardi. Bu yerda har bir bosqich alohida
+workerlar va chegaralangan asyncio.Queue orqali ulangan:
+
+    listing workerlar ──(yangi file_page)──▶ detail_queue ──▶ detail workerlar
+                                                                   │
+                               DB writer ◀── write_queue ◀─────────┘
+
+- Listing worker har sahifadan keyin linklarni bitta existing_pages so'rovi bilan
+  tekshiradi - DB da bor sahifalar darhol tashlab yuboriladi
+- Navbatlar to'lsa oldingi bosqich kutadi (backpressure) - xotira cheklangan
+- Writer kichik partiyalarda (yoki vaqt bo'yicha) insert_files qiladi -
+  to'xtatilsa ham yozilgan partiyalar saqlanib qoladi
+- Incremental rejim (stop_after_known=K): sahifalar eng yangisidan boshlab
+  o'qiladi, barcha linklari ma'lum K ta ketma-ket sahifadan keyin listing to'xtaydi
+- CrawlFrontier berilsa har URL holati (queued/in_flight/done/failed) DB da
+  yuritiladi va run(resume_items=...) to'xtagan crawl'ning detail'larini davom ettiradi;
+  run(retry_pages=...) oldingi crawl'ning xato listing sahifalarini tanlovdan oldin o'qiydi
+"""
+import asyncio
+import itertools
+from typing import Dict, List, Optional
+
+import aiohttp
+from tqdm import tqdm
+
+from core.async_db import AsyncFileDB
+from utils.logger_core import logger
+from .frontier import CrawlFrontier
+from .parsers.parse_file_page import scrape_file_page_safe
+from .parsers.parse_file_pages import scrape_page_list_safe
+
+# Navbat belgilari
+_STOP = object()
+
+
+class ScrapePipeline:
+    """Listing, detail va DB yozish bosqichlarini parallel ishlatuvchi pipeline"""
+
+    def __init__(self, config: dict, browser, db: AsyncFileDB,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 stop_after_known: int = 0,
+                 frontier: Optional[CrawlFrontier] = None):
+        """
+        Args:
+            config: Sayt konfiguratsiyasi (APP_CONFIG + SITE_CONFIG)
+            browser: Browser instance (aiohttp ishlamasa fallback)
+            db: AsyncFileDB - DB so'rovlari event loop'ni bloklamaydi
+            session: Umumiy pooled HTTP session
+            stop_after_known: K > 0 bo'lsa K ta ketma-ket to'liq ma'lum sahifadan
+                keyin yangi listing sahifalar olinmaydi (incremental crawl)
+            frontier: URL holatlarini saqlash (to'xtagan crawl'ni davom ettirish uchun)
+        """
+        self.config = config
+        self.browser = browser
+        self.db = db
+        self.session = session
+        self.stop_after_known = max(stop_after_known, 0)
+        self.frontier = frontier
+
+        self.concurrency = max(config.get("scrape_concurrency", 5), 1)
+        self.queue_size = max(config.get("scrape_queue_size", 100), 1)
+        self.write_batch = max(config.get("scrape_write_batch", 50), 1)
+        self.flush_interval = max(config.get("scrape_flush_interval", 5.0), 0.1)
+
+        self.detail_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        # walked - haqiqatda o'qilgan sahifalar, first_link - high-water mark uchun
+        self.listing_report: Dict = {"pages": 0, "walked": 0, "ok": 0, "empty": [],
+                                     "failed": {}, "stopped_at": None, "first_link": None}
+        self.stats = {
+            "found": 0,        # Listing sahifalardagi barcha linklar
+            "skipped": 0,      # DB da mavjud
+            "duplicates": 0,   # Shu ishga tushirishda takrorlangan
+            "processed": 0,    # Detail sahifasi o'qilganlar
+            "successful": 0,   # file_url topilganlar
+            "inserted": 0,
+            "write_errors": 0,
+            "batches": 0,
+            "resumed": 0,      # Oldingi crawl'dan davom ettirilgan detail sahifalar
+        }
+        self._seen = set()
+        self._page_known: Dict[int, bool] = {}  # sahifa indeksi -> barcha linklar ma'lum
+        self._stop_listing = False
+        self._pbar: Optional[tqdm] = None
+
+    async def run(self, page_urls: List[str],
+                  resume_items: Optional[List[dict]] = None,
+                  retry_pages: Optional[List[str]] = None) -> Dict:
+        """
+        Pipeline'ni ishga tushirish va barcha bosqichlar tugashini kutish.
+
+        Args:
+            page_urls: Listing sahifa URLlari
+            resume_items: Oldingi crawl'dan qolgan film linklari (to'g'ridan-to'g'ri detail navbatiga)
+            retry_pages: Oldingi crawl'da xato bo'lgan listing sahifalar - indekssiz o'qiladi,
+                high-water mark va incremental to'xtashga ta'sir qilmaydi
+
+        Returns:
+            Dict: stats (found, skipped, duplicates, processed, successful, inserted, ...)
+        """
+        retry_pages = retry_pages or []
+        total_pages = len(retry_pages) + len(page_urls)
+        self.listing_report["pages"] = total_pages
+        # Listing workerlar uchun umumiy navbat
+        pending_pages = itertools.chain(
+            ((None, url) for url in retry_pages), enumerate(page_urls))
+
+        self._pbar = tqdm(total=0, desc="🎬 Film sahifalari", unit="film")
+        writer = asyncio.create_task(self._writer())
+        listing = [asyncio.create_task(self._listing_worker(pending_pages))
+                   for _ in range(min(self.concurrency, total_pages) or 1)]
+        if resume_items:
+            listing.append(asyncio.create_task(self._seed(resume_items)))
+        details = [asyncio.create_task(self._detail_worker())
+                   for _ in range(self.concurrency)]
+
+        try:
+            await asyncio.gather(*listing)
+            for _ in details:
+                await self.detail_queue.put(_STOP)
+            await asyncio.gather(*details)
+        except BaseException:
+            # To'xtatildi yoki kutilmagan xato - qolgan workerlarni to'xtatamiz,
+            # writer esa navbatdagi natijalarni yozib ulguradi
+            for task in listing + details:
+                task.cancel()
+            await asyncio.gather(*listing, *details, return_exceptions=True)
+            raise
+        finally:
+            await self.write_queue.put(_STOP)
+            await writer
+            self._pbar.close()
+
+        logger.info(
+            f"✅ Pipeline yakunlandi: {self.stats['found']} link, "
+            f"{self.stats['skipped']} DB da bor, {self.stats['successful']} ta item, "
+            f"{self.stats['inserted']} ta yozildi ({self.stats['batches']} partiya)")
+        return self.stats
+
+    async def _track(self, method: str, *args) -> None:
+        """Frontier'ga yozish - xato pipeline'ni to'xtatmaydi"""
+        if self.frontier is None:
+            return
+        try:
+            await getattr(self.frontier, method)(*args)
+        except Exception as e:
+            logger.warning(f"⚠️ Frontier yangilanmadi ({method}): {e}")
+
+    async def _seed(self, items: List[dict]) -> None:
+        """Oldingi crawl'dan qolgan detail'larni navbatga qo'yish (DB da borlari done)"""
+        new_items = await self._filter_new(items)
+        new_pages = {item["file_page"] for item in new_items}
+        written = [item["file_page"] for item in items
+                   if item.get("file_page") and item["file_page"] not in new_pages]
+        await self._track("details_done", written)
+        self.stats["resumed"] += len(new_items)
+        self._pbar.total += len(new_items)
+        self._pbar.refresh()
+        logger.info(f"♻️ Oldingi crawl'dan {len(new_items)} ta film sahifasi davom ettiriladi")
+        for item in new_items:
+            await self.detail_queue.put(item)
+
+    async def _listing_worker(self, pending_pages) -> None:
+        """Listing sahifalarni o'qib, yangi linklarni detail navbatiga qo'yish"""
+        for index, url in pending_pages:
+            if self._stop_listing:
+                break
+            self.listing_report["walked"] += 1
+            await self._track("listing_started", url)
+            try:
+                items = await scrape_page_list_safe(
+                    self.config, self.browser, url, session=self.session)
+            except Exception as e:
+                self.listing_report["failed"][url] = str(e)
+                logger.error(f"❌ Sahifani o'qishda xato: {url} | {e}")
+                await self._track("listing_failed", url, str(e))
+                self._mark_page(index, url, known=False)
+                continue
+
+            if not items:
+                self.listing_report["empty"].append(url)
+                await self._track("listing_failed", url, "Bo'sh sahifa")
+                self._mark_page(index, url, known=False)
+                continue
+            self.listing_report["ok"] += 1
+            self.stats["found"] += len(items)
+            if index == 0:
+                self.listing_report["first_link"] = items[0].get("file_page")
+
+            new_items = await self._filter_new(items)
+            # Linklar frontier'ga yozilgandan keyin listing done - to'xtasa ham yo'qolmaydi
+            await self._track("listing_done", url, new_items, -1 if index is None else index)
+            self._mark_page(index, url, known=not new_items)
+            self._pbar.total += len(new_items)
+            self._pbar.refresh()
+            logger.debug(f"✅ {url}: {len(items)} link, {len(new_items)} ta yangi")
+
+            for item in new_items:
+                await self.detail_queue.put(item)  # Navbat to'lsa kutadi (backpressure)
+
+    def _mark_page(self, index: Optional[int], url: str, known: bool) -> None:
+        """Incremental rejim: K ta ketma-ket to'liq ma'lum sahifa bo'lsa listing'ni to'xtatish
+
+        Sahifalar parallel o'qilgani uchun ketma-ketlik tugash tartibi emas,
+        sahifa indeksi bo'yicha tekshiriladi. Xato yoki bo'sh sahifa ketma-ketlikni uzadi.
+        Qayta urinilayotgan sahifalar (index None) hisobga olinmaydi.
+        """
+        k = self.stop_after_known
+        if not k or self._stop_listing or index is None:
+            return
+        self._page_known[index] = known
+        if not known:
+            return
+        for start in range(max(index - k + 1, 0), index + 1):
+            if all(self._page_known.get(i) for i in range(start, start + k)):
+                self._stop_listing = True
+                self.listing_report["stopped_at"] = url
+                logger.info(
+                    f"⏹️ Incremental: {k} ta ketma-ket sahifa to'liq ma'lum - "
+                    f"listing to'xtatildi ({start + k}-sahifa)")
+                return
+
+    async def _filter_new(self, items: List[dict]) -> List[dict]:
+        """DB da va shu ishga tushirishda ko'rilgan sahifalarni chiqarib tashlash"""
+        pages = [item.get("file_page") for item in items if item.get("file_page")]
+        try:
+            existing = await self.db.existing_pages(self.config["name"], pages)
+        except Exception as e:
+            logger.error(f"❌ DB filtrlashda xato: {e}")
+            existing = set()
+
+        new_items = []
+        for item in items:
+            file_page = item.get("file_page")
+            if not file_page:
+                continue
+            if file_page in existing:
+                self.stats["skipped"] += 1
+                continue
+            if file_page in self._seen:
+                self.stats["duplicates"] += 1
+                continue
+            self._seen.add(file_page)
+            new_items.append(item)
+        return new_items
+
+    async def _detail_worker(self) -> None:
+        """Film sahifalarini tahlil qilib, natijani writer navbatiga qo'yish"""
+        while True:
+            film = await self.detail_queue.get()
+            if film is _STOP:
+                return
+
+            file_page = film["file_page"]
+            await self._track("detail_started", file_page)
+            try:
+                details = await scrape_file_page_safe(
+                    self.config, self.browser, file_page, session=self.session)
+            except Exception as e:
+                logger.error(f"❌ Worker xato: {file_page} | {e}")
+                details = {"file_page": file_page, "file_url": None, "error": str(e)}
+            finally:
+                self.stats["processed"] += 1
+                self._pbar.update(1)
+
+            if details and details.get("file_url"):
+                self.stats["successful"] += 1
+                await self.write_queue.put(details)  # done - DB ga yozilgandan keyin
+            elif not details or details.get("error"):
+                await self._track("details_failed", [file_page],
+                                  (details or {}).get("error") or "Natija yo'q")
+            else:
+                # Sahifa o'qildi, lekin fayl linki yo'q - qayta urinishdan foyda yo'q
+                await self._track("details_done", [file_page])
+
+    async def _writer(self) -> None:
+        """Natijalarni kichik partiyalarda DB ga yozish (hajm yoki vaqt bo'yicha)"""
+        batch: List[dict] = []
+        while True:
+            try:
+                item = await asyncio.wait_for(self.write_queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is _STOP:
+                break
+            if item is not None:
+                batch.append(item)
+            if batch and (item is None or len(batch) >= self.write_batch):
+                await self._write(batch)
+                batch = []
+
+        if batch:
+            await self._write(batch)
+
+    async def _write(self, batch: List[dict]) -> None:
+        try:
+            # on_conflict="ignore": qayta o'ynalgan (resume) itemlar dublikat bo'lmaydi
+            result = await self.db.insert_files(self.config["name"], batch, on_conflict="ignore")
+            self.stats["inserted"] += result["inserted"]
+            self.stats["batches"] += 1
+            logger.debug(f"💾 {result['inserted']} ta item yozildi (partiya: {len(batch)})")
+        except Exception as e:
+            self.stats["write_errors"] += len(batch)
+            logger.error(f"❌ DB ga yozishda xato ({len(batch)} ta item): {e}")
+            await self._track("details_failed", [item["file_page"] for item in batch], str(e))
+            return
+        await self._track("details_done", [item["file_page"] for item in batch])
@@ -8,18 +8,31 @@ Bu modul scraping jarayonining asosiy oqimini boshqaradi:
 4. DB orqali filtrlash
 5. Parallel processing
 6. Natijalarni saqlash
+
+3-6 bosqichlar run_scraping_process ichida ScrapePipeline orqali oqim
+(streaming) tarzida bajariladi - pipeline.py ga qarang.
 """
-import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional, Tuple
 
-from core.FileDB import FileDB
+import aiohttp
+
+from core.async_db import get_async_db
 from utils.helpers import parse_page_selection
 from utils.logger_core import logger
-from tqdm import tqdm
+from utils.rate_limiter import get_rate_limiter
 
-from .browser import launch_browser, cleanup_browser
-from .parsers.parse_file_pages import collect_links, scrape_page_list_safe
-from .workers import collect_items_parallel, ProcessingStats
+from .browser import (
+    BrowserPagePool, ResourceBlocker, activate_page_pool, browser_context_options, cleanup_browser,
+    create_browser_context, create_page_pool, deactivate_page_pool, launch_browser, navigation_options)
+from .frontier import CrawlFrontier
+from .http_cache import HttpCache, activate_http_cache, deactivate_http_cache
+from .http_client import create_http_session
+from .loop_monitor import LoopLagMonitor
+from .parse_pool import activate_parse_pool, create_parse_executor, deactivate_parse_pool
+from .parsers.parse_file_pages import collect_links
+from .pipeline import ScrapePipeline
+from .workers import ProcessingStats
 
 
 class ScrapingOrchestrator:
@@ -27,21 +40,149 @@ class ScrapingOrchestrator:
     Scraping jarayonini boshqaruvchi klass.
     """
 
-    def __init__(self, config: dict, browser_config: dict):
+    def __init__(self, config: dict, browser_config: dict, incremental: Optional[bool] = None,
+                 page_selection: Optional[str] = None, browser=None,
+                 http_session: Optional[aiohttp.ClientSession] = None,
+                 http_cache: Optional[HttpCache] = None,
+                 parse_pool: Optional[ProcessPoolExecutor] = None):
+        """
+        Args:
+            config: Sayt konfiguratsiyasi (APP_CONFIG + SITE_CONFIG)
+            browser_config: Browser konfiguratsiyasi
+            incremental: Incremental crawl (None - config["incremental_crawl"])
+            page_selection: Sahifa tanlash ("1-10,50" yoki "*") - berilsa input() so'ralmaydi
+            browser, http_session, http_cache, parse_pool: Umumiy resurslar
+                (MultiSiteScheduler) - orchestrator ularni ishlatadi, lekin yopmaydi
+        """
         self.config = config
         self.browser_config = browser_config
-        self.db = FileDB()
+        self.page_selection = page_selection
+        # Incremental crawl: eng yangi sahifalardan boshlab, ma'lum sahifalarda to'xtash
+        self.incremental = (config.get("incremental_crawl", False)
+                            if incremental is None else incremental)
         self.stats = ProcessingStats()
+        # ScrapePipeline listing hisoboti: {"pages", "ok", "empty", "failed", ...}
+        self.listing_report: Dict = {}
+        # Barcha listing/detail/hajm so'rovlari uchun bitta pooled session
+        self.http_session: Optional[aiohttp.ClientSession] = http_session
+        self._owns_http = http_session is None
+        # Diskdagi HTML cache (ETag / Last-Modified bilan shartli so'rovlar)
+        self.http_cache: Optional[HttpCache] = http_cache
+        self._owns_cache = http_cache is None
+        self._cache_token = None
+        # parse_workers > 0: HTML parse + normallash process pool'da
+        self.parse_pool: Optional[ProcessPoolExecutor] = parse_pool
+        self._owns_parse_pool = parse_pool is None
+        self._pool_token = None
+        # Umumiy browser berilsa orchestrator faqat o'z kontekstini ochadi va yopadi
+        self.shared_browser = browser
+        self._context = None
+        # Browser fallback uchun qayta ishlatiladigan kontekst/sahifalar
+        self.page_pool: Optional[BrowserPagePool] = None
+        self._page_pool_token = None
+        self.loop_lag: Dict = {}
+        # Host bo'yicha joriy so'rov tezliklari (umumiy RateLimiter snapshot)
+        self.rate_limits: Dict = {}
+
+    def setup_http(self) -> aiohttp.ClientSession:
+        """
+        Umumiy HTTP session yaratish (keep-alive, host limiti, DNS cache).
+
+        Returns:
+            aiohttp.ClientSession: Orchestrator egalik qiladigan session
+        """
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = create_http_session(self.config)
+            self._owns_http = True
+        if self.http_cache is None:
+            self.http_cache = HttpCache.from_config(self.config)
+        if self.http_cache is not None and self._cache_token is None:
+            self._cache_token = activate_http_cache(self.http_cache)
+        return self.http_session
+
+    async def close_http(self) -> None:
+        """Umumiy HTTP session'ni va HTML cache'ni yopish (scheduler bergan bo'lsa - faqat ajratish)"""
+        if self._owns_http and self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+        self.http_session = None
+
+        if self.http_cache is not None:
+            if self._cache_token is not None:
+                deactivate_http_cache(self._cache_token)
+                self._cache_token = None
+            if self._owns_cache:
+                await self.http_cache.flush_async()
+                self.http_cache.log_report()
+                await self.http_cache.aclose()
+            self.http_cache = None
+
+    def setup_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        """parse_workers > 0 bo'lsa CPU-bound parsing uchun process pool yaratish"""
+        if self.parse_pool is None:
+            self.parse_pool = create_parse_executor(self.config)
+        if self.parse_pool is not None and self._pool_token is None:
+            self._pool_token = activate_parse_pool(self.parse_pool)
+        return self.parse_pool
+
+    def close_parse_pool(self) -> None:
+        """Process pool'ni to'xtatish (umumiy pool bo'lsa - faqat ajratish)"""
+        if self.parse_pool is None:
+            return
+        if self._pool_token is not None:
+            deactivate_parse_pool(self._pool_token)
+            self._pool_token = None
+        if self._owns_parse_pool:
+            self.parse_pool.shutdown(cancel_futures=True)
+        self.parse_pool = None
+
+    async def setup_page_pool(self, browser) -> Optional[BrowserPagePool]:
+        """Browser fallback'lar uchun scrape_concurrency hajmli sahifalar pool'i"""
+        if self.page_pool is None:
+            self.page_pool = create_page_pool(
+                browser, self.config, browser_config=self.browser_config)
+            if self.page_pool is not None:
+                self._page_pool_token = activate_page_pool(self.page_pool)
+                try:
+                    await self.page_pool.warm(self.config.get("browser_pool_warm", 1))
+                except Exception as e:
+                    logger.warning(f"⚠️ Browser pool oldindan tayyorlanmadi: {e}")
+        return self.page_pool
+
+    async def close_page_pool(self) -> None:
+        """Pool statistikasini log qilish va kontekstlarni yopish"""
+        if self.page_pool is None:
+            return
+        report = self.page_pool.report()
+        if report["checkouts"]:
+            logger.info(
+                f"🧭 Browser pool: {report['checkouts']} ta fallback, "
+                f"{report['reused']} qayta ishlatildi, {report['created']} kontekst yaratildi, "
+                f"{report['recycled']} recycle, {report['unhealthy']} nosog', "
+                f"{report['blocked']} resurs so'rovi bloklandi")
+        if self._page_pool_token is not None:
+            deactivate_page_pool(self._page_pool_token)
+            self._page_pool_token = None
+        await self.page_pool.close()
+        self.page_pool = None
 
     async def setup_browser(self) -> Tuple:
         """
         Playwright browserni ishga tushirish.
 
         Returns:
-            Tuple: (playwright_instance, browser, page)
+            Tuple: (playwright_instance, browser, page) - umumiy browserda playwright_instance None
         """
         try:
-            pw, browser, page = await launch_browser(self.browser_config)
+            if self.shared_browser is not None:
+                # Umumiy browser: sayt uchun alohida kontekst (cookie/bloklash sozlamalari ajratilgan)
+                self._context = await create_browser_context(
+                    self.shared_browser, browser_context_options(self.browser_config),
+                    blocker=ResourceBlocker.from_options(
+                        navigation_options(self.config, self.browser_config)))
+                page = await self._context.new_page()
+                logger.info(f"🚀 Scraper ishga tushdi (umumiy browser): {self.config.get('name')}")
+                return None, self.shared_browser, page
+            pw, browser, page = await launch_browser(self.browser_config, self.config)
             logger.info("🚀 Scraper ishga tushdi.")
             return pw, browser, page
         except Exception as e:
@@ -52,6 +193,9 @@ class ScrapingOrchestrator:
         """
         Foydalanuvchidan sahifa tanlashni so'raydi va valid ro'yxat qaytaradi.
 
+        Incremental rejimda so'ralmaydi: barcha sahifalar eng yangisidan boshlab
+        qaytariladi, pipeline ma'lum sahifalarga yetganda o'zi to'xtaydi.
+
         Args:
             page: Browser page instance
 
@@ -60,13 +204,18 @@ class ScrapingOrchestrator:
         """
         try:
             logger.info("🌐 Linklarni yig'ish boshlandi...")
-            links = await collect_links(self.config, page)
+            links = await collect_links(self.config, page, incremental=self.incremental)
             total = len(links)
             logger.info(f"🔗 Topilgan sahifalar soni: {total}")
 
-            selection = input(
-                "📌 Qaysi sahifalarni ko'rib chiqamiz? (1-10,50,51 yoki *): "
-            ).strip()
+            if self.incremental:
+                return links, links
+
+            selection = self.page_selection
+            if selection is None:
+                selection = input(
+                    "📌 Qaysi sahifalarni ko'rib chiqamiz? (1-10,50,51 yoki *): "
+                ).strip()
 
             selected = parse_page_selection(selection, total)
 
@@ -90,104 +239,28 @@ class ScrapingOrchestrator:
             logger.error(f"❌ Sahifa tanlashda xato: {e}")
             return None, []
 
-    async def collect_film_links(self, browser, links: List[str]) -> List[dict]:
-        """
-        Har bir listing sahifadan film linklarini to'playdi.
-
-        Args:
-            browser: Browser instance
-            links: Listing sahifa linklari
-
-        Returns:
-            List[dict]: Film linklari
-        """
-        try:
-            film_links = []
-
-            with tqdm(total=len(links), desc="📄 Listing sahifalar", unit="sahifa") as pbar:
-                for link in links:
-                    try:
-                        items = await scrape_page_list_safe(self.config, browser, link)
-                        film_links.extend(items)
-                        logger.debug(
-                            f"✅ {link} dan {len(items)} ta link topildi")
-                    except Exception as e:
-                        logger.warning(f"❌ Sahifa o'qilmadi: {link} | {e}")
-                    finally:
-                        pbar.update(1)
-
+    async def log_crawl_state(self, db) -> None:
+        """Oldingi crawl high-water mark'ini ko'rsatish"""
+        state = await db.get_crawl_state(self.config["name"])
+        if state and state.get("high_water_page"):
             logger.info(
-                f"📊 Umumiy topilgan film sahifalari: {len(film_links)}")
-            return film_links
-
-        except Exception as e:
-            logger.error(f"❌ Film linklar to'plashda xato: {e}")
-            return []
-
-    def filter_existing_files(self, film_links: List[dict]) -> Tuple[List[dict], int]:
-        """
-        DB'da mavjud fayllarni chiqarib tashlaydi.
-
-        Args:
-            film_links: Barcha film linklari
-
-        Returns:
-            Tuple: (new_links, skipped_count)
-        """
-        try:
-            new_links, skipped = [], 0
-
-            for item in film_links:
-                file_page = item.get("file_page")
-                if not file_page:
-                    continue
-
-                if self.db.file_exists(self.config["name"], file_page):
-                    skipped += 1
-                    continue
-
-                new_links.append(item)
-
-            logger.info(f"🧠 DB'da mavjud {skipped} ta sahifa tashlab ketildi.")
-            logger.info(f"📥 Yangi sahifalar soni: {len(new_links)}")
-
-            return new_links, skipped
-
-        except Exception as e:
-            logger.error(f"❌ DB filtrlashda xato: {e}")
-            return film_links, 0
-
-    def insert_new_items(self, all_items: List[dict], skipped: int) -> int:
-        """
-        Yangi yig'ilgan itemlarni DB ga yozadi.
-
-        Args:
-            all_items: Yangi itemlar
-            skipped: Tashlab ketilgan itemlar soni
-
-        Returns:
-            int: Qo'shilgan itemlar soni
-        """
+                f"🔖 Oldingi crawl: {state['pages_walked']} sahifa, {state['new_files']} ta yangi, "
+                f"high-water: {state['high_water_page']}")
+        logger.info(
+            f"🔁 Incremental rejim: {self.config.get('incremental_stop_pages', 2)} ta "
+            f"ketma-ket ma'lum sahifadan keyin to'xtaydi")
+
+    async def save_high_water_mark(self, db, result: Dict) -> None:
+        """Eng yangi listing linkini config uchun high-water mark sifatida saqlash"""
+        first_link = self.listing_report.get("first_link")
+        if not first_link:
+            return
         try:
-            inserted = 0
-
-            for item in all_items:
-                if not item.get("file_page"):
-                    continue
-
-                self.db.insert_file(self.config["name"], item)
-                inserted += 1
-
-            logger.info(
-                f"📂 {self.config['name']} uchun {inserted} ta yangi item qo'shildi, "
-                f"{skipped} ta eskisi tashlab ketildi."
-            )
-
-            return inserted
-
+            await db.set_high_water_mark(
+                self.config["name"], first_link,
+                self.listing_report["walked"], result["inserted"])
         except Exception as e:
-            logger.error(f"❌ DB ga yozishda xato: {e}")
-            return 0
+            logger.error(f"❌ High-water mark saqlanmadi: {e}")
 
     async def run_scraping_process(self) -> Dict:
         """
@@ -202,44 +275,92 @@ class ScrapingOrchestrator:
         try:
             # 1. Browser setup
             pw, browser, page = await self.setup_browser()
-
-            # 2. Sahifalarni tanlash
-            selected_links, all_links = await self.select_pages(page)
-            if not selected_links:
-                return {"status": "cancelled", "reason": "No pages selected"}
-
-            # 3. Film linklarini to'plash
-            film_links = await self.collect_film_links(browser, selected_links)
-            if not film_links:
-                return {"status": "failed", "reason": "No film links found"}
-
-            # 4. DB orqali filtrlash
-            new_links, skipped = self.filter_existing_files(film_links)
-            if not new_links:
-                return {"status": "completed", "reason": "No new files to process", "skipped": skipped}
-
-            # 5. Parallel processing
+            await self.setup_page_pool(browser)
+            self.setup_http()
+            self.setup_parse_pool()
+
+            # 2. Sahifalarni tanlash (to'xtab qolgan crawl bo'lsa - frontier'dan davom etadi)
+            frontier, resumed, resume_items, retry_pages = None, None, None, None
+            if self.config.get("crawl_resume", True):
+                frontier = CrawlFrontier(get_async_db(), self.config["name"],
+                                         self.config.get("crawl_max_attempts", 3))
+                if await frontier.interrupted():
+                    resumed = await frontier.load_pending()
+
+            if resumed:
+                selected_links, resume_items = resumed
+                logger.info(
+                    f"♻️ Tugallanmagan crawl topildi: {len(selected_links)} ta listing sahifa, "
+                    f"{len(resume_items)} ta film sahifasi qolgan - davom ettiriladi")
+            else:
+                selected_links, all_links = await self.select_pages(page)
+                if not selected_links:
+                    return {"status": "cancelled", "reason": "No pages selected"}
+                if frontier is not None:
+                    # Oldingi crawl'ning qayta urinadigan xato URL'lari shu crawl'ga qo'shiladi
+                    retry_pages, resume_items = await frontier.start(selected_links)
+                    if retry_pages or resume_items:
+                        logger.info(
+                            f"♻️ Oldingi crawl'dan qayta urinish: {len(retry_pages)} ta listing "
+                            f"sahifa, {len(resume_items)} ta film sahifasi tanlovga qo'shildi")
+
+            # 3-6. Listing → DB filtr → detail → DB yozish (streaming pipeline)
+            db = get_async_db()
+            stop_after_known = 0
+            if self.incremental:
+                stop_after_known = max(self.config.get("incremental_stop_pages", 2), 1)
+                await self.log_crawl_state(db)
+            pipeline = ScrapePipeline(
+                self.config, browser, db, session=self.http_session,
+                stop_after_known=stop_after_known, frontier=frontier)
+            async with LoopLagMonitor() as monitor:
+                result = await pipeline.run(selected_links, resume_items=resume_items,
+                                            retry_pages=retry_pages)
+            # Pipeline oxirigacha ishladi - crawl tugagan deb belgilanadi, qayta urinadiganlar qoladi
+            if frontier is not None:
+                await frontier.finish()
+            self.loop_lag = monitor.report()
+            pool_state = "yoqilgan" if self.parse_pool else "o'chirilgan"
             logger.info(
-                f"🚀 Parallel processing boshlandi: {len(new_links)} ta yangi fayl")
-            all_items = await collect_items_parallel(self.config, browser, new_links)
-            logger.info(f"✅ Yig'ilgan yangi itemlar: {len(all_items)}")
-
-            if not all_items:
-                return {"status": "failed", "reason": "No items collected"}
-
-            # 6. DB ga saqlash
-            inserted = self.insert_new_items(all_items, skipped)
-
+                f"⏱️ Event loop kechikishi: o'rtacha {self.loop_lag['mean_ms']:.1f} ms, "
+                f"p95 {self.loop_lag['p95_ms']:.1f} ms, max {self.loop_lag['max_ms']:.1f} ms "
+                f"(parse pool {pool_state})")
+            self.listing_report = pipeline.listing_report
+            limiter = get_rate_limiter()
+            if limiter is not None:
+                limiter.log_snapshot()
+                self.rate_limits = limiter.snapshot()
+            if self.incremental:
+                await self.save_high_water_mark(db, result)
+
+            if not result["found"]:
+                return {"status": "failed", "reason": "No film links found",
+                        "listing": self.listing_report}
+            if not result["processed"]:
+                return {"status": "completed", "reason": "No new files to process",
+                        "skipped": result["skipped"], "listing": self.listing_report}
+
+            self.stats.total_processed = result["processed"]
+            self.stats.successful = result["successful"]
+            self.stats.errors = result["processed"] - result["successful"]
             self.stats.finish()
             stats_summary = self.stats.get_summary()
+            if self.http_cache is not None:
+                await self.http_cache.flush_async()  # report() da sinxron yozish qolmasin
 
             return {
                 "status": "success",
-                "total_found": len(film_links),
-                "skipped": skipped,
-                "processed": len(new_links),
-                "successful": len(all_items),
-                "inserted": inserted,
+                "total_found": result["found"],
+                "skipped": result["skipped"],
+                "processed": result["processed"],
+                "successful": result["successful"],
+                "inserted": result["inserted"],
+                "resumed": result["resumed"],
+                "listing": self.listing_report,
+                "http_cache": self.http_cache.report() if self.http_cache else None,
+                "loop_lag": self.loop_lag,
+                "browser_pool": self.page_pool.report() if self.page_pool else None,
+                "rate_limits": self.rate_limits,
                 "stats": stats_summary
             }
 
@@ -249,22 +370,35 @@ class ScrapingOrchestrator:
 
         finally:
             # Browser va resurslarni tozalash
+            await self.close_http()
+            self.close_parse_pool()
+            await self.close_page_pool()
+            if self._context is not None:
+                try:
+                    await self._context.close()
+                except Exception as e:
+                    logger.debug(f"🔍 Kontekst yopilmadi: {e}")
+                self._context = None
             if pw and browser:
                 await cleanup_browser(pw, browser)
 
 
-async def scrape(config: dict, browser_config: dict) -> Dict:
+async def scrape(config: dict, browser_config: dict, incremental: Optional[bool] = None,
+                 page_selection: Optional[str] = None) -> Dict:
     """
     Asosiy scraping funksiyasi (eski interface bilan moslashuv).
 
     Args:
         config: Sayt konfiguratsiyasi
         browser_config: Browser konfiguratsiyasi
+        incremental: Incremental crawl (None - config["incremental_crawl"])
+        page_selection: Sahifa tanlash (None - foydalanuvchidan so'raladi)
 
     Returns:
         Dict: Scraping natijalari
     """
-    orchestrator = ScrapingOrchestrator(config, browser_config)
+    orchestrator = ScrapingOrchestrator(config, browser_config, incremental=incremental,
+                                        page_selection=page_selection)
     return await orchestrator.run_scraping_process()
 
 
@@ -282,62 +416,51 @@ async def quick_scrape(config: dict, browser_config: dict, page_selection: str =
     Returns:
         Dict: Scraping natijalari
     """
-    # Input ni avtomatik qilib qo'yish
-    original_input = __builtins__.get('input')
-    __builtins__['input'] = lambda _: page_selection
-
-    try:
-        result = await scrape(config, browser_config)
-        return result
-    finally:
-        # Input ni qaytarish
-        __builtins__['input'] = original_input
+    return await scrape(config, browser_config, page_selection=page_selection)
 
 
-async def batch_scrape_multiple_sites(sites_configs: List[dict], browser_config: dict) -> List[Dict]:
+async def batch_scrape_multiple_sites(sites_configs: Optional[List[dict]], browser_config: dict,
+                                      max_sites: Optional[int] = None,
+                                      max_per_host: Optional[int] = None,
+                                      page_selection: str = "*") -> List[Dict]:
     """
-    Bir necha saytni ketma-ket scraping qilish.
+    Bir necha saytni parallel scraping qilish (MultiSiteScheduler orqali).
+
+    Saytlar umumiy browser va HTTP pool bilan bir vaqtda ishlaydi; bitta
+    hostdagi configlar max_per_host tadan oshmaydi.
 
     Args:
-        sites_configs: Saytlar konfiguratsiyasi ro'yxati
+        sites_configs: Saytlar konfiguratsiyasi ro'yxati (None - barcha SITE_CONFIGS)
         browser_config: Browser konfiguratsiyasi
+        max_sites: Bir vaqtda ishlaydigan saytlar (None - multi_site_concurrency)
+        max_per_host: Bitta hostda bir vaqtda (None - multi_site_per_host)
+        page_selection: Har sayt uchun sahifa tanlash
 
     Returns:
-        List[Dict]: Har bir sayt uchun natijalar
+        List[Dict]: Har bir sayt uchun natijalar (kiritilgan tartibda)
     """
-    results = []
-
-    for i, config in enumerate(sites_configs, 1):
-        logger.info(
-            f"🌐 Sayt {i}/{len(sites_configs)}: {config.get('name', 'Unknown')}")
-
-        try:
-            result = await scrape(config, browser_config)
-            result["site_name"] = config.get("name", f"Site_{i}")
-            results.append(result)
-
-            logger.info(f"✅ Sayt {i} yakunlandi: {result.get('status')}")
-
-            # Saytlar orasida tanaffus
-            await asyncio.sleep(5)
-
-        except Exception as e:
-            logger.error(f"❌ Sayt {i} da xato: {e}")
-            results.append({
-                "site_name": config.get("name", f"Site_{i}"),
-                "status": "error",
-                "error": str(e)
-            })
-
+    from .multi_site import MultiSiteScheduler, all_site_configs
+
+    scheduler = MultiSiteScheduler(
+        all_site_configs() if sites_configs is None else sites_configs, browser_config,
+        max_sites=max_sites, max_per_host=max_per_host, page_selection=page_selection)
+    results = await scheduler.run()
+
+    summary = get_scraping_summary(results, elapsed=scheduler.elapsed)
+    logger.info(
+        f"🏁 {summary['successful_sites']}/{summary['total_sites']} sayt muvaffaqiyatli, "
+        f"{summary['total_inserted']} ta yangi item | {summary['elapsed']} s "
+        f"(ketma-ket {summary['sites_duration']} s, x{summary['speedup']})")
     return results
 
 
-def get_scraping_summary(results: List[Dict]) -> Dict:
+def get_scraping_summary(results: List[Dict], elapsed: Optional[float] = None) -> Dict:
     """
     Scraping natijalarining umumiy xulosasi.
 
     Args:
         results: Scraping natijalari
+        elapsed: Butun batch'ning haqiqiy vaqti (s) - parallel ishda speedup hisoblanadi
 
     Returns:
         Dict: Umumiy statistika
@@ -346,6 +469,7 @@ def get_scraping_summary(results: List[Dict]) -> Dict:
     total_successful = sum(r.get("successful", 0) for r in results)
     total_inserted = sum(r.get("inserted", 0) for r in results)
     total_skipped = sum(r.get("skipped", 0) for r in results)
+    sites_duration = round(sum(r.get("duration", 0) for r in results), 2)
 
     successful_sites = len(
         [r for r in results if r.get("status") == "success"])
@@ -359,5 +483,11 @@ def get_scraping_summary(results: List[Dict]) -> Dict:
         "total_successful": total_successful,
         "total_inserted": total_inserted,
         "total_skipped": total_skipped,
-        "success_rate": (successful_sites / len(results) * 100) if results else 0
+        "success_rate": (successful_sites / len(results) * 100) if results else 0,
+        # Sayt bo'yicha holat va vaqt (ko'p saytli scheduler)
+        "sites": {r.get("site_name", f"Site_{i}"): r.get("status")
+                  for i, r in enumerate(results, 1)},
+        "sites_duration": sites_duration,
+        "elapsed": elapsed if elapsed is not None else sites_duration,
+        "speedup": round(sites_duration / elapsed, 2) if elapsed else 1.0,
     }
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor
 
+import aiohttp
 from tqdm.asyncio import tqdm
 from utils.logger_core import logger
 from .parsers.parse_file_page import scrape_file_page_safe
@@ -91,7 +92,8 @@ def save_checkpoint(config: dict, results: list, idx: int, batch_size: int) -> N
 
 
 async def single_worker(config: dict, browser, semaphore: asyncio.Semaphore,
-                        film: dict, pbar) -> Optional[dict]:
+                        film: dict, pbar,
+                        session: Optional[aiohttp.ClientSession] = None) -> Optional[dict]:
     """
     Bitta film sahifasini scrap qiladi.
 
@@ -101,6 +103,7 @@ async def single_worker(config: dict, browser, semaphore: asyncio.Semaphore,
         semaphore: Concurrency cheklash
         film: Film ma'lumotlari
         pbar: Progress bar
+        session: Umumiy pooled HTTP session
 
     Returns:
         dict | None: Film ma'lumotlari yoki None
@@ -112,7 +115,7 @@ async def single_worker(config: dict, browser, semaphore: asyncio.Semaphore,
 
     async with semaphore:
         try:
-            details = await scrape_file_page_safe(config, browser, file_page)
+            details = await scrape_file_page_safe(config, browser, file_page, session=session)
 
             if not validate_item(details):
                 pbar.update(1)
@@ -127,7 +130,8 @@ async def single_worker(config: dict, browser, semaphore: asyncio.Semaphore,
             return None
 
 
-async def batch_worker(config: dict, browser, films_batch: List[dict]) -> List[dict]:
+async def batch_worker(config: dict, browser, films_batch: List[dict],
+                       session: Optional[aiohttp.ClientSession] = None) -> List[dict]:
     """
     Film batch'ini parallel tahlil qilish.
 
@@ -135,6 +139,7 @@ async def batch_worker(config: dict, browser, films_batch: List[dict]) -> List[d
         config: Sayt konfiguratsiyasi
         browser: Browser instance
         films_batch: Film batch'i
+        session: Umumiy pooled HTTP session
 
     Returns:
         List[dict]: Tahlil qilingan filmlar
@@ -144,7 +149,7 @@ async def batch_worker(config: dict, browser, films_batch: List[dict]) -> List[d
 
     with tqdm(total=len(films_batch), desc="🎬 Batch", unit="film") as pbar:
         tasks = [
-            single_worker(config, browser, semaphore, film, pbar)
+            single_worker(config, browser, semaphore, film, pbar, session=session)
             for film in films_batch
         ]
 
@@ -156,7 +161,8 @@ async def batch_worker(config: dict, browser, films_batch: List[dict]) -> List[d
     return results
 
 
-async def collect_items_parallel(config: dict, browser, film_links: List[dict]) -> List[dict]:
+async def collect_items_parallel(config: dict, browser, film_links: List[dict],
+                                 session: Optional[aiohttp.ClientSession] = None) -> List[dict]:
     """
     Filmlarni parallel ravishda to'plash (asosiy worker funksiya).
 
@@ -164,6 +170,7 @@ async def collect_items_parallel(config: dict, browser, film_links: List[dict])
         config: Sayt konfiguratsiyasi
         browser: Browser instance
         film_links: Film linklari ro'yxati
+        session: Umumiy pooled HTTP session (ScrapingOrchestrator egalik qiladi)
 
     Returns:
         List[dict]: To'plangan filmlar ro'yxati
@@ -190,7 +197,8 @@ async def collect_items_parallel(config: dict, browser, film_links: List[dict])
 
                 async with semaphore:
                     try:
-                        details = await scrape_file_page_safe(config, browser, file_url)
+                        details = await scrape_file_page_safe(
+                            config, browser, file_url, session=session)
                         pbar.update(1)
 
                         if not details or not details.get("file_url"):
@@ -220,7 +228,8 @@ async def collect_items_parallel(config: dict, browser, film_links: List[dict])
 
 
 async def process_batch_parallel(config: dict, browser, film_links: List[dict],
-                                 batch_size: int = 10, checkpoint_interval: int = 50) -> List[dict]:
+                                 batch_size: int = 10, checkpoint_interval: int = 50,
+                                 session: Optional[aiohttp.ClientSession] = None) -> List[dict]:
     """
     Filmlarni batch'larda parallel tahlil qilish (checkpoint bilan).
 
@@ -230,6 +239,7 @@ async def process_batch_parallel(config: dict, browser, film_links: List[dict],
         film_links: Film linklari
         batch_size: Batch hajmi
         checkpoint_interval: Checkpoint saqlash oralig'i
+        session: Umumiy pooled HTTP session
 
     Returns:
         List[dict]: Barcha natijalar
@@ -248,7 +258,7 @@ async def process_batch_parallel(config: dict, browser, film_links: List[dict],
             f"📦 Batch {batch_num}/{total_batches}: {len(batch)} ta film")
 
         try:
-            batch_results = await batch_worker(config, browser, batch)
+            batch_results = await batch_worker(config, browser, batch, session=session)
             all_results.extend(batch_results)
 
             logger.info(
@@ -261,16 +271,16 @@ async def process_batch_parallel(config: dict, browser, film_links: List[dict],
 
         except Exception as e:
             logger.error(f"❌ Batch {batch_num} xato: {e}")
-
-        # Batch orasida tanaffus
-        await asyncio.sleep(2)
+        # Batch'lar orasida qat'iy tanaffus yo'q - so'rovlar tezligini
+        # host bo'yicha RateLimiter (utils/rate_limiter.py) boshqaradi
 
     logger.info(
         f"🎯 Batch processing yakunlandi: {len(all_results)} ta umumiy natija")
     return all_results
 
 
-async def advanced_parallel_processing(config: dict, browser, film_links: List[dict]) -> List[dict]:
+async def advanced_parallel_processing(config: dict, browser, film_links: List[dict],
+                                       session: Optional[aiohttp.ClientSession] = None) -> List[dict]:
     """
     Murakkab parallel processing strategiyasi.
 
@@ -278,6 +288,7 @@ async def advanced_parallel_processing(config: dict, browser, film_links: List[d
         config: Sayt konfiguratsiyasi
         browser: Browser instance
         film_links: Film linklari
+        session: Umumiy pooled HTTP session
 
     Returns:
         List[dict]: Natijalar
@@ -289,7 +300,8 @@ async def advanced_parallel_processing(config: dict, browser, film_links: List[d
     # Barcha tasklar yaratish
     tasks = []
     for film in film_links:
-        task = scrape_file_page_safe(config, browser, film.get("file_page"))
+        task = scrape_file_page_safe(
+            config, browser, film.get("file_page"), session=session)
         tasks.append(pool.add_task(task))
 
     # Progress bar bilan kuzatish
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Browser fallback benchmark - to'liq yuklash va resurs bloklash + domcontentloaded.
+
+Lokal aiohttp stub film sahifasini beradi: sahifada rasmlar, shrift, video
+preview va boshqa host'dan (localhost) tracker skripti bor, har biri sun'iy
+kechikish bilan. Ikkala rejimda ham BrowserPagePool + fetch_page_with_browser
+ishlatiladi:
+  - baseline: bloklashsiz, wait_until=load (avvalgi xatti-harakat)
+  - blocked:  image/media/font + tracker domeni bloklangan, wait_until=domcontentloaded
+
+Playwright browseri kerak: python -m playwright install chromium
+
+Foydalanish:
+    python scripts/benchmarks/bench_browser_blocking.py
+    python scripts/benchmarks/bench_browser_blocking.py --pages 100 --concurrency 5 --asset-delay 0.3
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+FIXTURE = project_root / "tests" / "fixtures" / "pages" / "asilmedia_film.html"
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082")
+
+
+async def _start_stub(asset_delay: float, images: int):
+    """Film sahifasi + sekin yuklanadigan resurslar beruvchi server"""
+    from aiohttp import web
+
+    body = FIXTURE.read_text(encoding="utf-8")
+
+    async def film_page(request):
+        port = request.url.port
+        extra = "".join(f'<img src="/img/{i}.png">' for i in range(images))
+        extra += (
+            '<style>@font-face{font-family:x;src:url(/font.woff2)} body{font-family:x}</style>'
+            '<video src="/preview.mp4" autoplay muted></video>'
+            f'<script src="http://localhost:{port}/tracker.js"></script>')
+        return web.Response(text=body.replace("</body>", extra + "</body>"), content_type="text/html")
+
+    def slow(content_type, payload):
+        async def handler(request):
+            await asyncio.sleep(asset_delay)
+            return web.Response(body=payload, content_type=content_type)
+        return handler
+
+    app = web.Application()
+    app.router.add_get("/film/{i}", film_page)
+    app.router.add_get("/img/{i}", slow("image/png", PNG))
+    app.router.add_get("/font.woff2", slow("font/woff2", b"\0" * 1024))
+    app.router.add_get("/preview.mp4", slow("video/mp4", b"\0" * 4096))
+    app.router.add_get("/tracker.js", slow("application/javascript", b"void 0;"))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def run_case(name: str, site_options: dict, args) -> dict:
+    from core.config import BROWSER_CONFIG
+    from core.site_configs import SITE_CONFIGS
+    from playwright.async_api import async_playwright
+    from scraper.browser import activate_page_pool, create_page_pool, deactivate_page_pool
+    from scraper.parsers.parse_file_page import fetch_page_with_browser
+
+    config = {**SITE_CONFIGS["asilmedia"], "name": "asilmedia",
+              "scrape_concurrency": args.concurrency, **site_options}
+    runner, base = await _start_stub(args.asset_delay, args.images)
+    pw = await async_playwright().start()
+    browser = await pw.chromium.launch(headless=True)
+    pool = create_page_pool(browser, config, browser_config=BROWSER_CONFIG)
+    token = activate_page_pool(pool)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    ok = 0
+
+    async def one(i: int):
+        nonlocal ok
+        async with semaphore:
+            html = await fetch_page_with_browser(browser, f"{base}/film/{i}", config)
+            if html and "qasoskorlar" in html.lower():
+                ok += 1
+
+    try:
+        await pool.warm()
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.pages)))
+        elapsed = time.perf_counter() - start
+        report = pool.report()
+    finally:
+        deactivate_page_pool(token)
+        await pool.close()
+        await browser.close()
+        await pw.stop()
+        await runner.cleanup()
+
+    return {"name": name, "seconds": elapsed, "pages_per_min": args.pages / elapsed * 60,
+            "ok": ok, "blocked": report["blocked"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Browser resurs bloklash benchmark")
+    parser.add_argument("--pages", type=int, default=60, help="Film sahifalari soni")
+    parser.add_argument("--concurrency", type=int, default=5, help="scrape_concurrency (pool hajmi)")
+    parser.add_argument("--images", type=int, default=12, help="Sahifadagi rasmlar soni")
+    parser.add_argument("--asset-delay", type=float, default=0.2, help="Har resurs kechikishi (s)")
+    args = parser.parse_args()
+
+    from utils.logger_core import logger
+    logger.setLevel("WARNING")
+
+    cases = [
+        ("Baseline (load)", {"block_resources": [], "block_domains": [], "wait_until": "load"}),
+        ("Bloklash + domcontentloaded", {"block_resources": ["image", "media", "font"],
+                                         "block_domains": ["localhost"],
+                                         "wait_until": "domcontentloaded"}),
+    ]
+    print(f"🧪 Browser fallback benchmark: {args.pages} sahifa, concurrency={args.concurrency}, "
+          f"{args.images} rasm, resurs kechikishi {args.asset_delay * 1000:.0f} ms")
+    try:
+        results = [asyncio.run(run_case(name, options, args)) for name, options in cases]
+    except Exception as e:
+        print(f"❌ Browser ishga tushmadi ({str(e).splitlines()[0]}). `python -m playwright install chromium` bajaring.")
+        sys.exit(1)
+
+    print("=" * 78)
+    print(f"{'Rejim':<30} {'Vaqt (s)':>9} {'Sahifa/min':>11} {'Bloklangan':>11} {'OK':>6}")
+    print("-" * 78)
+    for r in results:
+        print(f"{r['name']:<30} {r['seconds']:>9.2f} {r['pages_per_min']:>11.1f} "
+              f"{r['blocked']:>11} {r['ok']:>6}")
+    print("=" * 78)
+    print(f"⚡ Tezlanish: {results[1]['pages_per_min'] / results[0]['pages_per_min']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Kategoriya normallash benchmark - eski ichma-ich kalit so'z sikli va Aho-Corasick matcher.
+
+Xom kategoriyalar STANDARD_CATEGORIES kalit so'zlaridan yasaladi: sayt uslubidagi
+qo'shimchalar ("Kino", "Fantastika filmlar", "Боевики 2024"), katta/kichik harf,
+tinish belgilar va hech narsaga mos kelmaydigan qiymatlar. "eski" qatori har
+qiymat uchun barcha kategoriyalar va kalit so'zlarni `kw in raw` bilan tekshiradi.
+Natijalar eski yo'l bilan solishtiriladi.
+
+Foydalanish:
+    python scripts/benchmarks/bench_category_matcher.py
+    python scripts/benchmarks/bench_category_matcher.py --values 100000 --unique 0.05
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+PREFIXES = ["", "", "", "Yangi ", "Eng zo'r ", "Лучшие ", "Top "]
+SUFFIXES = ["", "", "", " filmlar", " kinolar", " 2024", "ы", " (HD)", "!", " seriallar"]
+UNKNOWN = ["Boshqa", "Разное", "Premyera", "Tas-ix", "Uzbek tilida", "2023", "Yangilar", "HD"]
+
+
+def legacy_normalize_category(raw: str) -> str:
+    """Avtomatdan oldingi normalize_category (taqqoslash uchun)"""
+    from core.catigories import STANDARD_CATEGORIES
+
+    if not raw:
+        return "other"
+    raw = raw.strip().lower()
+    raw = re.sub(r"[^\w\s\-+]", "", raw)
+    for key, keywords in STANDARD_CATEGORIES.items():
+        for kw in keywords:
+            if kw in raw:
+                return key
+    return "other"
+
+
+def make_values(count: int, unique: float, seed: int = 1) -> list:
+    """count ta xom kategoriya: taxminan `unique` ulushi noyob, qolganlari takrorlanadi"""
+    from core.catigories import STANDARD_CATEGORIES
+
+    rng = random.Random(seed)
+    keywords = [kw for kws in STANDARD_CATEGORIES.values() for kw in kws] + UNKNOWN
+    pool_size = max(int(count * unique), 1)
+    pool = []
+    for _ in range(pool_size):
+        word = rng.choice(keywords)
+        word = rng.choice([word, word.capitalize(), word.upper()])
+        pool.append(f"{rng.choice(PREFIXES)}{word}{rng.choice(SUFFIXES)}")
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(func, values: list) -> tuple:
+    start = time.perf_counter()
+    result = func(values)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kategoriya matcher benchmark")
+    parser.add_argument("--values", type=int, default=100000, help="Xom kategoriyalar soni")
+    parser.add_argument("--unique", type=float, default=0.05,
+                        help="Noyob qiymatlar ulushi (qolganlari takrorlanadi)")
+    args = parser.parse_args()
+
+    from core.catigories import STANDARD_CATEGORIES
+    from utils.category_matcher import CategoryMatcher
+
+    values = make_values(args.values, args.unique)
+    keywords = sum(len(kws) for kws in STANDARD_CATEGORIES.values())
+    print(f"🧪 Kategoriya matcher benchmark: {args.values} ta qiymat, {len(set(values))} ta noyob "
+          f"({len(STANDARD_CATEGORIES)} kategoriya, {keywords} kalit so'z)")
+
+    start = time.perf_counter()
+    matcher = CategoryMatcher()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rows = []
+    legacy_seconds, reference = timed(
+        lambda vs: [legacy_normalize_category(v) for v in vs], values)
+    rows.append(("eski (ichma-ich sikl)", legacy_seconds, True))
+
+    uncached = CategoryMatcher(cache_size=0)
+    seconds, result = timed(lambda vs: [uncached.normalize(v) for v in vs], values)
+    rows.append(("avtomat (cache'siz)", seconds, result == reference))
+
+    seconds, result = timed(matcher.normalize_many, values)
+    rows.append(("avtomat + cache (batch)", seconds, result == reference))
+
+    print("=" * 76)
+    print(f"{'Yo‘l':<26} {'Vaqt (ms)':>11} {'Qiymat/s':>13} {'Tezlanish':>11} {'Natija':>9}")
+    print("-" * 76)
+    for name, seconds, same in rows:
+        print(f"{name:<26} {seconds * 1000:>11,.1f} {args.values / seconds:>13,.0f} "
+              f"{legacy_seconds / seconds:>10.1f}x {'✅' if same else '❌ farq':>8}")
+    print("=" * 76)
+    info = matcher.cache_info()
+    print(f"   avtomat qurilishi: {build_ms:.1f} ms, cache: {info['hits']} hit / {info['misses']} miss")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+FileDB microbenchmark - eski (har chaqiruvda yangi ulanish) va pool rejimini solishtirish.
+
+Foydalanish:
+    python scripts/benchmarks/bench_filedb.py
+    python scripts/benchmarks/bench_filedb.py --rows 5000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.FileDB import FileDB  # noqa: E402
+from core.async_db import AsyncFileDB  # noqa: E402
+
+
+def _make_item(i: int) -> dict:
+    return {
+        "file_page": f"https://example.com/film/{i}",
+        "title": f"Film {i}",
+        "categories": "movies, action",
+        "file_url": f"https://cdn.example.com/{i}.mp4",
+        "year": "2024",
+        "country": "UZ",
+    }
+
+
+def _ops_per_sec(count: int, seconds: float) -> float:
+    return count / seconds if seconds > 0 else 0.0
+
+
+def run_case(pooled: bool, rows: int) -> dict:
+    """Bitta rejim uchun insert/exists/get/update ops/sec o'lchash"""
+    tmp_dir = tempfile.mkdtemp(prefix="bench_filedb_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    db = FileDB(db_path=db_path, pooled=pooled)
+    results = {}
+
+    start = time.perf_counter()
+    for i in range(rows):
+        db.insert_file("bench", _make_item(i))
+    results["insert_file"] = _ops_per_sec(rows, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(rows):
+        db.file_exists("bench", f"https://example.com/film/{i}")
+    results["file_exists"] = _ops_per_sec(rows, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(1, rows + 1):
+        db.get_file(i)
+    results["get_file"] = _ops_per_sec(rows, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(1, rows + 1):
+        db.update_file(i, local_path=f"downloads/{i}.mp4", file_size=i)
+    results["update_file"] = _ops_per_sec(rows, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    db.insert_files("bench_bulk", [_make_item(i) for i in range(rows)])
+    results["insert_files"] = _ops_per_sec(rows, time.perf_counter() - start)
+
+    db.close()
+    return results
+
+
+def run_existence_filter(links: int) -> dict:
+    """Scraper filtri: har link uchun file_exists va bitta existing_pages chaqiruvi"""
+    tmp_dir = tempfile.mkdtemp(prefix="bench_filedb_")
+    db = FileDB(db_path=os.path.join(tmp_dir, "bench.db"), pooled=True)
+    # Linklarning yarmi DB'da mavjud
+    db.insert_files("bench", [_make_item(i) for i in range(0, links, 2)])
+    pages = [f"https://example.com/film/{i}" for i in range(links)]
+
+    start = time.perf_counter()
+    found_loop = [p for p in pages if db.file_exists("bench", p)]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found_set = db.existing_pages("bench", pages)
+    set_seconds = time.perf_counter() - start
+
+    assert len(found_loop) == len(found_set)
+    db.close()
+    return {"file_exists loop": loop_seconds, "existing_pages": set_seconds}
+
+
+def run_search(rows: int) -> dict:
+    """Qidiruv: eski Python substring skani va FTS5 FileDB.search"""
+    rng = random.Random(42)
+    vocab = [f"soz{i}" for i in range(5000)]
+    tmp_dir = tempfile.mkdtemp(prefix="bench_filedb_")
+    db = FileDB(db_path=os.path.join(tmp_dir, "bench.db"), pooled=True)
+    db.insert_files("bench", [
+        dict(_make_item(i),
+             title=" ".join(rng.sample(vocab, 3)),
+             description=" ".join(rng.choices(vocab, k=30)),
+             actors=", ".join(rng.sample(vocab, 2)))
+        for i in range(rows)
+    ])
+    queries = rng.sample(vocab, 20)
+    fields = ("title", "description", "actors", "categories", "country", "file_url")
+
+    start = time.perf_counter()
+    for query in queries:
+        [row for row in db.iter_files("bench")
+         if any(query in str(row[f] or "").lower() for f in fields)]
+    scan_seconds = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    for query in queries:
+        db.search("bench", query, limit=50)
+    fts_seconds = (time.perf_counter() - start) / len(queries)
+
+    db.close()
+    return {"python scan": scan_seconds, "FileDB.search": fts_seconds}
+
+
+def run_write_behind(rows: int) -> dict:
+    """Consumer post-upload kabi 2 ta update/qator: to'g'ridan-to'g'ri va write-behind"""
+    async def case(write_behind: bool) -> tuple:
+        tmp_dir = tempfile.mkdtemp(prefix="bench_filedb_")
+        db = AsyncFileDB(db_path=os.path.join(tmp_dir, "bench.db"), write_behind=write_behind)
+        await db.insert_files("bench", [_make_item(i) for i in range(rows)])
+
+        async def post_upload(file_id: int):
+            await db.update_file(file_id, uploaded=True, local_path=f"d/{file_id}.mp4")
+            await db.update_file(file_id, local_path=None)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post_upload(i) for i in range(1, rows + 1)))
+        await db.flush()
+        seconds = time.perf_counter() - start
+        commits = db.write_stats["flushes"] if write_behind else rows * 2
+        await db.close()
+        return seconds, commits
+
+    return {
+        "direct": asyncio.run(case(False)),
+        "write-behind": asyncio.run(case(True)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FileDB ops/sec benchmark")
+    parser.add_argument("--rows", type=int, default=2000,
+                        help="Har bir operatsiya uchun qatorlar soni")
+    parser.add_argument("--links", type=int, default=50000,
+                        help="Mavjudlik filtri uchun linklar soni")
+    parser.add_argument("--update-rows", type=int, default=5000,
+                        help="Write-behind benchmarki uchun qatorlar soni")
+    parser.add_argument("--search-rows", type=int, default=100000,
+                        help="Qidiruv benchmarki uchun qatorlar soni")
+    args = parser.parse_args()
+
+    print(f"🧪 FileDB benchmark: {args.rows} ta qator")
+    legacy = run_case(pooled=False, rows=args.rows)
+    pooled = run_case(pooled=True, rows=args.rows)
+
+    print("=" * 64)
+    print(f"{'Operatsiya':<14} {'Eski (ops/s)':>15} {'Pool+WAL (ops/s)':>18} {'Tezlanish':>12}")
+    print("-" * 64)
+    for op in legacy:
+        speedup = pooled[op] / legacy[op] if legacy[op] else 0
+        print(f"{op:<14} {legacy[op]:>15,.0f} {pooled[op]:>18,.0f} {speedup:>11.1f}x")
+    print("=" * 64)
+
+    print(f"\n🔎 Mavjudlik filtri: {args.links} ta link")
+    for name, seconds in run_existence_filter(args.links).items():
+        print(f"   {name:<18} {seconds * 1000:>10,.1f} ms")
+
+    print(f"\n🔍 Qidiruv: {args.search_rows} ta qator (bitta so'rov uchun o'rtacha)")
+    for name, seconds in run_search(args.search_rows).items():
+        print(f"   {name:<18} {seconds * 1000:>10,.1f} ms")
+
+    print(f"\n✍️ Status yangilash: {args.update_rows} ta qator x 2 update (AsyncFileDB)")
+    for name, (seconds, commits) in run_write_behind(args.update_rows).items():
+        print(f"   {name:<18} {seconds * 1000:>10,.1f} ms   commit: {commits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+parse_page_fields benchmark - HTML backendlar (bs4 / lxml / selectolax) tezligi.
+
+tests/fixtures/pages dagi saqlangan film sahifalari (asilmedia, daxshat) har bir
+backend bilan kompilyatsiya qilingan plan orqali parse qilinadi. "eski" qatori
+plan'siz eski yo'l: har sahifada BeautifulSoup(html.parser) va har maydon uchun
+selector satrlarini qayta ajratish. Natijalar bs4 bilan solishtiriladi.
+
+Foydalanish:
+    python scripts/benchmarks/bench_html_parser.py
+    python scripts/benchmarks/bench_html_parser.py --pages 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+FIXTURES = project_root / "tests" / "fixtures" / "pages"
+CASES = [
+    ("asilmedia", "asilmedia_film.html", "http://asilmedia.org/123-qasoskorlar-final.html"),
+    ("daxshat_net_tarjima", "daxshat_film.html", "https://new.daxshat.net/998-tungi-ov.html"),
+]
+
+
+def legacy_parse_page_fields(config: dict, html: str, base_url: str) -> dict:
+    """Plan'dan oldingi parse_page_fields (taqqoslash uchun)"""
+    from bs4 import BeautifulSoup
+
+    item = {}
+    soup = BeautifulSoup(html, "html.parser")
+    base_domain = "{uri.scheme}://{uri.netloc}".format(uri=urlparse(base_url))
+    meta_data = {}
+    if config["fields"].get("meta"):
+        el = soup.select_one(config["fields"]["meta"].replace("::text", "").strip())
+        if el:
+            for line in el.get_text("\n", strip=True).split("\n"):
+                parts = line.split(":", 1)
+                if len(parts) == 2:
+                    meta_data[parts[0].strip()] = parts[1].strip()
+
+    for key, sel in config["fields"].items():
+        if not sel or key == "meta":
+            continue
+        if sel.startswith("meta:"):
+            value = meta_data.get(sel.split("meta:")[1].strip())
+        else:
+            value = None
+            for s in [s.strip() for s in sel.split("|")]:
+                if "::text" in s:
+                    el = soup.select_one(s.replace("::text", "").strip())
+                    if el:
+                        value = el.get_text(" ", strip=True)
+                elif "::attr(" in s:
+                    el = soup.select_one(s.split("::attr(")[0].strip())
+                    if el:
+                        value = el.get(s.split("::attr(")[1].replace(")", "").strip())
+                else:
+                    el = soup.select_one(s)
+                    if el:
+                        value = el.get_text(" ", strip=True)
+                if value:
+                    break
+            if value and key in ["image", "file_url", "file_picture"] and not value.startswith("http"):
+                value = urljoin(base_domain, value)
+        item[key] = value
+    return item
+
+
+def run_case(parse, pages: list, count: int) -> float:
+    """count ta sahifani parse qilish vaqti (soniya)"""
+    start = time.perf_counter()
+    for i in range(count):
+        config, html, url = pages[i % len(pages)]
+        parse(config, html, url)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML parser backend benchmark")
+    parser.add_argument("--pages", type=int, default=500, help="Parse qilinadigan sahifalar soni")
+    args = parser.parse_args()
+
+    from utils.logger_core import logger
+    logger.setLevel("WARNING")
+
+    from core.site_configs import SITE_CONFIGS
+    from scraper.parsers.extraction import BACKENDS, compile_plan, extract_fields, get_backend
+
+    pages = [(SITE_CONFIGS[site], (FIXTURES / name).read_text(encoding="utf-8"), url)
+             for site, name, url in CASES]
+    avg_kb = sum(len(html) for _, html, _ in pages) / len(pages) / 1024
+    print(f"🧪 parse_page_fields benchmark: {args.pages} ta sahifa "
+          f"({len(pages)} fixture, o'rtacha {avg_kb:.0f} KB)")
+
+    rows = []
+    reference = [legacy_parse_page_fields(*page) for page in pages]
+    rows.append(("eski (bs4, plan'siz)", run_case(legacy_parse_page_fields, pages, args.pages), True))
+
+    for name in BACKENDS:
+        backend = get_backend(name)
+        if backend.name != name:
+            print(f"⚠️ {name} o'rnatilmagan - o'tkazib yuborildi")
+            continue
+
+        def parse(config, html, url, backend=backend):
+            return extract_fields(compile_plan(config["fields"]), backend, html, url)
+
+        same = [parse(*page) for page in pages] == reference
+        rows.append((f"{name} + plan", run_case(parse, pages, args.pages), same))
+
+    baseline = rows[0][1]
+    print("=" * 72)
+    print(f"{'Backend':<24} {'Vaqt (ms)':>12} {'Sahifa/s':>12} {'Tezlanish':>11} {'Natija':>9}")
+    print("-" * 72)
+    for name, seconds, same in rows:
+        print(f"{name:<24} {seconds * 1000:>12,.1f} {args.pages / seconds:>12,.1f} "
+              f"{baseline / seconds:>10.1f}x {'✅' if same else '❌ farq':>8}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
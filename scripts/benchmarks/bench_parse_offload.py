@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Parse offload benchmark - parse + normallash event loop'da va ProcessPoolExecutor'da.
+
+Lokal aiohttp stub tests/fixtures/pages dagi film sahifalarini (sun'iy tarmoq
+kechikishi bilan) beradi. Har sahifa: fetch_page_html + parse_page_fields +
+normalize_extracted_data (scrape_file_page_safe dagi kabi, hajm tekshiruvisiz).
+Ish davomida LoopLagMonitor event loop kechikishini o'lchaydi.
+
+Foydalanish:
+    python scripts/benchmarks/bench_parse_offload.py
+    python scripts/benchmarks/bench_parse_offload.py --pages 400 --concurrency 20 --workers 4 --backend bs4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+# Lokal stub uchun host rate limiter o'lchovga aralashmasin
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+FIXTURES = project_root / "tests" / "fixtures" / "pages"
+SITES = [("asilmedia", "asilmedia_film.html"), ("daxshat_net_tarjima", "daxshat_film.html")]
+
+
+async def _start_stub(latency: float):
+    """Fixture sahifalarni latency soniya kechikish bilan beruvchi server"""
+    from aiohttp import web
+
+    pages = [(FIXTURES / name).read_text(encoding="utf-8") for _, name in SITES]
+
+    async def film_page(request):
+        await asyncio.sleep(latency)
+        i = int(request.match_info["i"])
+        return web.Response(text=pages[i % len(pages)], content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/film/{i}", film_page)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def run_case(workers: int, args) -> dict:
+    """Bitta rejim: workers=0 - event loop'da, >0 - process pool'da"""
+    from core.site_configs import SITE_CONFIGS
+    from scraper.http_client import create_http_session
+    from scraper.loop_monitor import LoopLagMonitor
+    from scraper.parse_pool import activate_parse_pool, create_parse_executor, deactivate_parse_pool
+    from scraper.parsers.parse_file_page import (
+        _parse_in_pool, fetch_page_html, normalize_extracted_data, parse_page_fields)
+
+    configs = [{**SITE_CONFIGS[site], "name": site, "html_parser_backend": args.backend,
+                "parse_workers": workers} for site, _ in SITES]
+    runner, base = await _start_stub(args.latency)
+    session = create_http_session({"http_limit_per_host": args.concurrency})
+    executor = create_parse_executor(configs[0])
+    token = activate_parse_pool(executor)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    ok = 0
+
+    async def one(i: int):
+        nonlocal ok
+        config = configs[i % len(configs)]
+        url = f"{base}/film/{i}"
+        async with semaphore:
+            html = await fetch_page_html(url, session=session)
+            item = await _parse_in_pool(config, html, url)
+            if item is None:
+                item = parse_page_fields(config, html, url)
+                item = await normalize_extracted_data(item)
+            if item.get("title"):
+                ok += 1
+
+    try:
+        if executor is not None:
+            # Worker process'larni oldindan ishga tushirish (start-up vaqtini o'lchamaslik)
+            await asyncio.gather(*(
+                asyncio.get_running_loop().run_in_executor(executor, os.getpid)
+                for _ in range(workers)))
+        async with LoopLagMonitor(interval=0.01) as monitor:
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.pages)))
+            elapsed = time.perf_counter() - start
+    finally:
+        deactivate_parse_pool(token)
+        if executor is not None:
+            executor.shutdown()
+        await session.close()
+        await runner.cleanup()
+
+    return {"seconds": elapsed, "pages_per_sec": args.pages / elapsed, "ok": ok, **monitor.report()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse offload (process pool) benchmark")
+    parser.add_argument("--pages", type=int, default=200, help="Film sahifalari soni")
+    parser.add_argument("--concurrency", type=int, default=20, help="scrape_concurrency")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="parse_workers (process pool hajmi)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub javob kechikishi (s)")
+    parser.add_argument("--backend", default="bs4", help="html_parser_backend (bs4 | lxml | selectolax)")
+    args = parser.parse_args()
+
+    from utils.logger_core import logger
+    logger.setLevel("WARNING")
+
+    print(f"🧪 Parse offload benchmark: {args.pages} sahifa, concurrency={args.concurrency}, "
+          f"backend={args.backend}, latency={args.latency * 1000:.0f} ms")
+    inline = asyncio.run(run_case(0, args))
+    pooled = asyncio.run(run_case(args.workers, args))
+
+    print("=" * 86)
+    print(f"{'Rejim':<26} {'Vaqt (s)':>9} {'Sahifa/s':>10} {'Lag o`rt.':>10} "
+          f"{'Lag p95':>9} {'Lag max':>9} {'OK':>6}")
+    print("-" * 86)
+    for name, r in (("Event loop ichida", inline), (f"ProcessPool ({args.workers} worker)", pooled)):
+        print(f"{name:<26} {r['seconds']:>9.2f} {r['pages_per_sec']:>10.1f} {r['mean_ms']:>8.1f}ms "
+              f"{r['p95_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms {r['ok']:>6}")
+    print("=" * 86)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Scraper HTTP benchmark - har URL uchun yangi ClientSession va umumiy pooled session.
+
+Lokal HTTP stub (aiohttp.web) film sahifalari va video hajmi (HEAD) uchun javob beradi.
+Har bir film: fetch_page_html + validate_and_optimize_file (scraper detail oqimi kabi).
+Server tomonida ochilgan TCP ulanishlar soni ham hisoblanadi.
+
+Foydalanish:
+    python scripts/benchmarks/bench_scraper_http.py
+    python scripts/benchmarks/bench_scraper_http.py --pages 1000 --concurrency 10 --tls
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+# Lokal stub uchun host rate limiter o'lchovga aralashmasin
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# Har rejim bir xil video URL'larni HEAD qiladi - URL metadata cache o'chiriladi
+os.environ.setdefault("URL_META_TTL", "0")
+
+VIDEO_SIZE = 500 * 1024 * 1024  # FILE_MIN_SIZE < hajm < MAX_SIZE_BYTES
+
+
+def _make_cert(directory: str) -> tuple:
+    """127.0.0.1 uchun self-signed sertifikat (openssl CLI orqali)"""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True)
+    return cert, key
+
+
+async def _start_stub(ssl_context=None):
+    """Film sahifalari va video HEAD javoblari uchun lokal server"""
+    from aiohttp import web
+
+    connections = set()
+    html = "<html><body><h1 class='title'>Film</h1>" + "<p>tavsif</p>" * 200 + "</body></html>"
+
+    async def film_page(request):
+        connections.add(request.transport.get_extra_info("peername"))
+        return web.Response(text=html, content_type="text/html")
+
+    async def video_head(request):
+        connections.add(request.transport.get_extra_info("peername"))
+        return web.Response(headers={"Content-Length": str(VIDEO_SIZE)})
+
+    app = web.Application()
+    app.router.add_get("/film/{i}", film_page)
+    app.router.add_route("HEAD", "/video/{i}.mp4", video_head)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port, connections
+
+
+async def run_case(pooled: bool, pages: int, concurrency: int, tls: bool, cert_key=None) -> dict:
+    """Bitta rejimni o'lchash: vaqt, sahifa/s va server tomonidagi ulanishlar"""
+    import ssl
+
+    from scraper.http_client import create_http_session
+    from scraper.parsers.parse_file_page import fetch_page_html, validate_and_optimize_file
+
+    ssl_context = None
+    if tls:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(*cert_key)
+
+    runner, port, connections = await _start_stub(ssl_context)
+    base = f"{'https' if tls else 'http'}://127.0.0.1:{port}"
+    config = {"http_limit_per_host": concurrency * 2}
+    session = create_http_session(config) if pooled else None
+    semaphore = asyncio.Semaphore(concurrency)
+    ok = 0
+
+    async def one(i: int):
+        nonlocal ok
+        async with semaphore:
+            html = await fetch_page_html(f"{base}/film/{i}", session=session)
+            item = {"file_page": f"{base}/film/{i}", "file_url": f"{base}/video/{i}.mp4"}
+            item = await validate_and_optimize_file(item, session=session)
+            if html and item.get("file_size") == VIDEO_SIZE:
+                ok += 1
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(pages)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if session is not None:
+            await session.close()
+        await runner.cleanup()
+
+    return {
+        "seconds": elapsed,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "connections": len(connections),
+        "ok": ok,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper HTTP session benchmark")
+    parser.add_argument("--pages", type=int, default=500,
+                        help="Film sahifalari soni (har biri: sahifa + HEAD)")
+    parser.add_argument("--concurrency", type=int, default=5,
+                        help="Parallel so'rovlar (scrape_concurrency)")
+    parser.add_argument("--tls", action="store_true",
+                        help="HTTPS stub (self-signed, openssl kerak) - TLS handshake narxini ham o'lchash")
+    args = parser.parse_args()
+
+    cert_key = None
+    if args.tls:
+        cert_key = _make_cert(tempfile.mkdtemp(prefix="bench_http_"))
+        # aiohttp default SSL context'i import paytida yaratiladi - import'dan oldin
+        os.environ["SSL_CERT_FILE"] = cert_key[0]
+
+    # Log chiqishini kamaytirish (har so'rov uchun debug yozuvlar)
+    from utils.logger_core import logger
+    logger.setLevel("WARNING")
+
+    scheme = "HTTPS" if args.tls else "HTTP"
+    print(f"🧪 Scraper {scheme} benchmark: {args.pages} ta sahifa, concurrency={args.concurrency}")
+    fresh = asyncio.run(run_case(False, args.pages, args.concurrency, args.tls, cert_key))
+    pooled = asyncio.run(run_case(True, args.pages, args.concurrency, args.tls, cert_key))
+
+    print("=" * 72)
+    print(f"{'Rejim':<22} {'Vaqt (ms)':>12} {'Sahifa/s':>12} {'TCP ulanish':>13} {'OK':>8}")
+    print("-" * 72)
+    for name, result in (("Har URL yangi session", fresh), ("Umumiy pooled session", pooled)):
+        print(f"{name:<22} {result['seconds'] * 1000:>12,.1f} {result['pages_per_sec']:>12,.1f} "
+              f"{result['connections']:>13} {result['ok']:>8}")
+    print("=" * 72)
+    speedup = pooled["pages_per_sec"] / fresh["pages_per_sec"] if fresh["pages_per_sec"] else 0
+    print(f"⚡ Tezlanish: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
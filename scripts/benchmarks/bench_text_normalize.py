@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Matn normallash benchmark - clean_title, transliteratsiya va description.
+
+tests/fixtures/titles.txt dagi sayt uslubidagi nomlardan itemlar yasaladi:
+aktyorlar, davlatlar va janrlar kichik pool'dan takrorlanadi (haqiqiy
+ma'lumotlardagidek). "eski" qatori kompilyatsiya va cache'siz eski yo'l:
+har title uchun 24 ta re.sub, har maydon uchun UzTransliterator. Yangi yo'l
+natijalari eski natija bilan solishtiriladi.
+
+Foydalanish:
+    python scripts/benchmarks/bench_text_normalize.py
+    python scripts/benchmarks/bench_text_normalize.py --items 100000 --unique 0.3
+"""
+import argparse
+import copy
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+TITLES = project_root / "tests" / "fixtures" / "titles.txt"
+ACTORS = ["Том Холланд", "Зендея", "Роберт Дауни мл.", "Крис Эванс", "Скарлетт Йоханссон",
+          "Шахрух Хан", "Дипика Падуконе", "Бурак Озчивит", "Эсра Бильгич", "Tom Hardy",
+          "Ван Дизель", "Джейсон Стэйтем", "Киану Ривз", "Margot Robbie", "Райан Гослинг"]
+COUNTRIES = ["США", "Индия", "Турция", "Россия", "Великобритания", "Франция", "Корея Южная",
+             "Япония", "USA", "Канада"]
+GENRES = ["Боевик", "Драма", "Комедия", "Фантастика", "Приключения", "Мультфильм",
+          "Мелодрама", "Триллер", "Ужасы", "Криминал"]
+DESCRIPTION = ("Film voqealari kichik shaharchada boshlanadi.\n"
+               "Действие фильма начинается в маленьком городке.\n"
+               "Qahramon o'z o'tmishi bilan yuzlashishga majbur bo'ladi.")
+
+LEGACY_PATTERNS = [
+    r"\(?\s*O[`']?zbek(cha)?\s*tilida\s*\)?", r"\(?\s*Tarjima\s*kino\s*\)?",
+    r"Uzbek\s*tilida.*?(skachat|HD|tas-ix)?",
+    r"O[`']?zbek(cha)?\s*tarjima\s*kino.*?(skachat|HD|tas-ix)?",
+    r"Premyera", r"Jangari\s*kino", r"Смотреть\s*Tas-ix", r"Full\s*HD", r"tas-ix", r"skachat",
+    r"\(\s*\)", r"\[\s*\]", r"\b(19|20)\d{2}\b", r"\bHD\b", r"O['`]?zbekchaHD",
+    r"O['`]?zbek\s*tarjima", r"Turk\s*kinosi", r"Hind\s*kino", r"-\s*qismlar!?+", r"[!]{2,}",
+    r"\b\d+-\d+-\d+\b", r"\b\d+(?:-\d+)+\b", r"\b\d+(?:,\d+)+\b", r"\b\d+\s*qism(lar)?\b",
+]
+
+
+def legacy_clean_title(text: str) -> str:
+    """Kompilyatsiya va cache'dan oldingi clean_title (taqqoslash uchun)"""
+    if not text:
+        return ""
+    clean = text
+    for pattern in LEGACY_PATTERNS:
+        clean = re.sub(pattern, "", clean, flags=re.IGNORECASE)
+    clean = re.sub(r"[\[\]\(\)]", "", clean)
+    clean = re.sub(r"\s{2,}", " ", clean)
+    return clean.strip(" ,.-")
+
+
+def legacy_normalize(items: list) -> list:
+    """Eski normalize_item_title + normalize_item_fields + normalize_description"""
+    from utils.translator import cyrillic_to_latin
+
+    for item in items:
+        if item.get("title"):
+            item["title"] = legacy_clean_title(item["title"])
+        item.setdefault("language", "uz")
+        for key in ("country", "actors", "categories"):
+            if isinstance(item.get(key), str) and item[key]:
+                if key == "country":
+                    countries = [c.strip() for c in item[key].split(",") if c.strip()]
+                    item[key] = ", ".join(cyrillic_to_latin(c) for c in countries).upper()
+                else:
+                    item[key] = cyrillic_to_latin(item[key])
+        parts = [p.strip() for p in item["description"].split("\n") if p.strip()]
+        uz_parts = [p for p in parts if not re.search(r"[А-Яа-яЁё]", p)]
+        item["description"] = " ".join(uz_parts or parts).strip()
+    return items
+
+
+def make_items(count: int, unique: float, seed: int = 1) -> list:
+    """count ta item: title'larning `unique` ulushi noyob (serial qismi raqami bilan)"""
+    rng = random.Random(seed)
+    titles = TITLES.read_text(encoding="utf-8").splitlines()
+    items = []
+    for i in range(count):
+        title = rng.choice(titles)
+        if rng.random() < unique:
+            title = f"{title} {i}-qism"
+        items.append({
+            "title": title,
+            "actors": ", ".join(rng.sample(ACTORS, 4)),
+            "country": ", ".join(rng.sample(COUNTRIES, rng.randint(1, 2))),
+            "categories": ", ".join(rng.sample(GENRES, 2)),
+            "description": DESCRIPTION,
+        })
+    return items
+
+
+def timed(func, items: list) -> tuple:
+    start = time.perf_counter()
+    result = func(items)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matn normallash benchmark")
+    parser.add_argument("--items", type=int, default=20000, help="Itemlar soni")
+    parser.add_argument("--unique", type=float, default=0.3,
+                        help="Noyob title'lar ulushi (qolganlari korpusdan takrorlanadi)")
+    args = parser.parse_args()
+
+    from utils.text import clean_title, clear_text_caches, normalize_items, text_cache_report
+
+    items = make_items(args.items, args.unique)
+    titles = [item["title"] for item in items]
+    print(f"🧪 Matn normallash benchmark: {args.items} ta item, "
+          f"{len(set(titles))} ta noyob title ({TITLES.name})")
+
+    rows = []
+    legacy_seconds, reference = timed(legacy_normalize, copy.deepcopy(items))
+    rows.append(("eski (re.sub + translit)", legacy_seconds, True))
+
+    def titles_only(values, clean=clean_title):
+        return [clean(value) for value in values]
+
+    legacy_titles_seconds, legacy_titles = timed(
+        lambda values: [legacy_clean_title(v) for v in values], titles)
+    rows.append(("eski clean_title", legacy_titles_seconds, True))
+
+    # Cache'siz: faqat kompilyatsiya + kalit bo'yicha o'tkazib yuborish
+    uncached = clean_title.__wrapped__
+    seconds, result = timed(lambda values: titles_only(values, uncached), titles)
+    rows.append(("clean_title (cache'siz)", seconds, result == legacy_titles))
+
+    clear_text_caches()
+    seconds, result = timed(titles_only, titles)
+    rows.append(("clean_title (cache)", seconds, result == legacy_titles))
+
+    clear_text_caches()
+    seconds, result = timed(normalize_items, copy.deepcopy(items))
+    rows.append(("normalize_items", seconds, result == reference))
+    report = text_cache_report()
+
+    print("=" * 76)
+    print(f"{'Yo‘l':<28} {'Vaqt (ms)':>11} {'Item/s':>12} {'Tezlanish':>11} {'Natija':>9}")
+    print("-" * 76)
+    for name, seconds, same in rows:
+        base = legacy_titles_seconds if "clean_title" in name else legacy_seconds
+        print(f"{name:<28} {seconds * 1000:>11,.1f} {args.items / seconds:>12,.0f} "
+              f"{base / seconds:>10.1f}x {'✅' if same else '❌ farq':>8}")
+    print("=" * 76)
+    for name, stats in report.items():
+        total = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / total * 100 if total else 0
+        print(f"   {name:<9} cache: {stats['hits']} hit / {stats['misses']} miss ({ratio:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
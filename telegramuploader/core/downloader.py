@@ -9,6 +9,8 @@ from tqdm.asyncio import tqdm
 from typing import Optional
 
 from utils.logger_core import logger
+from utils.rate_limiter import throttle
+from utils.url_meta import get_url_meta_cache
 
 
 class FileDownloader:
@@ -60,17 +62,18 @@ class FileDownloader:
         """
         async with semaphore:
             try:
-                # Avval file size olish
-                async with session.head(file_url) as head_resp:
-                    file_size = int(head_resp.headers.get("Content-Length", 0))
+                # Avval file size olish (producer tekshirgan bo'lsa cache'dan - HEAD yo'q)
+                file_size = await self.get_file_size(session, file_url)
                 
                 # ⚡ TIMEOUT OLIB TASHLANDI - muvaffaqiyatli yuklab olishni to'xtatmaymiz
                 # timeout_seconds = self.calculate_timeout(file_size)
                 
                 # ✅ Timeout siz download - 4 soat ham bo'lsa kutamiz
-                async with session.get(file_url) as resp:
+                async with throttle(file_url) as outcome, session.get(file_url) as resp:
+                    outcome.observe(resp)
                     if resp.status != 200:
                         logger.error(f"❌ Yuklab bo'lmadi: {file_url}")
+                        get_url_meta_cache().invalidate(file_url)
                         return None
 
                     total = int(resp.headers.get("Content-Length", file_size or 0))
@@ -92,6 +95,7 @@ class FileDownloader:
                 # Tekshiramiz: to'liq yuklandi (agar Content-Length bor bo'lsa)
                 if total and os.path.getsize(output_path) != total:
                     logger.error(f"❌ Fayl to'liq yuklanmadi: {filename}")
+                    get_url_meta_cache().invalidate(file_url)
                     os.remove(output_path)
                     return None
 
@@ -105,7 +109,7 @@ class FileDownloader:
 
     async def get_file_size(self, session: aiohttp.ClientSession, file_url: str) -> int:
         """
-        URL dan fayl hajmini olish
+        URL dan fayl hajmini olish (URL metadata cache, kerak bo'lsa HEAD / Range GET)
 
         Args:
             session: aiohttp session
@@ -114,53 +118,15 @@ class FileDownloader:
         Returns:
             File size in bytes, 0 if failed
         """
-        try:
-            # Avval HEAD so'rov bilan sinab ko'ramiz
-            async with session.head(file_url) as resp:
-                if resp.status == 200 and 'content-length' in resp.headers:
-                    content_length = resp.headers.get("Content-Length", "0")
-                    if content_length and content_length != "0":
-                        size = int(content_length)
-                        # Oqilona hajm tekshiruvi - 500GB dan katta bo'lsa, 0 qaytarish
-                        if size > 500 * 1024**3:  # 500GB limit
-                            logger.warning(f"⚠️ Juda katta fayl hajmi (HEAD): {size / (1024**3):.2f} GB, 0 qaytariladi")
-                            return 0
-                        return size
-
-            # HEAD ishlamasa, GET so'rov bilan range header ishlatamiz
-            headers = {'Range': 'bytes=0-0'}
-            async with session.get(file_url, headers=headers) as resp:
-                if resp.status in [206, 200]:  # 206 = Partial Content, 200 = OK
-                    # Content-Range headerdan to'liq hajmni olish
-                    content_range = resp.headers.get('Content-Range')
-                    if content_range:
-                        # Format: "bytes 0-0/total_size"
-                        if '/' in content_range:
-                            total_size = content_range.split('/')[-1]
-                            if total_size.isdigit():
-                                size = int(total_size)
-                                # Oqilona hajm tekshiruvi - 500GB dan katta bo'lsa, 0 qaytarish
-                                if size > 500 * 1024**3:  # 500GB limit
-                                    logger.warning(f"⚠️ Juda katta fayl hajmi (range): {size / (1024**3):.2f} GB, 0 qaytariladi")
-                                    return 0
-                                return size
-
-                    # Content-Length headerdan olish
-                    content_length = resp.headers.get("Content-Length", "0")
-                    if content_length and content_length != "0":
-                        size = int(content_length)
-                        # Oqilona hajm tekshiruvi - 500GB dan katta bo'lsa, 0 qaytarish
-                        if size > 500 * 1024**3:  # 500GB limit
-                            logger.warning(f"⚠️ Juda katta fayl hajmi: {size / (1024**3):.2f} GB, 0 qaytariladi")
-                            return 0
-                        return size
-
-            logger.warning(f"⚠️ Fayl hajmini aniqlab bo'lmadi: {file_url}")
-            return 0
-
-        except Exception as e:
-            logger.error(f"❌ Fayl hajmini olishda xato: {e}")
+        # Scraper yoki oldingi run'da tekshirilgan bo'lsa - HEAD so'rovsiz
+        size = (await get_url_meta_cache().get(session, file_url))["size"]
+        # Oqilona hajm tekshiruvi - 500GB dan katta bo'lsa, 0 qaytarish
+        if size > 500 * 1024**3:  # 500GB limit
+            logger.warning(f"⚠️ Juda katta fayl hajmi: {size / (1024**3):.2f} GB, 0 qaytariladi")
             return 0
+        if not size:
+            logger.warning(f"⚠️ Fayl hajmini aniqlab bo'lmadi: {file_url}")
+        return size
 
     def check_file_integrity(self, file_path: str, expected_size: int, tolerance_mb: int = 5) -> tuple[bool, str]:
         """
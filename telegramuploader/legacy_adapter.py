@@ -10,7 +10,7 @@ import asyncio
 import aiohttp
 from typing import List, Dict, Any
 
-from core.FileDB import FileDB
+from core.async_db import AsyncFileDB, get_async_db
 import sys
 import os
 # Add the parent directory to sys.path to import telegram module
@@ -20,7 +20,7 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 
-async def check_and_queue_existing_files(db: FileDB, config: Dict[str, Any]) -> None:
+async def check_and_queue_existing_files(db: AsyncFileDB, config: Dict[str, Any]) -> None:
     """
     Downloads papkasidagi mavjud fayllarni tekshirish va upload queue ga qo'yish
     """
@@ -42,7 +42,7 @@ async def check_and_queue_existing_files(db: FileDB, config: Dict[str, Any]) ->
     logger.info(f"📁 {len(existing_files)} ta fayl topildi downloads papkasida")
     
     # Database dan barcha yuklanmagan fayllarni olish
-    all_undownloaded = db.get_undownloaded_files(config["name"])
+    all_undownloaded = await db.get_undownloaded_files(config["name"])
     
     # Mavjud fayllarni database bilan match qilish
     matched_files = []
@@ -71,14 +71,14 @@ async def check_and_queue_existing_files(db: FileDB, config: Dict[str, Any]) ->
                             logger.info(f"🗑️ Noto'g'ri fayl o'chirildi: {local_filename}")
                             
                             # Database da local_path ni reset qilish
-                            db.update_file(db_file["id"], local_path=None)
+                            await db.update_file(db_file["id"], local_path=None)
                             logger.info(f"🔄 Database status reset qilindi: {db_file['id']}")
                             
                         except Exception as e:
                             logger.error(f"❌ Faylni o'chirishda xato: {e}")
                     else:
                         # Fayl to'g'ri - database update qilish va upload queue ga qo'yish
-                        db.update_file(
+                        await db.update_file(
                             db_file["id"], 
                             local_path=str(local_file),
                             file_size=local_size
@@ -111,32 +111,32 @@ async def download_and_upload(CONFIG: Dict[str, Any]) -> None:
             check_interval=CONFIG.get("disk_check_interval", 60)
         )
 
-    db = FileDB()
+    # DB so'rovlari alohida thread'da - download/upload tasklarni to'xtatmaydi
+    db = get_async_db()
 
-    # ✅ Faqat yuklanmagan fayllarni olish
-    items = db.get_undownloaded_files(CONFIG["name"])
+    # ✅ Yuklanmagan fayllar soni (fayllarning o'zi partiyalab claim_batch orqali olinadi)
+    pending = await db.count_files(CONFIG["name"], where="undownloaded")
 
     # Config'da sort_by_size parametrini tekshirish
     sort_by_size = CONFIG.get("sort_by_size", False)
     if sort_by_size:
         logger.info(f"📊 Yuklanmagan fayllar eng kichik hajmdan boshlab tartiblanadi")
-        # Yuklanmagan fayllarni hajm bo'yicha tartiblash
-        items = sorted(items, key=lambda x: x.get('file_size', 0) or 0)
     else:
         logger.info(f"📊 Yuklanmagan fayllar standart tartibda qayta ishlanadi")
 
-    # print("items", items)
-    if not items:
+    if not pending:
         logger.warning(f"❌ {CONFIG['name']} uchun DB da fayl yo'q.")
         return
     else:
-        logger.info(f"📊 {len(items)} ta yuklanmagan fayl topildi {CONFIG['name']} uchun.")
+        logger.info(f"📊 {pending} ta yuklanmagan fayl topildi {CONFIG['name']} uchun.")
 
     # ✅ Local downloads papkasidagi mavjud fayllarni tekshirish
     await check_and_queue_existing_files(db, CONFIG)
 
     # --- DEBUG: Eng kichik 10 faylni ko'rsatish va tanlash ---
+    items = None
     if CONFIG.get("debug", False):
+        items = await db.get_undownloaded_files(CONFIG["name"])
         items = await select_debug_files(items, CONFIG)
         if not items:
             return
@@ -157,22 +157,34 @@ async def download_and_upload(CONFIG: Dict[str, Any]) -> None:
 
         # Streaming mode tekshirish
         use_streaming = CONFIG.get("use_streaming_upload", True)
-        
+        run_mode = "streaming" if use_streaming else mode
+
         if use_streaming:
             logger.info("🚀 Streaming mode - fayllar disk ga saqlanmaydi")
-            await orchestrator.process_files_streaming(items, session, sem, db)
         elif mode == "sequential":
             logger.info("🚀 Sequential mode - klassik qayta ishlash")
-            await orchestrator.process_files_sequential(items, session, sem, db)
         else:
             logger.info("🚀 Parallel mode - klassik qayta ishlash")
-            await orchestrator.process_files_parallel(items, session, sem, db)
 
+        if items is not None:
+            # Debug: tanlangan fayl to'g'ridan-to'g'ri (claim'siz)
+            if run_mode == "streaming":
+                await orchestrator.process_files_streaming(items, session, sem, db)
+            elif run_mode == "sequential":
+                await orchestrator.process_files_sequential(items, session, sem, db)
+            else:
+                await orchestrator.process_files_parallel(items, session, sem, db)
+        else:
+            # Fayllar lease bilan partiyalab olinadi - bir nechta server bitta DB'ni bo'lishadi
+            await orchestrator.process_claimed_files(session, sem, db, mode=run_mode)
+
+    # Write-behind buffer'dagi status yangilanishlarini yozib yuborish
+    await db.flush()
     logger.info(f"\n✅ Jarayon tugadi. {CONFIG['name']} fayllari yangilandi.")
 
 
 async def sequential_mode(items: List[Dict[str, Any]], session: aiohttp.ClientSession,
-                          sem: asyncio.Semaphore, CONFIG: Dict[str, Any], db: FileDB) -> None:
+                          sem: asyncio.Semaphore, CONFIG: Dict[str, Any], db: AsyncFileDB) -> None:
     """
     Legacy sequential mode function - yangi sistemani ishlatadi
 
@@ -188,7 +200,7 @@ async def sequential_mode(items: List[Dict[str, Any]], session: aiohttp.ClientSe
 
 
 async def parallel_mode(items: List[Dict[str, Any]], session: aiohttp.ClientSession,
-                        sem: asyncio.Semaphore, CONFIG: Dict[str, Any], db: FileDB) -> None:
+                        sem: asyncio.Semaphore, CONFIG: Dict[str, Any], db: AsyncFileDB) -> None:
     """
     Legacy parallel mode function - yangi sistemani ishlatadi
 
@@ -204,7 +216,7 @@ async def parallel_mode(items: List[Dict[str, Any]], session: aiohttp.ClientSess
 
 
 async def streaming_mode(items: List[Dict[str, Any]], session: aiohttp.ClientSession,
-                        sem: asyncio.Semaphore, CONFIG: Dict[str, Any], db: FileDB) -> None:
+                        sem: asyncio.Semaphore, CONFIG: Dict[str, Any], db: AsyncFileDB) -> None:
     """
     Streaming mode - fayllarni disk ga saqlamasdan to'g'ridan-to'g'ri yuklash
 
@@ -248,11 +260,10 @@ async def upload_only_mode(CONFIG: Dict[str, Any]) -> None:
     
     logger.info(f"📁 {len(existing_files)} ta video fayl topildi downloads papkasida")
     
-    db = FileDB()
+    db = get_async_db()
     
-    # Database dan barcha fayllarni olish va mavjud fayllar bilan match qilish
-    all_files = db.get_files(CONFIG["name"])
-    logger.info(f"📊 Database da {len(all_files)} ta fayl mavjud")
+    # Database fayllari ro'yxatga yig'ilmaydi - partiyalab o'qib, nom bo'yicha match qilinadi
+    logger.info(f"📊 Database da {await db.get_files_count(CONFIG['name'])} ta fayl mavjud")
     
     # 🔍 DIAGNOSTIKA: Birinchi 3 ta fayl nomini ko'rsatish
     logger.info("🔍 DIAGNOSTIKA: Downloads papkasidagi fayllar:")
@@ -260,7 +271,8 @@ async def upload_only_mode(CONFIG: Dict[str, Any]) -> None:
         logger.info(f"  [{i+1}] {local_file.name}")
     
     logger.info("🔍 DIAGNOSTIKA: Database dagi fayllar:")
-    for i, db_file in enumerate(all_files[:3]):
+    first_rows = [row async for row in db.iter_files(CONFIG["name"], limit=3)]
+    for i, db_file in enumerate(first_rows):
         expected_filename = safe_filename(db_file.get("name", "unknown"))
         telegram_status = "✅ Yuklangan" if db_file.get("uploaded", False) else "❌ Yuklanmagan"
         logger.info(f"  [{i+1}] DB: '{db_file.get('name', 'unknown')}' → File: '{expected_filename}' ({telegram_status})")
@@ -271,67 +283,57 @@ async def upload_only_mode(CONFIG: Dict[str, Any]) -> None:
     
     logger.info("🔍 Database'dagi local_path'lar bilan match qilish...")
     
+    # Har bir lokal fayl nomi uchun local_path'i shu nomga mos birinchi DB yozuvi
+    local_names = {local_file.name for local_file in existing_files}
+    db_by_name = {}
+    async for db_file in db.iter_files(CONFIG["name"], where="downloaded"):
+        db_filename = Path(db_file["local_path"]).name
+        if db_filename in local_names and db_filename not in db_by_name:
+            db_by_name[db_filename] = dict(db_file)
+    
     for local_file in existing_files:
         local_filename = local_file.name
+        db_file = db_by_name.get(local_filename)
+        
+        if db_file is None:
+            unmatched_files.append(local_filename)
+            continue
+        
         local_size = local_file.stat().st_size
-        file_matched = False
+        db_local_path = db_file.get("local_path", "")
+        telegram_uploaded = db_file.get("uploaded", False)
+        db_file_size = db_file.get("file_size", 0)
         
-        # Database'dagi barcha fayllarni tekshirish
-        for db_file in all_files:
-            db_local_path = db_file.get("local_path", "")
-            
-            # Local path mavjud bo'lsa va fayl nomi mos kelsa
-            if db_local_path:
-                try:
-                    db_filename = Path(db_local_path).name
-                    if db_filename == local_filename:
-                        file_matched = True
-                except:
-                    # Path parse qila olmasa, string comparison
-                    if local_filename in db_local_path:
-                        file_matched = True
-                    else:
-                        continue
-                        
-                if file_matched:
-                    telegram_uploaded = db_file.get("uploaded", False)
-                    db_file_size = db_file.get("file_size", 0)
-                    
-                    logger.info(f"🎯 PATH MATCH: '{local_filename}'")
-                    logger.info(f"   DB path: {db_local_path}")
-                    logger.info(f"   Hajm: lokal={local_size:,} vs db={db_file_size:,}")
-                    logger.info(f"   Telegram: {telegram_uploaded}")
-                    
-                    # File size check - 1% tolerance
-                    size_diff = abs(local_size - db_file_size) if db_file_size > 0 else 0
-                    size_tolerance = max(local_size * 0.01, 1024)  # 1% yoki 1KB
-                    
-                    if db_file_size > 0 and size_diff > size_tolerance:
-                        logger.warning(f"⚠️ Hajm mos kelmaydi: {size_diff:,} bytes farq")
-                        logger.info(f"🗑️ Buzuq fayl o'chiriladi: {local_filename}")
-                        try:
-                            os.remove(local_file)
-                            logger.info(f"✅ O'chirildi: {local_filename}")
-                        except Exception as e:
-                            logger.error(f"❌ O'chirishda xato: {e}")
-                        break
-                    
-                    # Faqat telegram'ga yuklanmagan fayllarni qo'shish
-                    if not telegram_uploaded:
-                        matched_files.append({
-                            "local_path": str(local_file),
-                            "db_file": db_file,
-                            "file_size": local_size,
-                            "db_id": db_file.get("id")  # Database ID ni saqlash
-                        })
-                        logger.info(f"✅ Yuklash uchun qo'shildi: {local_filename}")
-                    else:
-                        logger.info(f"⏭️ Allaqachon yuklangan: {local_filename}")
-                    
-                    break
+        logger.info(f"🎯 PATH MATCH: '{local_filename}'")
+        logger.info(f"   DB path: {db_local_path}")
+        logger.info(f"   Hajm: lokal={local_size:,} vs db={db_file_size:,}")
+        logger.info(f"   Telegram: {telegram_uploaded}")
         
-        if not file_matched:
-            unmatched_files.append(local_filename)
+        # File size check - 1% tolerance
+        size_diff = abs(local_size - db_file_size) if db_file_size > 0 else 0
+        size_tolerance = max(local_size * 0.01, 1024)  # 1% yoki 1KB
+        
+        if db_file_size > 0 and size_diff > size_tolerance:
+            logger.warning(f"⚠️ Hajm mos kelmaydi: {size_diff:,} bytes farq")
+            logger.info(f"🗑️ Buzuq fayl o'chiriladi: {local_filename}")
+            try:
+                os.remove(local_file)
+                logger.info(f"✅ O'chirildi: {local_filename}")
+            except Exception as e:
+                logger.error(f"❌ O'chirishda xato: {e}")
+            continue
+        
+        # Faqat telegram'ga yuklanmagan fayllarni qo'shish
+        if not telegram_uploaded:
+            matched_files.append({
+                "local_path": str(local_file),
+                "db_file": db_file,
+                "file_size": local_size,
+                "db_id": db_file.get("id")  # Database ID ni saqlash
+            })
+            logger.info(f"✅ Yuklash uchun qo'shildi: {local_filename}")
+        else:
+            logger.info(f"⏭️ Allaqachon yuklangan: {local_filename}")
     
     # DIAGNOSTIKA: Match qilinmagan fayllar
     if unmatched_files:
@@ -399,7 +401,7 @@ async def upload_only_mode(CONFIG: Dict[str, Any]) -> None:
                             # Database'da uploaded = True qilish
                             db_id = file_info.get("db_id")
                             if db_id:
-                                db.update_file(db_id, uploaded=True)
+                                await db.update_file(db_id, uploaded=True)
                             uploaded_count += 1
                             logger.info(f"✅ Yuklandi: {Path(local_path).name}")
                             
@@ -437,6 +439,9 @@ async def upload_only_mode(CONFIG: Dict[str, Any]) -> None:
         logger.error("❌ Telegram connection muvaffaqiyatsiz!")
         return
     
+    # Write-behind buffer'dagi status yangilanishlarini yozib yuborish
+    await db.flush()
+    
     # Yakuniy hisobot
     logger.info(f"\n✅ Upload Only jarayoni tugadi!")
     logger.info(f"📊 Jami: {len(matched_files)} ta fayl")
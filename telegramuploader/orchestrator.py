@@ -5,8 +5,10 @@ import asyncio
 import aiohttp
 from typing import List, Dict, Any
 
-from core.FileDB import FileDB
+from core.async_db import AsyncFileDB
+from core.config import WORKER_NAME
 from utils.logger_core import logger
+from utils.url_meta import get_url_meta_cache
 from .core.downloader import FileDownloader
 from .core.uploader import TelegramUploader
 from .core.stream_uploader import StreamingUploader
@@ -54,8 +56,11 @@ class TelegramUploaderOrchestrator:
         self._successful_files = 0
         self._failed_files = 0
 
+        # Lease-based claiming (bir nechta server bitta DB'dan ishlaganda)
+        self.worker_name = config.get("worker_name") or WORKER_NAME
+
     async def process_files_sequential(self, items: List[Dict[str, Any]], session: aiohttp.ClientSession,
-                                       semaphore: asyncio.Semaphore, db: FileDB) -> None:
+                                       semaphore: asyncio.Semaphore, db: AsyncFileDB) -> None:
         """
         Sequential mode - fayllarni ketma-ket qayta ishlash
 
@@ -63,12 +68,18 @@ class TelegramUploaderOrchestrator:
             items: Qayta ishlanadigan fayllar ro'yxati
             session: aiohttp session
             semaphore: Download semaphore
-            db: Database connection
+            db: AsyncFileDB - so'rovlar event loop'ni bloklamaydi
         """
         # Batch tracking'ni boshlash
         self.set_total_files(len(items))
         logger.info(f"🚀 Sequential batch boshlandi: {len(items)} ta fayl")
 
+        await self._run_sequential(items, session, semaphore, db)
+        await self._finish_batch()
+
+    async def _run_sequential(self, items: List[Dict[str, Any]], session: aiohttp.ClientSession,
+                              semaphore: asyncio.Semaphore, db: AsyncFileDB) -> None:
+        """Sequential mode yadrosi (batch hisobotisiz)"""
         for row in items:
             queue = asyncio.Queue()
             await self.producer.process_file(session, semaphore, queue, row, self.config)
@@ -78,18 +89,8 @@ class TelegramUploaderOrchestrator:
                 await self.consumer.process_single_item(item, self.config, db)
                 queue.task_done()
 
-        # Batch yakunlanishi haqida xabar
-        await self.notifier.notify_batch_complete(
-            self._total_files, self._successful_files, self._failed_files
-        )
-
-        # Diagnostics hisobotini chop etish
-        logger.info("\n" + "="*60)
-        diagnostics.print_report()
-        logger.info("="*60 + "\n")
-
     async def process_files_parallel(self, items: List[Dict[str, Any]], session: aiohttp.ClientSession,
-                                     semaphore: asyncio.Semaphore, db: FileDB) -> None:
+                                     semaphore: asyncio.Semaphore, db: AsyncFileDB) -> None:
         """
         Parallel mode - fayllarni parallel qayta ishlash
 
@@ -97,12 +98,18 @@ class TelegramUploaderOrchestrator:
             items: Qayta ishlanadigan fayllar ro'yxati  
             session: aiohttp session
             semaphore: Download semaphore
-            db: Database connection
+            db: AsyncFileDB - so'rovlar event loop'ni bloklamaydi
         """
         # Batch tracking'ni boshlash
         self.set_total_files(len(items))
         logger.info(f"🚀 Batch boshlandi: {len(items)} ta fayl")
 
+        await self._run_parallel(items, session, semaphore, db)
+        await self._finish_batch()
+
+    async def _run_parallel(self, items: List[Dict[str, Any]], session: aiohttp.ClientSession,
+                            semaphore: asyncio.Semaphore, db: AsyncFileDB) -> None:
+        """Parallel mode yadrosi (batch hisobotisiz)"""
         queue = asyncio.Queue()
 
         # Consumer'larni ishga tushirish (agar upload_workers > 0 bo'lsa)
@@ -142,18 +149,8 @@ class TelegramUploaderOrchestrator:
         else:
             logger.info("📥 Download tugadi - Upload queue yo'q")
 
-        # Batch yakunlanishi haqida xabar
-        await self.notifier.notify_batch_complete(
-            self._total_files, self._successful_files, self._failed_files
-        )
-
-        # Diagnostics hisobotini chop etish
-        logger.info("\n" + "="*60)
-        diagnostics.print_report()
-        logger.info("="*60 + "\n")
-
     async def process_files_streaming(self, items: List[Dict[str, Any]], session: aiohttp.ClientSession,
-                                      semaphore: asyncio.Semaphore, db: FileDB) -> None:
+                                      semaphore: asyncio.Semaphore, db: AsyncFileDB) -> None:
         """
         Streaming mode - fayllarni disk ga saqlamasdan to'g'ridan-to'g'ri Telegram ga yuklash
 
@@ -161,7 +158,7 @@ class TelegramUploaderOrchestrator:
             items: Qayta ishlanadigan fayllar ro'yxati
             session: aiohttp session
             semaphore: Download semaphore
-            db: Database connection
+            db: AsyncFileDB - so'rovlar event loop'ni bloklamaydi
         """
         # Batch tracking'ni boshlash
         self.set_total_files(len(items))
@@ -169,6 +166,12 @@ class TelegramUploaderOrchestrator:
         logger.info(
             f"💡 Fayllar disk ga saqlanmaydi, to'g'ridan-to'g'ri Telegram ga yuklanadi")
 
+        await self._run_streaming(items, session, semaphore, db)
+        await self._finish_batch()
+
+    async def _run_streaming(self, items: List[Dict[str, Any]], session: aiohttp.ClientSession,
+                             semaphore: asyncio.Semaphore, db: AsyncFileDB) -> None:
+        """Streaming mode yadrosi (batch hisobotisiz)"""
         # Parallel yoki sequential
         concurrency = self.config.get("download_concurrency", 3)
 
@@ -188,6 +191,8 @@ class TelegramUploaderOrchestrator:
                     session, semaphore, row, self.config, db
                 )
 
+    async def _finish_batch(self) -> None:
+        """Batch yakuni: notification va diagnostics hisoboti"""
         # Batch yakunlanishi haqida xabar
         await self.notifier.notify_batch_complete(
             self._total_files, self._successful_files, self._failed_files
@@ -198,6 +203,84 @@ class TelegramUploaderOrchestrator:
         diagnostics.print_report()
         logger.info("="*60 + "\n")
 
+    async def process_claimed_files(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                    db: AsyncFileDB, mode: str = "parallel") -> int:
+        """
+        Claim mode - navbatdan fayllarni lease bilan partiyalab olib qayta ishlash
+
+        Bir nechta server (har biri o'z WORKER_NAME bilan) bitta DB'dan ishlaganda
+        har bir fayl faqat bitta worker tomonidan olinadi. Partiya ishlanayotganda
+        lease muddati uzaytirib turiladi; worker to'xtab qolsa, muddat o'tgach
+        fayllarni boshqa worker oladi. Muvaffaqiyatsiz fayllar lease tugaguncha
+        band qoladi - shu sessiyada darhol qayta olinmaydi.
+
+        Args:
+            session: aiohttp session
+            semaphore: Download semaphore
+            db: AsyncFileDB
+            mode: "parallel", "sequential" yoki "streaming"
+
+        Returns:
+            int: Qayta ishlangan fayllar soni
+        """
+        runners = {
+            "streaming": self._run_streaming,
+            "sequential": self._run_sequential,
+            "parallel": self._run_parallel,
+        }
+        runner = runners.get(mode, self._run_parallel)
+
+        config_name = self.config["name"]
+        batch_size = max(self.config.get("claim_batch_size", 20), 1)
+        lease_seconds = max(self.config.get("claim_lease_seconds", 1800), 30)
+        order_by = "file_size ASC" if self.config.get("sort_by_size", False) else "id"
+
+        self.set_total_files(await db.count_files(config_name, where="undownloaded"))
+        logger.info(
+            f"🚀 Claim batch boshlandi: ~{self._total_files} ta fayl | worker={self.worker_name} | "
+            f"partiya={batch_size} | lease={lease_seconds}s | mode={mode}")
+
+        processed = 0
+        try:
+            while True:
+                batch = await db.claim_batch(
+                    config_name, self.worker_name, batch_size, lease_seconds, order_by=order_by)
+                if not batch:
+                    break
+
+                file_ids = [row["id"] for row in batch]
+                # Scraping'da aniqlangan hajmlar - partiya uchun HEAD so'rovlarisiz
+                cached = await get_url_meta_cache().preload([row.get("file_url") for row in batch])
+                logger.info(f"📥 {len(batch)} ta fayl band qilindi ({processed} ta tayyor, "
+                            f"{cached} ta hajm cache'dan)")
+                renewer = asyncio.create_task(
+                    self._renew_leases(db, config_name, file_ids, lease_seconds))
+                try:
+                    await runner(batch, session, semaphore, db)
+                finally:
+                    renewer.cancel()
+                processed += len(batch)
+        except BaseException:
+            # To'xtatildi yoki xato - band qilinganlarni boshqa workerlarga darhol bo'shatish
+            released = await db.release_claims(config_name, self.worker_name)
+            logger.warning(f"🔓 {released} ta lease bo'shatildi ({self.worker_name})")
+            raise
+
+        await self._finish_batch()
+        return processed
+
+    async def _renew_leases(self, db: AsyncFileDB, config_name: str, file_ids: List[int],
+                            lease_seconds: int) -> None:
+        """Partiya tugaguncha lease'larni muddatidan oldin uzaytirib turish"""
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            try:
+                renewed = await db.renew_leases(
+                    config_name, self.worker_name, file_ids, lease_seconds)
+                logger.debug(f"⏳ {renewed} ta lease uzaytirildi")
+            except Exception as e:
+                logger.error(f"❌ Lease uzaytirishda xato: {e}")
+
     async def update_progress(self, completed: bool, successful: bool, current_filename: str = ""):
         """Progress'ni yangilash va batch notification yuborish"""
         if completed:
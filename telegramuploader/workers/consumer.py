@@ -4,18 +4,18 @@ File Consumer - Queue dan fayllarni olib Telegramga yuborish uchun
 import asyncio
 from typing import Dict, Any
 
-from core.FileDB import FileDB
+from core.async_db import AsyncFileDB
 from utils.telegram import detect_telegram_type
 from utils.logger_core import logger
 from ..core.uploader import TelegramUploader
 from ..handlers.notification import NotificationHandler
 
 
-def handle_post_upload(file_id: int, local_path: str, size: int, config: Dict[str, Any],
-                       db: FileDB, success: bool, filename: str) -> None:
+async def handle_post_upload(file_id: int, local_path: str, size: int, config: Dict[str, Any],
+                             db: AsyncFileDB, success: bool, filename: str) -> None:
     """Fayl yuborilgandan keyingi amallarni bajarish"""
     if success:
-        db.update_file(
+        await db.update_file(
             file_id,
             uploaded=True,
             local_path=local_path,
@@ -28,11 +28,13 @@ def handle_post_upload(file_id: int, local_path: str, size: int, config: Dict[st
                 import os
                 os.remove(local_path)
                 logger.info(f"🗑️ Fayl o'chirildi: {local_path}")
-                db.update_file(file_id, local_path=None)
+                await db.update_file(file_id, local_path=None)
             except Exception as e:
                 logger.error(f"❌ O'chirishda xato: {e}")
     else:
         logger.error(f"❌ Telegramga yuborishda xato: {filename}")
+        # Fayl diskda qoladi - qayta urinishda producer uni qayta yuklamasdan ishlatadi
+        await db.record_failure(file_id, "Telegram upload failed")
 
 
 class FileConsumer:
@@ -45,7 +47,7 @@ class FileConsumer:
         # Batch mode: individual notifications'ni kamaytirish
         self._quiet_mode = orchestrator is not None
 
-    async def consume_queue(self, queue: asyncio.Queue, config: Dict[str, Any], db: FileDB) -> None:
+    async def consume_queue(self, queue: asyncio.Queue, config: Dict[str, Any], db: AsyncFileDB) -> None:
         """Queue dan fayllarni qayta ishlash (parallel mode uchun)"""
         while True:
             try:
@@ -56,11 +58,11 @@ class FileConsumer:
             await self._process_item(item, config, db)
             queue.task_done()
 
-    async def process_single_item(self, item: Dict[str, Any], config: Dict[str, Any], db: FileDB) -> None:
+    async def process_single_item(self, item: Dict[str, Any], config: Dict[str, Any], db: AsyncFileDB) -> None:
         """Bitta itemni qayta ishlash (sequential mode uchun)"""
         await self._process_item(item, config, db)
 
-    async def _process_item(self, item: Dict[str, Any], config: Dict[str, Any], db: FileDB) -> None:
+    async def _process_item(self, item: Dict[str, Any], config: Dict[str, Any], db: AsyncFileDB) -> None:
         """Bitta itemni qayta ishlash (ichki funksiya)"""
         file_id = item["id"]
         local_path = item["local_path"]
@@ -69,7 +71,7 @@ class FileConsumer:
         size = item["size"]
 
         # 🔑 To'liq ma'lumotlarni DB dan olish
-        row = db.get_file(file_id)
+        row = await db.get_file(file_id)
         if not row:
             logger.error(f"❌ DB dan topilmadi: {file_id}")
             return
@@ -91,6 +93,7 @@ class FileConsumer:
         row_with_path["file_size"] = size
 
         # Upload qilish
+        await db.update_file(file_id, status="uploading")
         success = await self.uploader.upload_file(row_with_path, config)
 
         # Natija haqida xabar (faqat muhim paytlarda)
@@ -106,5 +109,5 @@ class FileConsumer:
                 await self.notifier.send_upload_failed(title, file_id, filename, size_mb)
 
         # Post-upload actions
-        handle_post_upload(file_id, local_path, size,
-                           config, db, success, filename)
+        await handle_post_upload(file_id, local_path, size,
+                                 config, db, success, filename)
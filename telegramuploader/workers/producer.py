@@ -5,9 +5,10 @@ import os
 import asyncio
 import aiohttp
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from core import config as app_config
+from core.async_db import AsyncFileDB, get_async_db
 from utils.files import safe_filename
 from utils.text import clean_title
 from utils.logger_core import logger
@@ -19,13 +20,22 @@ from ..handlers.notification import NotificationHandler
 class FileProducer:
     """Fayllarni yuklab olish va queue ga qo'yish uchun class"""
 
-    def __init__(self, downloader: FileDownloader, notifier: NotificationHandler, orchestrator=None):
+    def __init__(self, downloader: FileDownloader, notifier: NotificationHandler, orchestrator=None,
+                 db: Optional[AsyncFileDB] = None):
         self.downloader = downloader
         self.notifier = notifier
         self.orchestrator = orchestrator
+        self._db = db
         # Batch mode: individual notifications'ni kamaytirish
         self._quiet_mode = orchestrator is not None
 
+    @property
+    def db(self) -> AsyncFileDB:
+        """Producer DB handle'i (berilmagan bo'lsa umumiy AsyncFileDB)"""
+        if self._db is None:
+            self._db = get_async_db()
+        return self._db
+
     async def process_file(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
                            queue: asyncio.Queue, row: Dict[str, Any], config: Dict[str, Any]) -> None:
         """
@@ -75,7 +85,17 @@ class FileProducer:
 
         except Exception as e:
             logger.error(
-                f"❌ Producer da xato: {file_info.get('title', 'Unknown')} - {e}")
+                f"❌ Producer da xato: {row.get('title', 'Unknown')} - {e}")
+            await self._record_failure(row["id"], str(e))
+
+    async def _record_failure(self, file_id: int, error: str) -> None:
+        """Xatoni DB'ga yozish - fayl backoff bilan keyinroq qayta olinadi"""
+        try:
+            status = await self.db.record_failure(file_id, error)
+            if status == "dead":
+                logger.warning(f"💀 [{file_id}] Urinishlar tugadi, fayl boshqa olinmaydi")
+        except Exception as e:
+            logger.error(f"❌ [{file_id}] Xatoni DB'ga yozib bo'lmadi: {e}")
 
     def _extract_file_info(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """DB row'dan fayl ma'lumotlarini ajratib olish"""
@@ -172,9 +192,7 @@ class FileProducer:
             logger.error(f"❌ [{file_info['id']}] Faylni o'chirishda xato: {e}")
 
         # Database da local_path ni reset qilish (yangi download uchun)
-        from core.FileDB import FileDB
-        db = FileDB()
-        db.update_file(file_info['id'], local_path=None)
+        await self.db.update_file(file_info['id'], local_path=None)
 
     async def _download_file(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
                              file_info: Dict[str, Any], file_path: str, url_size: int,
@@ -242,6 +260,7 @@ class FileProducer:
                     f"❌ [{file_info['id']}] Yuklash muvaffaqiyatsiz: {filename}")
                 if not self._quiet_mode:
                     await self.notifier.send_file_failed(file_info["title"], file_info["id"], filename)
+                await self._record_failure(file_info["id"], "Download failed")
                 return None
 
             # Yuklangan fayl hajmini tekshirish
@@ -8,7 +8,7 @@ from typing import Dict, Any
 from utils.logger_core import logger
 from ..core.stream_uploader import StreamingUploader
 from ..handlers.notification import NotificationHandler
-from core.FileDB import FileDB
+from core.async_db import AsyncFileDB
 
 
 class StreamingProducer:
@@ -27,7 +27,7 @@ class StreamingProducer:
         semaphore: asyncio.Semaphore,
         row: Dict[str, Any],
         config: Dict[str, Any],
-        db: FileDB
+        db: AsyncFileDB
     ) -> bool:
         """
         Faylni stream orqali qayta ishlash - disk ga saqlamasdan
@@ -37,7 +37,7 @@ class StreamingProducer:
             semaphore: Concurrency control
             row: DB qatoridan olingan fayl ma'lumotlari
             config: Konfiguratsiya
-            db: Database connection
+            db: AsyncFileDB (event loop bloklanmaydi)
             
         Returns:
             True if successful, False otherwise
@@ -82,6 +82,7 @@ class StreamingProducer:
             logger.info(f"🚀 Streaming boshlandi: {file_info['title']}")
             
             # 3. Stream orqali download va upload
+            await db.update_file(file_info["id"], status="uploading")
             async with semaphore:
                 # group_ref ni olish - bo'sh bo'lsa None
                 group_ref = config.get("telegram_group")
@@ -101,7 +102,7 @@ class StreamingProducer:
                 logger.info(f"✅ Streaming muvaffaqiyatli: {file_info['title']}")
                 
                 # DB ni yangilash
-                db.mark_file_uploaded(file_info["id"])
+                await db.mark_file_uploaded(file_info["id"])
                 
                 # Notification - upload tugadi
                 if not self._quiet_mode:
@@ -118,6 +119,7 @@ class StreamingProducer:
                 return True
             else:
                 logger.error(f"❌ Streaming muvaffaqiyatsiz: {file_info['title']}")
+                await db.record_failure(file_info["id"], "Streaming failed")
                 
                 # Notification - xato
                 if not self._quiet_mode:
@@ -137,6 +139,10 @@ class StreamingProducer:
             import traceback
             logger.error(f"❌ Streaming xatosi: {file_info['title']} - {e}")
             logger.error(f"🔍 Traceback:\n{traceback.format_exc()}")
+            try:
+                await db.record_failure(file_info["id"], str(e))
+            except Exception as db_error:
+                logger.error(f"❌ Xatoni DB'ga yozib bo'lmadi: {db_error}")
             
             # Error notification
             if not self._quiet_mode:
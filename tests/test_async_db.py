@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+AsyncFileDB testlari - so'rovlar DB thread'ida bajarilishi va event loop bloklanmasligi
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.async_db import AsyncFileDB
+from core.FileDB import FileDB
+
+
+def _temp_db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="test_async_db_"), "files.db")
+
+
+def _item(i: int) -> dict:
+    return {
+        "file_page": f"https://example.com/film/{i}",
+        "title": f"Film {i}",
+        "file_url": f"https://cdn.example.com/{i}.mp4",
+    }
+
+
+def test_async_crud():
+    """FileDB metodlari awaitable ko'rinishda va DB thread'ida ishlashi"""
+    print("🧪 ASYNC CRUD TEST")
+
+    async def scenario():
+        async with AsyncFileDB(db_path=_temp_db_path()) as db:
+            result = await db.insert_files("site", [_item(i) for i in range(1, 6)])
+            assert result["inserted"] == 5
+
+            await db.update_file(2, local_path="downloads/2.mp4")
+            await db.mark_file_uploaded(3)
+            row = await db.get_file(2)
+            assert row["local_path"] == "downloads/2.mp4"
+            assert (await db.get_stats("site"))["uploaded"] == 1
+
+            rows = [row["id"] async for row in db.iter_files("site", batch_size=2)]
+            assert rows == [1, 2, 3, 4, 5]
+
+            # So'rov event loop thread'ida emas, alohida DB thread'ida bajariladi
+            db_thread = await db.run(lambda fdb: threading.get_ident())
+            assert db_thread != threading.get_ident()
+
+            # Xatolar chaqiruvchiga qaytadi
+            try:
+                await db.insert_files("site", [_item(9)], on_conflict="bad")
+                assert False, "ValueError kutilgan edi"
+            except ValueError:
+                pass
+
+            try:
+                db.not_a_method
+                assert False, "AttributeError kutilgan edi"
+            except AttributeError:
+                pass
+
+    asyncio.run(scenario())
+    print("✅ AsyncFileDB CRUD to'g'ri ishlaydi")
+
+
+def test_event_loop_not_blocked():
+    """Sekin DB so'rovi paytida boshqa tasklar ishlashda davom etishi"""
+    print("🧪 EVENT LOOP BLOCKING TEST")
+
+    async def scenario():
+        async with AsyncFileDB(db_path=_temp_db_path()) as db:
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await db.run(lambda fdb: time.sleep(0.3))  # disk sync'ga o'xshash sekin so'rov
+            task.cancel()
+            return ticks
+
+    ticks = asyncio.run(scenario())
+    print(f"   Sekin so'rov paytida {ticks} ta tick")
+    assert ticks >= 10
+    print("✅ Event loop bloklanmadi")
+
+
+def test_write_behind_coalesces():
+    """update_file'lar qator bo'yicha birlashib, bitta tranzaksiyada yozilishi"""
+    print("🧪 WRITE-BEHIND COALESCE TEST")
+
+    async def scenario():
+        db = AsyncFileDB(db_path=_temp_db_path(), write_behind=True,
+                         flush_interval_ms=60000, flush_max_updates=1000)
+        await db.insert_files("site", [_item(i) for i in range(1, 51)])
+
+        # Consumer post-upload kabi: har bir qatorga ketma-ket bir nechta update
+        for file_id in range(1, 51):
+            await db.update_file(file_id, uploaded=True, local_path=f"d/{file_id}.mp4")
+            await db.update_file(file_id, local_path=None)
+
+        # O'qishdan oldin buffer yoziladi
+        row = await db.get_file(7)
+        assert row["uploaded"] == 1 and row["local_path"] is None
+        assert row["uploaded_at"]
+        stats = dict(db.write_stats)
+        await db.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+    print(f"   {stats}")
+    assert stats == {"updates": 100, "rows_written": 50, "flushes": 1}
+    print("✅ 100 ta update_file 1 ta commit bilan yozildi")
+
+
+def test_write_behind_flush_triggers():
+    """Buffer vaqt, hajm va close() bo'yicha yozilishi"""
+    print("🧪 WRITE-BEHIND FLUSH TRIGGERS TEST")
+    path = _temp_db_path()
+    reader = FileDB(db_path=path, pooled=False)
+    reader.insert_files("site", [_item(i) for i in range(1, 31)])
+
+    async def scenario():
+        # Vaqt bo'yicha
+        db = AsyncFileDB(db_path=path, write_behind=True,
+                         flush_interval_ms=50, flush_max_updates=1000)
+        await db.update_file(1, title="vaqt")
+        await asyncio.sleep(0.3)
+        assert reader.get_file(1)["title"] == "vaqt"
+
+        await db.close()
+
+        # Hajm bo'yicha: har 10 qator yig'ilganda
+        db = AsyncFileDB(db_path=path, write_behind=True,
+                         flush_interval_ms=60000, flush_max_updates=10)
+        for file_id in range(2, 27):
+            await db.update_file(file_id, title="hajm")
+        await asyncio.sleep(0.1)
+        assert db.write_stats["flushes"] == 2
+        assert reader.get_file(21)["title"] == "hajm"
+        assert reader.get_file(26)["title"] != "hajm"  # hali bufferda
+
+        # close() qolganini yozadi
+        await db.close()
+        assert reader.get_file(26)["title"] == "hajm"
+
+    asyncio.run(scenario())
+    print("✅ Buffer vaqt, hajm va close() da yoziladi")
+
+
+def test_write_behind_uploaded_overrides_status():
+    """Consumer ketma-ketligi: status="uploading", keyin uploaded=True - qator navbatga qaytmaydi"""
+    print("🧪 WRITE-BEHIND STATUS OVERRIDE TEST")
+
+    async def scenario():
+        db = AsyncFileDB(db_path=_temp_db_path(), write_behind=True,
+                         flush_interval_ms=60000, flush_max_updates=1000)
+        await db.insert_files("site", [_item(i) for i in range(1, 3)])
+        await db.update_file(1, status="uploading")
+        await db.update_file(1, uploaded=True, local_path="d/1.mp4")
+        row = await db.get_file(1)
+        ready = [r["id"] async for r in db.iter_files("site", where="undownloaded")]
+        claimed = await db.claim_batch("site", "worker_b", 10, 60)
+        await db.close()
+        return row, ready, claimed
+
+    row, ready, claimed = asyncio.run(scenario())
+    assert row["status"] == "uploaded" and row["uploaded"] == 1
+    assert ready == [2]
+    assert [r["id"] for r in claimed] == [2]
+    print("✅ Upload qilingan fayl qayta download/upload navbatiga tushmaydi")
+
+
+def test_claim_file_lease():
+    """mark_downloading lease oladi - boshqa worker va claim_batch band faylni olmaydi"""
+    print("🧪 CLAIM FILE TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=False)
+    db.insert_files("site", [_item(i) for i in range(1, 4)])
+    assert db.claim_file(1, "worker_a", 60)
+    assert db.claim_file(1, "worker_a", 60)  # o'z lease'i - uzaytiriladi
+    assert not db.claim_file(1, "worker_b", 60)
+    assert [r["id"] for r in db.claim_batch("site", "worker_b", 10, 60)] == [2, 3]
+
+    db.update_file(1, claimed_by=None, lease_expires_at=None, uploaded=True)
+    assert not db.claim_file(1, "worker_b", 60)  # upload qilingan
+    db.update_file(2, lease_expires_at=0)  # worker_b to'xtab qolgan - lease muddati o'tgan
+    assert db.claim_file(2, "worker_a", 60)
+    print("✅ Fayl bitta worker'ga band qilinadi")
+
+
+if __name__ == "__main__":
+    test_async_crud()
+    test_event_loop_not_blocked()
+    test_write_behind_coalesces()
+    test_write_behind_flush_triggers()
+    test_write_behind_uploaded_overrides_status()
+    test_claim_file_lease()
+    print("\n🎉 AsyncFileDB testlari yakunlandi!")
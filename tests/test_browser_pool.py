@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Browser page pool testlari - checkout/return, limit, recycle, sog'lik tekshiruvi,
+resurs bloklash va yengil navigatsiya
+(Playwright o'rniga soxta browser/kontekst/sahifa obyektlari bilan)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scraper.browser import (
+    BrowserPagePool, ResourceBlocker, activate_page_pool, browser_page, create_page_pool,
+    deactivate_page_pool, get_page_pool, goto_page, navigation_options)
+from scraper.parsers import parse_file_page
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+        self.url = "about:blank"
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, timeout=None, wait_until=None):
+        if self.closed:
+            raise RuntimeError("Target closed")
+        self.browser.gotos.append(url)
+        self.browser.wait_untils.append(wait_until)
+        self.url = url
+
+    async def wait_for_selector(self, selector, timeout=None):
+        self.browser.selectors.append(selector)
+
+    async def content(self):
+        return f"<html><body>{self.url}</body></html>"
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = []
+        self.closed = False
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        page = FakePage(self.browser)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+        for page in self.pages:
+            page.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.gotos = []
+        self.wait_untils = []
+        self.selectors = []
+
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    def open_contexts(self):
+        return [c for c in self.contexts if not c.closed]
+
+
+def test_checkout_reuse_and_recycle():
+    """Sahifa qaytarilgach qayta ishlatiladi, max_uses dan keyin yangilanadi"""
+    print("🧪 BROWSER POOL REUSE TEST")
+
+    async def run():
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, size=2, max_uses=3)
+        assert await pool.warm() == 2
+        assert len(browser.contexts) == 2
+
+        pages = []
+        for _ in range(7):
+            async with pool.page() as page:
+                await page.goto("http://site/film")
+                pages.append(page)
+
+        report = pool.report()
+        assert report["checkouts"] == 7
+        assert report["recycled"] == 2  # har 3 marta ishlatilgach
+        assert len({id(p) for p in pages}) == 3
+        # Qaytarilgan sahifa about:blank ga qaytariladi
+        assert browser.gotos.count("about:blank") == 5
+        await pool.close()
+        assert browser.open_contexts() == []
+        return report
+
+    report = asyncio.run(run())
+    print(f"✅ Pool hisobot: {report}")
+
+
+def test_concurrency_cap_and_health():
+    """Bir vaqtda size tadan ortiq sahifa berilmaydi; nosog' sahifa tashlanadi"""
+    print("🧪 BROWSER POOL LIMIT TEST")
+
+    async def run():
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, size=2, max_uses=100)
+        active = 0
+        peak = 0
+
+        async def worker(i):
+            nonlocal active, peak
+            async with pool.page() as page:
+                active += 1
+                peak = max(peak, active)
+                await page.goto(f"http://site/{i}")
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(worker(i) for i in range(10)))
+        assert peak == 2
+        assert len(browser.contexts) == 2
+
+        # Yopilgan sahifa checkout'da aniqlanadi va almashtiriladi
+        pool._idle[-1].page.closed = True
+        async with pool.page() as page:
+            assert not page.is_closed()
+
+        # Xato bilan chiqqan sahifa qayta ishlatilmaydi
+        try:
+            async with pool.page() as page:
+                failed = page
+                raise RuntimeError("crash")
+        except RuntimeError:
+            pass
+        assert failed.is_closed()
+        assert pool.report()["unhealthy"] == 2
+        assert pool._semaphore._value == 2  # barcha slotlar qaytarildi
+        await pool.close()
+
+    asyncio.run(run())
+    print("✅ Limit va sog'lik tekshiruvi ishladi")
+
+
+def test_fallback_uses_active_pool():
+    """fetch_page_with_browser faol pool'dan foydalanadi, pool'siz vaqtinchalik kontekst ochadi"""
+    print("🧪 BROWSER FALLBACK POOL TEST")
+    assert create_page_pool(FakeBrowser(), {"browser_pool_enabled": False}) is None
+
+    async def run():
+        browser = FakeBrowser()
+        html = await parse_file_page.fetch_page_with_browser(browser, "http://site/a")
+        assert "http://site/a" in html
+        assert len(browser.contexts) == 1 and browser.open_contexts() == []
+
+        pool = create_page_pool(browser, {"scrape_concurrency": 3, "browser_pool_max_uses": 10})
+        assert pool.size == 3
+        token = activate_page_pool(pool)
+        try:
+            assert get_page_pool() is pool
+            for i in range(5):
+                html = await parse_file_page.fetch_page_with_browser(browser, f"http://site/{i}")
+                assert f"http://site/{i}" in html
+            async with browser_page(browser) as page:
+                assert pool._idle == [] and page.url == "about:blank"
+        finally:
+            deactivate_page_pool(token)
+        assert len(browser.contexts) == 2  # 1 vaqtinchalik + 1 pool'dagi
+        assert pool.report()["reused"] == 5
+        await pool.close()
+
+    asyncio.run(run())
+    assert get_page_pool() is None
+    print("✅ Fallback pool'dan foydalandi")
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.result = None
+
+    async def abort(self):
+        self.result = "abort"
+
+    async def continue_(self):
+        self.result = "continue"
+
+
+def test_resource_blocking():
+    """Rasm/media/shrift va tracker domenlari bekor qilinadi, sahifa va skriptlar o'tadi"""
+    print("🧪 RESOURCE BLOCKING TEST")
+    site = {"block_domains": ["doubleclick.net", "mc.yandex.ru"], "wait_selector": None}
+    options = navigation_options(site, {"block_resources": ["image", "media", "font"],
+                                        "block_domains": ["other.com"], "wait_until": "commit"})
+    assert options["block_domains"] == ["doubleclick.net", "mc.yandex.ru"]  # sayt config ustun
+    assert options["wait_until"] == "commit" and options["wait_selector"] is None
+    assert options["nav_timeout"] == 30000
+
+    blocker = ResourceBlocker.from_options(options)
+    cases = [
+        ("document", "http://asilmedia.org/films/", "continue"),
+        ("script", "http://asilmedia.org/js/app.js", "continue"),
+        ("image", "http://asilmedia.org/uploads/poster.jpg", "abort"),
+        ("font", "http://fonts.example.com/a.woff2", "abort"),
+        ("media", "http://cdn.example.com/preview.mp4", "abort"),
+        ("script", "https://stats.g.doubleclick.net/dc.js", "abort"),
+        ("script", "https://mc.yandex.ru/metrika/tag.js", "abort"),
+        ("script", "https://notdoubleclick.net/x.js", "continue"),
+    ]
+
+    async def run():
+        for resource_type, url, expected in cases:
+            route = FakeRoute(resource_type, url)
+            await blocker.handle(route)
+            assert route.result == expected, (resource_type, url, route.result)
+
+        # Pool har yangi kontekstga bloklashni o'rnatadi
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, size=2, navigation=options)
+        await pool.warm()
+        assert all(len(c.routes) == 1 for c in browser.contexts)
+        await pool.close()
+
+        # Bloklash o'chirilgan bo'lsa route o'rnatilmaydi
+        empty = ResourceBlocker((), ())
+        assert not empty.enabled
+        context = FakeContext(browser)
+        await empty.install(context)
+        assert context.routes == []
+
+    asyncio.run(run())
+    assert blocker.stats == {"allowed": 3, "blocked": 5}
+    print(f"✅ Bloklash: {blocker.stats}")
+
+
+def test_lightweight_navigation():
+    """goto_page wait_until bilan o'tadi va kerak bo'lsa selector kutadi"""
+    print("🧪 LIGHTWEIGHT NAVIGATION TEST")
+
+    async def run():
+        browser = FakeBrowser()
+        context = await browser.new_context()
+        page = await context.new_page()
+        config = {"wait_until": "domcontentloaded", "wait_selector": "h1.title"}
+        await goto_page(page, "http://site/film", config)
+        await goto_page(page, "http://site/page/2", config, wait_selector=".moviebox")
+        assert browser.wait_untils == ["domcontentloaded", "domcontentloaded"]
+        assert browser.selectors == ["h1.title", ".moviebox"]
+
+        # Faol pool sozlamalari ustun
+        pool = BrowserPagePool(browser, size=1, navigation=navigation_options(
+            {"wait_until": "commit"}, {}))
+        token = activate_page_pool(pool)
+        try:
+            await goto_page(page, "http://site/x", config)
+        finally:
+            deactivate_page_pool(token)
+        assert browser.wait_untils[-1] == "commit"
+        assert len(browser.selectors) == 2  # pool'da wait_selector yo'q
+        await pool.close()
+
+    asyncio.run(run())
+    print("✅ Navigatsiya sozlamalari qo'llandi")
+
+
+if __name__ == "__main__":
+    test_checkout_reuse_and_recycle()
+    test_concurrency_cap_and_health()
+    test_fallback_uses_active_pool()
+    test_resource_blocking()
+    test_lightweight_navigation()
+    print("\n🎉 Browser pool testlari yakunlandi!")
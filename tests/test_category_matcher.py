@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Kategoriya matcher testlari - Aho-Corasick avtomat eski ichma-ich sikl bilan bir xil,
+STANDARD_CATEGORIES tartibidagi ustuvorlik, cache va batch API
+"""
+import random
+import re
+import sys
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.catigories import STANDARD_CATEGORIES
+from scraper.parsers.parse_file_page import clean_and_normalize_categories
+from utils.category_matcher import CategoryMatcher, KeywordAutomaton
+from utils.helpers import normalize_categories, normalize_category, normalize_item_categories
+
+
+def legacy_normalize_category(raw: str) -> str:
+    """Avtomatdan oldingi normalize_category"""
+    if not raw:
+        return "other"
+    raw = re.sub(r"[^\w\s\-+]", "", raw.strip().lower())
+    for key, keywords in STANDARD_CATEGORIES.items():
+        for kw in keywords:
+            if kw in raw:
+                return key
+    return "other"
+
+
+def test_matches_legacy_priority():
+    """Har bir kalit so'z va tasodifiy birikmalar eski natija bilan bir xil"""
+    print("🧪 CATEGORY MATCHER TEST")
+    keywords = [kw for kws in STANDARD_CATEGORIES.values() for kw in kws]
+    values = keywords + [kw.upper() for kw in keywords] + ["", "  ", "Boshqa", "IT", "Ta'lim"]
+    rng = random.Random(7)
+    for _ in range(5000):
+        words = rng.sample(keywords, rng.randint(1, 3))
+        values.append(rng.choice([" ", "", ", ", "-"]).join(words) + rng.choice(["", "!", " 2024"]))
+
+    matcher = CategoryMatcher(cache_size=0)
+    for value in values:
+        assert matcher.normalize(value) == legacy_normalize_category(value), value
+
+    # Birinchi kategoriya yutadi: comedy (komediya) romance (sevgi) dan oldin
+    assert normalize_category("Sevgi komediyasi") == "comedy"
+    assert normalize_category("Фантастика!") == "sci-fi"
+    assert normalize_category("18+") == "adult_movies"
+    # Tozalashdan keyin "'" qolmaydi, katta harfli kalit so'zlar hech qachon mos kelmaydi
+    assert normalize_category("IT") == "other" and normalize_category(None) == "other"
+    print(f"✅ {len(values)} ta qiymat eski natija bilan bir xil")
+
+
+def test_automaton_cache_and_batch():
+    """Suffiks kalit so'zlar (fail zanjiri), cache va batch API"""
+    print("🧪 AUTOMATON / CACHE TEST")
+    automaton = KeywordAutomaton()
+    for rank, keyword in enumerate(["hers", "she", "he", "his"]):
+        automaton.add(keyword, rank)
+    automaton.build()
+    assert automaton.first_rank("ushers") == 0  # "she", "he", "hers" - eng kichigi hers
+    assert automaton.first_rank("ahishe") == 1
+    assert automaton.first_rank("xyz") is None
+
+    matcher = CategoryMatcher({"a": ["kino"], "b": ["serial", "kino serial"]})
+    assert matcher.normalize_many(["Kino serial", "Serial", "Multfilm", "Serial"]) == \
+        ["a", "b", "other", "b"]
+    assert matcher.cache_info() == {"hits": 1, "misses": 3, "size": 3}
+
+    assert normalize_categories(["Drama", " Kino ", "Разное"]) == ["drama", "movies", "other"]
+    item = normalize_item_categories({"categories": "Drama, Драма, Kino"})
+    assert sorted(item["categories"].split(", ")) == ["drama", "movies"]
+    assert clean_and_normalize_categories("Kino, Boevik, , Drama") == "action, drama, movies"
+    assert clean_and_normalize_categories(" , ") == "other"
+    print("✅ Avtomat, cache va batch to'g'ri")
+
+
+if __name__ == "__main__":
+    test_matches_legacy_priority()
+    test_automaton_cache_and_batch()
+    print("\n🎉 Kategoriya matcher testlari yakunlandi!")
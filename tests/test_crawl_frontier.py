@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Crawl frontier testlari - URL holatlari DB da, to'xtagan crawl'ni davom ettirish
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.async_db import AsyncFileDB
+from core.FileDB import FileDB
+from scraper import pipeline as pipeline_module
+from scraper.frontier import CrawlFrontier
+from scraper.pipeline import ScrapePipeline
+
+
+class Crash(BaseException):
+    """Jarayon kutilmaganda to'xtadi (Ctrl+C / kill o'rniga)"""
+
+
+def _db_path(prefix: str) -> str:
+    return os.path.join(tempfile.mkdtemp(prefix=prefix), "files.db")
+
+
+def _film(page: int, n: int) -> str:
+    return f"https://example.com/film/{page}-{n}"
+
+
+def test_frontier_states():
+    """queued → in_flight → done/failed, attempts chegarasi va listing_done tranzaksiyasi"""
+    print("🧪 FRONTIER STATES TEST")
+    db = FileDB(db_path=_db_path("test_frontier_"))
+    try:
+        assert db.frontier_add("site", "listing", [("p1", 0, None), ("p2", 1, None)]) == 2
+        assert db.frontier_add("site", "listing", [("p1", 0, None)]) == 0  # takror
+        db.frontier_mark("site", ["p1"], "in_flight")
+        db.frontier_listing_done("site", "p1", [("f1", 0, '{"file_page": "f1"}'), ("f2", 0, None)])
+
+        counts = db.frontier_counts("site")
+        assert counts["listing"] == {"done": 1, "queued": 1}
+        assert counts["detail"] == {"queued": 2}
+
+        for _ in range(3):
+            db.frontier_mark("site", ["f2"], "in_flight")
+            db.frontier_mark("site", ["f2"], "failed", error="timeout")
+        # Jarayonni har safar yiqitadigan URL in_flight'da qoladi - u ham cheklanadi
+        db.frontier_add("site", "detail", [("f3", 1, None)])
+        for _ in range(3):
+            db.frontier_mark("site", ["f3"], "in_flight")
+        # 3 ta urinishdan keyin f2 va f3 endi pending emas
+        assert [r["url"] for r in db.frontier_pending("site", "detail", max_attempts=3)] == ["f1"]
+        assert len(db.frontier_pending("site", "detail", max_attempts=5)) == 3
+        assert db.frontier_counts("other") == {}
+
+        # Tugagan crawl: faqat qayta urinadigan f1 qoladi (done, queued p2, f2, f3 o'chadi)
+        db.frontier_mark("site", ["f1"], "in_flight")
+        db.frontier_mark("site", ["f1"], "failed", error="timeout")
+        assert db.frontier_prune("site", max_attempts=3) == 4
+        assert db.frontier_counts("site") == {"detail": {"failed": 1}}
+        assert db.frontier_clear("site") == 1
+        assert db.frontier_counts("site") == {}
+
+        # crawl_finished marker high-water mark'ga tegmaydi
+        assert db.get_crawl_state("site") is None
+        db.set_crawl_finished("site", False)
+        assert db.get_crawl_state("site")["crawl_finished"] == 0
+        db.set_high_water_mark("site", "f1", 2, 1)
+        db.set_crawl_finished("site", True)
+        state = db.get_crawl_state("site")
+        assert state["crawl_finished"] == 1 and state["high_water_page"] == "f1"
+    finally:
+        db.close()
+    print("✅ Frontier holatlari to'g'ri")
+
+
+def test_pipeline_resume_after_crash():
+    """Crawl o'rtada to'xtaydi, keyingi ishga tushirish qolgan joydan davom etadi - dublikatsiz"""
+    print("🧪 RESUME AFTER CRASH TEST")
+    pages = [f"https://example.com/page/{i}/" for i in range(1, 11)]
+    config = {"name": "site", "scrape_concurrency": 2, "scrape_queue_size": 3,
+              "scrape_write_batch": 4, "scrape_flush_interval": 0.05}
+    calls = {"list": [], "detail": [], "crash_after": 5}
+
+    async def fake_list(config, browser, url, session=None):
+        calls["list"].append(url)
+        if len(calls["list"]) == calls["crash_after"]:
+            raise Crash()
+        await asyncio.sleep(0.01)
+        number = int(url.rstrip("/").rsplit("/", 1)[1])
+        return [{"file_page": _film(number, n)} for n in range(4)]
+
+    async def fake_detail(config, browser, url, session=None):
+        calls["detail"].append(url)
+        await asyncio.sleep(0.002)
+        if url.endswith("-3"):
+            return {"file_page": url, "file_url": None}  # Video yo'q - done
+        return {"file_page": url, "file_url": url + ".mp4", "title": url.rsplit("/", 1)[1]}
+
+    async def scenario():
+        async with AsyncFileDB(db_path=_db_path("test_resume_")) as db:
+            frontier = CrawlFrontier(db, "site")
+            assert not await frontier.interrupted()
+            assert await frontier.start(pages) == ([], [])
+            try:
+                await ScrapePipeline(config, None, db, frontier=frontier).run(pages)
+                raise AssertionError("Crash kutilgan edi")
+            except Crash:
+                pass
+            written_first = await db.count_files("site")
+
+            assert await frontier.interrupted()
+            resumed = await frontier.load_pending()
+            assert resumed is not None
+            listing, items = resumed
+            calls["list"].clear()
+            calls["detail"].clear()
+            calls["crash_after"] = 0
+            stats = await ScrapePipeline(config, None, db, frontier=frontier).run(
+                listing, resume_items=items)
+            counts = await frontier.counts()
+            await frontier.finish()
+            assert not await frontier.interrupted()
+            return written_first, listing, stats, counts, await db.count_files("site"), \
+                await frontier.load_pending()
+
+    originals = (pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe)
+    pipeline_module.scrape_page_list_safe = fake_list
+    pipeline_module.scrape_file_page_safe = fake_detail
+    try:
+        written_first, listing, stats, counts, total, after_finish = asyncio.run(scenario())
+    finally:
+        pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe = originals
+
+    print(f"   1-urinish: {written_first} ta yozildi, qolgan listing: {len(listing)}")
+    print(f"   resume stats: {stats}")
+    assert 0 < written_first < 30
+    assert len(listing) < len(pages)  # O'qilgan listing sahifalar qayta o'qilmaydi
+    assert sorted(set(calls["list"])) == sorted(listing)
+    assert stats["resumed"] > 0
+    # 10 sahifa x 3 ta videoli film, har biri bir marta
+    assert total == 30
+    assert len(calls["detail"]) == len(set(calls["detail"]))
+    assert all(status == "done" for kind in counts.values() for status in kind), counts
+    assert after_finish is None
+    print(f"✅ Davom ettirildi: jami {total} ta fayl, dublikatsiz")
+
+
+def test_failed_urls_retried_next_run():
+    """1-run oxirigacha ishlaydi, lekin sahifa va film xato - 2-run yangi tanlov bilan
+    oddiy crawl, xato URL'lar esa shu tanlovga qo'shiladi"""
+    print("🧪 FAILED RETRY TEST")
+    pages = [f"https://example.com/page/{i}/" for i in range(1, 6)]
+    first, second = pages[:4], [pages[0], pages[4]]
+    config = {"name": "site", "scrape_concurrency": 2, "scrape_queue_size": 3,
+              "scrape_write_batch": 4, "scrape_flush_interval": 0.05}
+    broken = {pages[2], _film(1, 1)}
+    calls = {"list": [], "detail": []}
+
+    async def fake_list(config, browser, url, session=None):
+        calls["list"].append(url)
+        if url in broken:
+            raise RuntimeError("timeout")
+        number = int(url.rstrip("/").rsplit("/", 1)[1])
+        return [{"file_page": _film(number, n)} for n in range(3)]
+
+    async def fake_detail(config, browser, url, session=None):
+        calls["detail"].append(url)
+        if url in broken:
+            raise RuntimeError("timeout")
+        return {"file_page": url, "file_url": url + ".mp4", "title": url.rsplit("/", 1)[1]}
+
+    async def scenario():
+        async with AsyncFileDB(db_path=_db_path("test_retry_")) as db:
+            frontier = CrawlFrontier(db, "site")
+            await frontier.start(first)
+            await ScrapePipeline(config, None, db, frontier=frontier).run(first)
+            await frontier.finish()
+            written_first = await db.count_files("site")
+            # Crawl tugagan - xato URL'lar bor, lekin avtomatik davom ettirilmaydi
+            assert not await frontier.interrupted()
+
+            listing, items = await frontier.start(second)
+            assert await frontier.interrupted()
+            broken.clear()
+            calls["list"].clear()
+            calls["detail"].clear()
+            await ScrapePipeline(config, None, db, frontier=frontier).run(
+                second, resume_items=items, retry_pages=listing)
+            await frontier.finish()
+            return written_first, listing, items, await db.count_files("site"), \
+                await frontier.load_pending()
+
+    originals = (pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe)
+    pipeline_module.scrape_page_list_safe = fake_list
+    pipeline_module.scrape_file_page_safe = fake_detail
+    try:
+        written_first, listing, items, total, after_finish = asyncio.run(scenario())
+    finally:
+        pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe = originals
+
+    print(f"   1-run: {written_first} ta yozildi, qayta: {listing} + {len(items)} ta film")
+    assert written_first == 8  # 3 sahifa x 3 film, bittasi xato
+    assert listing == [pages[2]]
+    assert [item["file_page"] for item in items] == [_film(1, 1)]
+    assert sorted(calls["list"]) == sorted([pages[2]] + second)
+    assert sorted(calls["detail"]) == sorted(
+        [_film(1, 1)] + [_film(n, i) for n in (3, 5) for i in range(3)])
+    assert total == 15
+    assert after_finish is None
+    print(f"✅ Xato URL'lar keyingi run'da qayta o'qildi: jami {total} ta fayl")
+
+
+if __name__ == "__main__":
+    test_frontier_states()
+    test_pipeline_resume_after_crash()
+    test_failed_urls_retried_next_run()
+    print("\n🎉 Crawl frontier testlari yakunlandi!")
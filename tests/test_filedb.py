@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+FileDB testlari - pool rejimi, WAL va CRUD amallari
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core import FileDB as filedb_module
+from core.FileDB import FileDB
+
+
+def _temp_db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="test_filedb_"), "files.db")
+
+
+def _item(i: int) -> dict:
+    return {
+        "file_page": f"https://example.com/film/{i}",
+        "title": f"Film {i}",
+        "file_url": f"https://cdn.example.com/{i}.mp4",
+        "file_size": i * 1024,
+    }
+
+
+def test_pooled_crud():
+    """Pool rejimida CRUD amallari eski rejim bilan bir xil ishlashi"""
+    print("🧪 POOLED CRUD TEST")
+    for pooled in (False, True):
+        db = FileDB(db_path=_temp_db_path(), pooled=pooled)
+        for i in range(1, 4):
+            db.insert_file("site", _item(i))
+
+        assert db.get_files_count("site") == 3
+        assert db.file_exists("site", "https://example.com/film/2")
+        assert not db.file_exists("site", "https://example.com/film/99")
+
+        db.update_file(1, local_path="downloads/1.mp4", uploaded=True)
+        row = db.get_file(1)
+        assert row["local_path"] == "downloads/1.mp4"
+        assert row["uploaded"] == 1 and row["uploaded_at"]
+
+        undownloaded = db.get_undownloaded_files("site")
+        assert [f["id"] for f in undownloaded] == [2, 3]
+
+        assert db.reset_uploaded_status("site") == 1
+        assert db.delete_files("site") == 3
+        db.close()
+        print(f"✅ pooled={pooled}: OK")
+
+
+def test_pooled_wal_mode():
+    """Pool ulanishi WAL journal rejimini yoqishi"""
+    print("🧪 WAL MODE TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=True)
+    with db._connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+    db.close()
+    print("✅ journal_mode=wal")
+
+
+def test_pool_reuses_connection_per_thread():
+    """Bitta thread ichida ulanish qayta ishlatilishi, boshqa thread'da alohida bo'lishi"""
+    print("🧪 THREAD-LOCAL CONNECTION TEST")
+    path = _temp_db_path()
+    db = FileDB(db_path=path, pooled=True)
+    other = FileDB(db_path=path, pooled=True)
+
+    with db._connection() as first:
+        pass
+    with other._connection() as second:
+        pass
+    assert first is second
+
+    seen = []
+
+    def worker():
+        with db._connection() as conn:
+            seen.append(conn)
+        db.insert_file("site", _item(1))
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert seen and seen[0] is not first
+    assert db.get_files_count("site") == 1
+    db.close()
+    print("✅ Thread-local ulanishlar to'g'ri ishlaydi")
+
+
+def test_failed_write_rolls_back():
+    """Xato bo'lgan tranzaksiya rollback qilinishi va ulanish ishlashda davom etishi"""
+    print("🧪 ROLLBACK TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=True)
+    db.insert_file("site", _item(1))
+
+    try:
+        db.update_file(1, not_a_column="x")
+    except Exception:
+        pass
+
+    db.update_file(1, title="Yangi nom")
+    assert db.get_file(1)["title"] == "Yangi nom"
+    db.close()
+    print("✅ Rollback dan keyin ulanish ishlaydi")
+
+
+def test_insert_files_bulk():
+    """insert_files: ignore/upsert siyosati va inserted/skipped hisoboti"""
+    print("🧪 BULK INSERT TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=True)
+    db.insert_file("site", _item(1))
+
+    items = [_item(i) for i in range(1, 6)]
+    items.append(_item(3))                    # ro'yxat ichidagi dublikat
+    items.append({"title": "file_page yo'q"})  # yaroqsiz item
+
+    result = db.insert_files("site", items, chunk_size=2)
+    assert result == {"inserted": 4, "updated": 0, "skipped": 3}
+    assert db.get_files_count("site") == 5
+
+    db.update_file(2, local_path="downloads/2.mp4")
+    changed = [dict(_item(2), title="Yangilangan", file_url=None)]
+    result = db.insert_files("site", changed, on_conflict="upsert")
+    assert result == {"inserted": 0, "updated": 1, "skipped": 0}
+
+    row = db.get_file(2)
+    assert row["title"] == "Yangilangan"
+    assert row["file_url"] == "https://cdn.example.com/2.mp4"  # None eski qiymatni o'chirmaydi
+    assert row["local_path"] == "downloads/2.mp4"               # yuklash holati saqlanadi
+    db.close()
+    print("✅ Bulk insert to'g'ri ishlaydi")
+
+
+def test_existing_pages():
+    """existing_pages kichik (IN) va katta (temp jadval) ro'yxatlarda to'g'ri ishlashi"""
+    print("🧪 EXISTING PAGES TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=True)
+    db.insert_files("site", [_item(i) for i in range(0, 2000, 2)])
+
+    small = [_item(i)["file_page"] for i in range(10)]
+    assert db.existing_pages("site", small) == {
+        _item(i)["file_page"] for i in range(0, 10, 2)}
+
+    big = [_item(i)["file_page"] for i in range(2000)] + [None, ""]
+    found = db.existing_pages("site", big)
+    assert len(found) == 1000
+    assert db.existing_pages("other", big) == set()
+    assert db.existing_pages("site", []) == set()
+    db.close()
+    print("✅ Mavjud sahifalar bitta so'rov bilan aniqlanadi")
+
+
+def test_migration_dedupes_pages():
+    """Eski bazadagi takroriy sahifalar tozalanib, unique index qo'yilishi"""
+    print("🧪 MIGRATION DEDUPE TEST")
+    path = _temp_db_path()
+    # Migratsiyadan oldingi holatni tiklash: unique index yo'q, user_version=0
+    FileDB(db_path=path, pooled=False)
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_files_config_page")
+    conn.execute("PRAGMA user_version=0")
+    conn.executemany(
+        "INSERT INTO files (config_name, file_page, file_url, local_path, uploaded) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            ("site", "p1", None, None, 0),
+            ("site", "p1", None, None, 1),       # yuklangani qoladi
+            ("site", "p2", None, "d/2.mp4", 0),  # yuklab olingani qoladi
+            ("site", "p2", None, None, 0),
+            ("site", "p3", None, None, 0),
+            ("other", "p4", None, None, 0),
+            ("other", "p4", "u4", None, 0),      # file_url'i bori qoladi
+        ])
+    conn.commit()
+    conn.close()
+
+    warnings = []
+    original_logger = filedb_module.logger
+    filedb_module.logger = type("Recorder", (), {"warning": staticmethod(warnings.append)})()
+    try:
+        db = FileDB(db_path=path, pooled=True)
+    finally:
+        filedb_module.logger = original_logger
+    rows = db.get_files("site")
+    assert len(rows) == 3
+    by_page = {row["file_page"]: row for row in rows}
+    assert by_page["p1"]["uploaded"] == 1
+    assert by_page["p2"]["local_path"] == "d/2.mp4"
+    assert [row["file_url"] for row in db.get_files("other")] == ["u4"]
+    # Nechta qator va qaysi configlardan o'chirilgani log qilinadi
+    assert len(warnings) == 1 and "3 ta" in warnings[0]
+    assert "site: 2" in warnings[0] and "other: 1" in warnings[0]
+
+    try:
+        db.insert_file("site", {"file_page": "p3"})
+        assert False, "takroriy sahifa qabul qilinmasligi kerak"
+    except sqlite3.IntegrityError:
+        pass
+    db.close()
+    print("✅ Migratsiya takrorlarni tozaladi va unique index qo'ydi")
+
+
+def test_iter_files():
+    """iter_files partiyalab o'qishi, filtrlar va sahifalash"""
+    print("🧪 ITER FILES TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=True)
+    db.insert_files("site", [_item(i) for i in range(1, 11)])
+    db.update_file(2, local_path="downloads/2.mp4")
+    db.update_file(3, local_path="downloads/3.mp4", uploaded=True)
+
+    rows = list(db.iter_files("site", batch_size=3))
+    assert [row["id"] for row in rows] == list(range(1, 11))
+    assert rows[0].get("title") == "Film 1"
+    assert rows[0].get("missing", "x") == "x"
+    assert dict(rows[1])["local_path"] == "downloads/2.mp4"
+
+    assert [r["id"] for r in db.iter_files("site", where="uploaded")] == [3]
+    assert [r["id"] for r in db.iter_files("site", where="downloaded")] == [2, 3]
+    assert len(list(db.iter_files("site", where="undownloaded"))) == 8
+    assert [r["id"] for r in db.iter_files("site", where="id > ?", params=(8,))] == [9, 10]
+
+    page = list(db.iter_files("site", columns=("id", "title"), limit=3, offset=3))
+    assert [r["id"] for r in page] == [4, 5, 6]
+    assert "title" in page[0] and "file_url" not in page[0]
+
+    # Iteratsiya davomida yozish bloklanmaydi
+    for row in db.iter_files("site", where="not_uploaded", batch_size=2):
+        db.update_file(row["id"], uploaded=True)
+    assert db.get_uploaded_files_count("site") == 10
+    assert db.get_undownloaded_files("site") == []
+    db.close()
+    print("✅ iter_files to'g'ri ishlaydi")
+
+
+def test_get_stats():
+    """get_stats hisoblagichlari va kategoriya/yil taqsimoti"""
+    print("🧪 GET STATS TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=True)
+    db.insert_files("site", [
+        dict(_item(1), categories="movies, action", year="2020"),
+        dict(_item(2), categories="movies", year="2021"),
+        dict(_item(3), file_url=None, categories=None, year=None),
+    ])
+    db.update_file(1, local_path="downloads/1.mp4", uploaded=True)
+
+    stats = db.get_stats("site", by_category=True, by_year=True)
+    assert (stats["total"], stats["downloaded"], stats["pending"],
+            stats["no_url"], stats["uploaded"]) == (3, 1, 1, 1, 1)
+    assert stats["total_size"] == 6 * 1024
+    assert stats["downloaded_size"] == stats["uploaded_size"] == 1024
+    assert stats["pending_size"] == 5 * 1024
+
+    assert stats["by_category"]["movies"]["total"] == 2
+    assert stats["by_category"]["action"]["uploaded"] == 1
+    assert stats["by_category"]["other"]["no_url"] == 1
+    assert set(stats["by_year"]) == {"2020", "2021", "unknown"}
+
+    assert db.get_stats("empty")["total"] == 0
+    db.close()
+    print("✅ Statistika bitta so'rovda to'g'ri hisoblanadi")
+
+
+def test_search_fts():
+    """FTS5 qidiruv: prefiks, tartiblash va triggerlar orqali sinxronlash"""
+    print("🧪 FTS SEARCH TEST")
+    db = FileDB(db_path=_temp_db_path(), pooled=True)
+    db.insert_files("site", [
+        dict(_item(1), title="Oila sirlari", actors="Ali Valiyev"),
+        dict(_item(2), title="Boshqa film", description="Oilaviy drama"),
+        dict(_item(3), title="Tun", country="O‘zbekiston"),
+    ])
+    db.insert_files("other", [dict(_item(1), title="Oila")])
+
+    # "oil" prefiksi tavsifdagi "Oilaviy"ni ham topadi, lekin nomdagi moslik yuqoriroq
+    assert [r["id"] for r in db.search("site", "oil")] == [1, 2]
+    assert [r["id"] for r in db.search("site", "oila sir")] == [1]
+    assert [r["id"] for r in db.search("site", "valiyev")] == [1]
+    assert [r["id"] for r in db.search("site", "o‘zbek")] == [3]
+    assert db.search("site", 'NEAR "OR -x:y') == []
+    assert db.search("site", "   ") == []
+
+    # Triggerlar: yangilash va o'chirish indeksga ta'sir qiladi
+    db.update_file(3, title="Oila tuni")
+    db.delete_file(1)
+    assert {r["id"] for r in db.search("site", "oila")} == {2, 3}
+    assert db.search("site", "sirlari") == []
+    db.update_file(3, uploaded=True)
+    assert [r["id"] for r in db.search("site", "tun")] == [3]
+    db.close()
+    print("✅ FTS qidiruv to'g'ri ishlaydi")
+
+
+def test_search_year_language():
+    """Yil va til ham FTS indeksida; eski (year/language'siz) indeks migratsiyada qayta quriladi"""
+    print("🧪 FTS YEAR / LANGUAGE TEST")
+    path = _temp_db_path()
+    db = FileDB(db_path=path, pooled=False)
+    db.insert_files("site", [
+        dict(_item(1), title="Qasoskorlar", year="2019", language="uz"),
+        dict(_item(2), title="Titanik", year="1997", language="ru"),
+    ])
+    # Migratsiya 8 dan oldingi holat: files_fts faqat 6 ta ustun bilan
+    conn = sqlite3.connect(path)
+    for sql in ("DROP TRIGGER files_fts_insert", "DROP TRIGGER files_fts_delete",
+                "DROP TRIGGER files_fts_update", "DROP TABLE files_fts"):
+        conn.execute(sql)
+    for sql in dict(FileDB._MIGRATIONS)[2]:
+        conn.execute(sql)
+    conn.execute("PRAGMA user_version=7")
+    conn.commit()
+    conn.close()
+
+    db = FileDB(db_path=path, pooled=True)
+    assert [r["id"] for r in db.search("site", "2019")] == [1]
+    assert [r["id"] for r in db.search("site", "uz")] == [1]
+    assert [r["id"] for r in db.search("site", "ru 1997")] == [2]
+    db.update_file(2, year="2019")
+    assert {r["id"] for r in db.search("site", "2019")} == {1, 2}
+    db.close()
+    print("✅ Yil va til bo'yicha qidiruv ishlaydi")
+
+
+def test_claim_batch():
+    """claim_batch: workerlar bir xil qatorni olmasligi, lease uzaytirish va muddat o'tgach qayta olish"""
+    print("🧪 CLAIM BATCH TEST")
+    path = _temp_db_path()
+    db = FileDB(db_path=path, pooled=False)
+    db.insert_files("site", [_item(i) for i in range(1, 201)])
+    db.update_file(1, uploaded=True)
+
+    # Ikki "server" bir vaqtda partiyalab olishadi
+    claimed = {"w1": [], "w2": []}
+
+    def worker(name):
+        worker_db = FileDB(db_path=path, pooled=False)
+        while True:
+            batch = worker_db.claim_batch("site", name, 7, 60)
+            if not batch:
+                break
+            claimed[name].extend(row["id"] for row in batch)
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in claimed]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ids_1, ids_2 = set(claimed["w1"]), set(claimed["w2"])
+    assert not ids_1 & ids_2
+    assert ids_1 | ids_2 == set(range(2, 201))
+    assert len(claimed["w1"]) + len(claimed["w2"]) == 199
+
+    # Tartib: file_size bo'yicha
+    db.release_claims("site", "w1")
+    db.release_claims("site", "w2")
+    batch = db.claim_batch("site", "w3", 3, 60, order_by="file_size ASC")
+    assert [row["id"] for row in batch] == [2, 3, 4]
+    assert batch[0]["claimed_by"] == "w3"
+
+    # Lease uzaytirish: faqat o'z qatorlari
+    assert db.renew_leases("site", "w3", [2, 3, 4, 5], 120) == 3
+    assert db.get_file(2)["lease_expires_at"] >= int(time.time()) + 119
+
+    # Muddati o'tgan lease boshqa worker tomonidan qayta olinadi
+    db.update_file(2, lease_expires_at=int(time.time()) - 1)
+    batch = db.claim_batch("site", "w4", 1, 60)
+    assert [row["id"] for row in batch] == [2]
+    assert db.renew_leases("site", "w3", [2], 120) == 0
+
+    # Bo'shatilgan qatorlar darhol olinadi
+    assert db.release_claims("site", "w3", [3]) == 1
+    assert [row["id"] for row in db.claim_batch("site", "w5", 1, 60)] == [3]
+    db.close()
+    print("✅ claim_batch workerlar orasida qatorlarni to'g'ri bo'ladi")
+
+
+def test_status_and_retry_backoff():
+    """status ustuni: eski DB'dan to'ldirilishi, xatolarda backoff va dead holati"""
+    print("🧪 STATUS / RETRY BACKOFF TEST")
+    from core.config import RETRY_BASE_DELAY_SECONDS
+
+    # status ustunlari yo'q eski schema
+    path = _temp_db_path()
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE files (id INTEGER PRIMARY KEY AUTOINCREMENT, config_name TEXT, "
+        "file_page TEXT, title TEXT, categories TEXT, language TEXT, description TEXT, "
+        "file_url TEXT, image TEXT, year TEXT, country TEXT, actors TEXT, local_path TEXT, "
+        "file_size INTEGER, mime TEXT, telegram_type TEXT, uploaded BOOLEAN DEFAULT 0, "
+        "created_at TEXT DEFAULT CURRENT_TIMESTAMP, uploaded_at TEXT)")
+    conn.executemany(
+        "INSERT INTO files (config_name, file_page, file_url, local_path, uploaded) VALUES (?, ?, ?, ?, ?)",
+        [("site", "p1", "u1", None, 0), ("site", "p2", "u2", "d/2.mp4", 0),
+         ("site", "p3", "u3", None, 1), ("site", "p4", "u4", None, 0)])
+    conn.commit()
+    conn.close()
+
+    db = FileDB(db_path=path, pooled=False)
+    assert [db.get_file(i)["status"] for i in (1, 2, 3, 4)] == [
+        "pending", "downloaded", "uploaded", "pending"]
+    assert [row["id"] for row in db.get_undownloaded_files("site")] == [1, 4]
+
+    # Xato: backoff vaqti kelguncha navbatda yo'q
+    before = int(time.time())
+    assert db.record_failure(1, "HTTP 404") == "failed"
+    assert db.record_failure(1, "HTTP 404") == "failed"
+    row = db.get_file(1)
+    assert row["attempts"] == 2 and row["last_error"] == "HTTP 404"
+    assert row["next_retry_at"] >= before + RETRY_BASE_DELAY_SECONDS * 2
+    assert [row["id"] for row in db.get_undownloaded_files("site")] == [4]
+
+    # Vaqt kelganda qayta olinadi
+    db.update_file(1, next_retry_at=before - 1)
+    assert [row["id"] for row in db.get_undownloaded_files("site")] == [1, 4]
+
+    # Urinishlar tugasa - dead, navbatga qaytmaydi
+    assert db.record_failure(4, "timeout", max_attempts=1) == "dead"
+    db.update_file(4, next_retry_at=before - 1)
+    assert [row["id"] for row in db.get_undownloaded_files("site")] == [1]
+    stats = db.get_stats("site")
+    assert (stats["failed"], stats["dead"], stats["pending"]) == (1, 1, 1)
+
+    # Muvaffaqiyat va reset holatlari
+    db.update_file(1, local_path="d/1.mp4")
+    assert db.get_file(1)["status"] == "downloaded"
+    db.update_file(1, local_path=None)
+    assert db.get_file(1)["status"] == "pending"
+    db.mark_file_uploaded(1)
+    db.update_file(1, local_path=None)
+    assert db.get_file(1)["status"] == "uploaded"
+    assert db.reset_failed_status("site") == 1
+    assert db.get_file(4)["status"] == "pending" and db.get_file(4)["attempts"] == 0
+    print("✅ status, backoff va dead holatlari to'g'ri")
+
+
+if __name__ == "__main__":
+    test_pooled_crud()
+    test_pooled_wal_mode()
+    test_pool_reuses_connection_per_thread()
+    test_failed_write_rolls_back()
+    test_insert_files_bulk()
+    test_existing_pages()
+    test_migration_dedupes_pages()
+    test_iter_files()
+    test_get_stats()
+    test_search_fts()
+    test_search_year_language()
+    test_claim_batch()
+    test_status_and_retry_backoff()
+    print("\n🎉 FileDB testlari yakunlandi!")
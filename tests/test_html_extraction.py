@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+HTML extraction testlari - kompilyatsiya qilingan plan va backendlar bir xil natija berishi
+"""
+import sys
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.site_configs import SITE_CONFIGS
+from scraper.parsers.extraction import BACKENDS, compile_plan, extract_fields, get_backend
+from scraper.parsers.parse_file_page import parse_page_fields
+
+FIXTURES = project_root / "tests" / "fixtures" / "pages"
+CASES = [
+    ("asilmedia", "asilmedia_film.html", "http://asilmedia.org/123-qasoskorlar-final.html"),
+    ("daxshat_net_tarjima", "daxshat_film.html", "https://new.daxshat.net/998-tungi-ov.html"),
+]
+
+
+def _available_backends():
+    backends = []
+    for name in BACKENDS:
+        backend = get_backend(name)
+        if backend.name == name:
+            backends.append(backend)
+    return backends
+
+
+def test_compile_plan():
+    """fields bir marta plan'ga aylanadi: muqobil selectorlar, ::attr() va meta:Key"""
+    print("🧪 EXTRACTION PLAN TEST")
+    fields = SITE_CONFIGS["asilmedia"]["fields"]
+    plan = compile_plan(fields)
+    assert compile_plan(dict(fields)) is plan  # bir xil fields - cache'dan
+
+    rules = {rule.key: rule for rule in plan.rules}
+    assert "file_page" not in rules  # selector None - o'tkazib yuboriladi
+    assert [(s.css, s.attr) for s in rules["image"].alternatives] == [
+        ("img.img-fit", "src"), ("img.img-fit", "data-src")]
+    assert rules["title"].alternatives[0].attr is None
+    assert len(plan.css) == len(set(plan.css))
+
+    meta_plan = compile_plan(SITE_CONFIGS["daxshat_net_tarjima"]["fields"])
+    assert meta_plan.meta_css == ".inner-page__desc .inner-page__text"
+    assert {r.key: r.meta_key for r in meta_plan.rules}["year"] == "Ishlab chiqarilgan yili"
+    print("✅ Plan to'g'ri kompilyatsiya qilindi")
+
+
+def test_backends_match():
+    """Barcha o'rnatilgan backendlar fixture sahifalarda bs4 bilan bir xil natija beradi"""
+    print("🧪 HTML BACKEND PARITY TEST")
+    backends = _available_backends()
+    print(f"   backendlar: {[b.name for b in backends]}")
+
+    for site, fixture, url in CASES:
+        config = SITE_CONFIGS[site]
+        html = (FIXTURES / fixture).read_text(encoding="utf-8")
+        plan = compile_plan(config["fields"])
+        reference = extract_fields(plan, get_backend("bs4"), html, url)
+        for backend in backends:
+            assert extract_fields(plan, backend, html, url) == reference, (site, backend.name)
+
+    item = parse_page_fields(SITE_CONFIGS["asilmedia"],
+                             (FIXTURES / "asilmedia_film.html").read_text(encoding="utf-8"),
+                             CASES[0][2])
+    assert item["title"] == "Qasoskorlar: Final (2019) Uzbek tilida O'zbekcha tarjima kino HD"
+    assert item["categories"] == "Fantastika , Jangari , Sarguzasht"
+    assert item["year"] == "2019"
+    assert item["country"] == "AQSh, Kanada"
+    assert item["file_url"] == "http://asilmedia.org/files/2019/qasoskorlar-final_1080p.mp4"
+    assert item["image"].startswith("http://asilmedia.org/uploads/posts/")
+    assert "reklama" not in item["description"] and "ichki izoh" not in item["description"]
+
+    item = parse_page_fields(SITE_CONFIGS["daxshat_net_tarjima"],
+                             (FIXTURES / "daxshat_film.html").read_text(encoding="utf-8"),
+                             CASES[1][2])
+    assert item["categories"] == "Triller, Jangari, Kriminal"
+    assert item["language"] == "O'zbek tilida (professional)"
+    assert item["file_url"] == "https://cdn.daxshat.net/films/2023/tungi-ov_720.mp4"
+    print("✅ Backendlar bir xil maydonlarni ajratdi")
+
+
+def test_unknown_backend_falls_back():
+    """Noma'lum backend nomi xato bermaydi - mavjud backend tanlanadi"""
+    print("🧪 BACKEND FALLBACK TEST")
+    backend = get_backend("no-such-parser")
+    assert backend.name in BACKENDS
+    assert get_backend(None) is get_backend("auto")
+    print(f"✅ Zaxira backend: {backend.name}")
+
+
+if __name__ == "__main__":
+    test_compile_plan()
+    test_backends_match()
+    test_unknown_backend_falls_back()
+    print("\n🎉 HTML extraction testlari yakunlandi!")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Scraper HTTP cache testlari - shartli so'rovlar (304), offline rejim va LRU eviction
+"""
+import asyncio
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aiohttp import web
+
+from scraper.http_cache import HttpCache, activate_http_cache, deactivate_http_cache, fetch_text
+from scraper.http_client import create_http_session
+from scraper.parsers.parse_file_page import fetch_page_html
+from scraper.parsers.parse_file_pages import fetch_page_html_safe
+
+
+def _temp_cache_path() -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="test_http_cache_"), "http_cache.db")
+
+
+async def _start_stub():
+    """ETag qo'llab-quvvatlaydigan lokal server; to'liq va 304 javoblarni sanaydi"""
+    counts = {"full": 0, "not_modified": 0}
+
+    async def film_page(request):
+        i = request.match_info["i"]
+        etag = f'"film-{i}-v1"'
+        if request.headers.get("If-None-Match") == etag:
+            counts["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        counts["full"] += 1
+        return web.Response(text=f"<html><h1>Film {i}</h1>{'<p>tavsif</p>' * 100}</html>",
+                            content_type="text/html", headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/film/{i}", film_page)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", counts
+
+
+def test_conditional_requests_and_offline():
+    """Ikkinchi o'qish 304 bilan cache'dan, offline rejimda so'rovsiz"""
+    print("🧪 HTTP CACHE 304 / OFFLINE TEST")
+    path = _temp_cache_path()
+
+    async def scenario():
+        runner, base, counts = await _start_stub()
+        session = create_http_session()
+        try:
+            cache = HttpCache(path, 10 * 1024 * 1024)
+            token = activate_http_cache(cache)
+            try:
+                first = [await fetch_page_html(f"{base}/film/{i}", session=session) for i in range(5)]
+                second = [await fetch_page_html_safe(f"{base}/film/{i}", session=session)
+                          for i in range(5)]
+                online = cache.report()
+            finally:
+                deactivate_http_cache(token)
+                cache.close()
+            assert first == second and all(first)
+
+            # Offline: yangi jarayon kabi qayta ochilgan cache, tarmoqqa chiqilmaydi
+            before = dict(counts)
+            offline = HttpCache(path, 10 * 1024 * 1024, offline=True)
+            token = activate_http_cache(offline)
+            try:
+                third = [await fetch_page_html(f"{base}/film/{i}", session=session) for i in range(5)]
+                offline_report = offline.report()
+            finally:
+                deactivate_http_cache(token)
+                offline.close()
+            assert third == first
+            assert counts == before
+
+            # Cache faollashtirilmagan chaqiruvlar oddiy GET qiladi
+            assert await fetch_page_html(f"{base}/film/0", session=session)
+            return counts, online, offline_report
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    counts, online, offline_report = asyncio.run(scenario())
+    print(f"   server: {counts}, online: hits={online['hits']} misses={online['misses']}, "
+          f"offline hits={offline_report['offline_hits']}")
+    assert counts == {"full": 6, "not_modified": 5}
+    assert online["hits"] == 5 and online["misses"] == 5 and online["hit_rate"] == 50.0
+    assert online["bytes_saved"] > 0 and online["entries"] == 5
+    assert offline_report["offline_hits"] == 5 and offline_report["misses"] == 0
+    print("✅ 304 javoblar va offline rejim cache'dan berildi")
+
+
+def test_lru_eviction():
+    """Hajm chegarasi oshsa eng uzoq ishlatilmagan sahifalar o'chiriladi"""
+    print("🧪 HTTP CACHE LRU TEST")
+    max_bytes = 64 * 1024
+    cache = HttpCache(_temp_cache_path(), max_bytes)
+    rng = random.Random(1)
+
+    def page() -> str:
+        # Siqilmaydigan matn - har sahifa ~8KB joy oladi
+        return "".join(rng.choices(string.ascii_letters + string.digits, k=10000))
+
+    try:
+        cache.store("https://example.com/hot", page(), etag='"hot"')
+        for i in range(30):
+            cache.store(f"https://example.com/film/{i}", page())
+            # "hot" sahifa doim ishlatiladi - LRU uni saqlab qolishi kerak
+            cache.mark_hit("https://example.com/hot", cache.lookup("https://example.com/hot"))
+        report = cache.report()
+    finally:
+        cache.close()
+
+    print(f"   {report['entries']} yozuv, {report['size_bytes']} / {max_bytes} bayt, "
+          f"evicted={report['evicted']}")
+    assert report["size_bytes"] <= max_bytes
+    assert report["evicted"] > 0 and report["entries"] + report["evicted"] == 31
+
+    reopened = HttpCache(cache.path, max_bytes)
+    try:
+        assert reopened.lookup("https://example.com/hot").etag == '"hot"'
+        assert reopened.lookup("https://example.com/film/0") is None
+        assert reopened.report()["size_bytes"] == report["size_bytes"]
+    finally:
+        reopened.close()
+    print("✅ LRU eviction hajm chegarasini saqladi")
+
+
+def test_writes_batched_off_loop():
+    """Javoblar buferda yig'iladi, flush_size ta bo'lganda thread'da bitta commit bilan yoziladi"""
+    print("🧪 HTTP CACHE WRITE-BEHIND TEST")
+    path = _temp_cache_path()
+    writes = []
+
+    def db_rows() -> int:
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        finally:
+            conn.close()
+
+    async def scenario():
+        runner, base, counts = await _start_stub()
+        session = create_http_session()
+        cache = HttpCache(path, 10 * 1024 * 1024, flush_size=4)
+        original_write = cache._write
+
+        def tracked_write(batch, touched):
+            writes.append((threading.get_ident(), len(batch), len(touched)))
+            original_write(batch, touched)
+
+        cache._write = tracked_write
+        token = activate_http_cache(cache)
+        try:
+            for i in range(3):
+                await fetch_text(session, f"{base}/film/{i}", 10)
+            # Hali yozilmagan, lekin lookup buferdan beradi
+            assert db_rows() == 0 and cache.lookup(f"{base}/film/0").etag == '"film-0-v1"'
+            for i in range(3, 10):
+                await fetch_text(session, f"{base}/film/{i}", 10)
+            for i in range(10):
+                status, _ = await fetch_text(session, f"{base}/film/{i}", 10)
+                assert status == 200
+            rows_before_close = db_rows()
+        finally:
+            deactivate_http_cache(token)
+            await cache.aclose()
+            await session.close()
+            await runner.cleanup()
+        return counts, rows_before_close, cache.counters
+
+    counts, rows_before_close, counters = asyncio.run(scenario())
+    main_thread = threading.get_ident()
+    print(f"   flush'lar: {writes}, server: {counts}")
+    assert counts == {"full": 10, "not_modified": 10}
+    # 20 ta javob / flush_size=4 - 5 ta flush (har biri bitta commit)
+    assert len(writes) == 5 and counters["flushes"] == 5
+    assert all(thread != main_thread for thread, _, _ in writes)
+    assert sum(stored for _, stored, _ in writes) == 10
+    assert sum(touched for _, _, touched in writes) == 10
+    assert rows_before_close == 10 and db_rows() == 10
+    print("✅ Cache yozuvlari partiyalab, event loop'dan tashqarida")
+
+
+def test_lookup_not_blocked_by_flush():
+    """fetch_text o'qishi thread'da va flush yozuvchi lock'ini ushlab turganda ham ishlaydi"""
+    print("🧪 HTTP CACHE LOOKUP OFF LOOP TEST")
+    cache = HttpCache(_temp_cache_path(), 10 * 1024 * 1024)
+    reads = []
+    original_read = cache._read
+
+    def tracked_read(url):
+        reads.append(threading.get_ident())
+        return original_read(url)
+
+    cache._read = tracked_read
+    try:
+        cache.store("https://example.com/a", "<html>a</html>", etag='"a"')
+        cache.flush()
+
+        locked, release = threading.Event(), threading.Event()
+
+        def slow_flush():
+            # Uzoq davom etayotgan flush kabi yozuvchi lock'ini ushlab turish
+            with cache._db_lock:
+                locked.set()
+                release.wait(10)
+
+        async def scenario():
+            entry = await asyncio.wait_for(cache.lookup_async("https://example.com/a"), timeout=2)
+            missing = await cache.lookup_async("https://example.com/b")
+            return entry, missing
+
+        holder = threading.Thread(target=slow_flush)
+        holder.start()
+        locked.wait(5)
+        try:
+            entry, missing = asyncio.run(scenario())
+        finally:
+            release.set()
+            holder.join()
+    finally:
+        cache.close()
+
+    assert entry.etag == '"a"' and entry.text == "<html>a</html>" and missing is None
+    assert reads and all(thread != threading.get_ident() for thread in reads)
+    print("✅ Cache o'qishi event loop va yozuvchi lock'idan tashqarida")
+
+
+if __name__ == "__main__":
+    test_conditional_requests_and_offline()
+    test_lru_eviction()
+    test_writes_batched_off_loop()
+    test_lookup_not_blocked_by_flush()
+    print("\n🎉 HTTP cache testlari yakunlandi!")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Listing bosqichi testlari - ScrapePipeline sliding window va xatolar hisobi
+(failed / empty haqiqiy scrape_page_list_safe orqali)
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aiohttp import web
+
+from core.async_db import AsyncFileDB
+from scraper import pipeline as pipeline_module
+from scraper.http_client import create_http_session
+from scraper.parsers import parse_file_pages
+from scraper.parsers.parse_file_pages import ListingFetchError, scrape_page_list_safe
+from scraper.pipeline import ScrapePipeline
+
+
+def test_pipeline_listing_window():
+    """Listing bosqichi: scrape_concurrency chegarasi (sliding window) va har sahifa xatolari"""
+    print("🧪 LISTING SLIDING WINDOW TEST")
+    pages = [f"https://example.com/page/{i}/" for i in range(1, 41)]
+    config = {"name": "site", "scrape_concurrency": 4, "scrape_flush_interval": 0.05}
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def fake_list(config, browser, url, session=None):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(random.uniform(0.001, 0.02))
+            number = int(url.rstrip("/").rsplit("/", 1)[1])
+            if number == 7:
+                raise RuntimeError("503")
+            if number == 13:
+                return []
+            return [{"file_page": f"{url}film-{n}"} for n in range(2)]
+        finally:
+            state["in_flight"] -= 1
+
+    async def fake_detail(config, browser, url, session=None):
+        return {"file_page": url, "file_url": url + ".mp4"}
+
+    async def scenario():
+        db_path = os.path.join(tempfile.mkdtemp(prefix="test_listing_"), "files.db")
+        async with AsyncFileDB(db_path=db_path) as db:
+            pipe = ScrapePipeline(config, None, db)
+            stats = await pipe.run(pages)
+        return pipe.listing_report, stats
+
+    originals = (pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe)
+    pipeline_module.scrape_page_list_safe = fake_list
+    pipeline_module.scrape_file_page_safe = fake_detail
+    try:
+        report, stats = asyncio.run(scenario())
+    finally:
+        pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe = originals
+
+    print(f"   max parallel: {state['max_in_flight']}, hisobot: ok={report['ok']}")
+    assert state["max_in_flight"] == 4
+    assert report["pages"] == report["walked"] == 40 and report["ok"] == 38
+    assert report["failed"] == {pages[6]: "503"}
+    assert report["empty"] == [pages[12]]
+    assert stats["inserted"] == 76
+    print("✅ Listing sahifalar parallel va xatolar hisobi bilan o'qildi")
+
+
+async def _start_stub():
+    """Listing sahifalar: 2 - 404, 3 - kartasiz, qolganlari 2 ta film kartasi"""
+    async def listing(request):
+        number = int(request.match_info["n"])
+        if number == 2:
+            return web.Response(status=404)
+        cards = "" if number == 3 else "".join(
+            f'<div class="card"><a href="/film/{number}-{n}">Film</a></div>' for n in range(2))
+        return web.Response(text=f"<html><body>{cards}</body></html>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/page/{n}/", listing)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+class FakePage:
+    """Browser fallback: 404 sahifa browserda ham ochilmaydi, kartasiz sahifa bo'sh"""
+
+    url = "http://127.0.0.1/"
+
+    async def goto(self, url, **kwargs):
+        if "/page/2/" in url:
+            raise RuntimeError("net::ERR_HTTP_RESPONSE_CODE_FAILURE")
+
+    async def wait_for_selector(self, selector, **kwargs):
+        raise TimeoutError(selector)
+
+    async def query_selector_all(self, selector):
+        return []
+
+
+@asynccontextmanager
+async def fake_browser_page(browser, config=None):
+    yield FakePage()
+
+
+def test_listing_failures_reported():
+    """Haqiqiy scrape_page_list_safe: yuklanmagan sahifa failed, kartasiz sahifa empty"""
+    print("🧪 LISTING FAILED / EMPTY TEST")
+    config = {"name": "site", "card_selector": "div.card", "scrape_concurrency": 2,
+              "scrape_flush_interval": 0.05}
+
+    async def fake_detail(config, browser, url, session=None):
+        return {"file_page": url, "file_url": url + ".mp4"}
+
+    async def scenario():
+        runner, base = await _start_stub()
+        session = create_http_session()
+        pages = [f"{base}/page/{n}/" for n in range(1, 5)]
+        try:
+            try:
+                await scrape_page_list_safe(config, None, pages[1], session=session)
+                raise AssertionError("ListingFetchError kutilgan edi")
+            except ListingFetchError as e:
+                error = str(e)
+            db_path = os.path.join(tempfile.mkdtemp(prefix="test_listing_"), "files.db")
+            async with AsyncFileDB(db_path=db_path) as db:
+                pipe = ScrapePipeline(config, None, db, session=session)
+                stats = await pipe.run(pages)
+            return pages, error, pipe.listing_report, stats
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    originals = (parse_file_pages.browser_page, pipeline_module.scrape_file_page_safe)
+    parse_file_pages.browser_page = fake_browser_page
+    pipeline_module.scrape_file_page_safe = fake_detail
+    try:
+        pages, error, listing_report, stats = asyncio.run(scenario())
+    finally:
+        parse_file_pages.browser_page, pipeline_module.scrape_file_page_safe = originals
+
+    print(f"   xato: {error}")
+    assert "HTTP 404" in error and "ERR_HTTP_RESPONSE_CODE_FAILURE" in error
+    assert listing_report["ok"] == 2 and listing_report["empty"] == [pages[2]]
+    assert list(listing_report["failed"]) == [pages[1]]
+    assert stats["inserted"] == 4
+    print("✅ Xato va bo'sh sahifalar alohida hisoblandi")
+
+
+if __name__ == "__main__":
+    test_pipeline_listing_window()
+    test_listing_failures_reported()
+    print("\n🎉 Listing testlari yakunlandi!")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Ko'p saytli scheduler testlari - saytlar parallel, host bo'yicha cheklov, umumiy browser va HTTP pool
+(Playwright o'rniga soxta browser/kontekst/sahifa obyektlari bilan)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scraper import multi_site
+from scraper.multi_site import MultiSiteScheduler, site_host
+from scraper.scraping import ScrapingOrchestrator, get_scraping_summary
+
+BROWSER_CONFIG = {"viewport": None, "user_agent": None, "locale": None, "device_scale_factor": 1,
+                  "proxy": None, "geolocation": None, "permissions": []}
+SITE_DELAY = 0.2
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+
+    async def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+def _site(name: str, host: str) -> dict:
+    return {"name": name, "base_url": f"https://{host}/films/"}
+
+
+def test_sites_run_concurrently_with_host_limit():
+    """Turli hostlar parallel, bitta hostdagi configlar navbat bilan; browser bitta marta ochiladi"""
+    print("🧪 MULTI-SITE SCHEDULER TEST")
+    sites = [_site("a_films", "a.example"), _site("a_cartoons", "a.example"),
+             _site("b", "b.example"), _site("c", "c.example"), _site("d", "d.example")]
+    launched, cleaned, spans, shared = [], [], {}, []
+    state = {"running": 0, "peak": 0}
+
+    async def fake_launch(browser_config, site_config=None):
+        browser = FakeBrowser()
+        launched.append(browser)
+        context = await browser.new_context()
+        return "pw", browser, await context.new_page()
+
+    async def fake_cleanup(pw, browser):
+        cleaned.append(browser)
+
+    async def fake_run(self):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        start = time.monotonic()
+        shared.append((self.shared_browser, self.http_session, self.page_selection))
+        await asyncio.sleep(SITE_DELAY)
+        state["running"] -= 1
+        spans[self.config["name"]] = (start, time.monotonic())
+        if self.config["name"] == "c":
+            raise RuntimeError("c ishlamadi")
+        return {"status": "success", "total_found": 10, "successful": 4, "inserted": 3, "skipped": 6}
+
+    originals = (multi_site.launch_browser, multi_site.cleanup_browser,
+                 ScrapingOrchestrator.run_scraping_process)
+    multi_site.launch_browser = fake_launch
+    multi_site.cleanup_browser = fake_cleanup
+    ScrapingOrchestrator.run_scraping_process = fake_run
+    try:
+        scheduler = MultiSiteScheduler(sites, BROWSER_CONFIG, max_sites=3, max_per_host=1,
+                                       page_selection="1-2")
+        results = asyncio.run(scheduler.run())
+    finally:
+        (multi_site.launch_browser, multi_site.cleanup_browser,
+         ScrapingOrchestrator.run_scraping_process) = originals
+
+    summary = get_scraping_summary(results, elapsed=scheduler.elapsed)
+    print(f"   {scheduler.elapsed} s, peak={state['peak']}, summary: {summary}")
+    assert [r["site_name"] for r in results] == [s["name"] for s in sites]
+    assert state["peak"] == 3
+    # Bitta hostdagi configlar ustma-ust tushmaydi
+    a1, a2 = spans["a_films"], spans["a_cartoons"]
+    assert a1[1] <= a2[0] or a2[1] <= a1[0]
+    # Ketma-ket 5 x 0.2 s bo'lardi
+    assert scheduler.elapsed < 3.5 * SITE_DELAY
+
+    assert len(launched) == 1 and cleaned == launched
+    assert launched[0].contexts[0].closed  # launch_browser'ning asosiy sahifasi kerak emas
+    assert len({id(b) for b, _, _ in shared}) == 1 and shared[0][0] is launched[0]
+    assert len({id(s) for _, s, _ in shared}) == 1 and shared[0][1].closed
+    assert {sel for _, _, sel in shared} == {"1-2"}
+
+    assert summary["successful_sites"] == 4 and summary["failed_sites"] == 1
+    assert summary["sites"]["c"] == "error"
+    assert summary["total_inserted"] == 12
+    assert summary["speedup"] > 1.5
+    assert site_host(sites[0]) == "a.example"
+    print("✅ Saytlar parallel, host cheklovi va umumiy resurslar to'g'ri")
+
+
+def test_orchestrator_keeps_shared_resources_open():
+    """Umumiy browser/session bilan orchestrator faqat o'z kontekstini yopadi"""
+    print("🧪 SHARED RESOURCES TEST")
+
+    async def scenario():
+        from scraper.http_client import create_http_session
+
+        browser = FakeBrowser()
+        session = create_http_session()
+        orchestrator = ScrapingOrchestrator(
+            {"name": "site", "browser_pool_enabled": False}, BROWSER_CONFIG,
+            page_selection="*", browser=browser, http_session=session)
+
+        async def no_pages(page):
+            assert page.context is browser.contexts[0]
+            return None, []
+
+        orchestrator.select_pages = no_pages
+        orchestrator.config["crawl_resume"] = False
+        result = await orchestrator.run_scraping_process()
+        still_open = not session.closed
+        await session.close()
+        return browser, result, still_open
+
+    browser, result, still_open = asyncio.run(scenario())
+    assert result["status"] == "cancelled"
+    assert len(browser.contexts) == 1 and browser.contexts[0].closed
+    assert still_open
+    print("✅ Umumiy session ochiq qoldi, sayt konteksti yopildi")
+
+
+if __name__ == "__main__":
+    test_sites_run_concurrently_with_host_limit()
+    test_orchestrator_keeps_shared_resources_open()
+    print("\n🎉 Ko'p saytli scheduler testlari yakunlandi!")
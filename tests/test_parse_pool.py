@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Parse process pool testlari - pool'dagi natija event loop'dagi bilan bir xil bo'lishi
+"""
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.site_configs import SITE_CONFIGS
+from scraper.loop_monitor import LoopLagMonitor
+from scraper.parse_pool import activate_parse_pool, create_parse_executor, deactivate_parse_pool, get_parse_pool
+from scraper.parsers.parse_file_page import (
+    _parse_in_pool, normalize_extracted_data, parse_and_normalize, parse_page_fields)
+
+FIXTURES = project_root / "tests" / "fixtures" / "pages"
+CASES = [
+    ("asilmedia", "asilmedia_film.html", "http://asilmedia.org/123-qasoskorlar-final.html"),
+    ("daxshat_net_tarjima", "daxshat_film.html", "https://new.daxshat.net/998-tungi-ov.html"),
+]
+
+
+def _inline(config: dict, html: str, url: str) -> dict:
+    item = parse_page_fields(config, html, url)
+    return asyncio.run(normalize_extracted_data(item))
+
+
+def test_parse_and_normalize_matches_inline():
+    """parse_and_normalize = parse_page_fields + normalize_extracted_data"""
+    print("🧪 PARSE AND NORMALIZE TEST")
+    for site, fixture, url in CASES:
+        config = SITE_CONFIGS[site]
+        html = (FIXTURES / fixture).read_text(encoding="utf-8")
+        expected = _inline(config, html, url)
+        assert expected.get("title")
+        result = parse_and_normalize(config["fields"], config.get("html_parser_backend"), html, url)
+        assert result == expected, f"{site}: {result} != {expected}"
+    print("✅ Sinxron natija bir xil")
+
+
+def test_process_pool_matches_inline():
+    """Faol pool orqali _parse_in_pool natijasi inline natija bilan bir xil"""
+    print("🧪 PROCESS POOL TEST")
+    assert create_parse_executor({"parse_workers": 0}) is None
+
+    async def run():
+        assert await _parse_in_pool(SITE_CONFIGS["asilmedia"], "<html></html>", "http://x") is None
+
+        executor = ProcessPoolExecutor(max_workers=1)
+        token = activate_parse_pool(executor)
+        try:
+            assert get_parse_pool() is executor
+            results = []
+            for site, fixture, url in CASES:
+                html = (FIXTURES / fixture).read_text(encoding="utf-8")
+                results.append(await _parse_in_pool(SITE_CONFIGS[site], html, url))
+            return results
+        finally:
+            deactivate_parse_pool(token)
+            executor.shutdown()
+
+    results = asyncio.run(run())
+    assert get_parse_pool() is None
+    for (site, fixture, url), result in zip(CASES, results):
+        html = (FIXTURES / fixture).read_text(encoding="utf-8")
+        assert result == _inline(SITE_CONFIGS[site], html, url), site
+    print("✅ Pool natijasi bir xil")
+
+
+def test_loop_lag_monitor():
+    """Bloklovchi CPU ishi loop lag sifatida ko'rinadi"""
+    print("🧪 LOOP LAG MONITOR TEST")
+
+    async def run():
+        async with LoopLagMonitor(interval=0.01) as monitor:
+            await asyncio.sleep(0.05)
+            sum(i * i for i in range(2_000_000))  # loop'ni band qilish
+            await asyncio.sleep(0.05)
+        return monitor.report()
+
+    report = asyncio.run(run())
+    assert report["samples"] > 0
+    assert report["max_ms"] >= report["p95_ms"] >= 0
+    assert report["max_ms"] > 20, report
+    assert LoopLagMonitor().report()["samples"] == 0
+    print(f"✅ Loop lag: max {report['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_parse_and_normalize_matches_inline()
+    test_process_pool_matches_inline()
+    test_loop_lag_monitor()
+    print("\n🎉 Parse pool testlari yakunlandi!")
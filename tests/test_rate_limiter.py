@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Rate limiter testlari - host bo'yicha token bucket, AIMD moslash va umumiy limiter
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aiohttp import web
+
+from scraper.http_cache import fetch_text
+from scraper.http_client import create_http_session
+from utils.files import get_file_size
+from utils.rate_limiter import RateLimiter, get_rate_limiter, set_rate_limiter, throttle
+from utils.url_meta import UrlMetaCache, set_url_meta_cache
+
+
+def test_token_bucket_pacing():
+    """burst tadan keyingi so'rovlar 1/rate oralig'ida, hostlar bir-biriga ta'sir qilmaydi"""
+    print("🧪 TOKEN BUCKET TEST")
+
+    async def run():
+        limiter = RateLimiter(initial_rate=20, burst=2, max_rate=20)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire("http://a.example/x") for _ in range(10)))
+        elapsed_a = time.monotonic() - start
+
+        start = time.monotonic()
+        await limiter.acquire("http://b.example/x")
+        elapsed_b = time.monotonic() - start
+        return elapsed_a, elapsed_b, limiter.snapshot()
+
+    elapsed_a, elapsed_b, snapshot = asyncio.run(run())
+    # 2 ta darhol, qolgan 8 tasi 20 so'rov/s da - ~0.4 s
+    assert 0.35 <= elapsed_a < 0.8, elapsed_a
+    assert elapsed_b < 0.05
+    assert snapshot["a.example"]["requests"] == 10
+    assert snapshot["b.example"]["requests"] == 1
+    print(f"✅ 10 so'rov: {elapsed_a:.2f} s")
+
+
+def test_aimd_adjustment():
+    """Muvaffaqiyat - additive increase; 429/5xx/sekin - bitta multiplicative decrease"""
+    print("🧪 AIMD TEST")
+    limiter = RateLimiter(initial_rate=4, min_rate=1, max_rate=6, increase=0.5,
+                          decrease=0.5, latency_target=1.0)
+    url = "https://cdn.example/video.mp4"
+
+    for _ in range(3):
+        limiter.record(url, 200, 0.1)
+    assert limiter.snapshot()["cdn.example"]["rate"] == 5.5
+    for _ in range(5):
+        limiter.record(url, 200, 0.1)
+    assert limiter.snapshot()["cdn.example"]["rate"] == 6  # max_rate
+
+    # Bir vaqtda kelgan 429 lar tezlikni bir marta kesadi
+    for _ in range(5):
+        limiter.record(url, 429, 0.1)
+    info = limiter.snapshot()["cdn.example"]
+    assert info["rate"] == 3 and info["throttled"] == 5
+
+    bucket = limiter.bucket("cdn.example")
+    bucket.last_decrease -= 10
+    limiter.record(url, 502, 0.1)
+    assert limiter.snapshot()["cdn.example"]["rate"] == 1.5
+    bucket.last_decrease -= 10
+    limiter.record(url, 200, 2.5)  # sekin javob
+    bucket.last_decrease -= 10
+    limiter.record(url, None, 0.1)  # tarmoq xatosi
+    info = limiter.snapshot()["cdn.example"]
+    assert info["rate"] == 1  # min_rate
+    assert info["errors"] == 2 and info["slow"] == 1
+    # 404 - server yuklamasi signali emas
+    limiter.record(url, 404, 0.1)
+    assert limiter.snapshot()["cdn.example"]["rate"] == 1.5
+    print(f"✅ AIMD: {limiter.snapshot()['cdn.example']}")
+
+
+def test_retry_after_pauses_host():
+    """Retry-After bo'lgan 429 dan keyin host shu vaqtgacha to'xtatiladi"""
+    print("🧪 RETRY-AFTER TEST")
+
+    async def run():
+        limiter = RateLimiter(initial_rate=100, burst=5, max_rate=100)
+        limiter.record("http://slow.example/a", 429, 0.01, retry_after=0.3)
+        assert limiter.snapshot()["slow.example"]["paused_for"] > 0.2
+        start = time.monotonic()
+        await limiter.acquire("http://slow.example/b")
+        return time.monotonic() - start
+
+    waited = asyncio.run(run())
+    assert waited >= 0.28, waited
+    print(f"✅ Pauza: {waited:.2f} s")
+
+
+def test_shared_limiter_with_http_helpers():
+    """fetch_text va get_file_size umumiy limiter orqali; 429/503 tezlikni pasaytiradi"""
+    print("🧪 SHARED LIMITER TEST")
+    hits = {"n": 0}
+
+    async def film_page(request):
+        hits["n"] += 1
+        if hits["n"] <= 2:
+            return web.Response(status=429)
+        return web.Response(text="<html><h1>Film</h1></html>", content_type="text/html")
+
+    async def video_head(request):
+        return web.Response(headers={"Content-Length": "1234"})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/film/{i}", film_page)
+        app.router.add_route("HEAD", "/video.mp4", video_head)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        base = f"http://127.0.0.1:{port}"
+
+        limiter = RateLimiter(initial_rate=50, burst=10, max_rate=100, decrease=0.5)
+        set_rate_limiter(limiter)
+        set_url_meta_cache(UrlMetaCache(persist=False))  # Loyiha DB siga yozilmasin
+        session = create_http_session()
+        try:
+            assert get_rate_limiter() is limiter
+            statuses = [(await fetch_text(session, f"{base}/film/{i}", 5))[0] for i in range(4)]
+            size = await get_file_size(session, f"{base}/video.mp4")
+
+            # Javob kelmasdan xato - status=None sifatida qayd qilinadi
+            try:
+                async with throttle("http://127.0.0.1:1/x"):
+                    raise ConnectionError("refused")
+            except ConnectionError:
+                pass
+        finally:
+            await session.close()
+            await runner.cleanup()
+            set_rate_limiter(None)
+            set_url_meta_cache(None)
+        return statuses, size, limiter.snapshot()
+
+    statuses, size, snapshot = asyncio.run(run())
+    assert statuses == [429, 429, 200, 200]
+    assert size == 1234
+    info = snapshot["127.0.0.1"]
+    assert info["requests"] == 6  # 4 GET + HEAD + xato
+    assert info["throttled"] == 2 and info["errors"] == 1
+    assert info["rate"] < 50
+    assert info["latency_ms"] is not None
+    print(f"✅ Snapshot: {info}")
+
+
+if __name__ == "__main__":
+    test_token_bucket_pacing()
+    test_aimd_adjustment()
+    test_retry_after_pauses_host()
+    test_shared_limiter_with_http_helpers()
+    print("\n🎉 Rate limiter testlari yakunlandi!")
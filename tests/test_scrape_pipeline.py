@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Scrape pipeline testlari - DB filtr, partiyalab yozish va navbatlar chegarasi
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.async_db import AsyncFileDB
+from scraper import pipeline as pipeline_module
+from scraper.pipeline import ScrapePipeline
+
+
+def _film(page: int, n: int) -> str:
+    return f"https://example.com/film/{page}-{n}"
+
+
+def test_scrape_pipeline():
+    """Mavjud sahifalar tashlanadi, yangilari partiyalab yoziladi, navbatlar to'lmaydi"""
+    print("🧪 SCRAPE PIPELINE TEST")
+    pages = [f"https://example.com/page/{i}/" for i in range(1, 21)]
+    config = {"name": "site", "scrape_concurrency": 4, "scrape_queue_size": 5,
+              "scrape_write_batch": 7, "scrape_flush_interval": 0.05}
+    state = {"max_detail": 0, "max_write": 0}
+    holder = {}
+
+    async def fake_list(config, browser, url, session=None):
+        await asyncio.sleep(random.uniform(0.001, 0.005))
+        number = int(url.rstrip("/").rsplit("/", 1)[1])
+        if number == 5:
+            raise RuntimeError("503")
+        if number == 9:
+            return []
+        items = [{"file_page": _film(number, n)} for n in range(5)]
+        if number == 2:
+            items.append({"file_page": _film(1, 0)})  # Boshqa sahifada ham bor
+        return items
+
+    async def fake_detail(config, browser, url, session=None):
+        pipe = holder["pipe"]
+        state["max_detail"] = max(state["max_detail"], pipe.detail_queue.qsize())
+        state["max_write"] = max(state["max_write"], pipe.write_queue.qsize())
+        await asyncio.sleep(random.uniform(0.001, 0.005))
+        if url.endswith("-4"):
+            return None  # Video topilmadi
+        return {"file_page": url, "file_url": url.replace("/film/", "/cdn/") + ".mp4",
+                "title": url.rsplit("/", 1)[1]}
+
+    async def scenario():
+        db_path = os.path.join(tempfile.mkdtemp(prefix="test_pipeline_"), "files.db")
+        async with AsyncFileDB(db_path=db_path) as db:
+            # 3-sahifa to'liq DB da bor
+            await db.insert_files("site", [
+                {"file_page": _film(3, n), "file_url": f"https://cdn/{n}.mp4"} for n in range(5)])
+            pipe = holder["pipe"] = ScrapePipeline(config, None, db)
+            stats = await pipe.run(pages)
+            total = await db.count_files("site")
+            return pipe, stats, total
+
+    originals = (pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe)
+    pipeline_module.scrape_page_list_safe = fake_list
+    pipeline_module.scrape_file_page_safe = fake_detail
+    try:
+        pipe, stats, total = asyncio.run(scenario())
+    finally:
+        pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe = originals
+
+    print(f"   stats: {stats}")
+    print(f"   navbatlar max: detail={state['max_detail']}, write={state['max_write']}")
+    # 18 ta sahifa x 5 link + 2-sahifadagi takror
+    assert stats["found"] == 91
+    assert stats["skipped"] == 5
+    assert stats["duplicates"] == 1
+    assert stats["processed"] == 85
+    assert stats["successful"] == 68  # har sahifada "-4" topilmaydi
+    assert stats["inserted"] == 68 and total == 73
+    assert stats["batches"] >= 68 // 7 and stats["write_errors"] == 0
+
+    assert pipe.listing_report["ok"] == 18
+    assert pipe.listing_report["failed"] == {pages[4]: "503"}
+    assert pipe.listing_report["empty"] == [pages[8]]
+
+    # Backpressure: navbatlar hech qachon maxsize dan oshmaydi
+    assert state["max_detail"] <= 5 and state["max_write"] <= 5
+    print("✅ Pipeline DB filtr, partiyalab yozish va backpressure bilan ishladi")
+
+
+def test_incremental_stop():
+    """K ta ketma-ket to'liq ma'lum sahifadan keyin listing to'xtaydi, high-water mark saqlanadi"""
+    print("🧪 INCREMENTAL CRAWL TEST")
+    pages = [f"https://example.com/page/{i}/" for i in range(1, 101)]
+    config = {"name": "site", "scrape_concurrency": 2, "scrape_flush_interval": 0.05}
+    walked = []
+
+    async def fake_list(config, browser, url, session=None):
+        walked.append(url)
+        await asyncio.sleep(0.001)
+        number = int(url.rstrip("/").rsplit("/", 1)[1])
+        if number == 4:
+            raise RuntimeError("503")  # Xato sahifa ketma-ketlikni uzadi
+        return [{"file_page": _film(number, n)} for n in range(3)]
+
+    async def fake_detail(config, browser, url, session=None):
+        return {"file_page": url, "file_url": url + ".mp4"}
+
+    async def scenario():
+        db_path = os.path.join(tempfile.mkdtemp(prefix="test_pipeline_"), "files.db")
+        async with AsyncFileDB(db_path=db_path) as db:
+            # 1-sahifa to'liq yangi, 2-sahifada bitta yangi, 3-sahifadan boshlab hammasi ma'lum
+            await db.insert_files("site", [
+                {"file_page": _film(page, n), "file_url": "u"}
+                for page in range(2, 101) for n in range(3) if (page, n) != (2, 0)])
+            pipe = ScrapePipeline(config, None, db, stop_after_known=2)
+            stats = await pipe.run(pages)
+            await db.set_high_water_mark(
+                "site", pipe.listing_report["first_link"], pipe.listing_report["walked"],
+                stats["inserted"])
+            state = await db.get_crawl_state("site")
+            return pipe, stats, state
+
+    originals = (pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe)
+    pipeline_module.scrape_page_list_safe = fake_list
+    pipeline_module.scrape_file_page_safe = fake_detail
+    try:
+        pipe, stats, state = asyncio.run(scenario())
+    finally:
+        pipeline_module.scrape_page_list_safe, pipeline_module.scrape_file_page_safe = originals
+
+    report = pipe.listing_report
+    print(f"   o'qildi: {report['walked']}/{report['pages']}, to'xtadi: {report['stopped_at']}")
+    # 3-sahifa ma'lum, 4 xato, 5 va 6 ma'lum -> 6-sahifada to'xtash (+ parallel ishdagi sahifa)
+    assert report["stopped_at"] == pages[5]
+    assert report["walked"] == len(walked) <= 6 + config["scrape_concurrency"]
+    assert stats["inserted"] == 4
+    assert state["high_water_page"] == _film(1, 0)
+    assert state["pages_walked"] == report["walked"] and state["new_files"] == 4
+    print("✅ Incremental crawl ma'lum sahifalarda to'xtadi")
+
+
+if __name__ == "__main__":
+    test_scrape_pipeline()
+    test_incremental_stop()
+    print("\n🎉 Scrape pipeline testlari yakunlandi!")
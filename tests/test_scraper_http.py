@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Scraper HTTP client testlari - umumiy pooled session ulanishlarni qayta ishlatishi
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aiohttp import web
+
+from scraper.http_client import create_http_session, http_session
+from scraper.parsers.parse_file_page import fetch_page_html, validate_and_optimize_file
+from scraper.parsers.parse_file_pages import fetch_page_html_safe
+from utils.url_meta import UrlMetaCache, set_url_meta_cache
+
+VIDEO_SIZE = 500 * 1024 * 1024
+
+
+async def _start_stub():
+    """Film sahifasi va video HEAD uchun lokal server; ulanishlarni sanaydi"""
+    peers = set()
+
+    async def film_page(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.Response(text="<html><h1>Film</h1></html>", content_type="text/html")
+
+    async def video_head(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.Response(headers={"Content-Length": str(VIDEO_SIZE)})
+
+    app = web.Application()
+    app.router.add_get("/film/{i}", film_page)
+    app.router.add_route("HEAD", "/video/{i}.mp4", video_head)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", peers
+
+
+def test_shared_session_reuses_connections():
+    """Fetch helperlar umumiy session orqali bitta keep-alive ulanishni ishlatishi"""
+    print("🧪 SHARED HTTP SESSION TEST")
+
+    async def scenario():
+        runner, base, peers = await _start_stub()
+        session = create_http_session({"http_limit_per_host": 4})
+        set_url_meta_cache(UrlMetaCache(persist=False))  # Loyiha DB siga yozilmasin
+        try:
+            for i in range(10):
+                assert await fetch_page_html(f"{base}/film/{i}", session=session)
+                assert await fetch_page_html_safe(f"{base}/film/{i}", session=session)
+                item = await validate_and_optimize_file(
+                    {"file_page": f"{base}/film/{i}", "file_url": f"{base}/video/{i}.mp4"},
+                    session=session)
+                assert item["file_size"] == VIDEO_SIZE
+            assert not session.closed
+            shared = len(peers)
+
+            # Session berilmasa vaqtinchalik ochiladi va yopiladi (eski chaqiruvlar)
+            peers.clear()
+            for i in range(3):
+                assert await fetch_page_html(f"{base}/film/{i}")
+            async with http_session(session) as client:
+                assert client is session
+            return shared, len(peers)
+        finally:
+            set_url_meta_cache(None)
+            await session.close()
+            await runner.cleanup()
+
+    shared, fresh = asyncio.run(scenario())
+    print(f"   30 so'rov: umumiy session {shared} ulanish, sessionsiz 3 so'rov {fresh} ulanish")
+    assert shared == 1
+    assert fresh == 3
+    print("✅ Umumiy session ulanishlarni qayta ishlatadi")
+
+
+if __name__ == "__main__":
+    test_shared_session_reuses_connections()
+    print("\n🎉 Scraper HTTP testlari yakunlandi!")
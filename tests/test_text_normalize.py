@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Matn normallash testlari - kompilyatsiya qilingan clean_title eski natija bilan bir xil,
+transliteratsiya cache va normalize_items partiya API
+"""
+import re
+import sys
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils import text as text_module
+from utils.text import (
+    clean_title,
+    clear_text_caches,
+    normalize_description,
+    normalize_item_fields,
+    normalize_item_title,
+    normalize_items,
+    text_cache_report,
+)
+from utils.translator import cyrillic_to_latin
+
+# Eski (ketma-ket 24 ta re.sub) clean_title natijalari
+EXPECTED_TITLES = {
+    "Qasoskorlar: Final / Мстители: Финал 2019 Uzbek tilida O'zbekcha tarjima kino HD skachat":
+        "Qasoskorlar: Final / Мстители: Финал",
+    "Qirollik jangi 1-2-3 qismlar!!! Turk kinosi": "Qirollik jangi qismlar",
+    "Qo'rqmas 1,2,3 qism Hind kino": "Qo'rqmas qism",
+    "Hayvonlar fermasi ( ) 1999": "Hayvonlar fermasi",
+    "Betmen / Бэтмен 2022 Смотреть Tas-ix": "Betmen / Бэтмен",
+    "Kuruluş Osman 1-150 qismlar TÜRK KİNOSİ": "Kuruluş Osman qismlar TÜRK KİNOSİ",
+    "Titanik 1997 O'zbekchaHD": "Titanik",
+    "Sirli orol (Tarjima kino) (O'zbek tilida) 2012": "Sirli orol",
+    # Yil o'chirilgach "()" paydo bo'ladi, "tas-ix" pattern'i esa undan oldin ishlagan
+    "Tas-(2020)ix Premyera": "Tas-ix",
+    # re.IGNORECASE: İ ~ i, ſ ~ s
+    "Sevgi (O'ZBEK TİLİDA) ſkachat": "Sevgi",
+    "": "",
+}
+
+
+def test_clean_title_matches_legacy():
+    """Kalit bo'yicha o'tkazib yuborilgan pattern'lar natijani o'zgartirmaydi; fold jadvali to'liq"""
+    print("🧪 CLEAN TITLE TEST")
+    clear_text_caches()
+    for title, expected in EXPECTED_TITLES.items():
+        assert clean_title(title) == expected, (title, clean_title(title))
+    corpus = (project_root / "tests" / "fixtures" / "titles.txt").read_text(encoding="utf-8")
+    for title in corpus.splitlines():
+        assert clean_title(title) == clean_title.__wrapped__(title)
+    hits = text_cache_report()["title"]["hits"]
+    assert clean_title("Titanik 1997 O'zbekchaHD") == "Titanik"
+    assert text_cache_report()["title"]["hits"] == hits + 1
+
+    # IGNORECASE kalit harfiga teng ko'radigan, lekin lower() bermaydigan belgilar _KEY_FOLD da
+    letters = {ch for needle, _ in text_module._TITLE_PATTERNS for ch in needle if ch.isalpha()}
+    every_char = "".join(chr(i) for i in range(0x2000))
+    for letter in letters:
+        for match in re.finditer(re.escape(letter), every_char, re.IGNORECASE):
+            assert text_module._match_key(match.group()) == letter, match.group()
+    print(f"✅ {len(EXPECTED_TITLES)} ta namuna va korpus eski natija bilan bir xil")
+
+
+def test_normalize_items_batch():
+    """Partiya API bitta-bitta normallash bilan bir xil; takroriy qiymatlar bir marta translit"""
+    print("🧪 NORMALIZE ITEMS TEST")
+    clear_text_caches()
+    actors = "Том Холланд, Зендея"
+    items = [{"title": f"O'rgimchak odam {n} qism O'zbek tilida", "actors": actors,
+              "country": "США, Великобритания", "categories": "Фантастика",
+              "description": "Uzbekcha tavsif\nРусское описание"} for n in range(1, 51)]
+    items.append({"title": "Ruscha", "language": "ru", "actors": actors,
+                  "description": "Uzbekcha\nРусское описание"})
+
+    expected = []
+    for item in items:
+        item = normalize_item_title(dict(item))
+        if item.get("language", "uz") == "uz":
+            item["language"] = "uz"
+            item["actors"] = cyrillic_to_latin(item["actors"])
+            item["categories"] = cyrillic_to_latin(item["categories"])
+            item["country"] = ", ".join(
+                cyrillic_to_latin(c.strip()) for c in item["country"].split(",")).upper()
+        expected.append(normalize_description(item, lang=item["language"]))
+
+    clear_text_caches()
+    result = normalize_items([dict(item) for item in items])
+    assert result == expected
+    assert result[0]["title"] == "O'rgimchak odam" and result[0]["country"] == "SSHA, VELIKOBRITANIYA"
+    assert result[0]["description"] == "Uzbekcha tavsif"
+    assert result[-1]["actors"] == actors and result[-1]["description"] == "Русское описание"
+
+    report = text_cache_report()
+    print(f"   cache: {report}")
+    # actors, categories va 2 ta davlat - har biri bir marta
+    assert report["translit"]["misses"] == 4
+    assert report["country"] == {"hits": 49, "misses": 1, "size": 1}
+    assert normalize_item_fields({}, ["country"]) == {}
+    print("✅ normalize_items natijasi bir xil, takrorlar cache'dan")
+
+
+if __name__ == "__main__":
+    test_clean_title_matches_legacy()
+    test_normalize_items_batch()
+    print("\n🎉 Matn normallash testlari yakunlandi!")
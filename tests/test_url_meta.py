@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+URL metadata cache testlari - probe natijalari TTL bilan, FileDB da saqlash, parallel variantlar
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Project root ni sys.path ga qo'shish
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aiohttp import web
+
+from core.async_db import AsyncFileDB
+from filedownloader.core.downloader import FileDownloader
+from scraper.http_client import create_http_session
+from scraper.parsers.parse_file_page import validate_and_optimize_file
+from utils.rate_limiter import RateLimiter, set_rate_limiter
+from utils.url_meta import UrlMetaCache, set_url_meta_cache
+
+GB = 1024 ** 3
+SIZES = {"film_1080.mp4": 6 * GB, "film_720.mp4": 3 * GB, "film_480.mp4": 1 * GB,
+         "norange.mp4": 7 * 1024 * 1024}
+PROBE_DELAY = 0.2
+
+
+async def _start_stub():
+    """Video HEAD / Range GET javoblari; so'rovlarni sanaydi"""
+    hits = {"head": 0, "get": 0}
+
+    async def video_head(request):
+        hits["head"] += 1
+        name = request.match_info["name"]
+        if name == "norange.mp4":
+            return web.Response(status=405)  # HEAD qo'llab-quvvatlanmaydi
+        await asyncio.sleep(PROBE_DELAY)
+        return web.Response(headers={"Content-Length": str(SIZES[name]), "Accept-Ranges": "bytes",
+                                     "Content-Type": "video/mp4"})
+
+    async def video_get(request):
+        hits["get"] += 1
+        size = SIZES[request.match_info["name"]]
+        return web.Response(status=206, body=b"\0",
+                            headers={"Content-Range": f"bytes 0-0/{size}", "Content-Type": "video/mp4"})
+
+    app = web.Application()
+    app.router.add_route("HEAD", "/v/{name}", video_head)
+    app.router.add_route("GET", "/v/{name}", video_get)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", hits
+
+
+def _run(scenario):
+    """Lokal stub uchun limiter pacing o'lchovga aralashmasin"""
+    set_rate_limiter(RateLimiter(initial_rate=1000, burst=100, max_rate=1000))
+    try:
+        return asyncio.run(scenario())
+    finally:
+        set_rate_limiter(None)
+        set_url_meta_cache(None)
+
+
+def test_probe_cache_and_persistence():
+    """Takroriy probe cache'dan; yangi jarayon (cache) FileDB dan oladi; invalidate - qayta probe"""
+    print("🧪 URL META CACHE TEST")
+
+    async def scenario():
+        runner, base, hits = await _start_stub()
+        session = create_http_session()
+        db_path = os.path.join(tempfile.mkdtemp(prefix="test_url_meta_"), "files.db")
+        try:
+            async with AsyncFileDB(db_path=db_path) as db:
+                cache = UrlMetaCache(ttl=60, db=db)
+                url = f"{base}/v/film_720.mp4"
+                first = await cache.get(session, url)
+                again = await cache.get(session, url)
+                assert first is again and hits["head"] == 1
+                assert first["accept_ranges"] is True and first["content_type"] == "video/mp4"
+
+                # HEAD 405 - Range GET: Content-Range dan hajm, 206 - resume mumkin
+                fallback = await cache.get(session, f"{base}/v/norange.mp4")
+                assert fallback["size"] == SIZES["norange.mp4"] and fallback["accept_ranges"] is True
+
+                # Yangi cache (keyingi download run) - HEAD yo'q, FileDB dan
+                fresh = UrlMetaCache(ttl=60, db=db)
+                assert await fresh.preload([url, f"{base}/v/norange.mp4"]) == 2
+                stored = await fresh.get(session, url)
+                assert stored["size"] == SIZES["film_720.mp4"] and hits["head"] == 2
+
+                # Hajm mos kelmadi - DB dagi natija ham eskirgan, qayta probe
+                fresh.invalidate(url)
+                await fresh.get(session, url)
+                assert hits["head"] == 3
+
+                # TTL o'tgan yozuvlar DB dan ham olinmaydi
+                expired = UrlMetaCache(ttl=0.05, db=db)
+                await asyncio.sleep(1.1)
+                await expired.get(session, url)
+                assert hits["head"] == 4
+                return cache.report(), fresh.report()
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    first, fresh = _run(scenario)
+    print(f"   cache: {first}, yangi jarayon: {fresh}")
+    assert first["hits"] == 1 and first["probes"] == 2
+    assert fresh["probes"] == 1
+    print("✅ Probe natijalari cache va FileDB orqali qayta ishlatiladi")
+
+
+def test_variants_probed_concurrently():
+    """4 GB dan katta fayl: 720p/480p variantlar parallel tekshiriladi, downloader HEAD qilmaydi"""
+    print("🧪 CONCURRENT VARIANTS TEST")
+
+    async def scenario():
+        runner, base, hits = await _start_stub()
+        session = create_http_session()
+        set_url_meta_cache(UrlMetaCache(ttl=60, persist=False))
+        try:
+            page = f"{base}/v/film_1080.mp4"
+            start = time.monotonic()
+            item = await validate_and_optimize_file(
+                {"file_page": page, "file_url": page}, session=session)
+            elapsed = time.monotonic() - start
+            probes = hits["head"]
+
+            size, resume = await FileDownloader().get_file_info(session, item["file_url"])
+            return item, elapsed, probes, (size, resume), hits["head"]
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    item, elapsed, probes, info, heads_after = _run(scenario)
+    print(f"   tanlandi: {item['file_url'].rsplit('/', 1)[1]}, {elapsed:.2f} s, {probes} HEAD")
+    assert item["file_url"].endswith("film_720.mp4")
+    assert item["file_size"] == SIZES["film_720.mp4"]
+    assert probes == 3
+    # Asosiy fayl + variantlar bitta bosqichda: ~2 x PROBE_DELAY (ketma-ket 3 x bo'lardi)
+    assert elapsed < 2.6 * PROBE_DELAY, elapsed
+    assert info == (SIZES["film_720.mp4"], True) and heads_after == probes
+    print("✅ Variantlar parallel, downloader cache'dan foydalanadi")
+
+
+if __name__ == "__main__":
+    test_probe_cache_and_persistence()
+    test_variants_probed_concurrently()
+    print("\n🎉 URL metadata cache testlari yakunlandi!")
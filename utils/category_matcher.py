@@ -0,0 +1,159 @@
+"""
+Kategoriya matcher - STANDARD_CATEGORIES kalit so'zlari bo'yicha Aho-Corasick avtomat.
+
+Eski normalize_category har bir xom kategoriya uchun barcha kategoriyalar va
+ularning ~600 ta kalit so'zini `kw in raw` bilan tekshirardi. Endi kalit so'zlar
+bitta avtomatga yig'iladi va matn bir marta o'qiladi.
+
+Ustuvorlik eskisidek: STANDARD_CATEGORIES tartibida birinchi kategoriya,
+qaysi kalit so'zi matnda uchrasa. Masalan "sevgi komediyasi" - "comedy"
+("romance" va "romantic_comedy" dan oldin turadi).
+
+    matcher = get_category_matcher()
+    matcher.normalize("Фантастика")             # "sci-fi"
+    matcher.normalize_many(["Drama", "Kino"])   # ["drama", "movies"]
+
+Bir xil xom qiymatlar (janrlar juda ko'p takrorlanadi) LRU cache'dan olinadi.
+"""
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from core.catigories import STANDARD_CATEGORIES
+
+DEFAULT_CATEGORY = "other"
+CACHE_SIZE = 8192
+
+# normalize_category tozalashi: harf/raqam, bo'sh joy, "-" va "+" qoladi
+_CLEAN_RE = re.compile(r"[^\w\s\-+]")
+_NO_MATCH = float("inf")
+
+
+class KeywordAutomaton:
+    """
+    Ko'p kalit so'zli qidiruv (Aho-Corasick): matndagi kalit so'zlarning eng kichik rank'i.
+
+    Har bir holatda o'sha joyda tugaydigan barcha kalit so'zlar (fail zanjiri
+    bo'yicha suffikslar ham) ichidagi eng kichik rank saqlanadi.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._rank: List[float] = [_NO_MATCH]
+        self._built = False
+
+    def add(self, keyword: str, rank: int) -> None:
+        """Kalit so'z qo'shish (bir xil so'z bir necha marta - eng kichik rank qoladi)"""
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._rank.append(_NO_MATCH)
+            state = nxt
+        self._rank[state] = min(self._rank[state], rank)
+        self._built = False
+
+    def build(self) -> "KeywordAutomaton":
+        """Fail havolalarini BFS bilan hisoblash"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        for state in queue:  # queue sikl davomida to'ldiriladi (BFS)
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = fail
+                # Suffiks kalit so'zlar ham shu joyda tugaydi
+                self._rank[nxt] = min(self._rank[nxt], self._rank[fail])
+        self._built = True
+        return self
+
+    def first_rank(self, text: str) -> Optional[int]:
+        """Matnda uchragan kalit so'zlarning eng kichik rank'i (yo'q bo'lsa None)"""
+        if not self._built:
+            self.build()
+        goto, fail, rank = self._goto, self._fail, self._rank
+        best = _NO_MATCH
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if rank[state] < best:
+                best = rank[state]
+                if best == 0:
+                    break
+        return None if best == _NO_MATCH else int(best)
+
+
+class CategoryMatcher:
+    """
+    Xom kategoriya → standart kategoriya (normalize_category qoidalari bilan).
+
+    Args:
+        categories: {kategoriya: [kalit so'zlar]} - tartib ustuvorlikni belgilaydi
+        default: Hech bir kalit so'z topilmasa qaytariladigan kategoriya
+        cache_size: Xom qiymatlar uchun LRU cache hajmi (0 - cache'siz)
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]] = STANDARD_CATEGORIES,
+                 default: str = DEFAULT_CATEGORY, cache_size: int = CACHE_SIZE):
+        self.names = list(categories)
+        self.default = default
+        self.automaton = KeywordAutomaton()
+        for rank, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                # Matn kichik harfga o'tkaziladi - katta harfli kalit so'zlar ("IT", "UFO")
+                # eskisidek hech qachon mos kelmaydi
+                self.automaton.add(keyword, rank)
+        self.automaton.build()
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize) if cache_size else self._normalize
+
+    def _normalize(self, raw: str) -> str:
+        if not raw:
+            return self.default
+        text = _CLEAN_RE.sub("", raw.strip().lower())
+        rank = self.automaton.first_rank(text)
+        return self.default if rank is None else self.names[rank]
+
+    def normalize_many(self, raws: Iterable[str]) -> List[str]:
+        """Xom kategoriyalar ro'yxati → standart kategoriyalar (o'sha tartibda)"""
+        normalize = self.normalize
+        return [normalize(raw) for raw in raws]
+
+    def cache_info(self) -> Dict[str, int]:
+        if not hasattr(self.normalize, "cache_info"):
+            return {"hits": 0, "misses": 0, "size": 0}
+        info = self.normalize.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[CategoryMatcher] = None
+
+
+def get_category_matcher() -> CategoryMatcher:
+    """Jarayon bo'yicha umumiy matcher (STANDARD_CATEGORIES dan bir marta quriladi)"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = CategoryMatcher()
+        return _shared
+
+
+def set_category_matcher(matcher: Optional[CategoryMatcher]) -> None:
+    """Umumiy matcher'ni almashtirish (testlar va boshqa kategoriya lug'atlari uchun)"""
+    global _shared
+    with _shared_lock:
+        _shared = matcher
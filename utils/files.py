@@ -1,7 +1,7 @@
 from pathlib import Path
 from tqdm.asyncio import tqdm
 import re
-from utils.logger_core import logger
+from utils.url_meta import get_url_meta_cache
 
 
 async def fetch_file(session, url, output_path, sem):
@@ -40,30 +40,9 @@ def safe_filename(name: str, ext: str = "") -> str:
 
 
 async def get_file_size(session, url: str) -> int:
-    """HEAD yoki Range GET orqali fayl hajmini aniqlash."""
-    try:
-        # 1️⃣ Avval HEAD bilan sinab ko‘ramiz
-        async with session.head(url, timeout=15, allow_redirects=True) as resp:
-            if resp.status == 200 and "Content-Length" in resp.headers:
-                return int(resp.headers["Content-Length"])
-
-        # 2️⃣ Agar HEAD ishlamasa, GET bilan Range yuboramiz
-        headers = {"Range": "bytes=0-1"}
-        async with session.get(url, headers=headers, timeout=15, allow_redirects=True) as resp:
-            if resp.status in (200, 206):
-                # Content-Range: bytes 0-1/12345678
-                crange = resp.headers.get("Content-Range")
-                if crange and "/" in crange:
-                    total_size = crange.split("/")[-1]
-                    if total_size.isdigit():
-                        return int(total_size)
-                # fallback – Content-Length
-                if "Content-Length" in resp.headers:
-                    return int(resp.headers["Content-Length"])
-    except Exception as e:
-        logger.warning(f"⚠️ Fayl hajmini aniqlab bo‘lmadi: {url} | {e}")
-
-    return 0
+    """HEAD yoki Range GET orqali fayl hajmini aniqlash (umumiy URL metadata cache orqali)."""
+    meta = await get_url_meta_cache().get(session, url)
+    return meta["size"]
 
 
 async def get_small_url(filepage: str, attempt: int = 1) -> str | None:
@@ -2,7 +2,8 @@ import json
 import re
 import html
 
-from core.catigories import CATEGORY_MAP, CATEGORY_NAME_TO_ID, STANDARD_CATEGORIES
+from core.catigories import CATEGORY_MAP, CATEGORY_NAME_TO_ID
+from utils.category_matcher import get_category_matcher
 
 
 def clean_html_for_telegram(text: str) -> str:
@@ -98,20 +99,18 @@ def format_file_size(size_bytes: int) -> str:
 
 # --- Normalizatsiya funksiyasi ---
 def normalize_category(raw: str) -> str:
-    if not raw:
-        return "other"
-
-    # tozalash
-    raw = raw.strip().lower()
-    raw = re.sub(r"[^\w\s\-+]", "", raw)
+    """
+    Xom kategoriyani standart kategoriyaga aylantiradi (STANDARD_CATEGORIES tartibida
+    birinchi mos kategoriya, topilmasa "other"). Aho-Corasick avtomat + cache.
+    """
+    return get_category_matcher().normalize(raw)
 
-    # mapping orqali tekshirish
-    for key, keywords in STANDARD_CATEGORIES.items():
-        for kw in keywords:
-            if kw in raw:
-                return key
 
-    return "other"
+def normalize_categories(raws: list[str]) -> list[str]:
+    """
+    Xom kategoriyalar ro'yxatini bitta chaqiruvda normalize qiladi (o'sha tartibda)
+    """
+    return get_category_matcher().normalize_many(raws)
 
 
 def normalize_item_categories(item):
@@ -126,7 +125,7 @@ def normalize_item_categories(item):
     cats = [c.strip() for c in str(raw_cats).split(",") if c.strip()]
 
     # Normalize qilish va takrorlarni olib tashlash
-    mapped = list({normalize_category(c) for c in cats if normalize_category(c)})
+    mapped = list(set(normalize_categories(cats)))
 
     item["categories"] = ", ".join(mapped) if mapped else "other"
     return item
@@ -143,8 +142,7 @@ def extract_and_map_categories(json_path: str):
         cats = item.get("categories")
         if not cats:
             continue
-        for raw in cats.split(","):
-            mapped.add(normalize_category(raw))
+        mapped.update(normalize_categories(cats.split(",")))
 
     return sorted(mapped)
 
@@ -5,15 +5,17 @@ from tqdm import tqdm
 from core.FileDB import FileDB
 from utils.helpers import normalize_item_categories
 from utils.logger_core import logger
-from utils.text import (
-    normalize_description,
-    normalize_item_fields,
-    normalize_item_title,
-)
+from utils.text import normalize_items
 
 
-def import_from_json(json_path: str, config_name: str):
-    """JSON fayldan DB ga yozish"""
+def import_from_json(json_path: str, config_name: str, on_conflict: str = "ignore"):
+    """JSON fayldan DB ga yozish
+
+    Args:
+        json_path: JSON fayl yo'li
+        config_name: Config nomi
+        on_conflict: Mavjud file_page uchun siyosat ("ignore" yoki "upsert")
+    """
     db = FileDB()
     path = Path(json_path)
 
@@ -29,31 +31,38 @@ def import_from_json(json_path: str, config_name: str):
         return
 
     logger.info(f"📥 {json_path} dan {len(items)} ta yozuv yuklanmoqda...")
-    for item in tqdm(items, desc=f"📂 Import {config_name}", unit="file"):
+    # Mavjud sahifalarni bitta so'rov bilan aniqlash - ularni normallashga vaqt sarflamaymiz
+    existing = set()
+    if on_conflict == "ignore":
+        existing = db.existing_pages(
+            config_name, [item.get("file_page") for item in items])
+
+    pending = []
+    skipped_existing = 0
+    for item in items:
         if not item.get("file_page"):
             logger.warning("⚠️ file_page yo‘q, tashlab ketildi")
             continue
 
-        if db.file_exists(config_name, item["file_page"]):
-            logger.info(f"♻️ Avval mavjud: {item['file_page']}")
+        if item["file_page"] in existing:
+            skipped_existing += 1
             continue
-        # Title ni tozalash
-        item = normalize_item_title(item)
+        pending.append(item)
 
-        # Country va actorsni translit qilish
-        item = normalize_item_fields(
-            item, keys_to_translate=["country", "actors", "categories"]
-        )
-        # Categories normalize
-        item = normalize_item_categories(item)
+    # Title, country/actors translit va description - bitta partiya (takrorlar cache'dan)
+    normalized = normalize_items(tqdm(pending, desc=f"📂 Import {config_name}", unit="file"))
+    # Categories normalize
+    prepared = [normalize_item_categories(item) for item in normalized]
 
-        # Country va actorsni translit qilish
-        item = normalize_description(item, lang=item.get("language", "uz"))
-        db.insert_file(config_name, item)
+    # Bitta tranzaksiyada yozish
+    result = db.insert_files(config_name, prepared, on_conflict=on_conflict)
+    result["skipped"] += skipped_existing
 
     logger.info(
-        f"✅ {json_path} dan {len(items)} ta yozuv DB ga qo‘shildi ({config_name})"
+        f"✅ {json_path} dan {result['inserted']} ta yozuv DB ga qo‘shildi, "
+        f"{result['updated']} ta yangilandi, {result['skipped']} ta tashlab ketildi ({config_name})"
     )
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+"""
+Host bo'yicha adaptiv rate limiter (token bucket + AIMD).
+
+Scraper fetchlari, hajm tekshiruvlari (HEAD / Range GET) va FileDownloader bitta
+umumiy limiter orqali so'rov yuboradi. Har host uchun alohida token bucket bor:
+so'rovlar soniyasiga `rate` tadan oshmaydi (`burst` tagacha to'plangan tokenlar
+bilan). Javobga qarab tezlik moslashadi (AIMD):
+
+- 2xx/3xx va latency `latency_target` dan past - rate += increase (additive increase)
+- 429, 5xx, tarmoq xatosi yoki sekin javob - rate *= decrease (multiplicative decrease),
+  Retry-After bo'lsa host shu vaqtgacha to'xtatiladi
+
+    async with throttle(url) as outcome:
+        async with session.get(url) as resp:
+            outcome.observe(resp)
+            ...
+
+    get_rate_limiter().snapshot()  # {"asilmedia.org": {"rate": 7.5, ...}, ...}
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+from utils.logger_core import logger
+
+
+class RequestOutcome:
+    """Bitta so'rov natijasi - throttle() ichida observe(resp) bilan to'ldiriladi"""
+
+    __slots__ = ("status", "latency", "retry_after", "_start")
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.latency: Optional[float] = None
+        self.retry_after: Optional[float] = None
+        self._start = time.monotonic()
+
+    def observe(self, resp) -> None:
+        """Javob sarlavhalari kelgan payt: status, latency (TTFB) va Retry-After"""
+        self.status = resp.status
+        self.latency = time.monotonic() - self._start
+        value = resp.headers.get("Retry-After") if resp.headers else None
+        if value and value.strip().isdigit():
+            self.retry_after = float(value.strip())
+
+
+class HostBucket:
+    """Bitta host uchun token bucket va AIMD holati"""
+
+    def __init__(self, host: str, rate: float, burst: float):
+        self.host = host
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        # tokens manfiy bo'lishi mumkin - navbatda kutayotgan so'rovlar soni
+        self.tokens = self.burst
+        # Tokenlar shu paytdan boshlab to'planadi (Retry-After pauzasida kelajakda)
+        self.updated = time.monotonic()
+        self.last_decrease = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.stats = {"requests": 0, "ok": 0, "throttled": 0, "errors": 0, "slow": 0}
+
+    def refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def pause(self, now: float, seconds: float) -> None:
+        """Host'ni seconds davomida to'xtatish - pauza tugaguncha token to'planmaydi"""
+        self.refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, now + seconds)
+
+
+class RateLimiter:
+    """
+    Host bo'yicha token bucket'lar to'plami.
+
+    Args:
+        initial_rate: Yangi host uchun boshlang'ich tezlik (so'rov/s)
+        min_rate: Pastki chegara
+        max_rate: Yuqori chegara
+        burst: Bucket sig'imi (ketma-ket yuborish mumkin bo'lgan so'rovlar)
+        increase: Har muvaffaqiyatli javobda qo'shiladigan so'rov/s
+        decrease: 429/5xx/sekin javobda ko'paytiriladigan koeffitsient (0..1)
+        latency_target: Shundan sekin javob (s) - ham kamaytirish signali
+    """
+
+    def __init__(self, initial_rate: float = 5.0, min_rate: float = 0.5, max_rate: float = 50.0,
+                 burst: float = 5.0, increase: float = 0.1, decrease: float = 0.5,
+                 latency_target: float = 3.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self._buckets: Dict[str, HostBucket] = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RateLimiter":
+        return cls(
+            initial_rate=config.get("rate_limit_initial", 5.0),
+            min_rate=config.get("rate_limit_min", 0.5),
+            max_rate=config.get("rate_limit_max", 50.0),
+            burst=config.get("rate_limit_burst", 5.0),
+            increase=config.get("rate_limit_increase", 0.1),
+            decrease=config.get("rate_limit_decrease", 0.5),
+            latency_target=config.get("rate_limit_latency_ms", 3000) / 1000,
+        )
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def bucket(self, host: str) -> HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = min(max(self.initial_rate, self.min_rate), self.max_rate)
+            bucket = HostBucket(host, rate, self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str) -> float:
+        """
+        Host bucket'idan bitta token olish (kerak bo'lsa kutadi).
+
+        Returns:
+            float: Kutilgan vaqt (s)
+        """
+        bucket = self.bucket(self.host_of(url))
+        now = time.monotonic()
+        bucket.refill(now)
+        # Token darhol band qilinadi (lock kerak emas): k-chi navbatdagi so'rov
+        # pauza tugagach yana k/rate soniya kutadi - tokenlar kelish tartibida beriladi
+        bucket.tokens -= 1
+        bucket.stats["requests"] += 1
+        delay = max(bucket.updated - now, 0.0) + max(-bucket.tokens, 0.0) / bucket.rate
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def record(self, url: str, status: Optional[int], latency: Optional[float],
+               retry_after: Optional[float] = None) -> None:
+        """
+        Javob natijasi bo'yicha tezlikni moslash (AIMD).
+
+        Args:
+            url: So'rov URL
+            status: HTTP status (None - tarmoq xatosi / timeout)
+            latency: Javob sarlavhalarigacha vaqt (s)
+            retry_after: Retry-After sarlavhasi (s)
+        """
+        bucket = self.bucket(self.host_of(url))
+        now = time.monotonic()
+        if latency is not None:
+            bucket.latency_ewma = (latency if bucket.latency_ewma is None
+                                   else 0.8 * bucket.latency_ewma + 0.2 * latency)
+
+        throttled = status == 429 or status == 503
+        failed = status is None or status >= 500
+        slow = latency is not None and latency > self.latency_target
+        if throttled:
+            bucket.stats["throttled"] += 1
+            if retry_after:
+                bucket.pause(now, retry_after)
+        elif failed:
+            bucket.stats["errors"] += 1
+        elif slow:
+            bucket.stats["slow"] += 1
+        else:
+            bucket.stats["ok"] += 1
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+            return
+
+        # Bir vaqtda kelgan xatolar tezlikni bir necha marta kesmasligi uchun:
+        # oxirgi kamaytirishdan keyin kamida bitta token oralig'i o'tgan bo'lsin
+        if now - bucket.last_decrease >= 1 / bucket.rate:
+            old = bucket.rate
+            bucket.refill(now)
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+            bucket.tokens = min(bucket.tokens, 1.0)  # to'plangan burst ham bekor
+            bucket.last_decrease = now
+            reason = ("tarmoq xatosi" if status is None
+                      else f"HTTP {status}" if throttled or failed else "sekin javob")
+            logger.info(f"🐢 {bucket.host}: {reason} - tezlik {old:.1f} → {bucket.rate:.1f} so'rov/s")
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Host bo'yicha joriy holat: rate, tokens, latency_ms va hisoblagichlar"""
+        now = time.monotonic()
+        result = {}
+        for host, bucket in self._buckets.items():
+            bucket.refill(now)
+            result[host] = {
+                "rate": round(bucket.rate, 2),
+                "tokens": round(bucket.tokens, 2),
+                "latency_ms": round(bucket.latency_ewma * 1000, 1) if bucket.latency_ewma else None,
+                "paused_for": round(max(bucket.updated - now, 0.0), 2),
+                **bucket.stats,
+            }
+        return result
+
+    def log_snapshot(self) -> None:
+        for host, info in self.snapshot().items():
+            logger.info(
+                f"🚦 {host}: {info['rate']:.1f} so'rov/s, {info['requests']} so'rov "
+                f"({info['throttled']} throttled, {info['errors']} xato, {info['slow']} sekin)")
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Jarayon bo'yicha umumiy limiter (APP_CONFIG dan). rate_limit_enabled=False bo'lsa None.
+    """
+    global _shared
+    from core.config import APP_CONFIG
+    if not APP_CONFIG.get("rate_limit_enabled", True):
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter.from_config(APP_CONFIG)
+        return _shared
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Umumiy limiter'ni almashtirish (testlar va maxsus sozlamalar uchun)"""
+    global _shared
+    with _shared_lock:
+        _shared = limiter
+
+
+@asynccontextmanager
+async def throttle(url: str, limiter: Optional[RateLimiter] = None) -> AsyncIterator[RequestOutcome]:
+    """
+    So'rovni limiter orqali o'tkazish: token olish, keyin natijani qayd qilish.
+
+    Blok ichida javob kelganda outcome.observe(resp) chaqiriladi; istisno
+    (timeout, ulanish xatosi) status=None sifatida qayd qilinadi.
+    """
+    limiter = limiter or get_rate_limiter()
+    if limiter is not None:
+        await limiter.acquire(url)
+    outcome = RequestOutcome()
+    try:
+        yield outcome
+    except Exception:
+        # Javobdan oldingi xato (timeout, ulanish uzildi) - status=None
+        if limiter is not None:
+            latency = outcome.latency if outcome.status is not None else time.monotonic() - outcome._start
+            limiter.record(url, outcome.status, latency, outcome.retry_after)
+        raise
+    if limiter is not None and outcome.status is not None:
+        limiter.record(url, outcome.status, outcome.latency, outcome.retry_after)
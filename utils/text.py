@@ -1,8 +1,77 @@
+"""
+Matn normallash - title, maydonlar (country, actors, categories) va description.
+
+Regexlar modul yuklanganda bir marta kompilyatsiya qilinadi. Har bir title
+pattern'i uchun "kalit" bo'lak bor: matnda kalit bo'lmasa pattern umuman
+ishga tushirilmaydi (odatiy title'da 24 ta pattern'dan 3-5 tasi kerak bo'ladi).
+Pattern'lar avvalgidek ketma-ket qo'llanadi - natija o'zgarmaydi.
+
+Takrorlanuvchi qiymatlar (bir xil aktyorlar, davlatlar, serial qismlari
+nomlari) LRU cache'dan olinadi - UzTransliterator har qiymat uchun bir marta.
+
+    items = normalize_items(items)   # title + maydonlar + description, bitta chaqiruv
+"""
 import re
+from functools import lru_cache
+from typing import Dict, Iterable, List
 
 from utils.translator import cyrillic_to_latin
 
-
+TRANSLATE_KEYS = ("country", "actors", "categories")
+TITLE_CACHE_SIZE = 16384
+TRANSLIT_CACHE_SIZE = 16384
+
+# (kalit, pattern): kalit - pattern mosligida albatta bo'ladigan bo'lak (kichik harfda),
+# "" - pattern har doim tekshiriladi
+_TITLE_PATTERNS = [
+    # (O'zbek tilida), O`zbek tilida
+    ("tilida", r"\(?\s*O[`']?zbek(cha)?\s*tilida\s*\)?"),
+    ("tarjima", r"\(?\s*Tarjima\s*kino\s*\)?"),  # (Tarjima kino)
+    # "Uzbek tilida ..." va oxirigacha
+    ("uzbek", r"Uzbek\s*tilida.*?(skachat|HD|tas-ix)?"),
+    ("tarjima", r"O[`']?zbek(cha)?\s*tarjima\s*kino.*?(skachat|HD|tas-ix)?"),
+    ("premyera", r"Premyera"),  # Premyera
+    ("jangari", r"Jangari\s*kino"),  # Jangari kino
+    ("смотреть", r"Смотреть\s*Tas-ix"),  # Ruscha bo‘lak
+    ("full", r"Full\s*HD"),  # Full HD
+    ("tas-ix", r"tas-ix"),  # tas-ix
+    ("skachat", r"skachat"),  # skachat
+    ("(", r"\(\s*\)"),  # bo‘sh qavslar ()
+    ("[", r"\[\s*\]"),  # bo‘sh qavslar []
+    ("", r"\b(19|20)\d{2}\b"),  # Yillar (1900–2099)
+    ("hd", r"\bHD\b"),  # HD so'zi
+    ("hd", r"O['`]?zbekchaHD"),  # O'zbekchaHD
+    ("tarjima", r"O['`]?zbek\s*tarjima"),  # O'zbek tarjima
+    ("turk", r"Turk\s*kinosi"),  # Turk kinosi
+    ("hind", r"Hind\s*kino"),  # Hind kino
+    ("qismlar", r"-\s*qismlar!?+"),  # -qismlar!!!
+    ("!!", r"[!]{2,}"),  # !!! belgilar
+    ("-", r"\b\d+-\d+-\d+\b"),  # masalan: 1-2-3
+    ("-", r"\b\d+(?:-\d+)+\b"),  # masalan: 1-2 yoki 1-2-3
+    (",", r"\b\d+(?:,\d+)+\b"),  # masalan: 1,2 yoki 1,2,3
+    ("qism", r"\b\d+\s*qism(lar)?\b"),  # "1 qism", "2-qism", "3 qismlar"
+]
+_TITLE_RULES = [
+    (key, re.compile(pattern, re.IGNORECASE)) for key, pattern in _TITLE_PATTERNS
+]
+
+# re.IGNORECASE bu harflarni kalitdagi harf bilan teng ko'radi, str.lower() esa yo'q
+_KEY_FOLD = str.maketrans({"İ": "i", "ı": "i", "ſ": "s",
+                           "ᲂ": "о", "ᲃ": "с", "ᲄ": "т", "ᲅ": "т"})
+_KEY_FOLD_RE = re.compile("[İıſᲂᲃᲄᲅ]")
+_BRACKETS_RE = re.compile(r"[\[\]\(\)]")
+_SPACES_RE = re.compile(r"\s{2,}")
+_CYRILLIC_RE = re.compile(r"[А-Яа-яЁё]")
+
+
+def _match_key(text: str) -> str:
+    # str.translate unicode matnda sekin - faqat kamdan-kam harflar bo'lsa
+    if _KEY_FOLD_RE.search(text):
+        text = text.translate(_KEY_FOLD)
+    return text.lower()
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
 def clean_title(text: str) -> str:
     """
     Kino nomidan keraksiz qismlarni olib tashlaydi:
@@ -15,47 +84,54 @@ def clean_title(text: str) -> str:
     if not text:
         return ""
 
-    remove_patterns = [
-        # (O'zbek tilida), O`zbek tilida
-        r"\(?\s*O[`']?zbek(cha)?\s*tilida\s*\)?",
-        r"\(?\s*Tarjima\s*kino\s*\)?",  # (Tarjima kino)
-        # "Uzbek tilida ..." va oxirigacha
-        r"Uzbek\s*tilida.*?(skachat|HD|tas-ix)?",
-        r"O[`']?zbek(cha)?\s*tarjima\s*kino.*?(skachat|HD|tas-ix)?",
-        r"Premyera",  # Premyera
-        r"Jangari\s*kino",  # Jangari kino
-        r"Смотреть\s*Tas-ix",  # Ruscha bo‘lak
-        r"Full\s*HD",  # Full HD
-        r"tas-ix",  # tas-ix
-        r"skachat",  # skachat
-        r"\(\s*\)",  # bo‘sh qavslar ()
-        r"\[\s*\]",  # bo‘sh qavslar []
-        r"\b(19|20)\d{2}\b",  # Yillar (1900–2099)
-        r"\bHD\b",  # HD so'zi
-        r"O['`]?zbekchaHD",  # O'zbekchaHD
-        r"O['`]?zbek\s*tarjima",  # O'zbek tarjima
-        r"Turk\s*kinosi",  # Turk kinosi
-        r"Hind\s*kino",  # Hind kino
-        r"-\s*qismlar!?+",  # -qismlar!!!
-        r"[!]{2,}",  # !!! belgilar
-        r"\b\d+-\d+-\d+\b",  # masalan: 1-2-3
-        r"\b\d+(?:-\d+)+\b",  # masalan: 1-2 yoki 1-2-3
-        r"\b\d+(?:,\d+)+\b",  # masalan: 1,2 yoki 1,2,3
-        r"\b\d+\s*qism(lar)?\b",  # "1 qism", "2-qism", "3 qismlar"
-    ]
-
     clean = text
-    for pattern in remove_patterns:
-        clean = re.sub(pattern, "", clean, flags=re.IGNORECASE)
+    key = _match_key(clean)
+    for needle, pattern in _TITLE_RULES:
+        if needle not in key:
+            continue
+        result = pattern.sub("", clean)
+        if result != clean:
+            # O'chirish yangi bo'lak hosil qilishi mumkin - kalit qayta olinadi
+            clean = result
+            key = _match_key(clean)
 
     # Ortiqcha bo‘sh joy va qavslarni tozalash
-    clean = re.sub(r"[\[\]\(\)]", "", clean)  # qolgan qavslarni olib tashlash
-    clean = re.sub(r"\s{2,}", " ", clean)  # ortiqcha bo‘sh joylar
+    clean = _BRACKETS_RE.sub("", clean)  # qolgan qavslarni olib tashlash
+    clean = _SPACES_RE.sub(" ", clean)  # ortiqcha bo‘sh joylar
     clean = clean.strip(" ,.-")
 
     return clean
 
 
+@lru_cache(maxsize=TRANSLIT_CACHE_SIZE)
+def to_latin(text: str) -> str:
+    """cyrillic_to_latin, takrorlanuvchi qiymatlar (aktyorlar, janrlar) uchun cache bilan"""
+    return cyrillic_to_latin(text)
+
+
+@lru_cache(maxsize=TRANSLIT_CACHE_SIZE)
+def normalize_country(value: str) -> str:
+    """Vergul bilan ajratilgan davlatlar - har biri lotinga, katta harflarda"""
+    countries = [c.strip() for c in value.split(",") if c.strip()]
+    return ", ".join(to_latin(c) for c in countries).upper()
+
+
+def text_cache_report() -> Dict[str, Dict[str, int]]:
+    """Normallash cache'lari statistikasi (hits, misses, size)"""
+    report = {}
+    for name, func in (("title", clean_title), ("translit", to_latin),
+                       ("country", normalize_country)):
+        info = func.cache_info()
+        report[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return report
+
+
+def clear_text_caches() -> None:
+    """Normallash cache'larini tozalash (benchmark va testlar uchun)"""
+    for func in (clean_title, to_latin, normalize_country):
+        func.cache_clear()
+
+
 def normalize_item_title(item: dict) -> dict:
     """
     Item ichidagi title ni clean_title orqali tozalaydi
@@ -65,7 +141,7 @@ def normalize_item_title(item: dict) -> dict:
     return item
 
 
-def normalize_item_fields(item: dict, keys_to_translate: list[str]) -> dict:
+def normalize_item_fields(item: dict, keys_to_translate: Iterable[str]) -> dict:
     """
     Item ichidagi ma'lumotlarni normalizatsiya qiladi.
     - Agar language None bo‘lsa → 'uz'
@@ -85,13 +161,9 @@ def normalize_item_fields(item: dict, keys_to_translate: list[str]) -> dict:
             if key in item and isinstance(item[key], str) and item[key]:
                 if key == "country":
                     # Country uchun vergul bilan ajratilgan bo‘lishi mumkin
-                    countries = [c.strip()
-                                 for c in item[key].split(",") if c.strip()]
-                    item[key] = ", ".join(
-                        cyrillic_to_latin(c) for c in countries
-                    ).upper()
+                    item[key] = normalize_country(item[key])
                 else:
-                    item[key] = cyrillic_to_latin(item[key])
+                    item[key] = to_latin(item[key])
 
     return item
 
@@ -116,11 +188,9 @@ def normalize_description(item: dict, lang: str = "uz") -> dict:
         return item
 
     # Tilni aniqlash: rus tilida asosan кириллица mavjud
-    def is_russian(text: str) -> bool:
-        return bool(re.search(r"[А-Яа-яЁё]", text))
-
-    uz_parts = [p for p in parts if not is_russian(p)]
-    ru_parts = [p for p in parts if is_russian(p)]
+    uz_parts, ru_parts = [], []
+    for part in parts:
+        (ru_parts if _CYRILLIC_RE.search(part) else uz_parts).append(part)
 
     if lang == "uz" and uz_parts:
         item["description"] = " ".join(uz_parts).strip()
@@ -131,3 +201,23 @@ def normalize_description(item: dict, lang: str = "uz") -> dict:
         item["description"] = " ".join(parts).strip()
 
     return item
+
+
+def normalize_items(items: Iterable[dict],
+                    keys_to_translate: Iterable[str] = TRANSLATE_KEYS) -> List[dict]:
+    """
+    Itemlar ro'yxatini bitta chaqiruvda normallash: title, maydonlar, description.
+
+    Partiya ichida takrorlanuvchi title/aktyor/davlat qiymatlari cache'dan olinadi.
+
+    Returns:
+        List[dict]: Normallashtirilgan itemlar (o'sha obyektlar, o'sha tartibda)
+    """
+    keys = tuple(keys_to_translate)
+    result = []
+    for item in items:
+        item = normalize_item_title(item)
+        item = normalize_item_fields(item, keys_to_translate=keys)
+        item = normalize_description(item, lang=item.get("language", "uz"))
+        result.append(item)
+    return result
@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from utils.helpers import normalize_category
+from utils.helpers import normalize_categories
 
 
 def clean_and_remap_categories(json_path: str, out_path: str):
@@ -13,8 +13,7 @@ def clean_and_remap_categories(json_path: str, out_path: str):
         cats = item.get("categories")
         mapped = set()
         if cats:
-            for raw in cats.split(","):
-                mapped.add(normalize_category(raw))
+            mapped.update(normalize_categories(cats.split(",")))
         if not mapped:
             mapped.add("other")
 
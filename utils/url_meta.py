@@ -0,0 +1,258 @@
+"""
+URL metadata cache - fayl hajmi, Accept-Ranges va Content-Type probe natijalari.
+
+Bitta video URL avval scraper'da (validate_and_optimize_file), keyin
+downloaderlarda (FileProducer._prepare_file_path, FileDownloader.get_file_info)
+qayta-qayta HEAD / Range GET bilan tekshirilardi. Endi probe natijasi bitta
+umumiy cache'da TTL bilan saqlanadi:
+
+- Xotira (LRU) - shu jarayondagi takroriy so'rovlar tarmoqqa chiqmaydi
+- FileDB url_meta jadvali - scraping'da olingan hajmni keyingi download
+  run'lari ham ishlatadi (HEAD round-trip yo'q)
+- get_many() bir nechta URL'ni (masalan sifat variantlarini) parallel tekshiradi
+
+    cache = get_url_meta_cache()
+    meta = await cache.get(session, url)      # {"size", "accept_ranges", "content_type", "probed_at"}
+    metas = await cache.get_many(session, [url_1080, url_720, url_480])
+
+URL_META_TTL=0 bo'lsa cache o'chadi - har chaqiruv yangi probe qiladi.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from utils.logger_core import logger
+from utils.rate_limiter import throttle
+
+PROBE_TIMEOUT = 15
+
+
+def _empty_meta() -> Dict[str, Any]:
+    return {"size": 0, "accept_ranges": None, "content_type": None, "probed_at": None}
+
+
+def _accept_ranges(headers) -> Optional[bool]:
+    value = (headers.get("Accept-Ranges") or "").lower()
+    if "bytes" in value:
+        return True
+    if value == "none":
+        return False
+    return None
+
+
+async def probe_url(session: aiohttp.ClientSession, url: str) -> Optional[Dict[str, Any]]:
+    """
+    HEAD, kerak bo'lsa Range GET (bytes=0-0) bilan URL metadata'sini olish.
+
+    Returns:
+        Dict: {"size", "accept_ranges", "content_type", "probed_at"} -
+            size=0 hajm aniqlanmagan; None - tarmoq xatosi
+    """
+    meta = _empty_meta()
+    try:
+        # 1️⃣ Avval HEAD bilan sinab ko'ramiz
+        async with throttle(url) as outcome, \
+                session.head(url, timeout=PROBE_TIMEOUT, allow_redirects=True) as resp:
+            outcome.observe(resp)
+            if resp.status == 200:
+                meta["accept_ranges"] = _accept_ranges(resp.headers)
+                meta["content_type"] = resp.headers.get("Content-Type")
+                if resp.headers.get("Content-Length", "0").isdigit():
+                    meta["size"] = int(resp.headers.get("Content-Length", "0"))
+
+        # 2️⃣ Hajm noma'lum bo'lsa, GET bilan Range yuboramiz (resume ham shu bilan aniqlanadi)
+        if not meta["size"]:
+            headers = {"Range": "bytes=0-0"}
+            async with throttle(url) as outcome, \
+                    session.get(url, headers=headers, timeout=PROBE_TIMEOUT, allow_redirects=True) as resp:
+                outcome.observe(resp)
+                if resp.status in (200, 206):
+                    meta["accept_ranges"] = resp.status == 206 or bool(_accept_ranges(resp.headers))
+                    meta["content_type"] = meta["content_type"] or resp.headers.get("Content-Type")
+                    # Content-Range: bytes 0-0/12345678
+                    crange = resp.headers.get("Content-Range")
+                    total = crange.split("/")[-1] if crange and "/" in crange else ""
+                    if total.isdigit():
+                        meta["size"] = int(total)
+                    elif resp.status == 200 and resp.headers.get("Content-Length", "").isdigit():
+                        # Range e'tiborsiz qoldirildi - to'liq javob hajmi
+                        meta["size"] = int(resp.headers["Content-Length"])
+    except Exception as e:
+        logger.warning(f"⚠️ Fayl hajmini aniqlab bo'lmadi: {url} | {e}")
+        return None
+
+    meta["probed_at"] = time.time()
+    return meta
+
+
+class UrlMetaCache:
+    """
+    URL probe natijalari uchun TTL + LRU cache, ixtiyoriy FileDB'da saqlash bilan.
+
+    Args:
+        ttl: Natija shuncha soniya yangi hisoblanadi (0 - cache o'chirilgan)
+        max_entries: Xotiradagi URL'lar chegarasi (LRU)
+        persist: Natijalarni FileDB url_meta jadvalida saqlash
+        db: AsyncFileDB (None bo'lsa get_async_db())
+    """
+
+    def __init__(self, ttl: float = 86400, max_entries: int = 10000,
+                 persist: bool = True, db=None):
+        self.ttl = max(ttl, 0)
+        self.max_entries = max(max_entries, 1)
+        self.persist = persist
+        self._db = db
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stale: set = set()  # invalidate() qilingan - DB dagi natija ham eskirgan
+        self.stats = {"hits": 0, "db_hits": 0, "probes": 0, "errors": 0}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "UrlMetaCache":
+        return cls(
+            ttl=config.get("url_meta_ttl", 86400),
+            max_entries=config.get("url_meta_max_entries", 10000),
+            persist=config.get("url_meta_persist", True),
+        )
+
+    @property
+    def db(self):
+        if self._db is None:
+            from core.async_db import get_async_db
+            self._db = get_async_db()
+        return self._db
+
+    def _fresh(self, meta: Dict[str, Any]) -> bool:
+        return bool(meta.get("probed_at")) and time.time() - meta["probed_at"] < self.ttl
+
+    def _remember(self, url: str, meta: Dict[str, Any]) -> None:
+        self._entries[url] = meta
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def peek(self, url: str) -> Optional[Dict[str, Any]]:
+        """Xotiradagi yangi natija (tarmoq va DB ga murojaat qilmaydi)"""
+        meta = self._entries.get(url)
+        if meta is None or not self._fresh(meta):
+            return None
+        self._entries.move_to_end(url)
+        return meta
+
+    def update(self, url: str, **fields) -> None:
+        """Xotiradagi yozuvni to'ldirish (masalan Range GET bilan aniqlangan accept_ranges)"""
+        meta = self._entries.get(url)
+        if meta is not None:
+            meta.update(fields)
+
+    def invalidate(self, url: str) -> None:
+        """URL natijasini eskirgan deb belgilash (masalan yuklangan hajm mos kelmasa) - keyingisi probe"""
+        self._entries.pop(url, None)
+        self._stale.add(url)
+
+    async def preload(self, urls: Sequence[str]) -> int:
+        """
+        Partiya URL'lari uchun saqlangan natijalarni bitta DB so'rovi bilan xotiraga yuklash.
+
+        Returns:
+            int: Yuklangan URL'lar soni
+        """
+        missing = [url for url in dict.fromkeys(urls)
+                   if url and url not in self._stale and self.peek(url) is None]
+        if not missing or not self.ttl or not self.persist:
+            return 0
+        try:
+            stored = await self.db.get_url_meta(missing, max_age=self.ttl)
+        except Exception as e:
+            logger.debug(f"🔍 url_meta o'qilmadi: {e}")
+            return 0
+        for url, meta in stored.items():
+            self._remember(url, meta)
+        self.stats["db_hits"] += len(stored)
+        return len(stored)
+
+    async def get(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        """Bitta URL metadata'si (cache → DB → probe)"""
+        return (await self.get_many(session, [url]))[url]
+
+    async def get_many(self, session: aiohttp.ClientSession,
+                       urls: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        URL'lar metadata'si: xotira, keyin bitta DB so'rovi, qolganlari parallel probe.
+
+        Returns:
+            Dict: {url: meta} - probe muvaffaqiyatsiz bo'lsa size=0
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        result: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for url in urls:
+            meta = self.peek(url) if self.ttl else None
+            if meta is not None:
+                self.stats["hits"] += 1
+                result[url] = meta
+            else:
+                missing.append(url)
+
+        lookup = [url for url in missing if url not in self._stale]
+        if lookup and self.ttl and self.persist:
+            try:
+                stored = await self.db.get_url_meta(lookup, max_age=self.ttl)
+            except Exception as e:
+                logger.debug(f"🔍 url_meta o'qilmadi: {e}")
+                stored = {}
+            for url, meta in stored.items():
+                self.stats["db_hits"] += 1
+                self._remember(url, meta)
+                result[url] = meta
+            missing = [url for url in missing if url not in stored]
+
+        if missing:
+            self.stats["probes"] += len(missing)
+            probed = await asyncio.gather(*(probe_url(session, url) for url in missing))
+            fresh = {}
+            for url, meta in zip(missing, probed):
+                if meta is None or not meta["size"]:
+                    # Xato yoki hajm noma'lum - keyingi chaqiruv qayta tekshiradi
+                    self.stats["errors"] += 1
+                    result[url] = meta or _empty_meta()
+                    continue
+                result[url] = meta
+                self._stale.discard(url)
+                if self.ttl:
+                    self._remember(url, meta)
+                    fresh[url] = meta
+            if fresh and self.persist:
+                try:
+                    await self.db.put_url_meta(fresh)
+                except Exception as e:
+                    logger.debug(f"🔍 url_meta saqlanmadi: {e}")
+
+        return result
+
+    def report(self) -> Dict[str, int]:
+        return {**self.stats, "entries": len(self._entries)}
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[UrlMetaCache] = None
+
+
+def get_url_meta_cache() -> UrlMetaCache:
+    """Jarayon bo'yicha umumiy URL metadata cache (APP_CONFIG dan)"""
+    global _shared
+    from core.config import APP_CONFIG
+    with _shared_lock:
+        if _shared is None:
+            _shared = UrlMetaCache.from_config(APP_CONFIG)
+        return _shared
+
+
+def set_url_meta_cache(cache: Optional[UrlMetaCache]) -> None:
+    """Umumiy cache'ni almashtirish (testlar va maxsus sozlamalar uchun)"""
+    global _shared
+    with _shared_lock:
+        _shared = cache